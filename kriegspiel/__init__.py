@@ -4,28 +4,35 @@ __author__ = "Alexander Filatov"
 
 __email__ = "alexander@kriegspiel.org"
 
-__version__ = "1.7.3"
-
-from kriegspiel.berkeley import BerkeleyGame
-from kriegspiel.cincinnati import CincinnatiGame
-from kriegspiel.crazykrieg import CrazyKriegGame
-from kriegspiel.english import EnglishGame
-from kriegspiel.game import KriegspielGame
-from kriegspiel.move import CapturedPieceAnnouncement
-from kriegspiel.move import KriegspielAnswer
-from kriegspiel.move import KriegspielMove
-from kriegspiel.move import MainAnnouncement
-from kriegspiel.move import QuestionAnnouncement
-from kriegspiel.move import SpecialCaseAnnouncement
-from kriegspiel.rand import RandGame
-from kriegspiel.snapshot import BerkeleyGameSnapshot
-from kriegspiel.snapshot import KriegspielGameSnapshot
-from kriegspiel.snapshot import MaterialSideSummary
-from kriegspiel.snapshot import PublicMaterialSummary
-from kriegspiel.snapshot import PublicReserveSummary
-from kriegspiel.snapshot import ReserveSideSummary
-from kriegspiel.snapshot import ScoresheetSnapshot
-from kriegspiel.wild16 import Wild16Game
+__version__ = "2.0.0"
+
+import importlib
+
+# Public names are imported on first access (PEP 562), so `import kriegspiel`
+# stays cheap for CLI tools and worker processes that only need part of the API.
+_LAZY_ATTRIBUTES = {
+    "BerkeleyGame": "kriegspiel.berkeley",
+    "BerkeleyGameSnapshot": "kriegspiel.snapshot",
+    "CapturedPieceAnnouncement": "kriegspiel.move",
+    "CincinnatiGame": "kriegspiel.cincinnati",
+    "CrazyKriegGame": "kriegspiel.crazykrieg",
+    "EnglishGame": "kriegspiel.english",
+    "KriegspielAnswer": "kriegspiel.move",
+    "KriegspielGame": "kriegspiel.game",
+    "KriegspielGameSnapshot": "kriegspiel.snapshot",
+    "KriegspielMove": "kriegspiel.move",
+    "MainAnnouncement": "kriegspiel.move",
+    "MaterialSideSummary": "kriegspiel.snapshot",
+    "PlayerView": "kriegspiel.snapshot",
+    "PublicMaterialSummary": "kriegspiel.snapshot",
+    "PublicReserveSummary": "kriegspiel.snapshot",
+    "QuestionAnnouncement": "kriegspiel.move",
+    "RandGame": "kriegspiel.rand",
+    "ReserveSideSummary": "kriegspiel.snapshot",
+    "ScoresheetSnapshot": "kriegspiel.snapshot",
+    "SpecialCaseAnnouncement": "kriegspiel.move",
+    "Wild16Game": "kriegspiel.wild16",
+}
 
 __all__ = [
     "BerkeleyGame",
@@ -40,6 +47,7 @@ __all__ = [
     "KriegspielMove",
     "MainAnnouncement",
     "MaterialSideSummary",
+    "PlayerView",
     "PublicMaterialSummary",
     "PublicReserveSummary",
     "QuestionAnnouncement",
@@ -49,3 +57,17 @@ __all__ = [
     "SpecialCaseAnnouncement",
     "Wild16Game",
 ]
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streaming JSON Lines archives of Kriegspiel games.
+
+Every line of an archive holds one game:
+
+    {"header":{"ruleset_id":"berkeley","result":"1-0","plies":57},"game":{...}}
+
+`game` is the compact schema 10 document written by `serialize_compact_game`.
+The header is always written first, so readers can filter on ruleset, result
+and ply count by decoding only the leading object of each line and leave the
+scoresheets untouched until a game is actually requested.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from kriegspiel.serialization import MalformedDataError
+from kriegspiel.serialization import SerializationError
+from kriegspiel.serialization import deserialize_berkeley_game
+from kriegspiel.serialization import deserialize_game_snapshot
+from kriegspiel.serialization import serialize_compact_game
+from kriegspiel.snapshot import KriegspielGameSnapshot
+
+DEFAULT_BATCH_SIZE = 256
+
+_HEADER_PREFIX = '{"header":'
+_GAME_SEPARATOR = ',"game":'
+_DECODER = json.JSONDecoder()
+
+
+@dataclass(frozen=True)
+class ArchiveHeader:
+    """Summary fields stored ahead of each archived game."""
+
+    ruleset_id: str
+    result: str
+    plies: int
+
+
+@dataclass(frozen=True)
+class ArchivedGame:
+    """An archived game whose payload is decoded only on request."""
+
+    header: ArchiveHeader
+    payload: str
+
+    def data(self) -> Dict[str, Any]:
+        """Return the schema 10 document of this game."""
+        try:
+            return json.loads(self.payload)
+        except json.JSONDecodeError as e:
+            raise MalformedDataError("Invalid JSON in archived game") from e
+
+    def snapshot(self) -> KriegspielGameSnapshot:
+        """Decode the game into a KriegspielGameSnapshot."""
+        return deserialize_game_snapshot(self.data())
+
+    def game(self, game_class=None):
+        """Decode the game into a live game; `game_class` defaults to `KriegspielGame`."""
+        return deserialize_berkeley_game(self.data(), game_class=game_class)
+
+
+def game_header(game) -> ArchiveHeader:
+    """Build the archive header of a live game."""
+    return ArchiveHeader(
+        ruleset_id=game.ruleset_id,
+        result=game.result,
+        plies=len(game._move_stack),
+    )
+
+
+def _archive_line(game) -> str:
+    header = game_header(game)
+    return "".join((
+        _HEADER_PREFIX,
+        json.dumps(
+            {"ruleset_id": header.ruleset_id, "result": header.result, "plies": header.plies},
+            separators=(",", ":"),
+        ),
+        _GAME_SEPARATOR,
+        json.dumps(serialize_compact_game(game), separators=(",", ":")),
+        "}\n",
+    ))
+
+
+def write_games(games: Iterable, path: str, batch_size: int = DEFAULT_BATCH_SIZE, append: bool = False) -> int:
+    """
+    Stream games to a JSON Lines archive and return the number written.
+
+    Lines are buffered and written `batch_size` at a time, so memory stays
+    bounded for arbitrarily long iterables. With `append=True` the games are
+    added to an existing archive.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    count = 0
+    try:
+        with open(path, "a" if append else "w") as f:
+            batch = []
+            for game in games:
+                batch.append(_archive_line(game))
+                if len(batch) >= batch_size:
+                    f.write("".join(batch))
+                    count += len(batch)
+                    batch = []
+            if batch:
+                f.write("".join(batch))
+                count += len(batch)
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to write games to {path}") from e
+    return count
+
+
+def _parse_line(line: str, line_number: int, path: str) -> ArchivedGame:
+    record = line.rstrip("\r\n")
+    try:
+        if not record.startswith(_HEADER_PREFIX) or not record.endswith("}"):
+            raise ValueError("unexpected record layout")
+        header_data, end = _DECODER.raw_decode(record, len(_HEADER_PREFIX))
+        if not record.startswith(_GAME_SEPARATOR, end):
+            raise ValueError("missing game payload")
+        header = ArchiveHeader(
+            ruleset_id=header_data["ruleset_id"],
+            result=header_data["result"],
+            plies=header_data["plies"],
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise MalformedDataError(f"Invalid archive record on line {line_number} of {path}") from e
+    return ArchivedGame(header=header, payload=record[end + len(_GAME_SEPARATOR):-1])
+
+
+def iter_games(
+    path: str,
+    ruleset: Optional[str] = None,
+    lazy: bool = True,
+    result: Optional[str] = None,
+    min_plies: Optional[int] = None,
+    max_plies: Optional[int] = None,
+    game_class=None,
+) -> Iterator[Union[ArchivedGame, Any]]:
+    """
+    Iterate over the games of a JSON Lines archive.
+
+    Records are read one line at a time. Only the header of each line is
+    decoded to apply the `ruleset`, `result`, `min_plies` and `max_plies`
+    filters. With `lazy=True` matching records are yielded as `ArchivedGame`
+    values; otherwise they are decoded into `game_class` instances.
+    """
+    try:
+        with open(path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = _parse_line(line, line_number, path)
+                header = record.header
+                if ruleset is not None and header.ruleset_id != ruleset:
+                    continue
+                if result is not None and header.result != result:
+                    continue
+                if min_plies is not None and header.plies < min_plies:
+                    continue
+                if max_plies is not None and header.plies > max_plies:
+                    continue
+                yield record if lazy else record.game(game_class=game_class)
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to read games from {path}") from e
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Re-adjudication of stored games against the current engine.
+
+Every question recorded on the scoresheets is asked again, in ply order, on
+a fresh game of the recorded ruleset, and each answer is compared with the
+recorded one. The first divergent answer of each game is reported, which is
+how rule changes between library versions are checked against a whole
+archive before release.
+
+Questions answered `IMPOSSIBLE_TO_ASK` are never recorded, so they are not
+replayed either; a recorded question that the current engine refuses shows
+up as a divergence.
+
+Files are processed over the `kriegspiel.bulk` process pool and results are
+streamed in input order. As in `kriegspiel.bulk`, a file that fails for any
+reason is reported as a failed result instead of aborting the run.
+
+Command line:
+
+    python -m kriegspiel.audit PATH... [--workers N] [--chunksize N]
+"""
+
+import argparse
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from kriegspiel.bulk import DEFAULT_CHUNKSIZE
+from kriegspiel.bulk import expand_paths
+from kriegspiel.bulk import map_paths
+from kriegspiel.bulk import read_snapshot_file
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielAnswer
+from kriegspiel.move import KriegspielMove
+from kriegspiel.snapshot import KriegspielGameSnapshot
+from kriegspiel.snapshot import turns_in_ply_order
+
+
+@dataclass(frozen=True)
+class Divergence:
+    """The first question whose replayed answer differs from the recorded one."""
+
+    index: int
+    ply: int
+    question: KriegspielMove
+    recorded: KriegspielAnswer
+    replayed: KriegspielAnswer
+
+
+@dataclass(frozen=True)
+class AuditResult:
+    """Outcome of re-adjudicating one file."""
+
+    path: str
+    questions: int = 0
+    divergence: Optional[Divergence] = None
+    error_type: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.divergence is None and self.error_type is None
+
+
+def question_sequence(snapshot: KriegspielGameSnapshot) -> List[Tuple[KriegspielMove, KriegspielAnswer]]:
+    """Return every recorded `(question, answer)` pair of both players in the order they were asked."""
+    return [
+        pair
+        for turn in turns_in_ply_order(snapshot.white_scoresheet, snapshot.black_scoresheet)
+        for pair in turn
+    ]
+
+
+def audit_snapshot(snapshot: KriegspielGameSnapshot) -> Tuple[int, Optional[Divergence]]:
+    """
+    Replay the recorded questions of `snapshot` on a fresh game.
+
+    Returns the number of questions replayed and the first divergence, if any.
+    Replay stops at the first divergence because later questions were asked
+    in a position the current engine no longer reaches.
+    """
+    game = KriegspielGame(ruleset=snapshot.ruleset_id)
+    sequence = question_sequence(snapshot)
+    for index, (question, recorded) in enumerate(sequence):
+        ply = len(game._move_stack)
+        replayed = game.ask_for(question)
+        if replayed != recorded:
+            return index + 1, Divergence(index, ply, question, recorded, replayed)
+    return len(sequence), None
+
+
+def audit_file(path: str) -> AuditResult:
+    """Re-adjudicate the game stored at `path`; any error is reported in the result."""
+    try:
+        questions, divergence = audit_snapshot(read_snapshot_file(path))
+    except Exception as e:
+        return AuditResult(path, error_type=type(e).__name__, error=str(e))
+    return AuditResult(path, questions=questions, divergence=divergence)
+
+
+def iter_audit(
+    paths: Sequence[str], workers: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[AuditResult]:
+    """Re-adjudicate files in parallel, yielding results in input order as they complete."""
+    return map_paths(audit_file, expand_paths(paths), workers, chunksize)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay saved Kriegspiel games and diff the answers")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    files = 0
+    failures = 0
+    for result in iter_audit(args.paths, workers=args.workers, chunksize=args.chunksize):
+        files += 1
+        if result.ok:
+            continue
+        failures += 1
+        if result.error_type is not None:
+            print(f"error path={result.path} type={result.error_type} message={result.error}")
+        else:
+            divergence = result.divergence
+            print(
+                f"diverged path={result.path} index={divergence.index} ply={divergence.ply} "
+                f"question={divergence.question} recorded={divergence.recorded} replayed={divergence.replayed}"
+            )
+    print(f"files={files}")
+    print(f"failures={failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite of the referee engine.
+
+Every benchmark replays reproducible work, seeded question scripts or fixed
+positions, and reports the median time per operation over `rounds` runs:
+
+    ask_for.<ruleset>             random games of every ruleset, including
+                                  CrazyKrieg drops and RAND/Wild16 pawn tries
+    ask_any.<ruleset>             games asking ASK_ANY whenever allowed
+    illegal_attempts.<ruleset>    turns trying every illegal question first
+    terminal_detection            is_game_over on mate, stalemate, dead and
+                                  live positions
+    snapshot.<ruleset>            snapshot() of middlegames
+    from_snapshot.<ruleset>       from_snapshot() of those snapshots
+    material_summary.<ruleset>    public material and reserve summaries
+    scoresheet_access.<ruleset>   last turn, turn counts and result read from
+                                  the live scoresheets of middlegames
+
+Results are written as JSON together with the environment they were
+measured in. With `--baseline`, every benchmark slower than the baseline by
+more than `--threshold` (a fraction) is reported and the exit status is 1.
+
+Command line:
+
+    python -m kriegspiel.bench [--rounds N] [--games N] [--questions N] [--filter TEXT]
+                               [--output FILE] [--baseline FILE] [--threshold X]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import chess
+
+import kriegspiel
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove
+from kriegspiel.move import QuestionAnnouncement
+from kriegspiel.rulesets import RULESET_BERKELEY
+from kriegspiel.rulesets import RULESET_BERKELEY_ANY
+from kriegspiel.rulesets import RULESET_CINCINNATI
+from kriegspiel.rulesets import RULESET_CRAZYKRIEG
+from kriegspiel.rulesets import RULESET_ENGLISH
+from kriegspiel.rulesets import RULESET_RAND
+from kriegspiel.rulesets import RULESET_WILD16
+from kriegspiel.rulesets import resolve_ruleset_policy
+from kriegspiel.snapshot import result_from_scoresheets
+
+RULESETS = (
+    RULESET_BERKELEY, RULESET_BERKELEY_ANY, RULESET_CINCINNATI, RULESET_CRAZYKRIEG,
+    RULESET_ENGLISH, RULESET_RAND, RULESET_WILD16,
+)
+ASK_ANY_RULESETS = (RULESET_BERKELEY_ANY, RULESET_CRAZYKRIEG, RULESET_ENGLISH)
+
+DEFAULT_ROUNDS = 5
+DEFAULT_GAMES = 4
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_QUESTIONS = 300
+SCHEMA = 1
+
+TERMINAL_POSITIONS = (
+    # Checkmate, stalemate, insufficient material and a live middlegame.
+    "r1bqkb1r/pppp1Qpp/2n2n2/4p3/2B1P3/8/PPPP1PPP/RNB1K1NR b KQkq - 0 4",
+    "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1",
+    "8/8/4k3/8/8/3NK3/8/8 w - - 0 1",
+    "r1bq1rk1/2ppbppp/p1n2n2/1p2p3/4P3/1B3N2/PPPP1PPP/RNBQR1K1 w - - 2 8",
+)
+
+# A setup returns `(run, operations)`: `run()` is timed and performs `operations` operations.
+Setup = Callable[[], Tuple[Callable[[], Any], int]]
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Timings of one benchmark."""
+
+    name: str
+    operations: int
+    rounds: Tuple[float, ...]
+
+    @property
+    def per_op_seconds(self) -> float:
+        return statistics.median(self.rounds) / self.operations
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "operations": self.operations,
+            "rounds": list(self.rounds),
+            "per_op_us": self.per_op_seconds * 1e6,
+            "ops_per_second": 1.0 / self.per_op_seconds,
+        }
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A benchmark slower than its baseline by more than the threshold."""
+
+    name: str
+    baseline_us: float
+    current_us: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_us / self.baseline_us
+
+
+def _random_policy(game, rng):
+    return rng.choice(sorted(game.possible_to_ask))
+
+
+def _ask_any_policy(game, rng):
+    ask_any = KriegspielMove(QuestionAnnouncement.ASK_ANY)
+    if ask_any in game.possible_to_ask:
+        return ask_any
+    return _random_policy(game, rng)
+
+
+def _illegal_first_policy(game, rng):
+    illegal = [
+        question for question in sorted(game.possible_to_ask)
+        if question.chess_move is not None and not game._board.is_legal(question.chess_move)
+    ]
+    return rng.choice(illegal) if illegal else _random_policy(game, rng)
+
+
+def record_script(
+    ruleset: str, seed: int, policy=_random_policy, questions: int = DEFAULT_QUESTIONS
+) -> List[KriegspielMove]:
+    """Play a seeded game with `policy` for at most `questions` questions and return the questions asked."""
+    rng = random.Random(seed)
+    game = KriegspielGame(ruleset=ruleset)
+    script = []
+    while len(script) < questions and not game.game_over:
+        question = policy(game, rng)
+        game.ask_for(question)
+        script.append(question)
+    return script
+
+
+def _replay(ruleset: str, scripts: Sequence[Sequence[KriegspielMove]]) -> Setup:
+    operations = sum(len(script) for script in scripts)
+
+    def setup():
+        games = [KriegspielGame(ruleset=ruleset) for _ in scripts]
+
+        def run():
+            for game, script in zip(games, scripts):
+                ask_for = game.ask_for
+                for question in script:
+                    ask_for(question)
+
+        return run, operations
+
+    return setup
+
+
+def _middlegames(ruleset: str, games: int, questions: int) -> List[KriegspielGame]:
+    result = []
+    for seed in range(games):
+        game = KriegspielGame(ruleset=ruleset)
+        for question in record_script(ruleset, seed, questions=questions // 2):
+            game.ask_for(question)
+        result.append(game)
+    return result
+
+
+def _repeat(operation: Callable[[Any], Any], items: Sequence, repeat: int) -> Setup:
+    def setup():
+        def run():
+            for _ in range(repeat):
+                for item in items:
+                    operation(item)
+
+        return run, repeat * len(items)
+
+    return setup
+
+
+def _terminal_detection(repeat: int) -> Setup:
+    policy = resolve_ruleset_policy(ruleset=RULESET_BERKELEY)
+    games = [KriegspielGame._blank(policy, chess.Board(fen)) for fen in TERMINAL_POSITIONS]
+
+    def detect(game):
+        game._game_over = False
+        return game.is_game_over()
+
+    return _repeat(detect, games, repeat)
+
+
+def _material_summary(game):
+    return game.public_material_summary, game.public_reserve_summary
+
+
+def _scoresheet_access(game):
+    white, black = game._whites_scoresheet, game._blacks_scoresheet
+    for scoresheet in (white, black):
+        scoresheet.own_turn(scoresheet.own_turn_count - 1)
+        scoresheet.opponent_turn(-1)
+    return result_from_scoresheets(white, black)
+
+
+def build_suite(
+    games: int = DEFAULT_GAMES, name_filter: Optional[str] = None, questions: int = DEFAULT_QUESTIONS
+) -> Dict[str, Setup]:
+    """Return `{benchmark name: setup}`, building only the benchmarks whose name contains `name_filter`."""
+    factories: Dict[str, Callable[[], Setup]] = {}
+    middlegames: Dict[str, List[KriegspielGame]] = {}
+
+    def middlegames_of(ruleset):
+        if ruleset not in middlegames:
+            middlegames[ruleset] = _middlegames(ruleset, games, questions)
+        return middlegames[ruleset]
+
+    for ruleset in RULESETS:
+        factories[f"ask_for.{ruleset}"] = lambda ruleset=ruleset: _replay(
+            ruleset, [record_script(ruleset, seed, questions=questions) for seed in range(games)]
+        )
+    for ruleset in ASK_ANY_RULESETS:
+        factories[f"ask_any.{ruleset}"] = lambda ruleset=ruleset: _replay(
+            ruleset, [record_script(ruleset, seed, _ask_any_policy, questions) for seed in range(games)]
+        )
+    for ruleset in (RULESET_BERKELEY, RULESET_WILD16):
+        factories[f"illegal_attempts.{ruleset}"] = lambda ruleset=ruleset: _replay(
+            ruleset, [record_script(ruleset, seed, _illegal_first_policy, questions) for seed in range(games)]
+        )
+    factories["terminal_detection"] = lambda: _terminal_detection(repeat=250)
+    for ruleset in RULESETS:
+        factories[f"snapshot.{ruleset}"] = lambda ruleset=ruleset: _repeat(
+            KriegspielGame.snapshot, middlegames_of(ruleset), repeat=5
+        )
+        factories[f"from_snapshot.{ruleset}"] = lambda ruleset=ruleset: _repeat(
+            KriegspielGame.from_snapshot, [game.snapshot() for game in middlegames_of(ruleset)], repeat=5
+        )
+        factories[f"material_summary.{ruleset}"] = lambda ruleset=ruleset: _repeat(
+            _material_summary, middlegames_of(ruleset), repeat=50
+        )
+        factories[f"scoresheet_access.{ruleset}"] = lambda ruleset=ruleset: _repeat(
+            _scoresheet_access, middlegames_of(ruleset), repeat=50
+        )
+    return {
+        name: factory()
+        for name, factory in factories.items()
+        if name_filter is None or name_filter in name
+    }
+
+
+def run_benchmark(name: str, setup: Setup, rounds: int = DEFAULT_ROUNDS) -> BenchmarkResult:
+    """Time `rounds` runs of a benchmark, each on freshly set-up state."""
+    timings = []
+    operations = 0
+    for _ in range(rounds):
+        run, operations = setup()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return BenchmarkResult(name, operations, tuple(timings))
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the interpreter, machine and library versions a run was measured with."""
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "kriegspiel": kriegspiel.__version__,
+        "python_chess": chess.__version__,
+    }
+
+
+def run_suite(
+    rounds: int = DEFAULT_ROUNDS,
+    games: int = DEFAULT_GAMES,
+    name_filter: Optional[str] = None,
+    questions: int = DEFAULT_QUESTIONS,
+) -> Dict[str, Any]:
+    """Run the suite and return the JSON-ready report."""
+    results = {
+        name: run_benchmark(name, setup, rounds).as_dict()
+        for name, setup in build_suite(games, name_filter, questions).items()
+    }
+    return {
+        "schema": SCHEMA,
+        "environment": environment(),
+        "config": {"rounds": rounds, "games": games, "questions": questions, "filter": name_filter},
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """Return the benchmarks of `report` slower than in `baseline` by more than `threshold`."""
+    regressions = []
+    for name, result in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        if result["per_op_us"] > previous["per_op_us"] * (1.0 + threshold):
+            regressions.append(Regression(name, previous["per_op_us"], result["per_op_us"]))
+    return regressions
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the `--filter`, `--output`, `--baseline` and `--threshold` options shared by benchmark suites."""
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", default=None, help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+
+def finish_report(report: Dict[str, Any], args: argparse.Namespace) -> int:
+    """Write `report` as `add_report_arguments` asked and return the exit status of the baseline check."""
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.threshold)
+    for regression in regressions:
+        print(
+            f"regression name={regression.name} baseline_us={regression.baseline_us:.3f} "
+            f"current_us={regression.current_us:.3f} ratio={regression.ratio:.2f}",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Kriegspiel referee engine")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES)
+    parser.add_argument("--questions", type=int, default=DEFAULT_QUESTIONS, help="questions per scripted game")
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    return finish_report(run_suite(args.rounds, args.games, args.filter, args.questions), args)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
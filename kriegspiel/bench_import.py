@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+Import-time benchmark with a budget check.
+
+Every round of every benchmark runs its import statement in a fresh
+interpreter, so nothing is cached in `sys.modules`:
+
+    package          import kriegspiel
+    engine           from kriegspiel import KriegspielGame
+    serialization    import kriegspiel.serialization
+    everything       from kriegspiel import *
+    crazykrieg       from kriegspiel import CrazyKriegGame; CrazyKriegGame()
+
+Besides the median seconds of the statement, each result lists how many
+modules it loaded and whether `chess`, `chess.variant` and `json` were among
+them. The JSON report has the same layout as `kriegspiel.bench`, so
+`--baseline` comparisons work the same way. The run also fails when the
+median `package` import takes longer than `--budget` milliseconds (20 by
+default), which keeps the package cheap to import for CLI tools and
+short-lived workers.
+
+Command line:
+
+    python -m kriegspiel.bench_import [--rounds N] [--budget MS]
+        [--filter TEXT] [--output FILE] [--baseline FILE] [--threshold X]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+from kriegspiel.bench import DEFAULT_ROUNDS
+from kriegspiel.bench import SCHEMA
+from kriegspiel.bench import BenchmarkResult
+from kriegspiel.bench import add_report_arguments
+from kriegspiel.bench import environment
+from kriegspiel.bench import finish_report
+
+DEFAULT_BUDGET_MS = 20.0
+
+STATEMENTS = {
+    "package": "import kriegspiel",
+    "engine": "from kriegspiel import KriegspielGame",
+    "serialization": "import kriegspiel.serialization",
+    "everything": "from kriegspiel import *",
+    "crazykrieg": "from kriegspiel import CrazyKriegGame; CrazyKriegGame()",
+}
+
+WATCHED_MODULES = ("chess", "chess.variant", "json")
+
+# The probe itself imports nothing beyond `sys` and `time`, so the modules it sees are the statement's own.
+_PROBE = """\
+import sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+exec(sys.argv[1], {})
+seconds = time.perf_counter() - start
+loaded = set(sys.modules) - before
+print(repr(seconds), len(loaded), *sorted(loaded & set(sys.argv[2:])))
+"""
+
+
+def measure_import(statement: str) -> Dict[str, Any]:
+    """Run `statement` in a fresh interpreter and return its seconds, module count and watched modules."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (root, env.get("PYTHONPATH"))))
+    seconds, modules, *watched = subprocess.run(
+        [sys.executable, "-c", _PROBE, statement, *WATCHED_MODULES],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout.split()
+    return {"seconds": float(seconds), "modules": int(modules), "watched": watched}
+
+
+def run_suite(rounds: int = DEFAULT_ROUNDS, name_filter: Optional[str] = None) -> Dict[str, Any]:
+    """Run the suite and return the JSON-ready report."""
+    results = {}
+    for name, statement in STATEMENTS.items():
+        if name_filter is not None and name_filter not in name:
+            continue
+        probes = [measure_import(statement) for _ in range(rounds)]
+        result = BenchmarkResult(name, 1, tuple(probe["seconds"] for probe in probes)).as_dict()
+        result["modules"] = probes[-1]["modules"]
+        result["loaded"] = probes[-1]["watched"]
+        results[name] = result
+    return {
+        "schema": SCHEMA,
+        "environment": environment(),
+        "config": {"rounds": rounds, "filter": name_filter},
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Kriegspiel import time")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument(
+        "--budget", type=float, default=DEFAULT_BUDGET_MS, metavar="MS",
+        help="fail when the median `import kriegspiel` takes longer",
+    )
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.rounds, args.filter)
+    status = finish_report(report, args)
+    package = report["results"].get("package")
+    if package is not None:
+        milliseconds = package["per_op_us"] / 1000
+        if milliseconds > args.budget:
+            print(f"over_budget name=package ms={milliseconds:.3f} budget_ms={args.budget:g}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Idle-game memory benchmark.
+
+For every ruleset and every ply count in `plies`, `games` seeded random games
+are played until that many moves are completed (fewer if the game ends
+first) and then left idle. The benchmark reports the memory `tracemalloc`
+sees them retain:
+
+    idle.<ruleset>.<ply>
+
+The games are first played untraced to record their questions, which also
+fills the interning caches that every game shares; the traced run replays
+the recorded questions, so each game is charged only for its own state.
+
+Every result holds `bytes_per_game`, the mean `plies` actually reached and
+`games_per_gib`. Results for a ply count listed in `BUDGETS` fail the run
+when they exceed its bytes per game.
+
+Command line:
+
+    python -m kriegspiel.bench_memory [--games N] [--plies N,N,...]
+        [--filter TEXT] [--output FILE]
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from kriegspiel.bench import RULESETS
+from kriegspiel.bench import SCHEMA
+from kriegspiel.bench import environment
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove
+
+DEFAULT_GAMES = 4
+DEFAULT_PLIES = (0, 40, 400)
+
+# Bytes per idle game: about 25% over the largest ruleset on CPython 3.11,
+# where games held about 11 KB, 60-80 KB and 330-460 KB before the askable
+# set, move history and scoresheets were made compact.
+BUDGETS = {
+    0: 6000,
+    40: 10000,
+    400: 36000,
+}
+
+
+def idle_script(ruleset: str, seed: int, plies: int) -> List[KriegspielMove]:
+    """Return the questions of a seeded random game played until `plies` moves are completed."""
+    rng = random.Random(seed)
+    game = KriegspielGame(ruleset=ruleset)
+    script = []
+    while len(game._move_stack) < plies and not game.game_over:
+        question = rng.choice(sorted(game.possible_to_ask))
+        game.ask_for(question)
+        script.append(question)
+    return script
+
+
+def measure_idle(ruleset: str, scripts: Sequence[Sequence[KriegspielMove]]) -> Tuple[int, float]:
+    """
+    Replay one game per script under `tracemalloc`.
+
+    Returns the bytes the idle games retain and the mean plies they reached.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        games = []
+        for script in scripts:
+            game = KriegspielGame(ruleset=ruleset)
+            for question in script:
+                game.ask_for(question)
+            games.append(game)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return retained, sum(len(game._move_stack) for game in games) / len(games)
+
+
+def run_suite(
+    games: int = DEFAULT_GAMES, plies: Sequence[int] = DEFAULT_PLIES, name_filter: Optional[str] = None
+) -> Dict[str, Any]:
+    """Run the suite and return the JSON-ready report."""
+    results = {}
+    for ruleset in RULESETS:
+        for ply in plies:
+            name = f"idle.{ruleset}.{ply}"
+            if name_filter is not None and name_filter not in name:
+                continue
+            scripts = [idle_script(ruleset, seed, ply) for seed in range(games)]
+            retained, reached = measure_idle(ruleset, scripts)
+            bytes_per_game = retained / games
+            results[name] = {
+                "games": games,
+                "plies": reached,
+                "bytes_per_game": bytes_per_game,
+                "games_per_gib": (1 << 30) / bytes_per_game,
+                "budget_bytes": BUDGETS.get(ply),
+            }
+    return {
+        "schema": SCHEMA,
+        "environment": environment(),
+        "config": {"games": games, "plies": list(plies), "filter": name_filter},
+        "results": results,
+    }
+
+
+def over_budget(report: Dict[str, Any]) -> List[str]:
+    """Return the names of the results that exceed their bytes-per-game budget."""
+    return [
+        name for name, result in report["results"].items()
+        if result["budget_bytes"] is not None and result["bytes_per_game"] > result["budget_bytes"]
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the memory held by idle Kriegspiel games")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="games per ruleset and ply count")
+    parser.add_argument(
+        "--plies", default=",".join(map(str, DEFAULT_PLIES)), help="comma-separated completed moves per game"
+    )
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    plies = [int(ply) for ply in args.plies.split(",")]
+    report = run_suite(args.games, plies, args.filter)
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    failures = over_budget(report)
+    for name in failures:
+        result = report["results"][name]
+        print(
+            f"over_budget name={name} bytes_per_game={result['bytes_per_game']:.0f} "
+            f"budget_bytes={result['budget_bytes']}",
+            file=sys.stderr,
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serialization and persistence benchmark suite.
+
+A reproducible corpus is built for every ruleset: `games` seeded random
+games for each length in `lengths` (questions asked, fewer if the game ends
+first). Each operation runs over the whole corpus of a ruleset:
+
+    serialize.<ruleset>            serialize_berkeley_game
+    deserialize.<ruleset>          deserialize_berkeley_game
+    save_game.<ruleset>            game.save_game
+    load_game.<ruleset>            KriegspielGame.load_game
+    save_game_compact.<ruleset>    game.save_game(compact=True)
+    load_game_compact.<ruleset>    KriegspielGame.load_game of compact files
+    snapshot.<ruleset>             game.snapshot
+    from_snapshot.<ruleset>        KriegspielGame.from_snapshot
+    wrapper_load_game.<ruleset>    load_game of the ruleset's wrapper class
+
+Besides the median time per game, encoding operations report the encoded
+bytes per game and every operation reports the peak memory traced by
+`tracemalloc` during one extra untimed run. The JSON report has the same
+layout as `kriegspiel.bench`, so `--baseline` comparisons work the same way.
+
+Command line:
+
+    python -m kriegspiel.bench_serialization [--rounds N] [--games N]
+        [--lengths N,N,...] [--filter TEXT] [--output FILE]
+        [--baseline FILE] [--threshold X]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from kriegspiel.bench import DEFAULT_ROUNDS
+from kriegspiel.bench import RULESETS
+from kriegspiel.bench import SCHEMA
+from kriegspiel.bench import Setup
+from kriegspiel.bench import add_report_arguments
+from kriegspiel.bench import environment
+from kriegspiel.bench import finish_report
+from kriegspiel.bench import record_script
+from kriegspiel.bench import run_benchmark
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.crazykrieg import CrazyKriegGame
+from kriegspiel.english import EnglishGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.rand import RandGame
+from kriegspiel.serialization import KriegspielJSONEncoder
+from kriegspiel.serialization import deserialize_berkeley_game
+from kriegspiel.serialization import serialize_berkeley_game
+from kriegspiel.wild16 import Wild16Game
+
+DEFAULT_GAMES = 2
+DEFAULT_LENGTHS = (20, 100, 300)
+
+OPERATIONS = (
+    "serialize", "deserialize", "save_game", "load_game", "save_game_compact", "load_game_compact",
+    "snapshot", "from_snapshot", "wrapper_load_game",
+)
+
+WRAPPERS = {
+    "berkeley": BerkeleyGame,
+    "berkeley_any": BerkeleyGame,
+    "cincinnati": CincinnatiGame,
+    "crazykrieg": CrazyKriegGame,
+    "english": EnglishGame,
+    "rand": RandGame,
+    "wild16": Wild16Game,
+}
+
+
+def build_corpus(ruleset: str, games: int = DEFAULT_GAMES, lengths: Sequence[int] = DEFAULT_LENGTHS):
+    """Return `games` seeded games of `ruleset` for every length in `lengths`."""
+    corpus = []
+    for length in lengths:
+        for seed in range(games):
+            game = KriegspielGame(ruleset=ruleset)
+            for question in record_script(ruleset, seed, questions=length):
+                game.ask_for(question)
+            corpus.append(game)
+    return corpus
+
+
+def _encode(data: Dict[str, Any]) -> str:
+    return json.dumps(data, cls=KriegspielJSONEncoder)
+
+
+def _over(operation, items: Sequence) -> Setup:
+    def setup():
+        def run():
+            for item in items:
+                operation(item)
+
+        return run, len(items)
+
+    return setup
+
+
+def _save(paths: List[Tuple[KriegspielGame, str]], compact: bool) -> Setup:
+    def setup():
+        def run():
+            for game, path in paths:
+                game.save_game(path, compact=compact)
+
+        return run, len(paths)
+
+    return setup
+
+
+def _operations(
+    ruleset: str, corpus: List[KriegspielGame], directory: str
+) -> Dict[str, Tuple[Setup, Optional[float]]]:
+    """Return `{operation: (setup, encoded bytes per game or None)}` for one ruleset corpus."""
+    count = len(corpus)
+    documents = [json.loads(_encode(serialize_berkeley_game(game))) for game in corpus]
+    paths = {}
+    for compact in (False, True):
+        paths[compact] = [
+            (game, os.path.join(directory, f"{ruleset}-{index}{'-compact' if compact else ''}.json"))
+            for index, game in enumerate(corpus)
+        ]
+        for game, path in paths[compact]:
+            game.save_game(path, compact=compact)
+    file_bytes = {
+        compact: sum(os.path.getsize(path) for _, path in paths[compact]) / count for compact in (False, True)
+    }
+    files = [path for _, path in paths[False]]
+    compact_files = [path for _, path in paths[True]]
+    encoded_bytes = sum(len(_encode(document).encode()) for document in documents) / count
+    snapshots = [game.snapshot() for game in corpus]
+    wrapper = WRAPPERS[ruleset]
+    return {
+        "serialize": (_over(serialize_berkeley_game, corpus), encoded_bytes),
+        "deserialize": (_over(deserialize_berkeley_game, documents), None),
+        "save_game": (_save(paths[False], compact=False), file_bytes[False]),
+        "load_game": (_over(KriegspielGame.load_game, files), None),
+        "save_game_compact": (_save(paths[True], compact=True), file_bytes[True]),
+        "load_game_compact": (_over(KriegspielGame.load_game, compact_files), None),
+        "snapshot": (_over(KriegspielGame.snapshot, corpus), None),
+        "from_snapshot": (_over(KriegspielGame.from_snapshot, snapshots), None),
+        "wrapper_load_game": (_over(wrapper.load_game, files), None),
+    }
+
+
+def peak_memory(setup: Setup) -> int:
+    """Return the peak bytes traced by `tracemalloc` during one run of `setup`."""
+    run, _ = setup()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(
+    rounds: int = DEFAULT_ROUNDS,
+    games: int = DEFAULT_GAMES,
+    lengths: Sequence[int] = DEFAULT_LENGTHS,
+    name_filter: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run the suite and return the JSON-ready report."""
+    results = {}
+    corpus_stats = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for ruleset in RULESETS:
+            corpus = None
+            for operation in OPERATIONS:
+                name = f"{operation}.{ruleset}"
+                if name_filter is not None and name_filter not in name:
+                    continue
+                if corpus is None:
+                    corpus = build_corpus(ruleset, games, lengths)
+                    operations = _operations(ruleset, corpus, directory)
+                    corpus_stats[ruleset] = {
+                        "games": len(corpus),
+                        "plies": sum(len(game._move_stack) for game in corpus),
+                    }
+                setup, encoded_bytes = operations[operation]
+                result = run_benchmark(name, setup, rounds).as_dict()
+                result["peak_bytes"] = peak_memory(setup)
+                if encoded_bytes is not None:
+                    result["bytes_per_game"] = encoded_bytes
+                    result["megabytes_per_second"] = encoded_bytes * result["ops_per_second"] / 1e6
+                results[name] = result
+    return {
+        "schema": SCHEMA,
+        "environment": environment(),
+        "config": {"rounds": rounds, "games": games, "lengths": list(lengths), "filter": name_filter},
+        "corpus": corpus_stats,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Kriegspiel serialization and persistence")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="games per ruleset and length")
+    parser.add_argument(
+        "--lengths", default=",".join(map(str, DEFAULT_LENGTHS)), help="comma-separated questions per game"
+    )
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    lengths = [int(length) for length in args.lengths.split(",")]
+    return finish_report(run_suite(args.rounds, args.games, lengths, args.filter), args)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
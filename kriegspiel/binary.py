@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compact binary serialization for Kriegspiel game state.
+
+The binary format carries exactly the game state of JSON schema 9, so a game
+loaded from either encoding re-serializes to the same schema 9 document. It
+trades readability for size: moves are packed integers, answers are bit fields
+and every count or number is a LEB128 varint.
+
+Layout:
+
+    header   struct "<4sBB": magic b"KSGB", format version, compression id
+    body     optionally zlib/lzma compressed
+      ruleset_id          varint length + ASCII
+      flags               varint: any_rule, must_use_pawns, game_over,
+                          has_possible_to_ask
+      board_fen           varint length + ASCII
+      possible_to_ask     varint count + question codes (when flagged)
+      white_scoresheet    see `_write_scoresheet`
+      black_scoresheet
+
+The `move_stack` of schema 9 is not stored: it is derived from the scoresheets,
+which `KriegspielGame.from_snapshot` already requires to match it.
+
+Questions are stored as `pack_kriegspiel_move` codes.
+Answer flags are laid out as:
+
+    bits 0-2    main announcement value
+    bits 3-6    special announcement index
+    bit  7      capture square follows
+    bits 8-10   captured piece announcement value (0 = none)
+    bits 11-13  dropped piece announcement value (0 = none)
+    bits 14-16  double-check first kind (0 = none)
+    bits 17-19  double-check second kind (0 = none)
+    bit  20     promotion announced
+    bit  21     en passant announced
+    bits 22-23  next-turn pawn metadata: none, tries, has-capture, try squares
+    bit  24     next-turn has pawn capture value
+
+followed by the capture square byte, the pawn-try varint, or a varint count of
+pawn-try squares and one byte per square, as flagged.
+Like the `KriegspielAnswer` constructor, the encoder accepts at most one
+next-turn pawn field and raises `SerializationError` otherwise.
+"""
+
+import lzma
+import struct
+import zlib
+from typing import Optional
+
+from kriegspiel.move import (
+    CapturedPieceAnnouncement, KriegspielAnswer, MainAnnouncement, SINGLE_CHECK, SpecialCaseAnnouncement
+)
+from kriegspiel.serialization import MalformedDataError
+from kriegspiel.serialization import SerializationError
+from kriegspiel.serialization import UnsupportedVersionError
+from kriegspiel.serialization import deserialize_question_value
+from kriegspiel.serialization import pack_kriegspiel_move
+from kriegspiel.serialization import unpack_kriegspiel_move
+from kriegspiel.snapshot import KriegspielGameSnapshot
+from kriegspiel.snapshot import ScoresheetSnapshot
+from kriegspiel.snapshot import move_stack_from_scoresheets
+
+BINARY_MAGIC = b"KSGB"
+BINARY_FORMAT_VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZMA = 2
+
+_COMPRESSION_IDS = {
+    None: COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "lzma": COMPRESSION_LZMA,
+}
+
+_HEADER = struct.Struct("<4sBB")
+
+_FLAG_ANY_RULE = 1
+_FLAG_MUST_USE_PAWNS = 2
+_FLAG_GAME_OVER = 4
+_FLAG_HAS_POSSIBLE_TO_ASK = 8
+
+_MAIN_ANNOUNCEMENTS = {item.value: item for item in MainAnnouncement}
+_PIECE_ANNOUNCEMENTS = {item.value: item for item in CapturedPieceAnnouncement}
+_SPECIAL_ANNOUNCEMENTS = tuple(SpecialCaseAnnouncement)
+_SPECIAL_INDEXES = {item: index for index, item in enumerate(_SPECIAL_ANNOUNCEMENTS)}
+_CHECK_INDEXES = {item: index + 1 for index, item in enumerate(SINGLE_CHECK)}
+
+_PAWN_METADATA_NONE = 0
+_PAWN_METADATA_TRIES = 1
+_PAWN_METADATA_HAS_CAPTURE = 2
+_PAWN_METADATA_SQUARES = 3
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_text(out: bytearray, text: str) -> None:
+    encoded = text.encode("ascii")
+    _write_varint(out, len(encoded))
+    out += encoded
+
+
+class _Reader(object):
+    """Cursor over an uncompressed binary game body."""
+
+    def __init__(self, data):
+        self._data = data
+        self._position = 0
+
+    def byte(self) -> int:
+        try:
+            value = self._data[self._position]
+        except IndexError as e:
+            raise MalformedDataError("Truncated binary game data") from e
+        self._position += 1
+        return value
+
+    def varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            value = self.byte()
+            result |= (value & 0x7F) << shift
+            if value < 0x80:
+                return result
+            shift += 7
+
+    def text(self) -> str:
+        length = self.varint()
+        end = self._position + length
+        if end > len(self._data):
+            raise MalformedDataError("Truncated binary game data")
+        try:
+            value = bytes(self._data[self._position:end]).decode("ascii")
+        except UnicodeDecodeError as e:
+            raise MalformedDataError("Invalid text field in binary game data") from e
+        self._position = end
+        return value
+
+    def finish(self) -> None:
+        if self._position != len(self._data):
+            raise MalformedDataError("Unexpected trailing bytes in binary game data")
+
+
+def _write_answer(out: bytearray, answer: KriegspielAnswer) -> None:
+    flags = answer.main_announcement.value | (_SPECIAL_INDEXES[answer.special_announcement] << 3)
+    if answer.capture_at_square is not None:
+        flags |= 1 << 7
+    if answer.captured_piece_announcement is not None:
+        flags |= answer.captured_piece_announcement.value << 8
+    if answer.dropped_piece_announcement is not None:
+        flags |= answer.dropped_piece_announcement.value << 11
+    if answer.check_1 is not None:
+        flags |= _CHECK_INDEXES[answer.check_1] << 14
+    if answer.check_2 is not None:
+        flags |= _CHECK_INDEXES[answer.check_2] << 17
+    if answer.promotion_announced:
+        flags |= 1 << 20
+    if answer.en_passant_announced:
+        flags |= 1 << 21
+    pawn_metadata = (
+        answer.next_turn_pawn_tries, answer.next_turn_has_pawn_capture, answer.next_turn_pawn_try_squares
+    )
+    if sum(value is not None for value in pawn_metadata) > 1:
+        raise SerializationError("KriegspielAnswer has more than one next-turn pawn-capture field")
+    if answer.next_turn_pawn_tries is not None:
+        flags |= _PAWN_METADATA_TRIES << 22
+    elif answer.next_turn_has_pawn_capture is not None:
+        flags |= _PAWN_METADATA_HAS_CAPTURE << 22
+        if answer.next_turn_has_pawn_capture:
+            flags |= 1 << 24
+    elif answer.next_turn_pawn_try_squares is not None:
+        flags |= _PAWN_METADATA_SQUARES << 22
+
+    _write_varint(out, flags)
+    if answer.capture_at_square is not None:
+        out.append(answer.capture_at_square)
+    if answer.next_turn_pawn_tries is not None:
+        _write_varint(out, answer.next_turn_pawn_tries)
+    elif answer.next_turn_pawn_try_squares is not None:
+        _write_varint(out, len(answer.next_turn_pawn_try_squares))
+        out += bytes(answer.next_turn_pawn_try_squares)
+
+
+def _piece_announcement(value: int) -> CapturedPieceAnnouncement:
+    try:
+        return _PIECE_ANNOUNCEMENTS[value]
+    except KeyError as e:
+        raise MalformedDataError(f"Invalid CapturedPieceAnnouncement code: {value}") from e
+
+
+def _check_kind(index: int) -> SpecialCaseAnnouncement:
+    if not 1 <= index <= len(SINGLE_CHECK):
+        raise MalformedDataError(f"Invalid check code: {index}")
+    return SINGLE_CHECK[index - 1]
+
+
+def _read_answer(reader: _Reader) -> KriegspielAnswer:
+    flags = reader.varint()
+    try:
+        main_announcement = _MAIN_ANNOUNCEMENTS[flags & 7]
+        special_announcement = _SPECIAL_ANNOUNCEMENTS[(flags >> 3) & 15]
+    except (KeyError, IndexError) as e:
+        raise MalformedDataError(f"Invalid KriegspielAnswer flags: {flags}") from e
+
+    kwargs = {}
+    if flags & (1 << 7):
+        kwargs["capture_at_square"] = reader.byte()
+    if (flags >> 8) & 7:
+        kwargs["captured_piece_announcement"] = _piece_announcement((flags >> 8) & 7)
+    if (flags >> 11) & 7:
+        kwargs["dropped_piece_announcement"] = _piece_announcement((flags >> 11) & 7)
+    if flags & (1 << 20):
+        kwargs["promotion_announced"] = True
+    if flags & (1 << 21):
+        kwargs["en_passant_announced"] = True
+
+    pawn_metadata = (flags >> 22) & 3
+    if pawn_metadata == _PAWN_METADATA_TRIES:
+        kwargs["next_turn_pawn_tries"] = reader.varint()
+    elif pawn_metadata == _PAWN_METADATA_HAS_CAPTURE:
+        kwargs["next_turn_has_pawn_capture"] = bool(flags & (1 << 24))
+    elif pawn_metadata == _PAWN_METADATA_SQUARES:
+        kwargs["next_turn_pawn_try_squares"] = tuple(reader.byte() for _ in range(reader.varint()))
+
+    if special_announcement == SpecialCaseAnnouncement.CHECK_DOUBLE and (flags >> 14) & 63:
+        kwargs["special_announcement"] = (
+            SpecialCaseAnnouncement.CHECK_DOUBLE,
+            [_check_kind((flags >> 14) & 7), _check_kind((flags >> 17) & 7)],
+        )
+    elif special_announcement != SpecialCaseAnnouncement.NONE:
+        kwargs["special_announcement"] = special_announcement
+
+    try:
+        return KriegspielAnswer(main_announcement, **kwargs)
+    except (TypeError, ValueError) as e:
+        raise MalformedDataError(f"Invalid KriegspielAnswer flags: {flags}") from e
+
+
+def _write_scoresheet(out: bytearray, scoresheet: ScoresheetSnapshot) -> None:
+    """Write color, move-number cursor, own turns and opponent turns."""
+    out.append(1 if scoresheet.color else 0)
+    _write_varint(out, scoresheet.last_move_number)
+    moves_own = scoresheet.moves_own
+    moves_opponent = scoresheet.moves_opponent
+    _write_varint(out, len(moves_own))
+    for turn in moves_own:
+        _write_varint(out, len(turn))
+        for move, answer in turn:
+            _write_varint(out, pack_kriegspiel_move(move))
+            _write_answer(out, answer)
+    _write_varint(out, len(moves_opponent))
+    for turn in moves_opponent:
+        _write_varint(out, len(turn))
+        for question, answer in turn:
+            out.append(question.value)
+            _write_answer(out, answer)
+
+
+def _read_scoresheet(reader: _Reader) -> ScoresheetSnapshot:
+    color = bool(reader.byte())
+    last_move_number = reader.varint()
+    moves_own = tuple(
+        tuple((unpack_kriegspiel_move(reader.varint()), _read_answer(reader)) for _ in range(reader.varint()))
+        for _ in range(reader.varint())
+    )
+    moves_opponent = tuple(
+        tuple((deserialize_question_value(reader.byte()), _read_answer(reader)) for _ in range(reader.varint()))
+        for _ in range(reader.varint())
+    )
+    return ScoresheetSnapshot(
+        color=color,
+        moves_own=moves_own,
+        moves_opponent=moves_opponent,
+        last_move_number=last_move_number,
+    )
+
+
+def serialize_snapshot_binary(snapshot: KriegspielGameSnapshot, compression: Optional[str] = None) -> bytes:
+    """Encode a KriegspielGameSnapshot in the compact binary format."""
+    if compression not in _COMPRESSION_IDS:
+        raise ValueError(f"Unsupported compression: {compression!r}")
+
+    body = bytearray()
+    _write_text(body, snapshot.ruleset_id)
+    flags = 0
+    if snapshot.any_rule:
+        flags |= _FLAG_ANY_RULE
+    if snapshot.must_use_pawns:
+        flags |= _FLAG_MUST_USE_PAWNS
+    if snapshot.game_over:
+        flags |= _FLAG_GAME_OVER
+    if snapshot.possible_to_ask is not None:
+        flags |= _FLAG_HAS_POSSIBLE_TO_ASK
+    _write_varint(body, flags)
+    _write_text(body, snapshot.board_fen)
+    if snapshot.possible_to_ask is not None:
+        codes = sorted(pack_kriegspiel_move(move) for move in snapshot.possible_to_ask)
+        _write_varint(body, len(codes))
+        for code in codes:
+            _write_varint(body, code)
+    _write_scoresheet(body, snapshot.white_scoresheet)
+    _write_scoresheet(body, snapshot.black_scoresheet)
+
+    if compression == "zlib":
+        body = zlib.compress(bytes(body))
+    elif compression == "lzma":
+        body = lzma.compress(bytes(body))
+    return _HEADER.pack(BINARY_MAGIC, BINARY_FORMAT_VERSION, _COMPRESSION_IDS[compression]) + bytes(body)
+
+
+def serialize_game_binary(game, compression: Optional[str] = None) -> bytes:
+    """Encode a shared Kriegspiel game in the compact binary format."""
+    return serialize_snapshot_binary(game.snapshot(), compression=compression)
+
+
+def _decompress_body(data) -> memoryview:
+    if len(data) < _HEADER.size:
+        raise MalformedDataError("Truncated binary game header")
+    magic, version, compression = _HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise MalformedDataError("Invalid binary game magic")
+    if version != BINARY_FORMAT_VERSION:
+        raise UnsupportedVersionError(f"Unsupported binary format version: {version}")
+    body = memoryview(data)[_HEADER.size:]
+    try:
+        if compression == COMPRESSION_NONE:
+            return body
+        if compression == COMPRESSION_ZLIB:
+            return memoryview(zlib.decompress(body))
+        if compression == COMPRESSION_LZMA:
+            return memoryview(lzma.decompress(body))
+    except (zlib.error, lzma.LZMAError) as e:
+        raise MalformedDataError("Corrupt compressed binary game data") from e
+    raise MalformedDataError(f"Unsupported binary compression id: {compression}")
+
+
+def deserialize_snapshot_binary(data) -> KriegspielGameSnapshot:
+    """Decode bytes produced by `serialize_snapshot_binary` into a snapshot."""
+    reader = _Reader(_decompress_body(data))
+    ruleset_id = reader.text()
+    flags = reader.varint()
+    board_fen = reader.text()
+    possible_to_ask = None
+    if flags & _FLAG_HAS_POSSIBLE_TO_ASK:
+        possible_to_ask = tuple(unpack_kriegspiel_move(reader.varint()) for _ in range(reader.varint()))
+    white_scoresheet = _read_scoresheet(reader)
+    black_scoresheet = _read_scoresheet(reader)
+    reader.finish()
+
+    try:
+        move_stack = move_stack_from_scoresheets(white_scoresheet, black_scoresheet)
+    except ValueError as e:
+        raise MalformedDataError(str(e)) from e
+
+    return KriegspielGameSnapshot(
+        ruleset_id=ruleset_id,
+        any_rule=bool(flags & _FLAG_ANY_RULE),
+        board_fen=board_fen,
+        move_stack=move_stack,
+        must_use_pawns=bool(flags & _FLAG_MUST_USE_PAWNS),
+        game_over=bool(flags & _FLAG_GAME_OVER),
+        possible_to_ask=possible_to_ask,
+        white_scoresheet=white_scoresheet,
+        black_scoresheet=black_scoresheet,
+    )
+
+
+def deserialize_game_binary(data, game_class=None):
+    """Decode bytes produced by `serialize_game_binary` into a live game."""
+    snapshot = deserialize_snapshot_binary(data)
+    if game_class is None:
+        # Import here to avoid circular import
+        from kriegspiel.game import KriegspielGame
+
+        game_class = KriegspielGame
+    try:
+        return game_class.from_snapshot(snapshot)
+    except ValueError as e:
+        raise MalformedDataError(str(e)) from e
+
+
+def save_game_binary(game, filename: str, compression: Optional[str] = None) -> None:
+    """Save a shared Kriegspiel game to a binary file."""
+    data = serialize_game_binary(game, compression=compression)
+    try:
+        with open(filename, 'wb') as f:
+            f.write(data)
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to save game to {filename}") from e
+
+
+def load_game_binary(filename: str, game_class=None):
+    """Load a shared Kriegspiel game from a binary file."""
+    try:
+        with open(filename, 'rb') as f:
+            data = f.read()
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to load game from {filename}") from e
+    return deserialize_game_binary(data, game_class=game_class)
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parallel bulk loading, validation and conversion of saved games.
+
+Files are distributed over a `ProcessPoolExecutor` in chunks of `chunksize`
+paths, so per-task overhead stays small for very large runs. Only a bounded
+window of chunks is in flight at a time, so memory does not grow with the
+number of files. Every file is
+decoded and replayed through `KriegspielGame.from_snapshot`; failures,
+including unexpected exceptions, are reported per file as a `BulkResult`
+instead of aborting the run.
+
+JSON files (`.json`, any schema) and binary files (`.ksgb`) are accepted.
+
+Command line:
+
+    python -m kriegspiel.bulk validate PATH... [--workers N] [--chunksize N]
+    python -m kriegspiel.bulk convert PATH... --output DIR [--format FORMAT]
+
+Directories given as PATH are expanded to the game files they contain.
+"""
+
+import argparse
+import collections
+import glob
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from kriegspiel.binary import deserialize_snapshot_binary
+from kriegspiel.binary import serialize_game_binary
+from kriegspiel.serialization import KriegspielJSONEncoder
+from kriegspiel.serialization import MalformedDataError
+from kriegspiel.serialization import SerializationError
+from kriegspiel.serialization import deserialize_game_snapshot
+from kriegspiel.serialization import serialize_berkeley_game
+from kriegspiel.serialization import serialize_compact_game
+from kriegspiel.snapshot import KriegspielGameSnapshot
+
+BINARY_SUFFIX = ".ksgb"
+JSON_SUFFIX = ".json"
+DEFAULT_CHUNKSIZE = 64
+CHUNKS_PER_WORKER = 2
+
+FORMAT_JSON = "json"
+FORMAT_COMPACT = "compact"
+FORMAT_BINARY = "binary"
+FORMAT_BINARY_ZLIB = "binary-zlib"
+
+FORMATS = (FORMAT_JSON, FORMAT_COMPACT, FORMAT_BINARY, FORMAT_BINARY_ZLIB)
+
+
+@dataclass(frozen=True)
+class BulkResult:
+    """Outcome of processing one file."""
+
+    path: str
+    error_type: Optional[str] = None
+    error: Optional[str] = None
+    snapshot: Optional[KriegspielGameSnapshot] = None
+    output: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error_type is None
+
+
+@dataclass(frozen=True)
+class BulkReport:
+    """Results and throughput of a bulk run."""
+
+    results: List[BulkResult]
+    seconds: float
+
+    @property
+    def files(self) -> int:
+        return len(self.results)
+
+    @property
+    def failures(self) -> List[BulkResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+
+def expand_paths(paths: Sequence[str]) -> List[str]:
+    """Expand directories to their sorted `.json` and `.ksgb` files; keep other paths as given."""
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(sorted(
+                glob.glob(os.path.join(path, "*" + JSON_SUFFIX)) + glob.glob(os.path.join(path, "*" + BINARY_SUFFIX))
+            ))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def read_snapshot_file(path: str) -> KriegspielGameSnapshot:
+    """Decode a JSON or binary game file into a snapshot without replaying it."""
+    try:
+        if path.endswith(BINARY_SUFFIX):
+            with open(path, "rb") as f:
+                return deserialize_snapshot_binary(f.read())
+        with open(path, "r") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise MalformedDataError(f"Invalid BerkeleyGame data structure in {path}")
+        return deserialize_game_snapshot(data)
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to load game from {path}") from e
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise MalformedDataError(f"Invalid JSON in file {path}") from e
+
+
+def load_game_file(path: str):
+    """Load and validate a JSON or binary game file into a `KriegspielGame`."""
+    snapshot = read_snapshot_file(path)
+
+    # Import here to avoid circular import
+    from kriegspiel.game import KriegspielGame
+
+    try:
+        return KriegspielGame.from_snapshot(snapshot)
+    except ValueError as e:
+        raise MalformedDataError(str(e)) from e
+
+
+def _converted_path(path: str, output_directory: str, output_format: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    suffix = BINARY_SUFFIX if output_format in (FORMAT_BINARY, FORMAT_BINARY_ZLIB) else JSON_SUFFIX
+    return os.path.join(output_directory, stem + suffix)
+
+
+def _write_game(game, target: str, output_format: str) -> None:
+    try:
+        if output_format == FORMAT_JSON:
+            with open(target, "w") as f:
+                json.dump(serialize_berkeley_game(game), f, indent=2, cls=KriegspielJSONEncoder)
+        elif output_format == FORMAT_COMPACT:
+            with open(target, "w") as f:
+                json.dump(serialize_compact_game(game), f, separators=(",", ":"))
+        else:
+            compression = "zlib" if output_format == FORMAT_BINARY_ZLIB else None
+            with open(target, "wb") as f:
+                f.write(serialize_game_binary(game, compression=compression))
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to save game to {target}") from e
+
+
+def _process_file(path: str, operation: str, output_directory: Optional[str], output_format: str) -> BulkResult:
+    try:
+        game = load_game_file(path)
+        if operation == "load":
+            return BulkResult(path, snapshot=game.snapshot())
+        if operation == "convert":
+            target = _converted_path(path, output_directory, output_format)
+            _write_game(game, target, output_format)
+            return BulkResult(path, output=target)
+        return BulkResult(path)
+    except Exception as e:
+        return BulkResult(path, error_type=type(e).__name__, error=str(e))
+
+
+def _run(
+    paths: Sequence[str],
+    operation: str,
+    workers: Optional[int],
+    chunksize: int,
+    output_directory: Optional[str] = None,
+    output_format: str = FORMAT_COMPACT,
+) -> Iterator[BulkResult]:
+    task = partial(
+        _process_file, operation=operation, output_directory=output_directory, output_format=output_format
+    )
+    return map_paths(task, paths, workers, chunksize)
+
+
+def _map_chunk(task: Callable[[str], Any], chunk: List[str]) -> List[Any]:
+    return [task(path) for path in chunk]
+
+
+def map_paths(
+    task: Callable[[str], Any], paths: Iterable[str], workers: Optional[int], chunksize: int
+) -> Iterator[Any]:
+    """
+    Apply the picklable `task` to every path over a process pool, in input order.
+
+    Paths are sent to the pool in chunks of `chunksize`, with at most
+    `CHUNKS_PER_WORKER` chunks per worker in flight; each chunk's results are
+    yielded as soon as it and the chunks before it are done. With `workers=1`
+    the paths are processed in-process.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive")
+    if workers == 1:
+        yield from map(task, paths)
+        return
+    window = CHUNKS_PER_WORKER * (workers or os.cpu_count() or 1)
+    paths = iter(paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        while True:
+            while len(pending) < window:
+                chunk = list(itertools.islice(paths, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_map_chunk, task, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def iter_loaded(
+    paths: Sequence[str], workers: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[BulkResult]:
+    """
+    Load and validate files in parallel, yielding results in input order.
+
+    Results are streamed, so only the window of chunks in flight is held in
+    memory. Successful results carry the validated `snapshot`; build live
+    games from it with `from_snapshot` on the consuming side.
+    """
+    return _run(expand_paths(paths), "load", workers, chunksize)
+
+
+def validate_files(
+    paths: Sequence[str], workers: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE
+) -> BulkReport:
+    """Validate files in parallel and report per-file errors and throughput."""
+    start = time.perf_counter()
+    results = list(_run(expand_paths(paths), "validate", workers, chunksize))
+    return BulkReport(results=results, seconds=time.perf_counter() - start)
+
+
+def convert_files(
+    paths: Sequence[str],
+    output_directory: str,
+    output_format: str = FORMAT_COMPACT,
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> BulkReport:
+    """
+    Validate files in parallel and re-serialize them into `output_directory`.
+
+    `output_format` is one of `json` (schema 9), `compact` (schema 10),
+    `binary` or `binary-zlib`. Output files keep the input file stem; a file
+    whose output name is already taken by an earlier input, such as `a.json`
+    after `a.ksgb` or a same-named file from another directory, is not
+    converted and is reported as an `OutputCollision` failure.
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"Unsupported format: {output_format!r}")
+    os.makedirs(output_directory, exist_ok=True)
+    start = time.perf_counter()
+    paths = expand_paths(paths)
+    owners = {}
+    collisions = {}
+    for path in paths:
+        target = _converted_path(path, output_directory, output_format)
+        if target in owners:
+            collisions[path] = BulkResult(
+                path, error_type="OutputCollision", error=f"Output {target} is already written for {owners[target]}"
+            )
+        else:
+            owners[target] = path
+    converted = iter(list(_run(
+        [path for path in paths if path not in collisions], "convert", workers, chunksize,
+        output_directory=output_directory, output_format=output_format,
+    )))
+    results = [collisions[path] if path in collisions else next(converted) for path in paths]
+    return BulkReport(results=results, seconds=time.perf_counter() - start)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate or convert saved Kriegspiel games in parallel")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("validate", "convert"):
+        subparser = subparsers.add_parser(command)
+        subparser.add_argument("paths", nargs="+")
+        subparser.add_argument("--workers", type=int, default=None)
+        subparser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+        if command == "convert":
+            subparser.add_argument("--output", required=True)
+            subparser.add_argument("--format", choices=FORMATS, default=FORMAT_COMPACT)
+    args = parser.parse_args(argv)
+
+    if args.command == "validate":
+        report = validate_files(args.paths, workers=args.workers, chunksize=args.chunksize)
+    else:
+        report = convert_files(
+            args.paths, args.output, output_format=args.format, workers=args.workers, chunksize=args.chunksize
+        )
+    for failure in report.failures:
+        print(f"error path={failure.path} type={failure.error_type} message={failure.error}")
+    print(f"files={report.files}")
+    print(f"failures={len(report.failures)}")
+    print(f"seconds={report.seconds:.3f}")
+    print(f"files_per_second={report.files_per_second:.1f}")
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
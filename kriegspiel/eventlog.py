@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+Append-only event-log persistence for live Kriegspiel games.
+
+A journal keeps two files next to each other:
+
+    <path>.checkpoint   {"events": n, "game": compact schema 10 document}
+    <path>.log          one JSON line per question asked after the checkpoint:
+                        [sequence number, pack_kriegspiel_move code, compact answer]
+
+`flush` appends only the events asked since the previous flush, so the cost
+of saving no longer grows with the length of the game. Every
+`checkpoint_every` events a new checkpoint is written to a temporary file and
+moved into place with `os.replace`, after which the log is truncated.
+
+`GameJournal.open` recovers a game by loading the checkpoint and replaying
+the logged questions through `ask_for`. Events already covered by the
+checkpoint are skipped, so a crash between the checkpoint rename and the log
+truncation is harmless, and a torn final line from an interrupted append is
+discarded.
+"""
+
+import json
+import os
+from typing import List
+
+from kriegspiel.serialization import MalformedDataError
+from kriegspiel.serialization import SerializationError
+from kriegspiel.serialization import deserialize_berkeley_game
+from kriegspiel.serialization import pack_kriegspiel_move
+from kriegspiel.serialization import serialize_compact_answer
+from kriegspiel.serialization import serialize_compact_game
+from kriegspiel.serialization import unpack_kriegspiel_move
+
+DEFAULT_CHECKPOINT_EVERY = 64
+
+
+def checkpoint_path(path: str) -> str:
+    """Return the checkpoint file of the journal at `path`."""
+    return path + ".checkpoint"
+
+
+def log_path(path: str) -> str:
+    """Return the event log file of the journal at `path`."""
+    return path + ".log"
+
+
+def _write_checkpoint(path: str, game, events: int, fsync: bool) -> None:
+    target = checkpoint_path(path)
+    temporary = target + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump({"events": events, "game": serialize_compact_game(game)}, f, separators=(",", ":"))
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(temporary, target)
+
+
+class GameJournal(object):
+    """
+    Crash-safe persistence of one game as a checkpoint plus an event log.
+
+    Questions must be asked through `ask_for` so they can be journaled; the
+    wrapped game is available as `game` for read-only use.
+    """
+
+    def __init__(self, path: str, game, events: int, checkpoint_every: int, fsync: bool):
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be positive")
+        self._path = path
+        self._game = game
+        self._events = events
+        self._checkpoint_events = events
+        self._checkpoint_every = checkpoint_every
+        self._fsync = fsync
+        self._pending: List[str] = []
+        self._log = open(log_path(path), "a")
+
+    @classmethod
+    def create(
+        cls, path: str, game, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY, fsync: bool = False
+    ) -> "GameJournal":
+        """Start a journal for `game`, replacing any journal stored at `path`."""
+        try:
+            _write_checkpoint(path, game, 0, fsync)
+            open(log_path(path), "w").close()
+            return cls(path, game, 0, checkpoint_every, fsync)
+        except (IOError, OSError) as e:
+            raise SerializationError(f"Failed to create game journal {path}") from e
+
+    @classmethod
+    def open(
+        cls, path: str, game_class=None, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY, fsync: bool = False
+    ) -> "GameJournal":
+        """Recover the journaled game at `path` from its checkpoint and event log."""
+        try:
+            with open(checkpoint_path(path), "r") as f:
+                checkpoint = json.load(f)
+            with open(log_path(path), "r") as f:
+                log = f.read()
+        except (IOError, OSError) as e:
+            raise SerializationError(f"Failed to open game journal {path}") from e
+        except json.JSONDecodeError as e:
+            raise MalformedDataError(f"Invalid JSON in checkpoint of {path}") from e
+
+        try:
+            events = checkpoint["events"]
+            game = deserialize_berkeley_game(checkpoint["game"], game_class=game_class)
+        except (AttributeError, KeyError, TypeError) as e:
+            raise MalformedDataError(f"Invalid checkpoint of {path}") from e
+
+        complete, _, torn = log.rpartition("\n")
+        for line in complete.split("\n") if complete else ():
+            events = cls._replay(game, line, events)
+
+        journal = cls(path, game, events, checkpoint_every, fsync)
+        if torn:
+            # Drop the partial line left by an interrupted append.
+            journal._log.truncate(len(complete) + 1 if complete else 0)
+        return journal
+
+    @staticmethod
+    def _replay(game, line: str, events: int) -> int:
+        try:
+            sequence, code, expected = json.loads(line)
+            if not isinstance(sequence, int):
+                raise TypeError(sequence)
+        except (TypeError, ValueError) as e:
+            raise MalformedDataError(f"Invalid event log entry: {line}") from e
+        if sequence <= events:
+            return events
+        if sequence != events + 1:
+            raise MalformedDataError(f"Missing events before event {sequence}")
+        answer = game.ask_for(unpack_kriegspiel_move(code))
+        if serialize_compact_answer(answer) != expected:
+            raise MalformedDataError(f"Replayed answer diverges from the log at event {sequence}")
+        return sequence
+
+    @property
+    def game(self):
+        """The journaled game."""
+        return self._game
+
+    @property
+    def events(self) -> int:
+        """Number of questions journaled so far, flushed or not."""
+        return self._events
+
+    def ask_for(self, move):
+        """Ask `move` on the journaled game and queue the event for the next flush."""
+        answer = self._game.ask_for(move)
+        self._events += 1
+        self._pending.append(json.dumps(
+            [self._events, pack_kriegspiel_move(move), serialize_compact_answer(answer)],
+            separators=(",", ":"),
+        ) + "\n")
+        return answer
+
+    def flush(self) -> None:
+        """Append the queued events to the log and checkpoint when due."""
+        try:
+            if self._pending:
+                self._log.write("".join(self._pending))
+                self._log.flush()
+                if self._fsync:
+                    os.fsync(self._log.fileno())
+                self._pending = []
+            if self._events - self._checkpoint_events >= self._checkpoint_every:
+                self.checkpoint()
+        except (IOError, OSError) as e:
+            raise SerializationError(f"Failed to write game journal {self._path}") from e
+
+    def checkpoint(self) -> None:
+        """Write a compact snapshot atomically and truncate the event log."""
+        try:
+            _write_checkpoint(self._path, self._game, self._events, self._fsync)
+            self._log.truncate(0)
+        except (IOError, OSError) as e:
+            raise SerializationError(f"Failed to checkpoint game journal {self._path}") from e
+        self._pending = []
+        self._checkpoint_events = self._events
+
+    def close(self) -> None:
+        """Flush queued events and close the log."""
+        try:
+            self.flush()
+        finally:
+            self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+
+"""
+Multi-process sharded hosting of referee games.
+
+`RefereeFarm` runs one worker process per shard. Every worker owns the live
+`KriegspielGame` objects of its games and answers questions with the
+unchanged `ask_for`, so answers, scoresheets and errors are exactly those of
+a game hosted in-process.
+
+Games are placed by consistent hashing of their id over a `HashRing`, so
+every question for a game goes to the same worker. `migrate` moves a game to
+another shard by snapshot: the game is imported on the target before it is
+dropped from its old shard, and the move is remembered so that later
+questions follow the game.
+
+`ask_many` groups questions by shard and sends each shard a single batch over
+its pipe, so all shards work at the same time and the per-message cost is
+paid once per batch rather than once per question. Each shard answers its
+part of a batch in order.
+
+`stats()` aggregates per-shard question counts and busy time with the wall
+time spent waiting for answers.
+"""
+
+import bisect
+import hashlib
+import multiprocessing
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielAnswer
+from kriegspiel.move import KriegspielMove
+from kriegspiel.server import UnknownGameError
+from kriegspiel.snapshot import KriegspielGameSnapshot
+
+DEFAULT_REPLICAS = 64
+
+_CREATE = "create"
+_ASK = "ask"
+_POSSIBLE = "possible"
+_SNAPSHOT = "snapshot"
+_CHECK = "check"
+_IMPORT = "import"
+_CLOSE = "close"
+
+
+def _hash(key: str) -> int:
+    # Stable across processes and runs, unlike the built-in hash().
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing(object):
+    """Consistent-hash ring mapping keys to nodes `0 .. nodes - 1`."""
+
+    def __init__(self, nodes: int, replicas: int = DEFAULT_REPLICAS):
+        if nodes < 1 or replicas < 1:
+            raise ValueError("nodes and replicas must be positive")
+        points = sorted((_hash(f"{node}:{replica}"), node) for node in range(nodes) for replica in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str) -> int:
+        """Return the node owning `key`: the first ring point at or after its hash."""
+        index = bisect.bisect_left(self._hashes, _hash(key))
+        return self._nodes[index % len(self._nodes)]
+
+
+class _Shard(object):
+    """Games owned by one worker, and the batch handler run in its process."""
+
+    def __init__(self):
+        self.games: Dict[str, KriegspielGame] = {}
+
+    def _game(self, game_id: str) -> KriegspielGame:
+        try:
+            return self.games[game_id]
+        except KeyError:
+            raise UnknownGameError(f"Unknown game: {game_id}") from None
+
+    def _apply(self, op: str, game_id: str, argument: Any) -> Any:
+        if op == _ASK:
+            return self._game(game_id).ask_for(argument)
+        if op == _POSSIBLE:
+            return list(self._game(game_id).possible_to_ask)
+        if op == _SNAPSHOT:
+            return self._game(game_id).snapshot()
+        if op == _CHECK:
+            self._game(game_id)
+            return None
+        if op == _CLOSE:
+            self._game(game_id)
+            del self.games[game_id]
+            return None
+        if game_id in self.games:
+            raise ValueError(f"Game id already in use: {game_id}")
+        if op == _CREATE:
+            self.games[game_id] = KriegspielGame(ruleset=argument)
+        elif op == _IMPORT:
+            self.games[game_id] = KriegspielGame.from_snapshot(argument)
+        else:
+            raise ValueError(f"Unknown op: {op!r}")
+        return None
+
+    def handle(self, batch: Sequence[Tuple[str, str, Any]]) -> Tuple[List[Any], Optional[Exception], float]:
+        """
+        Apply a batch of `(op, game_id, argument)` requests in order.
+
+        Stops at the first failing request and returns the results of the
+        requests before it, the exception, and the seconds spent.
+        """
+        start = time.perf_counter()
+        results = []
+        error = None
+        for op, game_id, argument in batch:
+            try:
+                results.append(self._apply(op, game_id, argument))
+            except Exception as e:
+                error = e
+                break
+        return results, error, time.perf_counter() - start
+
+
+class ShardError(RuntimeError):
+    """Stands in for a worker error that could not be pickled back to the caller."""
+    pass
+
+
+def _reply(connection, reply: Tuple[List[Any], Optional[Exception], float]) -> None:
+    """Send a `_Shard.handle` reply, replacing an error that does not pickle with a `ShardError`."""
+    try:
+        connection.send(reply)
+    except Exception as e:
+        results, error, busy = reply
+        if error is None:
+            # The answers themselves did not pickle; report the first as failed.
+            results, error = [], e
+        connection.send((results, ShardError(f"{type(error).__name__}: {error!r}"), busy))
+
+
+def _shard_main(connection) -> None:  # pragma: no cover - runs in the worker process
+    shard = _Shard()
+    while True:
+        batch = connection.recv()
+        if batch is None:
+            break
+        _reply(connection, shard.handle(batch))
+    connection.close()
+
+
+@dataclass(frozen=True)
+class FarmStats:
+    """Aggregate throughput of a farm since it started."""
+
+    asks: Tuple[int, ...]
+    busy_seconds: Tuple[float, ...]
+    batches: int
+    wall_seconds: float
+
+    @property
+    def total_asks(self) -> int:
+        return sum(self.asks)
+
+    @property
+    def asks_per_second(self) -> float:
+        return self.total_asks / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+class RefereeFarm(object):
+    """
+    Host games over `shards` worker processes.
+
+    Use as a context manager, or call `close()`, to stop the workers. Errors
+    raised in a worker, such as `UnknownGameError` or the `TypeError` of
+    `ask_for`, are raised again in the caller; errors that cannot be pickled
+    arrive as a `ShardError` naming their type and repr.
+    """
+
+    def __init__(self, shards: Optional[int] = None, replicas: int = DEFAULT_REPLICAS):
+        if shards is None:
+            shards = os.cpu_count() or 1
+        self._ring = HashRing(shards, replicas)
+        self._moved: Dict[str, int] = {}
+        self._connections = []
+        self._processes = []
+        self._asks = [0] * shards
+        self._busy = [0.0] * shards
+        self._batches = 0
+        self._wall = 0.0
+        for _ in range(shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_main, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def shards(self) -> int:
+        return len(self._processes)
+
+    def close(self) -> None:
+        """Stop the workers; hosted games are discarded."""
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send(None)
+            except OSError:
+                pass  # The worker already died.
+            process.join()
+            connection.close()
+        self._connections = []
+        self._processes = []
+
+    def shard_of(self, game_id: str) -> int:
+        """Return the shard that owns `game_id`."""
+        shard = self._moved.get(game_id)
+        return self._ring.node_for(game_id) if shard is None else shard
+
+    def _run(self, requests: Sequence[Tuple[str, str, Any]], shard: Optional[int] = None) -> List[Any]:
+        # Requests go to the shards owning their games, or all to `shard` when it is given.
+        batches: Dict[int, List[int]] = {}
+        for index, (_, game_id, _) in enumerate(requests):
+            batches.setdefault(self.shard_of(game_id) if shard is None else shard, []).append(index)
+
+        start = time.perf_counter()
+        results: List[Any] = [None] * len(requests)
+        failures = []
+        sent = []
+        try:
+            for shard, indices in batches.items():
+                self._connections[shard].send([requests[index] for index in indices])
+                sent.append(shard)
+        finally:
+            # Read every reply that is owed, even when a send failed, so that
+            # no stale reply is left in a pipe for the next batch.
+            receive_error = None
+            for shard in sent:
+                indices = batches[shard]
+                try:
+                    answers, error, busy = self._connections[shard].recv()
+                except Exception as e:
+                    receive_error = receive_error or e
+                    continue
+                for index, answer in zip(indices, answers):
+                    results[index] = answer
+                if error is not None:
+                    failures.append((indices[len(answers)], error))
+                self._asks[shard] += sum(requests[index][0] == _ASK for index in indices[:len(answers)])
+                self._busy[shard] += busy
+            self._wall += time.perf_counter() - start
+            self._batches += len(sent)
+        if receive_error is not None:
+            raise receive_error
+
+        if failures:
+            _, error = min(failures, key=lambda failure: failure[0])
+            error.results = results
+            error.failures = dict(failures)
+            raise error
+        return results
+
+    def create_game(self, ruleset: Optional[str] = None, game_id: Optional[str] = None) -> str:
+        """Start hosting a new game on its shard and return its id; `ruleset` defaults as in `KriegspielGame`."""
+        if game_id is None:
+            game_id = uuid.uuid4().hex
+        self._run([(_CREATE, game_id, ruleset)])
+        return game_id
+
+    def close_game(self, game_id: str) -> None:
+        """Stop hosting a game."""
+        self._run([(_CLOSE, game_id, None)])
+        self._moved.pop(game_id, None)
+
+    def ask(self, game_id: str, question: KriegspielMove) -> KriegspielAnswer:
+        """Ask `question` on a hosted game, with the semantics of `KriegspielGame.ask_for`."""
+        return self._run([(_ASK, game_id, question)])[0]
+
+    def ask_many(self, requests: Iterable[Tuple[str, KriegspielMove]]) -> List[KriegspielAnswer]:
+        """
+        Ask `(game_id, question)` pairs in one batch per shard and return the answers in order.
+
+        Questions for the same game are answered in the given order. If one
+        fails, the later questions of its shard are not asked, the other
+        shards still answer theirs, and the earliest error is raised. The
+        error carries what was applied: `results` holds the answer of every
+        question that was asked and None for the others, and `failures` maps
+        the index of every failed question, at most one per shard, to its
+        error.
+        """
+        return self._run([(_ASK, game_id, question) for game_id, question in requests])
+
+    def possible_to_ask(self, game_id: str) -> List[KriegspielMove]:
+        """Return the questions the player to move may ask."""
+        return self._run([(_POSSIBLE, game_id, None)])[0]
+
+    def snapshot(self, game_id: str) -> KriegspielGameSnapshot:
+        """Return the snapshot of a hosted game."""
+        return self._run([(_SNAPSHOT, game_id, None)])[0]
+
+    def migrate(self, game_id: str, shard: int) -> None:
+        """
+        Move a game to `shard` by snapshot; its questions are routed there from now on.
+
+        The game is imported on `shard` before it is dropped from its current
+        shard, so a failed import leaves it where it was. Unknown games raise
+        `UnknownGameError`.
+        """
+        if not 0 <= shard < self.shards:
+            raise ValueError(f"Shard must be in range 0..{self.shards - 1}")
+        source = self.shard_of(game_id)
+        if source == shard:
+            self._run([(_CHECK, game_id, None)])
+            return
+        snapshot = self._run([(_SNAPSHOT, game_id, None)])[0]
+        self._run([(_IMPORT, game_id, snapshot)], shard=shard)
+        if shard == self._ring.node_for(game_id):
+            self._moved.pop(game_id, None)
+        else:
+            self._moved[game_id] = shard
+        self._run([(_CLOSE, game_id, None)], shard=source)
+
+    def stats(self) -> FarmStats:
+        """Return per-shard question counts and busy time, and the total wall time."""
+        return FarmStats(
+            asks=tuple(self._asks), busy_seconds=tuple(self._busy), batches=self._batches, wall_seconds=self._wall,
+        )
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+"""
+Incremental announcement feeds for players and spectators.
+
+`KriegspielGame.subscribe` delivers a `RefereeEvent` after every recorded
+answer. This module turns those events into what each audience may see:
+
+- `player_announcement(event, color)`: the asking player sees its question
+  and the answer; the opponent sees the question type and the answer exactly
+  when the ruleset records it on the opponent's scoresheet
+  (`should_record_opponent_answer`), so a feed replays into the same
+  scoresheets as `snapshot()`.
+- `SpectatorDelay`: completed moves with the full board, released only when
+  the game is `delay` plies further on, or when it ends.
+
+`FeedBroadcaster` fans events out to many asyncio subscribers. Every
+subscription has a queue of at most `max_buffer` items; a subscriber whose
+queue is full when a new item arrives is dropped rather than slowing down
+the publisher or growing without bound. `attach(game, game_id)` publishes a
+game's feeds on the channels `(game_id, chess.WHITE)`, `(game_id,
+chess.BLACK)` and `(game_id, SPECTATOR)` and closes them when the game ends.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+import chess
+
+from kriegspiel.move import KriegspielAnswer
+from kriegspiel.move import KriegspielMove
+from kriegspiel.move import QuestionAnnouncement
+from kriegspiel.snapshot import RefereeEvent
+
+SPECTATOR = "spectator"
+DEFAULT_MAX_BUFFER = 64
+DEFAULT_SPECTATOR_DELAY = 4
+
+_CLOSED = object()
+
+
+@dataclass(frozen=True)
+class PlayerAnnouncement:
+    """One answer as announced to one player; `question` is only set for the player who asked."""
+
+    ply: int
+    own: bool
+    question_type: QuestionAnnouncement
+    question: Optional[KriegspielMove]
+    answer: KriegspielAnswer
+
+
+@dataclass(frozen=True)
+class SpectatorMove:
+    """A completed move with the full board after it."""
+
+    ply: int
+    move: chess.Move
+    answer: KriegspielAnswer
+    fen: str
+
+
+def player_announcement(event: RefereeEvent, color: chess.Color) -> Optional[PlayerAnnouncement]:
+    """Return what `color` is told about `event`, or `None` if the referee tells it nothing."""
+    if color == event.color:
+        return PlayerAnnouncement(event.ply, True, event.question.question_type, event.question, event.answer)
+    if event.opponent_notified:
+        return PlayerAnnouncement(event.ply, False, event.question.question_type, None, event.answer)
+    return None
+
+
+class SpectatorDelay(object):
+    """Hold completed moves back until the game is `delay` plies further on."""
+
+    def __init__(self, delay: int = DEFAULT_SPECTATOR_DELAY):
+        if delay < 0:
+            raise ValueError("delay must not be negative")
+        self._delay = delay
+        self._pending = deque()
+
+    def push(self, event: RefereeEvent) -> List[SpectatorMove]:
+        """Take an event and return the moves that may now be shown, oldest first."""
+        if event.answer.move_done:
+            self._pending.append(SpectatorMove(event.ply, event.question.chess_move, event.answer, event.fen))
+        released = []
+        while self._pending and (event.game_over or self._pending[0].ply <= event.ply - self._delay):
+            released.append(self._pending.popleft())
+        return released
+
+
+class Subscription(object):
+    """
+    A bounded queue of items published on one channel.
+
+    Iterate with `async for`; iteration ends when the channel is closed or
+    the subscriber is dropped for falling behind, which sets `dropped`.
+    """
+
+    def __init__(self, broadcaster: "FeedBroadcaster", key: Hashable, max_buffer: int):
+        self.key = key
+        self.dropped = False
+        self._closed = False
+        self._broadcaster = broadcaster
+        # One extra slot so the end-of-stream marker always fits.
+        self._queue = asyncio.Queue(max_buffer + 1)
+        self._max_buffer = max_buffer
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self._queue.get()
+        if item is _CLOSED:
+            raise StopAsyncIteration
+        return item
+
+    def pending(self) -> int:
+        """Return the number of items waiting to be read."""
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        """Stop receiving items; iteration ends after the items already queued."""
+        if self._closed:
+            return
+        self._closed = True
+        self._broadcaster._remove(self)
+        self._queue.put_nowait(_CLOSED)
+
+    def _offer(self, item) -> bool:
+        if self._queue.qsize() >= self._max_buffer:
+            return False
+        self._queue.put_nowait(item)
+        return True
+
+    def _drop(self) -> None:
+        self.dropped = True
+        self._closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(_CLOSED)
+
+
+class FeedBroadcaster(object):
+    """Fan published items out to every subscription of a channel."""
+
+    def __init__(self, max_buffer: int = DEFAULT_MAX_BUFFER):
+        if max_buffer < 1:
+            raise ValueError("max_buffer must be positive")
+        self._max_buffer = max_buffer
+        self._channels: Dict[Hashable, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, key: Hashable) -> Subscription:
+        subscription = Subscription(self, key, self._max_buffer)
+        self._channels.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def subscribers(self, key: Hashable) -> int:
+        return len(self._channels.get(key, ()))
+
+    def _remove(self, subscription: Subscription) -> None:
+        subscriptions = self._channels[subscription.key]
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._channels[subscription.key]
+
+    def publish(self, key: Hashable, item: Any) -> int:
+        """Queue `item` for every subscriber of `key`, dropping those that are full; return the deliveries."""
+        self.published += 1
+        delivered = 0
+        slow = []
+        for subscription in self._channels.get(key, ()):
+            if subscription._offer(item):
+                delivered += 1
+            else:
+                slow.append(subscription)
+        for subscription in slow:
+            self._remove(subscription)
+            subscription._drop()
+        self.delivered += delivered
+        self.dropped += len(slow)
+        return delivered
+
+    def close(self, key: Hashable) -> None:
+        """End every subscription of `key` after the items already queued."""
+        for subscription in tuple(self._channels.get(key, ())):
+            subscription.close()
+
+    def attach(self, game, game_id: Hashable, spectator_delay: int = DEFAULT_SPECTATOR_DELAY) -> Callable:
+        """
+        Publish the feeds of `game` under `game_id` and return the game listener.
+
+        Pass the listener to `game.unsubscribe` to stop publishing.
+        """
+        delay = SpectatorDelay(spectator_delay)
+        channels = ((game_id, chess.WHITE), (game_id, chess.BLACK), (game_id, SPECTATOR))
+
+        def listener(event: RefereeEvent) -> None:
+            for color in chess.COLORS:
+                announcement = player_announcement(event, color)
+                if announcement is not None:
+                    self.publish((game_id, color), announcement)
+            for move in delay.push(event):
+                self.publish((game_id, SPECTATOR), move)
+            if event.game_over:
+                for key in channels:
+                    self.close(key)
+
+        game.subscribe(listener)
+        return listener
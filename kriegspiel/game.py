@@ -1,29 +1,42 @@
 # -*- coding: utf-8 -*-
 
+from functools import lru_cache
+
 import chess
 
 from kriegspiel.move import KriegspielMove as KSMove
 from kriegspiel.move import QuestionAnnouncement as QA
 
-from kriegspiel.move import CapturedPieceAnnouncement as CPA
 from kriegspiel.move import KriegspielAnswer as KSAnswer
 from kriegspiel.move import MainAnnouncement as MA
 from kriegspiel.move import SpecialCaseAnnouncement as SCA
 
 from kriegspiel.move import KriegspielScoresheet as KSSS
+from kriegspiel.move import _shared_answer
 from kriegspiel.rulesets import resolve_ruleset_policy
 from kriegspiel.snapshot import KriegspielGameSnapshot
+from kriegspiel.snapshot import PlayerView
 from kriegspiel.snapshot import MaterialSideSummary
 from kriegspiel.snapshot import PublicMaterialSummary
 from kriegspiel.snapshot import PublicReserveSummary
+from kriegspiel.snapshot import RefereeEvent
 from kriegspiel.snapshot import ReserveSideSummary
 from kriegspiel.snapshot import move_stack_from_scoresheets
-from kriegspiel.serialization import save_game_to_json, load_game_from_json
+from kriegspiel.snapshot import result_from_final_answers
+from kriegspiel.stats import instrument
+from kriegspiel.stats import uninstrument
 
 
 HALFMOVE_CLOCK_LIMIT = 2000
 
 
+@lru_cache(maxsize=None)
+def _common_question(chess_move):
+    # Questions are immutable values, so every game shares one object per
+    # legal move; there are only a few thousand of them.
+    return KSMove(QA.COMMON, chess_move)
+
+
 class KriegspielGame(object):
     """
     Shared hidden-board Kriegspiel referee engine.
@@ -42,6 +55,10 @@ class KriegspielGame(object):
     MainAnnouncement(s) and SpecialCaseAnnouncement.
     """
 
+    # Ruleset a variant-named wrapper is bound to; its loaders reject games
+    # of any other ruleset. None accepts every ruleset.
+    RULESET = None
+
     def __init__(self, any_rule=None, ruleset=None):
         """
         Initialize a new Kriegspiel referee game.
@@ -54,16 +71,54 @@ class KriegspielGame(object):
                      `english`, `rand`, and `wild16`.
         """
         super().__init__()
-        self._ruleset = resolve_ruleset_policy(ruleset=ruleset, any_rule=any_rule)
-        self._any_rule = self._ruleset.allow_ask_any
-        self._board = self._ruleset.new_board()
+        ruleset_policy = resolve_ruleset_policy(ruleset=ruleset, any_rule=any_rule)
+        self._init_state(ruleset_policy, ruleset_policy.new_board())
+        self._generate_possible_to_ask_list()
+
+    def _init_state(self, ruleset, board):
+        """Set the per-game engine state without generating askable questions."""
+        self._ruleset = ruleset
+        self._any_rule = ruleset.allow_ask_any
+        self._board = board
         self._must_use_pawns = False
         self._game_over = False
-        self._possible_to_ask = []
-        self._possible_to_ask_set = set()
-        self._generate_possible_to_ask_list()
+        self._possible_to_ask = set()
+        # Completed moves. The referee never takes a move back, so the board
+        # keeps no undo history of its own (see `_make_move`).
+        self._move_stack = []
         self._whites_scoresheet = KSSS(chess.WHITE)
         self._blacks_scoresheet = KSSS(chess.BLACK)
+        self._listeners = []
+        self._observers = ()
+        # Latest PlayerView per color, indexed by chess.BLACK / chess.WHITE.
+        self._player_views = [None, None]
+        self._stats = None
+        self._stats_aggregate = False
+
+    @classmethod
+    def _blank(cls, ruleset, board):
+        """Build an instance around `board` without running `__init__`."""
+        game = cls.__new__(cls)
+        KriegspielGame._init_state(game, ruleset, board)
+        return game
+
+    @classmethod
+    def _require_ruleset(cls, game):
+        """Return `game` after checking that it uses the class's `RULESET`, if it has one."""
+        if cls.RULESET is None:
+            return game
+        if not isinstance(game, KriegspielGame):
+            raise TypeError("game must be a KriegspielGame")
+        if game.ruleset_id != cls.RULESET:
+            raise ValueError(f"game must use the {cls.RULESET} ruleset")
+        return game
+
+    @classmethod
+    def _from_kriegspiel_game(cls, game):
+        """Build a `cls` instance from an independent copy of a shared-engine instance."""
+        return cls._require_ruleset(game)._copy_as(cls)
+
+    _from_berkeley_game = _from_kriegspiel_game
 
     def ask_for(self, move):
         """
@@ -81,7 +136,8 @@ class KriegspielGame(object):
         Returns:
             KriegspielAnswer: Contains the main announcement (MOVE_DONE, ILLEGAL_MOVE, etc.),
                             any capture information, and special case announcements like
-                            CHECK, CHECKMATE, or DRAW conditions.
+                            CHECK, CHECKMATE, or DRAW conditions. Answers are interned:
+                            equal answers may be one read-only object shared between games.
         
         Raises:
             TypeError: If move is not a KriegspielMove object.
@@ -93,26 +149,131 @@ class KriegspielGame(object):
         """
         if not isinstance(move, KSMove):
             raise TypeError("move must be a KriegspielMove")
+        observers = self._observers
+        if observers:
+            was_over = self._game_over
+            for observer in observers:
+                observer.before_question(self, move)
         # Get the main response of the referee
-        result = self._ask_for(move)
+        result = _shared_answer(self._ask_for(move))
         # Record the move if it was legit question.
         if result.main_announcement != MA.IMPOSSIBLE_TO_ASK:
             self._record_the_move(move, result)
         # Regenerate possible to asking list if a move is done
         if result.move_done:
             self._generate_possible_to_ask_list()
-        self._ruleset.apply_post_answer_constraints(self, result)
-        if self._ruleset.should_discard_attempt(move, result):
-            self._discard_possible_to_ask(move)
+        self._apply_post_answer_constraints(move, result)
+        if self._listeners and result.main_announcement != MA.IMPOSSIBLE_TO_ASK:
+            self._notify_listeners(move, result)
+        if observers:
+            for observer in observers:
+                observer.after_question(self, move, result)
+            if self._game_over and not was_over:
+                for observer in observers:
+                    observer.game_over(self)
         return result
 
+    def add_observer(self, observer):
+        """Register a `kriegspiel.observer.RefereeObserver`; see that module for the hooks."""
+        self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer):
+        """Unregister an observer added with `add_observer`."""
+        observers = list(self._observers)
+        observers.remove(observer)
+        self._observers = tuple(observers)
+
+    def subscribe(self, listener):
+        """
+        Call `listener(event)` with a `RefereeEvent` after every recorded answer.
+
+        Questions answered `IMPOSSIBLE_TO_ASK` are not recorded and produce
+        no event. Listeners run synchronously inside `ask_for`.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Stop calling a listener added with `subscribe`."""
+        self._listeners.remove(listener)
+
+    def enable_stats(self, aggregate=True):
+        """
+        Start timing the phases of `ask_for` on this game; see `kriegspiel.stats`.
+
+        With `aggregate`, every answer is also added to
+        `kriegspiel.stats.GLOBAL_STATS`. Calling it again restarts the game's
+        counters. Returns the game's `RefereeStats`.
+        """
+        self.disable_stats()
+        self._stats = instrument(self, aggregate=aggregate)
+        self._stats_aggregate = aggregate
+        return self._stats
+
+    def disable_stats(self):
+        """Stop timing `ask_for`; the game runs uninstrumented again."""
+        if self._stats is not None:
+            uninstrument(self)
+            self._stats = None
+
+    def stats(self):
+        """Return the game's `RefereeStats`, or None when stats are not enabled."""
+        return self._stats
+
+    def _hooks(self):
+        """Return the listeners, observers and stats settings of the game, or None when it has none."""
+        if not self._listeners and not self._observers and self._stats is None:
+            return None
+        return self._listeners, self._observers, self._stats, self._stats_aggregate
+
+    def _attach_hooks(self, hooks):
+        """Take over the listeners, observers and stats that `_hooks` returned for another game."""
+        self._listeners, self._observers, stats, aggregate = hooks
+        if stats is not None:
+            self._stats = instrument(self, aggregate=aggregate, stats=stats)
+            self._stats_aggregate = aggregate
+
+    def _notify_listeners(self, move, answer):
+        event = RefereeEvent(
+            color=not self._board.turn if answer.move_done else self._board.turn,
+            question=move,
+            answer=answer,
+            opponent_notified=self._ruleset.should_record_opponent_answer(move, answer),
+            ply=len(self._move_stack),
+            fen=self._board.fen(),
+            game_over=self._game_over,
+        )
+        for listener in tuple(self._listeners):
+            listener(event)
+
+    def _apply_post_answer_constraints(self, move, answer):
+        self._ruleset.apply_post_answer_constraints(self, answer)
+        if self._ruleset.should_discard_attempt(move, answer):
+            self._discard_possible_to_ask(move)
+
+    def _validate_question(self, move):
+        """Return the answer to a question that may not be asked now, or None."""
+        if move in self._possible_to_ask:
+            return None
+        if move.question_type == QA.COMMON:
+            return KSAnswer(self._ruleset.classify_impossible_common_attempt(self))
+        return KSAnswer(MA.IMPOSSIBLE_TO_ASK)
+
+    def _next_turn_metadata(self):
+        """Return the ruleset's pawn-try announcements for the player now to move."""
+        return (
+            self._ruleset.next_turn_pawn_tries(self),
+            self._ruleset.next_turn_has_pawn_capture(self),
+            self._ruleset.next_turn_pawn_try_squares(self),
+        )
+
     def _ask_for(self, move):
         """
         return (MoveAnnouncement, captured_square, SpecialCaseAnnouncement)
         """
+        impossible = self._validate_question(move)
+        if impossible is not None:
+            return impossible
         if move.question_type == QA.COMMON:
-            if move not in self._possible_to_ask_set:
-                return KSAnswer(self._ruleset.classify_impossible_common_attempt(self))
             # Player asks about a common move
             if self._is_legal_move(move.chess_move):
                 # Move is legal in normal chess
@@ -127,9 +288,11 @@ class KriegspielGame(object):
                     move.chess_move
                 )
                 special_case = self._check_special_cases()
-                next_turn_pawn_tries = self._ruleset.next_turn_pawn_tries(self)
-                next_turn_has_pawn_capture = self._ruleset.next_turn_has_pawn_capture(self)
-                next_turn_pawn_try_squares = self._ruleset.next_turn_pawn_try_squares(self)
+                (
+                    next_turn_pawn_tries,
+                    next_turn_has_pawn_capture,
+                    next_turn_pawn_try_squares,
+                ) = self._next_turn_metadata()
                 answer_kwargs = {"special_announcement": special_case}
                 if promotion_announced:
                     answer_kwargs["promotion_announced"] = True
@@ -154,8 +317,6 @@ class KriegspielGame(object):
             # If a move is illegal from the referee's perspective. But it's
             # was a possible move from asking player's perspective.
             return KSAnswer(MA.ILLEGAL_MOVE)
-        if move not in self._possible_to_ask_set:
-            return KSAnswer(MA.IMPOSSIBLE_TO_ASK)
         policy_answer = self._ruleset.handle_special_question(self, move)
         if policy_answer is not None:
             return policy_answer
@@ -347,7 +508,8 @@ class KriegspielGame(object):
         captured_square = None
         captured_piece_announcement = None
         en_passant_announced = False
-        dropped_piece_announcement = self._ruleset.dropped_piece_announcement_for(KSMove(QA.COMMON, move))
+        question = _common_question(move)
+        dropped_piece_announcement = self._ruleset.dropped_piece_announcement_for(question)
         promotion_announced = bool(move.promotion and self._ruleset.announce_promotion)
         if self._board.is_capture(move):
             captured_square = self._get_captured_square(move)
@@ -359,6 +521,10 @@ class KriegspielGame(object):
                 captured_square=captured_square,
             )
         self._board.push(move)
+        self._board.clear_stack()
+        self._move_stack.append(question.chess_move)
+        for observer in self._observers:
+            observer.move_pushed(self, move)
         return (
             captured_square,
             captured_piece_announcement,
@@ -424,12 +590,38 @@ class KriegspielGame(object):
         # Make a copy of the FULL board (referee's board)
         players_board = self._board.copy(stack=False)
         active_color = self._board.turn
-        # Remove all pieces belonging not to the current player
-        for square, piece in self._board.piece_map().items():
-            if piece.color != active_color:
-                players_board.remove_piece_at(square)
+        # Mask out all pieces not belonging to the current player
+        own = self._board.occupied_co[active_color]
+        players_board.pawns &= own
+        players_board.knights &= own
+        players_board.bishops &= own
+        players_board.rooks &= own
+        players_board.queens &= own
+        players_board.kings &= own
+        players_board.promoted &= own
+        players_board.occupied &= own
+        players_board.occupied_co[not active_color] = 0
         return players_board
 
+    def player_view(self, color):
+        """
+        Return the pieces `color` can see on its own board.
+
+        Views are immutable and cached until the next move, so any number of
+        readers share one `PlayerView` per color and ply. A view one move
+        behind is updated from the squares the last move changed; older views
+        are rebuilt from the board.
+        """
+        ply = len(self._move_stack)
+        view = self._player_views[color]
+        if view is None or view.ply != ply:
+            if view is not None and view.ply == ply - 1:
+                view = view.advanced(self._board, ply)
+            else:
+                view = PlayerView.from_board(self._board, color, ply)
+            self._player_views[color] = view
+        return view
+
     def _generate_possible_pawn_captures(self):
         """
         Generate all possible pawn capture moves for the current player.
@@ -448,29 +640,22 @@ class KriegspielGame(object):
                     # If capture is promotion for pawn.
                     possibilities.extend(
                         [
-                            KSMove(QA.COMMON, chess.Move(square, attacked, promotion=chess.QUEEN)),
-                            KSMove(QA.COMMON, chess.Move(square, attacked, promotion=chess.BISHOP)),
-                            KSMove(QA.COMMON, chess.Move(square, attacked, promotion=chess.KNIGHT)),
-                            KSMove(QA.COMMON, chess.Move(square, attacked, promotion=chess.ROOK)),
+                            _common_question(chess.Move(square, attacked, promotion=chess.QUEEN)),
+                            _common_question(chess.Move(square, attacked, promotion=chess.BISHOP)),
+                            _common_question(chess.Move(square, attacked, promotion=chess.KNIGHT)),
+                            _common_question(chess.Move(square, attacked, promotion=chess.ROOK)),
                         ]
                     )
                 else:
                     # If capture is not promotion for pawn
-                    possibilities.append(KSMove(QA.COMMON, chess.Move(square, attacked)))
+                    possibilities.append(_common_question(chess.Move(square, attacked)))
         return possibilities
 
     def _set_possible_to_ask(self, possibilities):
-        self._possible_to_ask_set = set(possibilities)
-        self._possible_to_ask = list(self._possible_to_ask_set)
+        self._possible_to_ask = set(possibilities)
 
     def _discard_possible_to_ask(self, move):
-        if move not in self._possible_to_ask_set:
-            return
-        self._possible_to_ask_set.remove(move)
-        try:
-            self._possible_to_ask.remove(move)
-        except ValueError:  # pragma: no cover
-            self._possible_to_ask = list(self._possible_to_ask_set)
+        self._possible_to_ask.discard(move)
 
     def _generate_possible_to_ask_list(self):
         """
@@ -484,19 +669,37 @@ class KriegspielGame(object):
             Variant-specific additions such as `ASK_ANY` are injected by the
             active ruleset policy instead of being hard-coded here.
         """
+        observers = self._observers
+        for observer in observers:
+            observer.before_regeneration(self)
+        self._set_possible_to_ask(self._fresh_possible_to_ask())
+        for observer in observers:
+            observer.askable_regenerated(self)
+
+    def _fresh_possible_to_ask(self):
+        """Return the full question set of a new turn without changing state."""
         if self._game_over:
-            self._set_possible_to_ask(set())
-            return
+            return set()
         # Make the board that the current player sees
         players_board = self._build_players_board()
         # First collect all possible moves keeping in mind castling rules.
         # Castling rules are kept as it is generated by the referee's board,
         # which contains info about previous moves.
-        possibilities = {KSMove(QA.COMMON, chess_move) for chess_move in players_board.legal_moves}
+        possibilities = {_common_question(chess_move) for chess_move in players_board.legal_moves}
         self._ruleset.add_special_questions(possibilities)
         # Second add ruleset-approved hidden pawn-capture tries.
         possibilities.update(self._ruleset.pawn_capture_attempts_for_prompt(self))
-        self._set_possible_to_ask(possibilities)
+        return possibilities
+
+    def _regenerated_possible_to_ask(self):
+        """
+        Return the question set `from_snapshot` rebuilds when none is stored.
+
+        A pending pawn obligation narrows the set to the pawn-capture tries.
+        """
+        if self._must_use_pawns:
+            return set(self._generate_possible_pawn_captures())
+        return self._fresh_possible_to_ask()
 
     @property
     def possible_to_ask(self):
@@ -507,8 +710,9 @@ class KriegspielGame(object):
             List[KriegspielMove]: All legal moves and questions the current player
                                 can ask, including regular moves, pawn captures,
                                 and ASK_ANY questions (if any_rule is enabled).
+                                A new list is built on every access.
         """
-        return self._possible_to_ask
+        return list(self._possible_to_ask)
 
     @property
     def game_over(self):
@@ -521,6 +725,18 @@ class KriegspielGame(object):
         """
         return self._game_over
 
+    @property
+    def result(self):
+        """
+        Get the game result in PGN notation.
+
+        Returns:
+            str: "1-0", "0-1", "1/2-1/2", or "*" while the game is in progress.
+        """
+        return result_from_final_answers(
+            self._whites_scoresheet.last_own_answer, self._blacks_scoresheet.last_own_answer
+        )
+
     @property
     def any_rule(self):
         """Backward-compatible public flag for Berkeley+Any behavior."""
@@ -561,19 +777,6 @@ class KriegspielGame(object):
         """
         return self._ruleset.next_turn_pawn_try_squares(self)
 
-    @staticmethod
-    def _capture_counts_from_completed_moves(moves_own):
-        captures = 0
-        pawn_captures = 0
-        for turn in moves_own:
-            for _move, answer in turn:
-                if answer.main_announcement != MA.CAPTURE_DONE:
-                    continue
-                captures += 1
-                if answer.captured_piece_announcement == CPA.PAWN:
-                    pawn_captures += 1
-        return captures, pawn_captures
-
     def _board_piece_count(self, color):
         return sum(1 for piece in self._board.piece_map().values() if piece.color == color)
 
@@ -600,12 +803,8 @@ class KriegspielGame(object):
                 ),
             )
 
-        white_captures, white_pawn_captures = self._capture_counts_from_completed_moves(
-            self._whites_scoresheet.moves_own
-        )
-        black_captures, black_pawn_captures = self._capture_counts_from_completed_moves(
-            self._blacks_scoresheet.moves_own
-        )
+        white_captures, white_pawn_captures = self._whites_scoresheet.capture_counts()
+        black_captures, black_pawn_captures = self._blacks_scoresheet.capture_counts()
         announces_pawn_captures = self._ruleset.typed_capture_announcements
 
         return PublicMaterialSummary(
@@ -674,16 +873,20 @@ class KriegspielGame(object):
             bool: True if the move is in the current list of possible questions,
                  False if it's not allowed or has already been asked.
         """
-        return move in self._possible_to_ask_set
+        return move in self._possible_to_ask
 
-    def save_game(self, filename):
+    def save_game(self, filename, compact=False):
         """
         Save the current game state to a JSON file.
         
         Args:
             filename: Path to the file where the game state will be saved
+            compact: Write the compact schema 10 document instead of the
+                     indented schema 9 one
         """
-        save_game_to_json(self, filename)
+        from kriegspiel.serialization import save_game_to_json
+
+        save_game_to_json(self, filename, compact=compact)
 
     def snapshot(self):
         """Return a public snapshot of the current game state."""
@@ -691,66 +894,117 @@ class KriegspielGame(object):
             ruleset_id=self.ruleset_id,
             any_rule=self.any_rule,
             board_fen=self._board.fen(),
-            move_stack=tuple(move.uci() for move in self._board.move_stack),
+            move_stack=tuple(move.uci() for move in self._move_stack),
             must_use_pawns=self._must_use_pawns,
             game_over=self._game_over,
-            possible_to_ask=tuple(self._possible_to_ask),
+            possible_to_ask=tuple(sorted(self._possible_to_ask)),
             white_scoresheet=self._whites_scoresheet.snapshot(),
             black_scoresheet=self._blacks_scoresheet.snapshot(),
         )
 
+    def copy(self):
+        """
+        Return an independent copy of the game in the same state.
+
+        Listeners, observers and stats are not copied. Much faster than a
+        snapshot round trip, which replays and validates the move stack.
+        """
+        return self._copy_as(type(self))
+
+    def _copy_as(self, game_class):
+        """Return an independent copy of the game as a `game_class` instance."""
+        game = game_class._blank(self._ruleset, self._board.copy(stack=False))
+        game._must_use_pawns = self._must_use_pawns
+        game._game_over = self._game_over
+        game._possible_to_ask = set(self._possible_to_ask)
+        game._move_stack = list(self._move_stack)
+        game._whites_scoresheet = self._whites_scoresheet.copy()
+        game._blacks_scoresheet = self._blacks_scoresheet.copy()
+        return game
+
     @classmethod
     def from_snapshot(cls, snapshot):
         """Build a KriegspielGame from a validated public snapshot."""
+        return cls._require_ruleset(cls._from_snapshot(snapshot))
+
+    @classmethod
+    def _from_snapshot(cls, snapshot):
+        """Build a game from `snapshot` without checking `RULESET`."""
         if not isinstance(snapshot, KriegspielGameSnapshot):
             raise TypeError("snapshot must be a KriegspielGameSnapshot")
 
-        ruleset = resolve_ruleset_policy(ruleset=snapshot.ruleset_id)
+        return cls._restore(
+            ruleset_id=snapshot.ruleset_id,
+            board_fen=snapshot.board_fen,
+            move_stack=snapshot.move_stack,
+            must_use_pawns=snapshot.must_use_pawns,
+            game_over=snapshot.game_over,
+            possible_to_ask=snapshot.possible_to_ask,
+            derive_move_stack=lambda: move_stack_from_scoresheets(
+                snapshot.white_scoresheet, snapshot.black_scoresheet
+            ),
+            whites_scoresheet=KSSS.from_snapshot(snapshot.white_scoresheet),
+            blacks_scoresheet=KSSS.from_snapshot(snapshot.black_scoresheet),
+        )
+
+    @classmethod
+    def _restore(
+        cls, ruleset_id, board_fen, move_stack, must_use_pawns, game_over, possible_to_ask,
+        derive_move_stack, whites_scoresheet, blacks_scoresheet,
+    ):
+        """
+        Validate restored state and build a game around it.
+
+        `derive_move_stack` returns the UCI moves completed on the scoresheets,
+        which must match `move_stack`. The scoresheets are used as given, so
+        they may still be lazily decoded.
+        """
+        ruleset = resolve_ruleset_policy(ruleset=ruleset_id)
 
         try:
-            ruleset.board_from_fen(snapshot.board_fen)
+            ruleset.board_from_fen(board_fen)
         except ValueError as exc:
-            raise ValueError(f"Invalid board FEN: {snapshot.board_fen}") from exc
+            raise ValueError(f"Invalid board FEN: {board_fen}") from exc
 
         board = ruleset.new_board()
         try:
-            for move_uci in snapshot.move_stack:
+            for move_uci in move_stack:
                 board.push_uci(move_uci)
         except ValueError as exc:
             raise ValueError(f"Invalid move_stack entry: {move_uci}") from exc
 
-        if board.fen() != snapshot.board_fen:
+        if board.fen() != board_fen:
             raise ValueError("Serialized move_stack does not match board_fen")
 
-        derived_move_stack = move_stack_from_scoresheets(
-            snapshot.white_scoresheet, snapshot.black_scoresheet
-        )
-        if derived_move_stack != snapshot.move_stack:
+        if tuple(derive_move_stack()) != tuple(move_stack):
             raise ValueError("Scoresheet-derived moves do not match move_stack")
 
-        game = cls(ruleset=snapshot.ruleset_id)
-        game._board = board
-        game._must_use_pawns = snapshot.must_use_pawns
-        game._game_over = snapshot.game_over
-        game._whites_scoresheet = KSSS.from_snapshot(snapshot.white_scoresheet)
-        game._blacks_scoresheet = KSSS.from_snapshot(snapshot.black_scoresheet)
-        if snapshot.possible_to_ask is None:
-            game._generate_possible_to_ask_list()
-            if game._must_use_pawns:
-                game._set_possible_to_ask(game._generate_possible_pawn_captures())
+        moves = [_common_question(move).chess_move for move in board.move_stack]
+        board.clear_stack()
+        game = cls._blank(ruleset, board)
+        game._move_stack = moves
+        game._must_use_pawns = must_use_pawns
+        game._game_over = game_over
+        game._whites_scoresheet = whites_scoresheet
+        game._blacks_scoresheet = blacks_scoresheet
+        if possible_to_ask is None:
+            game._set_possible_to_ask(game._regenerated_possible_to_ask())
         else:
-            game._set_possible_to_ask(snapshot.possible_to_ask)
+            game._set_possible_to_ask(possible_to_ask)
         return game
 
     @classmethod
-    def load_game(cls, filename):
+    def load_game(cls, filename, lazy=False):
         """
         Load a game state from a JSON file.
         
         Args:
             filename: Path to the file containing the saved game state
+            lazy: Decode scoresheet turns on first access instead of on load
             
         Returns:
             KriegspielGame: New game instance with restored state
         """
-        return cls.from_snapshot(load_game_from_json(filename).snapshot())
+        from kriegspiel.serialization import load_game_from_json
+
+        return load_game_from_json(filename, game_class=cls, lazy=lazy)
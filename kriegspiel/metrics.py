@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+"""
+Referee metrics in the Prometheus text exposition format.
+
+`RefereeMetrics` is a `RefereeObserver`; `attach(game)` registers it on a
+game and from then on every question is recorded without touching the call
+sites of `ask_for`:
+
+    kriegspiel_ask_for_seconds{ruleset}             histogram
+    kriegspiel_regeneration_seconds{ruleset}        histogram
+    kriegspiel_answers_total{ruleset,announcement}  counter
+    kriegspiel_games_total{ruleset}                 counter of attached games
+    kriegspiel_save_seconds                         histogram
+    kriegspiel_load_seconds                         histogram
+
+Saves and loads are timed by `save_game` and `load_game`, or by observing
+the `save` and `load` histograms directly. Histogram counts and answer
+counters are preallocated per ruleset when its first game is attached, so
+recording a question is a clock read, a bucket search and a few integer
+additions. A game registered with `game.add_observer(metrics)` instead of
+`attach` is recorded too, but is not counted in `kriegspiel_games_total`.
+
+`render()` returns the exposition text and `write(filename)` replaces a file
+atomically, as the node exporter textfile collector expects:
+
+    metrics = RefereeMetrics()
+    metrics.attach(game)
+    ...
+    metrics.write("/var/lib/node_exporter/kriegspiel.prom")
+"""
+
+import bisect
+import os
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from kriegspiel.move import MainAnnouncement
+from kriegspiel.observer import RefereeObserver
+
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+DEFAULT_REFEREE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025)
+
+_ANNOUNCEMENTS = tuple(MainAnnouncement)
+
+
+class LatencyHistogram(object):
+    """Latency histogram over fixed upper bounds in seconds, with per-bucket (not cumulative) counts."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        if list(buckets) != sorted(set(buckets)) or not buckets:
+            raise ValueError("buckets must be a non-empty increasing sequence")
+        self.bounds = tuple(buckets)
+        # The last count is for observations above every bound.
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def buckets(self) -> Tuple[Tuple[float, int], ...]:
+        """Return `(upper bound, count)` pairs; the last bound is `inf`."""
+        return tuple(zip(self.bounds + (float("inf"),), self.counts))
+
+
+class RefereeMetrics(RefereeObserver):
+    """Latency histograms and answer counters of every attached game."""
+
+    def __init__(
+        self,
+        referee_buckets: Sequence[float] = DEFAULT_REFEREE_BUCKETS,
+        persistence_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self._referee_buckets = tuple(referee_buckets)
+        # Validates the buckets before any game is attached.
+        LatencyHistogram(self._referee_buckets)
+        self.save = LatencyHistogram(persistence_buckets)
+        self.load = LatencyHistogram(persistence_buckets)
+        self._ask_for: Dict[str, LatencyHistogram] = {}
+        self._regeneration: Dict[str, LatencyHistogram] = {}
+        # ruleset id -> answers indexed by MainAnnouncement value
+        self._answers: Dict[str, List[int]] = {}
+        self._games: Dict[str, int] = {}
+        # id(game) -> perf_counter() at the start of its question or regeneration
+        self._asking: Dict[int, float] = {}
+        self._regenerating: Dict[int, float] = {}
+
+    def _register(self, ruleset_id: str) -> None:
+        self._ask_for[ruleset_id] = LatencyHistogram(self._referee_buckets)
+        self._regeneration[ruleset_id] = LatencyHistogram(self._referee_buckets)
+        self._answers[ruleset_id] = [0] * len(_ANNOUNCEMENTS)
+        self._games[ruleset_id] = 0
+
+    def attach(self, game) -> None:
+        """Record the questions of `game` from now on."""
+        ruleset_id = game.ruleset_id
+        if ruleset_id not in self._games:
+            self._register(ruleset_id)
+        self._games[ruleset_id] += 1
+        game.add_observer(self)
+
+    def detach(self, game) -> None:
+        game.remove_observer(self)
+
+    def before_question(self, game, question):
+        self._asking[id(game)] = time.perf_counter()
+
+    def after_question(self, game, question, answer):
+        seconds = time.perf_counter() - self._asking.pop(id(game))
+        ruleset_id = game.ruleset_id
+        if ruleset_id not in self._games:
+            self._register(ruleset_id)
+        self._ask_for[ruleset_id].observe(seconds)
+        self._answers[ruleset_id][answer.main_announcement.value] += 1
+
+    def before_regeneration(self, game):
+        self._regenerating[id(game)] = time.perf_counter()
+
+    def askable_regenerated(self, game):
+        seconds = time.perf_counter() - self._regenerating.pop(id(game))
+        ruleset_id = game.ruleset_id
+        if ruleset_id not in self._games:
+            self._register(ruleset_id)
+        self._regeneration[ruleset_id].observe(seconds)
+
+    def save_game(self, game, filename: str, compact: bool = False) -> None:
+        """`game.save_game(filename, compact)`, timed in the save histogram."""
+        start = time.perf_counter()
+        game.save_game(filename, compact=compact)
+        self.save.observe(time.perf_counter() - start)
+
+    def load_game(self, game_class, filename: str, lazy: bool = False):
+        """`game_class.load_game(filename, lazy)`, timed in the load histogram; the game is attached."""
+        start = time.perf_counter()
+        game = game_class.load_game(filename, lazy=lazy)
+        self.load.observe(time.perf_counter() - start)
+        self.attach(game)
+        return game
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        _histogram_family(
+            lines, "kriegspiel_ask_for_seconds", "Latency of KriegspielGame.ask_for.",
+            [({"ruleset": ruleset_id}, histogram) for ruleset_id, histogram in sorted(self._ask_for.items())],
+        )
+        _histogram_family(
+            lines, "kriegspiel_regeneration_seconds", "Latency of rebuilding the possible questions.",
+            [({"ruleset": ruleset_id}, histogram) for ruleset_id, histogram in sorted(self._regeneration.items())],
+        )
+        lines.append("# HELP kriegspiel_answers_total Answers given, by main announcement.")
+        lines.append("# TYPE kriegspiel_answers_total counter")
+        for ruleset_id, counts in sorted(self._answers.items()):
+            for announcement in _ANNOUNCEMENTS:
+                labels = _labels({"ruleset": ruleset_id, "announcement": announcement.name})
+                lines.append(f"kriegspiel_answers_total{labels} {counts[announcement.value]}")
+        lines.append("# HELP kriegspiel_games_total Games attached to the metrics.")
+        lines.append("# TYPE kriegspiel_games_total counter")
+        for ruleset_id, games in sorted(self._games.items()):
+            lines.append(f"kriegspiel_games_total{_labels({'ruleset': ruleset_id})} {games}")
+        _histogram_family(lines, "kriegspiel_save_seconds", "Latency of saving a game.", [({}, self.save)])
+        _histogram_family(lines, "kriegspiel_load_seconds", "Latency of loading a game.", [({}, self.load)])
+        return "\n".join(lines) + "\n"
+
+    def write(self, filename: str) -> None:
+        """Write `render()` to `filename`, replacing it atomically."""
+        temporary = f"{filename}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(self.render())
+        os.replace(temporary, filename)
+
+
+def _histogram_family(lines: List[str], name: str, help_text: str, series) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in series:
+        cumulative = 0
+        for bound, count in histogram.buckets():
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(dict(labels, le=_number(bound)))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
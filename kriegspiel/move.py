@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import enum
+from array import array
 
 import chess
 
@@ -32,8 +33,12 @@ class KriegspielMove(object):
     """
     Basic class to define main operations and validations
     for general Kriegspiel move.
+
+    Moves are immutable, so games can share one object per question.
     """
 
+    __slots__ = ("question_type", "chess_move")
+
     def __init__(self, question_type, chess_move=None):
         """
         Initialize a Kriegspiel move question.
@@ -56,8 +61,17 @@ class KriegspielMove(object):
         # then it should be valid chess move object
         if question_type == QuestionAnnouncement.COMMON and not isinstance(chess_move, chess.Move):
             raise TypeError("COMMON questions require a python-chess Move")
-        self.question_type = question_type
-        self.chess_move = chess_move
+        object.__setattr__(self, "question_type", question_type)
+        object.__setattr__(self, "chess_move", chess_move)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KriegspielMove is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("KriegspielMove is immutable")
+
+    def __reduce__(self):
+        return (KriegspielMove, (self.question_type, self.chess_move))
 
     def __str__(self):
         """
@@ -258,6 +272,22 @@ class KriegspielAnswer(object):
     game state announcements like check or checkmate.
     """
 
+    __slots__ = (
+        "_main_announcement",
+        "_capture_at_square",
+        "_captured_piece_announcement",
+        "_special_announcement",
+        "_move_done",
+        "_check_1",
+        "_check_2",
+        "_next_turn_pawn_tries",
+        "_next_turn_has_pawn_capture",
+        "_next_turn_pawn_try_squares",
+        "_promotion_announced",
+        "_dropped_piece_announcement",
+        "_en_passant_announced",
+    )
+
     def __init__(self, main_announcement, **kwargs):
         """
         Initialize a Kriegspiel referee answer.
@@ -696,6 +726,108 @@ class KriegspielAnswer(object):
         return hash(self._identity_key())
 
 
+class _SharedAnswer(KriegspielAnswer):
+    """Read-only `KriegspielAnswer` handed out by `_shared_answer`."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Shared KriegspielAnswer is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Shared KriegspielAnswer is immutable")
+
+    def __reduce__(self):
+        return (_restore_answer, (type(self), _answer_values(self)))
+
+
+def _answer_values(answer):
+    return tuple(getattr(answer, name) for name in KriegspielAnswer.__slots__)
+
+
+def _restore_answer(cls, values):
+    answer = object.__new__(cls)
+    for name, value in zip(KriegspielAnswer.__slots__, values):
+        object.__setattr__(answer, name, value)
+    return answer
+
+
+def _frozen_answer(answer):
+    """Return a read-only copy of `answer` that may be shared between games."""
+    if type(answer) is _SharedAnswer:
+        return answer
+    return _restore_answer(_SharedAnswer, _answer_values(answer))
+
+
+# Interned answers, keyed both by the answer itself and by the payload keys of
+# the decoders that produced it. Every game and decoder in the process shares
+# this one table, up to this many entries.
+ANSWER_CACHE_SIZE = 4096
+_ANSWERS = {}
+
+
+def _shared_answer(answer):
+    """
+    Return the interned read-only answer equal to `answer`.
+
+    Once the table is full, unseen answers are returned as they are and stay
+    private to their caller.
+    """
+    shared = _ANSWERS.get(answer)
+    if shared is not None:
+        return shared
+    if len(_ANSWERS) >= ANSWER_CACHE_SIZE:
+        return answer
+    shared = _frozen_answer(answer)
+    _ANSWERS[shared] = shared
+    return shared
+
+
+def _shared_decoded_answer(key, decode, data):
+    """
+    Return the interned answer decoded from `data`, remembered under the payload `key`.
+
+    `decode(data)` runs only when `key` is not in the table yet; keys that
+    cannot be hashed are decoded uncached.
+    """
+    try:
+        shared = _ANSWERS.get(key)
+    except TypeError:
+        return decode(data)
+    if shared is None:
+        shared = _shared_answer(decode(data))
+        if len(_ANSWERS) < ANSWER_CACHE_SIZE:
+            _ANSWERS[key] = shared
+    return shared
+
+
+def _flatten_turns(turns):
+    """Return the flat `[question, answer, ...]` list and turn start indexes of nested `turns`."""
+    entries = []
+    starts = array("I")
+    for turn in turns:
+        starts.append(len(entries))
+        for question, answer in turn:
+            entries.append(question)
+            entries.append(answer)
+    return entries, starts
+
+
+def _nested_turns(entries, starts):
+    """Rebuild the `[[(question, answer), ...], ...]` turns flattened by `_flatten_turns`."""
+    ends = starts[1:].tolist() + [len(entries)]
+    return [list(zip(entries[start:end:2], entries[start + 1:end:2])) for start, end in zip(starts, ends)]
+
+
+def _nested_turn(entries, starts, index):
+    """Rebuild turn `index` of the turns flattened by `_flatten_turns`; negative indexes count from the end."""
+    start = starts[index]
+    if index < 0:
+        index += len(starts)
+    end = starts[index + 1] if index + 1 < len(starts) else len(entries)
+    return list(zip(entries[start:end:2], entries[start + 1:end:2]))
+
+
 class KriegspielScoresheet:
     """
     Maintains game history for a player in Kriegspiel.
@@ -703,8 +835,26 @@ class KriegspielScoresheet:
     This class tracks both the player's own moves and the opponent's visible moves
     with their outcomes, enabling game replay and analysis. Each player has their
     own scoresheet containing only the information visible to them.
+
+    The history is stored flat to keep idle games small: one list holds
+    question, answer, question, answer, ... and an array holds the index at
+    which every turn starts. `moves_own` and `moves_opponent` rebuild the
+    nested turn lists on access, which costs time linear in the game length;
+    `own_turn_count`, `own_turn()` and their opponent counterparts read one
+    turn in constant time.
     """
-    
+
+    __slots__ = (
+        "__color",
+        "__own",
+        "__own_turns",
+        "__opponent",
+        "__opponent_turns",
+        "__last_move_number",
+        "__decode",
+        "__summary",
+    )
+
     def __init__(self, color=chess.WHITE):
         """
         Initialize a scoresheet for a player.
@@ -714,9 +864,40 @@ class KriegspielScoresheet:
                   this scoresheet belongs to. Defaults to WHITE.
         """
         self.__color = color
-        self.__moves_own = []
-        self.__moves_opponent = []
+        self.__own = []
+        self.__own_turns = array("I")
+        self.__opponent = []
+        self.__opponent_turns = array("I")
         self.__last_move_number = 0
+        self.__decode = None
+        self.__summary = None
+
+    @classmethod
+    def _lazy(cls, color, last_move_number, decode, capture_counts, last_own_answer):
+        """
+        Build a scoresheet whose turns are decoded on first access.
+
+        `decode` returns the `(moves_own, moves_opponent)` lists. Until it is
+        called, `capture_counts()` and `last_own_answer` are served from the
+        precomputed `capture_counts` and `last_own_answer`.
+        """
+        scoresheet = cls(color)
+        scoresheet.__last_move_number = last_move_number
+        scoresheet.__decode = decode
+        scoresheet.__summary = (capture_counts, last_own_answer)
+        return scoresheet
+
+    def __materialize(self):
+        moves_own, moves_opponent = self.__decode()
+        self.__own, self.__own_turns = _flatten_turns(moves_own)
+        self.__opponent, self.__opponent_turns = _flatten_turns(moves_opponent)
+        self.__decode = None
+        self.__summary = None
+
+    @property
+    def decoded(self):
+        """True once the move history is held as decoded objects."""
+        return self.__decode is None
 
     @property
     def moves_own(self):
@@ -725,9 +906,12 @@ class KriegspielScoresheet:
         
         Returns:
             List of move sets, where each move set is a list of (question, answer) pairs
-            representing all questions asked during one turn.
+            representing all questions asked during one turn. The lists are
+            built on every access; use `own_turn()` to read a single turn.
         """
-        return self.__moves_own
+        if self.__decode is not None:
+            self.__materialize()
+        return _nested_turns(self.__own, self.__own_turns)
 
     @property
     def moves_opponent(self):
@@ -736,9 +920,86 @@ class KriegspielScoresheet:
         
         Returns:
             List of move sets, where each move set contains the opponent's questions
-            and answers that were visible to this player.
+            and answers that were visible to this player. The lists are built
+            on every access; use `opponent_turn()` to read a single turn.
+        """
+        if self.__decode is not None:
+            self.__materialize()
+        return _nested_turns(self.__opponent, self.__opponent_turns)
+
+    @property
+    def own_turn_count(self):
+        """Number of turns in `moves_own`."""
+        if self.__decode is not None:
+            self.__materialize()
+        return len(self.__own_turns)
+
+    @property
+    def opponent_turn_count(self):
+        """Number of turns in `moves_opponent`."""
+        if self.__decode is not None:
+            self.__materialize()
+        return len(self.__opponent_turns)
+
+    def own_turn(self, index):
+        """
+        Get one turn of the player's own move history.
+
+        Args:
+            index: Turn index into `moves_own`; negative indexes count from the end.
+
+        Returns:
+            List of the (question, answer) pairs of that turn, equal to `moves_own[index]`.
+
+        Raises:
+            IndexError: If there is no such turn.
+        """
+        if self.__decode is not None:
+            self.__materialize()
+        return _nested_turn(self.__own, self.__own_turns, index)
+
+    def opponent_turn(self, index):
+        """
+        Get one turn of the opponent's visible move history.
+
+        Args:
+            index: Turn index into `moves_opponent`; negative indexes count from the end.
+
+        Returns:
+            List of the (question, answer) pairs of that turn, equal to `moves_opponent[index]`.
+
+        Raises:
+            IndexError: If there is no such turn.
         """
-        return self.__moves_opponent
+        if self.__decode is not None:
+            self.__materialize()
+        return _nested_turn(self.__opponent, self.__opponent_turns, index)
+
+    @property
+    def last_own_answer(self):
+        """The answer to this player's most recent question, or None before the first one."""
+        if self.__decode is not None:
+            return self.__summary[1]
+        return self.__own[-1] if self.__own else None
+
+    def capture_counts(self):
+        """
+        Count captures announced on this player's own completed moves.
+
+        Returns:
+            tuple[int, int]: Total captures and captures announced as pawns.
+        """
+        if self.__decode is not None:
+            return self.__summary[0]
+        captures = 0
+        pawn_captures = 0
+        for answer in self.__own[1::2]:
+            if answer.main_announcement != MainAnnouncement.CAPTURE_DONE:
+                continue
+            captures += 1
+            if answer.captured_piece_announcement == CapturedPieceAnnouncement.PAWN:
+                pawn_captures += 1
+        return captures, pawn_captures
 
     @property
     def last_move_number(self):
@@ -766,12 +1027,12 @@ class KriegspielScoresheet:
             bool: True if the last move was completed (not just a question),
                  False if the last question was illegal or impossible.
         """
+        if self.__decode is not None:
+            self.__materialize()
         if self.__color == color:
-            last_set_of_questions = self.__moves_own[-1]
+            last_answer = self.__own[-1]
         else:
-            last_set_of_questions = self.__moves_opponent[-1]
-        last_pair = last_set_of_questions[-1]
-        last_answer = last_pair[1]
+            last_answer = self.__opponent[-1]
         return last_answer.move_done
 
     def __get_current_move_number(self):
@@ -788,7 +1049,7 @@ class KriegspielScoresheet:
             self.__last_move_number += 1
             return self.__last_move_number
         # One of the list is smaller → we are still in progress.
-        if len(self.__moves_own) < len(self.__moves_opponent) or len(self.__moves_opponent) < len(self.__moves_own):
+        if len(self.__own_turns) != len(self.__opponent_turns):
             return self.__last_move_number
         # If the same lenghts of moves' lists.
         if self.was_the_last_move_ended(chess.WHITE) and self.was_the_last_move_ended(chess.BLACK):
@@ -812,11 +1073,13 @@ class KriegspielScoresheet:
             raise ValueError("move must be a KriegspielMove")
         if not isinstance(answer, KriegspielAnswer):
             raise ValueError("answer must be a KriegspielAnswer")
+        if self.__decode is not None:
+            self.__materialize()
         current_move_number = self.__get_current_move_number()
-        if current_move_number == len(self.__moves_own):
-            self.__moves_own[-1].append((move, answer))
-        else:
-            self.__moves_own.append([(move, answer)])
+        if current_move_number != len(self.__own_turns):
+            self.__own_turns.append(len(self.__own))
+        self.__own.append(move)
+        self.__own.append(answer)
 
     def record_move_opponent(self, question, answer):
         """
@@ -834,20 +1097,39 @@ class KriegspielScoresheet:
             raise ValueError("question must be a QuestionAnnouncement")
         if not isinstance(answer, KriegspielAnswer):
             raise ValueError("answer must be a KriegspielAnswer")
+        if self.__decode is not None:
+            self.__materialize()
         current_move_number = self.__get_current_move_number()
-        if current_move_number == len(self.__moves_opponent):
-            self.__moves_opponent[-1].append((question, answer))
+        if current_move_number != len(self.__opponent_turns):
+            self.__opponent_turns.append(len(self.__opponent))
+        self.__opponent.append(question)
+        self.__opponent.append(answer)
+
+    def copy(self):
+        """Return an independent scoresheet with the same history."""
+        scoresheet = type(self)(self.__color)
+        scoresheet.__last_move_number = self.__last_move_number
+        if self.__decode is not None:
+            # `decode` builds fresh lists on every call, so it can be shared.
+            scoresheet.__decode = self.__decode
+            scoresheet.__summary = self.__summary
         else:
-            self.__moves_opponent.append([(question, answer)])
+            scoresheet.__own = list(self.__own)
+            scoresheet.__own_turns = array("I", self.__own_turns)
+            scoresheet.__opponent = list(self.__opponent)
+            scoresheet.__opponent_turns = array("I", self.__opponent_turns)
+        return scoresheet
 
     def snapshot(self):
         """Return a public, serialization-friendly snapshot of this scoresheet."""
         from kriegspiel.snapshot import ScoresheetSnapshot
 
+        if self.__decode is not None:
+            self.__materialize()
         return ScoresheetSnapshot(
             color=self.__color,
-            moves_own=tuple(tuple(turn) for turn in self.__moves_own),
-            moves_opponent=tuple(tuple(turn) for turn in self.__moves_opponent),
+            moves_own=tuple(map(tuple, _nested_turns(self.__own, self.__own_turns))),
+            moves_opponent=tuple(map(tuple, _nested_turns(self.__opponent, self.__opponent_turns))),
             last_move_number=self.__last_move_number,
         )
 
@@ -860,7 +1142,7 @@ class KriegspielScoresheet:
             raise TypeError("snapshot must be a ScoresheetSnapshot")
 
         scoresheet = cls(snapshot.color)
-        scoresheet.__moves_own = [list(turn) for turn in snapshot.moves_own]
-        scoresheet.__moves_opponent = [list(turn) for turn in snapshot.moves_opponent]
+        scoresheet.__own, scoresheet.__own_turns = _flatten_turns(snapshot.moves_own)
+        scoresheet.__opponent, scoresheet.__opponent_turns = _flatten_turns(snapshot.moves_opponent)
         scoresheet.__last_move_number = snapshot.last_move_number
         return scoresheet
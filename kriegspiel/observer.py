@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""
+Observer hooks of the referee engine.
+
+Register an observer with `KriegspielGame.add_observer`. Hooks run
+synchronously on the thread calling `ask_for`, in this order for one
+question:
+
+    before_question(game, question)
+    move_pushed(game, move)             when the question completes a move
+    before_regeneration(game)           whenever the question list is rebuilt,
+    askable_regenerated(game)           before and after rebuilding it
+    after_question(game, question, answer)
+    game_over(game)                     once, after the question ending the game
+
+`RefereeObserver` implements every hook as a no-op, so subclasses override
+only what they need. Games without observers pay one empty-tuple check per
+hook point.
+"""
+
+
+class RefereeObserver(object):
+    """Base class for `KriegspielGame` observers; every hook does nothing."""
+
+    def before_question(self, game, question):
+        pass
+
+    def after_question(self, game, question, answer):
+        pass
+
+    def move_pushed(self, game, move):
+        pass
+
+    def before_regeneration(self, game):
+        pass
+
+    def askable_regenerated(self, game):
+        pass
+
+    def game_over(self, game):
+        pass
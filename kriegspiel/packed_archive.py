@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memory-mapped packed archives of Kriegspiel games with random access.
+
+An archive is a single file:
+
+    header   struct "<4sBBxxQQ": magic b"KSPA", format version, record
+             encoding (0 binary, 1 compact JSON), game count, index offset
+    records  one encoded game after another
+    index    game count times struct "<QQ": record offset and length
+
+Game `n` is located with one lookup in the index, so fetching it costs a
+constant-time slice of the mapping followed by the decode of that one record.
+Records use the `kriegspiel.binary` encoding or compact schema 10 JSON.
+
+Next to the archive a sidecar index (`<archive>.idx`) stores the ruleset id,
+result and ply count of every game:
+
+    header   struct "<4sBIQI": magic b"KSPI", format version, game count,
+             archive size in bytes, CRC-32 of the archive header and index
+    rulesets byte count, then byte length + ASCII name per ruleset
+    entries  game count times struct "<BBI": ruleset, result and plies
+
+Both files are written under temporary names and moved into place with
+`os.replace` once complete, the archive first, so a failed write never
+leaves a partial archive behind. The size and CRC-32 stamp ties the sidecar
+to its archive; a sidecar left over from an earlier archive is rejected.
+
+`python -m kriegspiel.packed_archive OUTPUT DIRECTORY...` compacts
+directories of `save_game` JSON files into an archive; files that fail to
+load are skipped and reported like in `kriegspiel.bulk`.
+"""
+
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from kriegspiel.archive import ArchiveHeader
+from kriegspiel.archive import game_header
+from kriegspiel.binary import deserialize_snapshot_binary
+from kriegspiel.binary import serialize_game_binary
+from kriegspiel.bulk import BulkReport
+from kriegspiel.bulk import BulkResult
+from kriegspiel.serialization import MalformedDataError
+from kriegspiel.serialization import SerializationError
+from kriegspiel.serialization import UnsupportedVersionError
+from kriegspiel.serialization import deserialize_game_snapshot
+from kriegspiel.serialization import load_game_from_json
+from kriegspiel.serialization import serialize_compact_game
+from kriegspiel.snapshot import KriegspielGameSnapshot
+from kriegspiel.snapshot import RESULT_BLACK_WINS
+from kriegspiel.snapshot import RESULT_DRAW
+from kriegspiel.snapshot import RESULT_UNFINISHED
+from kriegspiel.snapshot import RESULT_WHITE_WINS
+
+PACKED_ARCHIVE_MAGIC = b"KSPA"
+PACKED_INDEX_MAGIC = b"KSPI"
+PACKED_ARCHIVE_VERSION = 1
+
+ENCODING_BINARY = "binary"
+ENCODING_JSON = "json"
+
+_ENCODING_IDS = {ENCODING_BINARY: 0, ENCODING_JSON: 1}
+_ENCODINGS = {value: key for key, value in _ENCODING_IDS.items()}
+_RESULTS = (RESULT_UNFINISHED, RESULT_WHITE_WINS, RESULT_BLACK_WINS, RESULT_DRAW)
+_RESULT_IDS = {result: index for index, result in enumerate(_RESULTS)}
+
+_HEADER = struct.Struct("<4sBBxxQQ")
+_INDEX_ENTRY = struct.Struct("<QQ")
+_SIDECAR_HEADER = struct.Struct("<4sBIQI")
+_SIDECAR_ENTRY = struct.Struct("<BBI")
+
+
+def sidecar_path(path: str) -> str:
+    """Return the path of the sidecar index that belongs to archive `path`."""
+    return path + ".idx"
+
+
+def _encode_game(game, encoding: str, compression: Optional[str]) -> bytes:
+    if encoding == ENCODING_BINARY:
+        return serialize_game_binary(game, compression=compression)
+    return json.dumps(serialize_compact_game(game), separators=(",", ":")).encode("utf-8")
+
+
+def _archive_stamp(header: bytes, index: bytes) -> int:
+    return zlib.crc32(index, zlib.crc32(header))
+
+
+def _write_sidecar(path: str, headers: Sequence[ArchiveHeader], size: int, stamp: int) -> None:
+    rulesets = sorted({header.ruleset_id for header in headers})
+    ruleset_ids = {ruleset: index for index, ruleset in enumerate(rulesets)}
+    out = bytearray(_SIDECAR_HEADER.pack(PACKED_INDEX_MAGIC, PACKED_ARCHIVE_VERSION, len(headers), size, stamp))
+    out.append(len(rulesets))
+    for ruleset in rulesets:
+        encoded = ruleset.encode("ascii")
+        out.append(len(encoded))
+        out += encoded
+    for header in headers:
+        out += _SIDECAR_ENTRY.pack(ruleset_ids[header.ruleset_id], _RESULT_IDS[header.result], header.plies)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_packed_archive(
+    games: Iterable, path: str, encoding: str = ENCODING_BINARY, compression: Optional[str] = None
+) -> int:
+    """
+    Write games to a packed archive plus its sidecar index and return the count.
+
+    Games are encoded and written one at a time; only the offset index and
+    the sidecar entries are held in memory. `compression` applies to the
+    binary encoding only. If writing fails, `path` and its sidecar index are
+    left as they were.
+    """
+    if encoding not in _ENCODING_IDS:
+        raise ValueError(f"Unsupported encoding: {encoding!r}")
+    if compression is not None and encoding != ENCODING_BINARY:
+        raise ValueError(f"Compression is not supported for the {encoding} encoding")
+    entries = []
+    headers = []
+    temporary = path + ".tmp"
+    sidecar_temporary = sidecar_path(path) + ".tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(_HEADER.pack(PACKED_ARCHIVE_MAGIC, PACKED_ARCHIVE_VERSION, _ENCODING_IDS[encoding], 0, 0))
+            offset = _HEADER.size
+            for game in games:
+                record = _encode_game(game, encoding, compression)
+                f.write(record)
+                entries.append((offset, len(record)))
+                headers.append(game_header(game))
+                offset += len(record)
+            index = b"".join(_INDEX_ENTRY.pack(*entry) for entry in entries)
+            f.write(index)
+            header = _HEADER.pack(
+                PACKED_ARCHIVE_MAGIC, PACKED_ARCHIVE_VERSION, _ENCODING_IDS[encoding], len(entries), offset
+            )
+            f.seek(0)
+            f.write(header)
+        _write_sidecar(sidecar_temporary, headers, offset + len(index), _archive_stamp(header, index))
+        os.replace(temporary, path)
+        os.replace(sidecar_temporary, sidecar_path(path))
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to write packed archive {path}") from e
+    finally:
+        for leftover in (temporary, sidecar_temporary):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return len(entries)
+
+
+def _read_sidecar(path: str, count: int, size: int, stamp: int) -> List[ArchiveHeader]:
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        magic, version, sidecar_count, sidecar_size, sidecar_stamp = _SIDECAR_HEADER.unpack_from(data)
+        if magic != PACKED_INDEX_MAGIC:
+            raise MalformedDataError(f"Invalid sidecar index magic in {path}")
+        if version != PACKED_ARCHIVE_VERSION:
+            raise UnsupportedVersionError(f"Unsupported sidecar index version: {version}")
+        if (sidecar_count, sidecar_size, sidecar_stamp) != (count, size, stamp):
+            raise MalformedDataError(f"Sidecar index {path} does not match the archive")
+        position = _SIDECAR_HEADER.size
+        rulesets = []
+        for _ in range(data[position]):
+            length = data[position + 1]
+            rulesets.append(data[position + 2:position + 2 + length].decode("ascii"))
+            position += 1 + length
+        position += 1
+        headers = []
+        for ruleset, result, plies in _SIDECAR_ENTRY.iter_unpack(data[position:]):
+            headers.append(ArchiveHeader(ruleset_id=rulesets[ruleset], result=_RESULTS[result], plies=plies))
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise MalformedDataError(f"Invalid sidecar index {path}") from e
+    if len(headers) != count:
+        raise MalformedDataError(f"Invalid sidecar index {path}")
+    return headers
+
+
+class PackedArchive(object):
+    """
+    Read-only, memory-mapped view of a packed archive.
+
+    Games are addressed by their zero-based position and decoded only when
+    requested. The sidecar index is loaded on first use of `header` or `find`.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._headers = None
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError) as e:
+            raise SerializationError(f"Failed to open packed archive {path}") from e
+        try:
+            self._parse_header()
+        except SerializationError:
+            self._mmap.close()
+            raise
+
+    def _parse_header(self) -> None:
+        if len(self._mmap) < _HEADER.size:
+            raise MalformedDataError(f"Truncated packed archive {self._path}")
+        magic, version, encoding, count, index_offset = _HEADER.unpack_from(self._mmap)
+        if magic != PACKED_ARCHIVE_MAGIC:
+            raise MalformedDataError(f"Invalid packed archive magic in {self._path}")
+        if version != PACKED_ARCHIVE_VERSION:
+            raise UnsupportedVersionError(f"Unsupported packed archive version: {version}")
+        if encoding not in _ENCODINGS:
+            raise MalformedDataError(f"Unsupported packed archive encoding id: {encoding}")
+        if index_offset + count * _INDEX_ENTRY.size != len(self._mmap):
+            raise MalformedDataError(f"Invalid offset index in {self._path}")
+        self._encoding = _ENCODINGS[encoding]
+        self._count = count
+        self._index_offset = index_offset
+
+    @property
+    def encoding(self) -> str:
+        """Record encoding used by this archive, `binary` or `json`."""
+        return self._encoding
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        self._mmap.close()
+
+    def _position(self, game_id: int) -> int:
+        if game_id < 0:
+            game_id += self._count
+        if not 0 <= game_id < self._count:
+            raise IndexError(f"Game id out of range: {game_id}")
+        return game_id
+
+    def record(self, game_id: int) -> bytes:
+        """Return the undecoded bytes of game `game_id`."""
+        offset, length = _INDEX_ENTRY.unpack_from(
+            self._mmap, self._index_offset + self._position(game_id) * _INDEX_ENTRY.size
+        )
+        if offset < _HEADER.size or offset + length > self._index_offset:
+            raise MalformedDataError(f"Invalid offset index entry for game {game_id}")
+        return self._mmap[offset:offset + length]
+
+    def snapshot(self, game_id: int) -> KriegspielGameSnapshot:
+        """Decode game `game_id` into a KriegspielGameSnapshot."""
+        record = self.record(game_id)
+        if self._encoding == ENCODING_BINARY:
+            return deserialize_snapshot_binary(record)
+        try:
+            data = json.loads(record)
+        except ValueError as e:
+            raise MalformedDataError(f"Invalid JSON record for game {game_id}") from e
+        return deserialize_game_snapshot(data)
+
+    def game(self, game_id: int, game_class=None):
+        """Decode game `game_id` into a live game; `game_class` defaults to `KriegspielGame`."""
+        snapshot = self.snapshot(game_id)
+        if game_class is None:
+            # Import here to avoid circular import
+            from kriegspiel.game import KriegspielGame
+
+            game_class = KriegspielGame
+        try:
+            return game_class.from_snapshot(snapshot)
+        except ValueError as e:
+            raise MalformedDataError(str(e)) from e
+
+    def header(self, game_id: int) -> ArchiveHeader:
+        """Return the sidecar header of game `game_id`."""
+        return self._load_headers()[self._position(game_id)]
+
+    def find(
+        self,
+        ruleset: Optional[str] = None,
+        result: Optional[str] = None,
+        min_plies: Optional[int] = None,
+        max_plies: Optional[int] = None,
+    ) -> Iterator[int]:
+        """Yield ids of games whose sidecar header matches every given filter."""
+        for game_id, header in enumerate(self._load_headers()):
+            if ruleset is not None and header.ruleset_id != ruleset:
+                continue
+            if result is not None and header.result != result:
+                continue
+            if min_plies is not None and header.plies < min_plies:
+                continue
+            if max_plies is not None and header.plies > max_plies:
+                continue
+            yield game_id
+
+    def _load_headers(self) -> List[ArchiveHeader]:
+        if self._headers is None:
+            path = sidecar_path(self._path)
+            stamp = _archive_stamp(self._mmap[:_HEADER.size], self._mmap[self._index_offset:])
+            try:
+                self._headers = _read_sidecar(path, self._count, len(self._mmap), stamp)
+            except (IOError, OSError) as e:
+                raise SerializationError(f"Failed to read sidecar index {path}") from e
+        return self._headers
+
+
+def _iter_json_games(directories: Sequence[str], results: List[BulkResult], path: str):
+    for directory in directories:
+        for filename in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            try:
+                game = load_game_from_json(filename)
+            except Exception as e:
+                results.append(BulkResult(filename, error_type=type(e).__name__, error=str(e)))
+                continue
+            results.append(BulkResult(filename, output=path))
+            yield game
+
+
+def compact_directories(
+    directories: Sequence[str], path: str, encoding: str = ENCODING_BINARY, compression: Optional[str] = None
+) -> BulkReport:
+    """
+    Merge the `*.json` game files of `directories` into one packed archive.
+
+    Files are loaded one at a time in sorted order per directory, so game ids
+    follow directory order and then file name order. Files that fail to load
+    are skipped; the report holds one `BulkResult` per file.
+    """
+    start = time.perf_counter()
+    results = []
+    write_packed_archive(
+        _iter_json_games(directories, results, path), path, encoding=encoding, compression=compression
+    )
+    return BulkReport(results=results, seconds=time.perf_counter() - start)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compact saved Kriegspiel JSON games into a packed archive")
+    parser.add_argument("output")
+    parser.add_argument("directories", nargs="+")
+    parser.add_argument("--encoding", choices=sorted(_ENCODING_IDS), default=ENCODING_BINARY)
+    parser.add_argument("--compression", choices=["zlib", "lzma"], default=None)
+    args = parser.parse_args(argv)
+    if args.compression is not None and args.encoding != ENCODING_BINARY:
+        parser.error(f"--compression is not supported for the {args.encoding} encoding")
+
+    report = compact_directories(args.directories, args.output, encoding=args.encoding, compression=args.compression)
+    for failure in report.failures:
+        print(f"error path={failure.path} type={failure.error_type} message={failure.error}")
+    print(f"games={report.files - len(report.failures)}")
+    print(f"failures={len(report.failures)}")
+    print(f"archive_bytes={os.path.getsize(args.output)}")
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+Kriegspiel perft: node counts of the referee question tree.
+
+A node is a game state; its children are the states after asking each of
+its possible questions (`possible_to_ask`), including ASK_ANY and the pawn
+tries and moves that turn out illegal, which keep the same player to move.
+The referee's answer is a function of the hidden board, so every question
+has exactly one answer branch. `kperft(game, depth)` counts the nodes
+exactly `depth` questions below `game`; finished games have no children.
+
+Like chess perft, the counts are a correctness oracle for any change to
+question generation or answering, and counting them is a nodes-per-second
+benchmark of the whole referee. Reference counts from the start position of
+every ruleset:
+
+    ruleset        depth 1  depth 2  depth 3    depth 4     depth 5
+    berkeley            34     1142    38684    1324283    46069933
+    berkeley_any        35     1196    41206    1435297    50774420
+    cincinnati          20      400     9096     214407     5843759
+    crazykrieg          35     1196    41206    1435297    50807842
+    english             35     1196    41206    1435297    50778658
+    rand                20      400     8926     199967     5020091
+    wild16              20      400     9096     214407     5843759
+
+Command line:
+
+    python -m kriegspiel.perft [--ruleset ID ...] [--depth N] [--divide] [--check]
+"""
+
+import argparse
+import time
+from typing import Dict, Optional, Sequence
+
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove
+
+REFERENCE_COUNTS = {
+    "berkeley": (34, 1142, 38684, 1324283, 46069933),
+    "berkeley_any": (35, 1196, 41206, 1435297, 50774420),
+    "cincinnati": (20, 400, 9096, 214407, 5843759),
+    "crazykrieg": (35, 1196, 41206, 1435297, 50807842),
+    "english": (35, 1196, 41206, 1435297, 50778658),
+    "rand": (20, 400, 8926, 199967, 5020091),
+    "wild16": (20, 400, 9096, 214407, 5843759),
+}
+
+
+def kperft(game: KriegspielGame, depth: int) -> int:
+    """Count the question-tree nodes `depth` questions below `game`, which is left unchanged."""
+    if depth < 0:
+        raise ValueError("depth must not be negative")
+    if depth == 0:
+        return 1
+    questions = game._possible_to_ask
+    if depth == 1:
+        return len(questions)
+    nodes = 0
+    for question in tuple(questions):
+        child = game.copy()
+        child.ask_for(question)
+        nodes += kperft(child, depth - 1)
+    return nodes
+
+
+def kperft_divide(game: KriegspielGame, depth: int) -> Dict[KriegspielMove, int]:
+    """Return the `kperft(child, depth - 1)` count of every question of `game`, in question order."""
+    if depth < 1:
+        raise ValueError("depth must be positive")
+    counts = {}
+    for question in sorted(game.possible_to_ask):
+        child = game.copy()
+        child.ask_for(question)
+        counts[question] = kperft(child, depth - 1)
+    return counts
+
+
+def _describe(question: KriegspielMove) -> str:
+    if question.chess_move is None:
+        return question.question_type.name
+    return question.chess_move.uci()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Count the Kriegspiel referee question tree")
+    parser.add_argument("--ruleset", action="append", choices=sorted(REFERENCE_COUNTS), default=None)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--divide", action="store_true", help="print the count below every first question")
+    parser.add_argument("--check", action="store_true", help="compare with the reference counts")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for ruleset in args.ruleset or sorted(REFERENCE_COUNTS):
+        game = KriegspielGame(ruleset=ruleset)
+        start = time.perf_counter()
+        if args.divide:
+            counts = kperft_divide(game, args.depth)
+            for question, count in counts.items():
+                print(f"{_describe(question)} {count}")
+            nodes = sum(counts.values())
+        else:
+            nodes = kperft(game, args.depth)
+        seconds = time.perf_counter() - start
+        print(f"ruleset={ruleset} depth={args.depth} nodes={nodes} seconds={seconds:.3f} "
+              f"nodes_per_second={nodes / seconds:.0f}")
+        if args.check:
+            reference = REFERENCE_COUNTS[ruleset]
+            expected = reference[args.depth - 1] if 1 <= args.depth <= len(reference) else None
+            if expected is None:
+                print(f"unchecked ruleset={ruleset} depth={args.depth}")
+            elif nodes != expected:
+                failures += 1
+                print(f"mismatch ruleset={ruleset} depth={args.depth} expected={expected} nodes={nodes}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+"""
+PGN export and streaming import of Kriegspiel games.
+
+The movetext holds the moves actually played. The referee transcript of each
+turn is stored in the comment of the move that ended it, as a PGN comment
+command:
+
+    1. e4 { [%ks e2e4:regular_move] } 1... d5 { [%ks d7d5:regular_move] }
+    2. exd5 { [%ks any:has_any e4d5:capture_done@d5] }
+    2... Qxd5 { [%ks d8d5:capture_done@d5] } 3. Qh5 { [%ks d1h5:regular_move] }
+    3... Qe4+ { [%ks d5e4:regular_move,check_file] } *
+
+Each entry is `question:answer`, including illegal attempts. Questions are
+UCI moves or `any` for `Any?`; answers are the lower-case main announcement,
+followed by `@square` for captures and comma-separated details: special
+announcements (checks, mates, draws; `check_double=check_rank+check_file`),
+`captured=`, `dropped=`, `promotion`, `en_passant`, `tries=`,
+`pawn_capture=yes|no` and `try_squares=` (`+`-separated squares). Questions of an unfinished turn are
+stored as `[%ksnext ...]` on the last move, or on the game comment before
+the first move.
+
+The headers carry `Result` and a `Ruleset` tag with the ruleset id.
+
+Import reads one game at a time with `chess.pgn.read_game` and replays it
+through `ask_for`: the `[%ks]` questions when present, otherwise each move
+as a plain question, so PGN written by other tools can be imported too.
+Recorded answers are informational; the engine answers every question again.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import chess
+import chess.pgn
+
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielAnswer
+from kriegspiel.move import KriegspielMove
+from kriegspiel.move import QuestionAnnouncement
+from kriegspiel.move import SpecialCaseAnnouncement
+from kriegspiel.rulesets import RULESET_BERKELEY
+from kriegspiel.rulesets import RULESET_CRAZYKRIEG
+from kriegspiel.rulesets import resolve_ruleset_policy
+from kriegspiel.serialization import MalformedDataError
+from kriegspiel.serialization import SerializationError
+from kriegspiel.snapshot import turns_in_ply_order
+
+RULESET_HEADER = "Ruleset"
+
+_TRANSCRIPT = re.compile(r"\[%ks\s+([^\]]*)\]")
+_PENDING_TRANSCRIPT = re.compile(r"\[%ksnext\s+([^\]]*)\]")
+
+
+def format_question(move: KriegspielMove) -> str:
+    """Return the transcript token of a question: its UCI move, or `any`."""
+    if move.question_type == QuestionAnnouncement.ASK_ANY:
+        return "any"
+    return move.chess_move.uci()
+
+
+def format_answer(answer: KriegspielAnswer) -> str:
+    """Return the transcript token of a referee answer."""
+    text = answer.main_announcement.name.lower()
+    if answer.capture_at_square is not None:
+        text += "@" + chess.square_name(answer.capture_at_square)
+    details = []
+    if answer.special_announcement == SpecialCaseAnnouncement.CHECK_DOUBLE:
+        details.append(f"check_double={answer.check_1.name.lower()}+{answer.check_2.name.lower()}")
+    elif answer.special_announcement != SpecialCaseAnnouncement.NONE:
+        details.append(answer.special_announcement.name.lower())
+    if answer.captured_piece_announcement is not None:
+        details.append("captured=" + answer.captured_piece_announcement.name.lower())
+    if answer.dropped_piece_announcement is not None:
+        details.append("dropped=" + answer.dropped_piece_announcement.name.lower())
+    if answer.promotion_announced:
+        details.append("promotion")
+    if answer.en_passant_announced:
+        details.append("en_passant")
+    if answer.next_turn_pawn_tries is not None:
+        details.append(f"tries={answer.next_turn_pawn_tries}")
+    if answer.next_turn_has_pawn_capture is not None:
+        details.append("pawn_capture=" + ("yes" if answer.next_turn_has_pawn_capture else "no"))
+    if answer.next_turn_pawn_try_squares is not None:
+        details.append("try_squares=" + "+".join(map(chess.square_name, answer.next_turn_pawn_try_squares)))
+    return ",".join([text, *details])
+
+
+def _format_turn(turn) -> str:
+    return " ".join(f"{format_question(move)}:{format_answer(answer)}" for move, answer in turn)
+
+
+def game_to_pgn(game, headers: Optional[Dict[str, str]] = None) -> chess.pgn.Game:
+    """
+    Build an annotated `chess.pgn.Game` from a Kriegspiel game.
+
+    `headers` are applied last and override the generated `Event`, `Result`
+    and `Ruleset` tags.
+    """
+    snapshot = game.snapshot()
+    pgn_game = chess.pgn.Game()
+    # Games start from the ruleset's initial position; the live board keeps no history.
+    pgn_game.setup(game._ruleset.new_board())
+    node = pgn_game
+    for move in game._move_stack:
+        node = node.add_variation(move)
+    pgn_game.headers["Event"] = "Kriegspiel"
+    pgn_game.headers["Result"] = game.result
+    pgn_game.headers[RULESET_HEADER] = snapshot.ruleset_id
+    pgn_game.headers.update(headers or {})
+
+    turns = turns_in_ply_order(snapshot.white_scoresheet, snapshot.black_scoresheet)
+    node = pgn_game
+    for turn in turns:
+        if node.next() is None:
+            # Only the last turn can be unfinished.
+            node.comment = " ".join(filter(None, [node.comment, f"[%ksnext {_format_turn(turn)}]"]))
+            break
+        node = node.next()
+        node.comment = f"[%ks {_format_turn(turn)}]"
+    return pgn_game
+
+
+def export_pgn(game, headers: Optional[Dict[str, str]] = None) -> str:
+    """Return the annotated PGN text of a Kriegspiel game."""
+    return str(game_to_pgn(game, headers=headers))
+
+
+def write_pgn(games: Iterable, path: str, append: bool = False) -> int:
+    """Stream games to a multi-game PGN file and return the number written."""
+    count = 0
+    try:
+        with open(path, "a" if append else "w") as f:
+            for game in games:
+                f.write(export_pgn(game) + "\n\n")
+                count += 1
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to write PGN to {path}") from e
+    return count
+
+
+def _parse_question(token: str) -> KriegspielMove:
+    question = token.split(":", 1)[0]
+    if question == "any":
+        return KriegspielMove(QuestionAnnouncement.ASK_ANY)
+    try:
+        return KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci(question))
+    except ValueError as e:
+        raise MalformedDataError(f"Invalid transcript question: {token}") from e
+
+
+def _transcript(pattern, comment: str) -> Optional[List[KriegspielMove]]:
+    match = pattern.search(comment)
+    if match is None:
+        return None
+    return [_parse_question(token) for token in match.group(1).split()]
+
+
+def _default_ruleset(pgn_game: chess.pgn.Game) -> str:
+    if pgn_game.headers.get("Variant", "").lower() == "crazyhouse":
+        return RULESET_CRAZYKRIEG
+    return RULESET_BERKELEY
+
+
+def pgn_to_game(pgn_game: chess.pgn.Game, game_class=None):
+    """
+    Replay a parsed PGN game into a live game.
+
+    Raises `MalformedDataError` when the PGN has parse errors, does not start
+    from the initial position, or its transcript does not produce the
+    recorded moves. `game_class` defaults to `KriegspielGame`; the game is
+    built as that class up front, so the transcript is replayed only once.
+    """
+    if pgn_game.errors:
+        raise MalformedDataError(f"Invalid PGN: {pgn_game.errors[0]}")
+    if game_class is None:
+        game_class = KriegspielGame
+    try:
+        ruleset = resolve_ruleset_policy(ruleset=pgn_game.headers.get(RULESET_HEADER) or _default_ruleset(pgn_game))
+        game = game_class._require_ruleset(game_class._blank(ruleset, ruleset.new_board()))
+    except ValueError as e:
+        raise MalformedDataError(str(e)) from e
+    game._generate_possible_to_ask_list()
+    if pgn_game.board().fen() != game._board.fen():
+        raise MalformedDataError("PGN game does not start from the initial position")
+
+    last = pgn_game
+    for ply, node in enumerate(pgn_game.mainline(), 1):
+        questions = _transcript(_TRANSCRIPT, node.comment) or [
+            KriegspielMove(QuestionAnnouncement.COMMON, node.move)
+        ]
+        for question in questions:
+            game.ask_for(question)
+        move_stack = game._move_stack
+        if len(move_stack) != ply or move_stack[-1] != node.move:
+            raise MalformedDataError(f"Referee transcript does not produce move {ply}: {node.move.uci()}")
+        last = node
+
+    plies = len(game._move_stack)
+    for question in _transcript(_PENDING_TRANSCRIPT, last.comment) or ():
+        game.ask_for(question)
+    if len(game._move_stack) != plies:
+        raise MalformedDataError("Unfinished turn transcript completes a move")
+    return game
+
+
+def iter_pgn(path: str, game_class=None) -> Iterator:
+    """
+    Iterate over the games of a multi-game PGN file.
+
+    Games are parsed and replayed one at a time, so memory does not grow
+    with the size of the file.
+    """
+    try:
+        with open(path, "r") as f:
+            while True:
+                pgn_game = chess.pgn.read_game(f)
+                if pgn_game is None:
+                    return
+                yield pgn_to_game(pgn_game, game_class=game_class)
+    except (IOError, OSError) as e:
+        raise SerializationError(f"Failed to read PGN from {path}") from e
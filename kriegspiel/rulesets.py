@@ -5,7 +5,6 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 import chess
-import chess.variant
 
 from kriegspiel.move import KriegspielAnswer as KSAnswer
 from kriegspiel.move import CapturedPieceAnnouncement as CPA
@@ -22,6 +21,9 @@ RULESET_ENGLISH = "english"
 RULESET_RAND = "rand"
 RULESET_WILD16 = "wild16"
 
+# Shared by every game's askable set, like the COMMON questions in `kriegspiel.game`.
+_ASK_ANY = KSMove(QA.ASK_ANY)
+
 
 @dataclass(frozen=True)
 class BerkeleyRulesetPolicy:
@@ -59,7 +61,7 @@ class BerkeleyRulesetPolicy:
 
     def add_special_questions(self, possibilities: set[KSMove]) -> None:
         if self.allow_ask_any:
-            possibilities.add(KSMove(QA.ASK_ANY))
+            possibilities.add(_ASK_ANY)
 
     def pawn_capture_attempts_for_prompt(self, game) -> set[KSMove]:
         """Return hidden pawn-capture tries that belong in this prompt."""
@@ -96,16 +98,16 @@ class BerkeleyRulesetPolicy:
         if self.release_ask_any_after_failed_pawn_try and game.must_use_pawns and answer.main_announcement == MA.ILLEGAL_MOVE:
             game._must_use_pawns = False
             game._generate_possible_to_ask_list()
-            game._discard_possible_to_ask(KSMove(QA.ASK_ANY))
+            game._discard_possible_to_ask(_ASK_ANY)
             return
         if not self.allow_ask_any:
             return
         if answer.main_announcement == MA.HAS_ANY:
             pawn_captures = set(game._generate_possible_pawn_captures())
-            game._set_possible_to_ask(game._possible_to_ask_set & pawn_captures)
+            game._set_possible_to_ask(game._possible_to_ask & pawn_captures)
         elif answer.main_announcement == MA.NO_ANY:
             pawn_captures = set(game._generate_possible_pawn_captures())
-            game._set_possible_to_ask(game._possible_to_ask_set - pawn_captures)
+            game._set_possible_to_ask(game._possible_to_ask - pawn_captures)
 
     def should_record_opponent_answer(self, move: KSMove, answer: KSAnswer) -> bool:
         if answer.main_announcement == MA.IMPOSSIBLE_TO_ASK:
@@ -254,6 +256,9 @@ def resolve_ruleset_policy(*, ruleset: str | None = None, any_rule: bool | None
             announce_en_passant=False,
         )
     if ruleset == RULESET_CRAZYKRIEG:
+        # Only CrazyKrieg needs the python-chess variant boards; keep them off the import path.
+        from chess.variant import CrazyhouseBoard
+
         return BerkeleyRulesetPolicy(
             identifier=ruleset,
             allow_ask_any=True,
@@ -267,7 +272,7 @@ def resolve_ruleset_policy(*, ruleset: str | None = None, any_rule: bool | None
             announce_next_turn_pawn_try_squares=False,
             release_ask_any_after_failed_pawn_try=True,
             stalemate_loses=False,
-            board_type=chess.variant.CrazyhouseBoard,
+            board_type=CrazyhouseBoard,
             exact_capture_announcements=True,
             announce_drops=True,
             announce_en_passant=False,
@@ -9,7 +9,7 @@ Kriegspiel game components using JSON format with custom encoders/decoders.
 JSON Schema Structure:
 {
   "schema_version": 9,
-  "library_version": "1.7.3",
+  "library_version": "2.0.0",
   "game_type": "BerkeleyGame",
   "game_state": {
     "ruleset_id": "berkeley_any",
@@ -59,16 +59,51 @@ moves_own/moves_opponent: [
     ]
   ]
 ]
+
+Compact Schema 10:
+Written by `serialize_compact_game` (or `save_game(filename, compact=True)`)
+without indentation. Enums are stored as their integer values, moves as
+`pack_chess_move` integers and questions as `pack_kriegspiel_move` integers.
+False flags, null answer fields and the `move_stack` (derived from the
+scoresheets on load) are omitted, as is `possible_to_ask` whenever it equals
+the question set the game regenerates on its own.
+{
+  "schema_version": 10,
+  "library_version": "2.0.0",
+  "game_type": "BerkeleyGame",
+  "game_state": {
+    "ruleset_id": "berkeley_any",
+    "board_fen": str,
+    "any_rule": true,         // only when set
+    "must_use_pawns": true,   // only when set
+    "game_over": true,        // only when set
+    "possible_to_ask": [int], // only when not regenerable
+    "white_scoresheet": {
+      "moves_own": [[[int, answer], ...], ...],
+      "moves_opponent": [[[int, answer], ...], ...],
+      "last_move_number": int
+    },
+    "black_scoresheet": {...}
+  }
+}
+
+A compact answer is the bare main announcement value when nothing else was
+announced, otherwise an object with the keys "m" (main), "s" (special),
+"c" (capture square), "p" (captured piece), "d" (dropped piece),
+"k" ([check_1, check_2]), "pr" / "ep" (promotion / en passant, only when
+true), "t" (pawn tries), "h" (has pawn capture) and "q" (pawn try squares).
 """
 
 import json
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from itertools import zip_longest
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import chess
 
 from kriegspiel.move import (
     QuestionAnnouncement, MainAnnouncement, SpecialCaseAnnouncement, CapturedPieceAnnouncement,
-    KriegspielMove, KriegspielAnswer, KriegspielScoresheet
+    KriegspielMove, KriegspielAnswer, KriegspielScoresheet, _shared_decoded_answer
 )
 from kriegspiel.snapshot import KriegspielGameSnapshot
 from kriegspiel.snapshot import ScoresheetSnapshot
@@ -85,6 +120,17 @@ CINCINNATI_SERIALIZATION_SCHEMA_VERSION = 6
 RAND_SERIALIZATION_SCHEMA_VERSION = 7
 CRAZYKRIEG_SERIALIZATION_SCHEMA_VERSION = 8
 SERIALIZATION_SCHEMA_VERSION = 9
+COMPACT_SERIALIZATION_SCHEMA_VERSION = 10
+
+_QUESTION_ANNOUNCEMENT_VALUES = {item.value: item for item in QuestionAnnouncement}
+_MAIN_ANNOUNCEMENT_VALUES = {item.value: item for item in MainAnnouncement}
+_SPECIAL_CASE_ANNOUNCEMENT_VALUES = {item.value: item for item in SpecialCaseAnnouncement}
+_CAPTURED_PIECE_ANNOUNCEMENT_VALUES = {item.value: item for item in CapturedPieceAnnouncement}
+
+_QUESTION_ANNOUNCEMENT_NAMES = {item.name: item for item in QuestionAnnouncement}
+_MAIN_ANNOUNCEMENT_NAMES = {item.name: item for item in MainAnnouncement}
+_SPECIAL_CASE_ANNOUNCEMENT_NAMES = {item.name: item for item in SpecialCaseAnnouncement}
+_CAPTURED_PIECE_ANNOUNCEMENT_NAMES = {item.name: item for item in CapturedPieceAnnouncement}
 
 
 class SerializationError(Exception):
@@ -128,16 +174,79 @@ def serialize_chess_move(move: Optional[chess.Move]) -> Optional[str]:
     return move.uci() if move is not None else None
 
 
+@lru_cache(maxsize=None)
+def _move_from_uci(uci_str: str) -> chess.Move:
+    # Only valid moves are cached, and there are a few thousand of them.
+    return chess.Move.from_uci(uci_str)
+
+
 def deserialize_chess_move(uci_str: Optional[str]) -> Optional[chess.Move]:
-    """Deserialize UCI notation string to chess.Move."""
+    """
+    Deserialize UCI notation string to chess.Move.
+
+    Moves are interned: equal strings decode to the same `chess.Move` object.
+    """
     if uci_str is None:
         return None
     try:
-        return chess.Move.from_uci(uci_str)
+        return _move_from_uci(uci_str)
     except ValueError as e:
         raise MalformedDataError(f"Invalid UCI move string: {uci_str}") from e
 
 
+def pack_chess_move(move: chess.Move) -> int:
+    """
+    Pack a chess.Move into a single integer.
+
+    Bits 0-5 hold the source square, bits 6-11 the target square, bits 12-14
+    the promotion piece type and bits 15-17 the dropped piece type.
+    """
+    return (
+        move.from_square
+        | (move.to_square << 6)
+        | ((move.promotion or 0) << 12)
+        | ((move.drop or 0) << 15)
+    )
+
+
+def unpack_chess_move(code: int) -> chess.Move:
+    """
+    Unpack an integer produced by `pack_chess_move`.
+
+    Moves are interned: equal codes unpack to the same `chess.Move` object.
+    """
+    if not isinstance(code, int) or isinstance(code, bool) or not (0 <= code < 1 << 18):
+        raise MalformedDataError(f"Invalid packed move: {code}")
+    return _unpack_valid_chess_move(code)
+
+
+@lru_cache(maxsize=None)
+def _unpack_valid_chess_move(code: int) -> chess.Move:
+    promotion = (code >> 12) & 7
+    drop = (code >> 15) & 7
+    if promotion > chess.KING or drop > chess.KING:
+        raise MalformedDataError(f"Invalid packed move: {code}")
+    return chess.Move(code & 63, (code >> 6) & 63, promotion=promotion or None, drop=drop or None)
+
+
+def pack_kriegspiel_move(move: KriegspielMove) -> int:
+    """Pack a KriegspielMove into `pack_chess_move(chess_move) << 2 | question_type`."""
+    move_code = pack_chess_move(move.chess_move) if move.chess_move is not None else 0
+    return (move_code << 2) | move.question_type.value
+
+
+def unpack_kriegspiel_move(code: int) -> KriegspielMove:
+    """Unpack an integer produced by `pack_kriegspiel_move`."""
+    if not isinstance(code, int) or isinstance(code, bool) or code < 0:
+        raise MalformedDataError(f"Invalid packed question: {code}")
+    question_type = deserialize_question_value(code & 3)
+    move_code = code >> 2
+    chess_move = None
+    if question_type == QuestionAnnouncement.COMMON or move_code:
+        chess_move = unpack_chess_move(move_code)
+    return KriegspielMove(question_type, chess_move)
+
+
 def serialize_enum(
     enum_val: Union[
         QuestionAnnouncement,
@@ -152,34 +261,43 @@ def serialize_enum(
 
 def deserialize_question_announcement(name: str) -> QuestionAnnouncement:
     """Deserialize string name to QuestionAnnouncement enum."""
+    return _enum_from_name(_QUESTION_ANNOUNCEMENT_NAMES, QuestionAnnouncement, name)
+
+
+def _enum_from_name(names, enum_type, name):
     try:
-        return QuestionAnnouncement[name]
+        return names[name]
     except KeyError as e:
-        raise MalformedDataError(f"Invalid QuestionAnnouncement: {name}") from e
+        raise MalformedDataError(f"Invalid {enum_type.__name__}: {name}") from e
+
+
+def _enum_from_value(values, enum_type, value):
+    try:
+        if isinstance(value, bool):
+            raise TypeError(value)
+        return values[value]
+    except (KeyError, TypeError) as e:
+        raise MalformedDataError(f"Invalid {enum_type.__name__} code: {value}") from e
+
+
+def deserialize_question_value(value: int) -> QuestionAnnouncement:
+    """Deserialize an integer value to QuestionAnnouncement enum."""
+    return _enum_from_value(_QUESTION_ANNOUNCEMENT_VALUES, QuestionAnnouncement, value)
 
 
 def deserialize_main_announcement(name: str) -> MainAnnouncement:
     """Deserialize string name to MainAnnouncement enum."""
-    try:
-        return MainAnnouncement[name]
-    except KeyError as e:
-        raise MalformedDataError(f"Invalid MainAnnouncement: {name}") from e
+    return _enum_from_name(_MAIN_ANNOUNCEMENT_NAMES, MainAnnouncement, name)
 
 
 def deserialize_special_case_announcement(name: str) -> SpecialCaseAnnouncement:
     """Deserialize string name to SpecialCaseAnnouncement enum."""
-    try:
-        return SpecialCaseAnnouncement[name]
-    except KeyError as e:
-        raise MalformedDataError(f"Invalid SpecialCaseAnnouncement: {name}") from e
+    return _enum_from_name(_SPECIAL_CASE_ANNOUNCEMENT_NAMES, SpecialCaseAnnouncement, name)
 
 
 def deserialize_captured_piece_announcement(name: str) -> CapturedPieceAnnouncement:
     """Deserialize string name to CapturedPieceAnnouncement enum."""
-    try:
-        return CapturedPieceAnnouncement[name]
-    except KeyError as e:
-        raise MalformedDataError(f"Invalid CapturedPieceAnnouncement: {name}") from e
+    return _enum_from_name(_CAPTURED_PIECE_ANNOUNCEMENT_NAMES, CapturedPieceAnnouncement, name)
 
 
 def serialize_kriegspiel_move(move: KriegspielMove) -> Dict[str, Any]:
@@ -242,8 +360,43 @@ def serialize_kriegspiel_answer(answer: KriegspielAnswer) -> Dict[str, Any]:
     return result
 
 
+def _frozen_value(value):
+    if isinstance(value, list):
+        return list, tuple(_frozen_value(item) for item in value)
+    return type(value), value
+
+
+def _answer_cache_key(data):
+    if not isinstance(data, dict):
+        return _frozen_value(data)
+    types = tuple(map(type, data.values()))
+    if list in types:
+        return tuple((name, _frozen_value(value)) for name, value in data.items())
+    return tuple(data.items()), types
+
+
+def _interned_answer(encoding, decode, data):
+    """
+    Decode `data` with `decode`, sharing the result with equal earlier payloads.
+
+    Answers go through the process-wide table of `kriegspiel.move`, so decoded
+    games share them with live ones. Keys carry the encoding and the type of
+    every value so that, say, `1` and `True` never share an entry; payloads
+    that cannot be hashed are decoded uncached.
+    """
+    return _shared_decoded_answer((encoding, _answer_cache_key(data)), decode, data)
+
+
 def deserialize_kriegspiel_answer(data: Dict[str, Any]) -> KriegspielAnswer:
-    """Deserialize dictionary to KriegspielAnswer."""
+    """
+    Deserialize dictionary to KriegspielAnswer.
+
+    Answers are interned: equal payloads decode to the same immutable object.
+    """
+    return _interned_answer("json", _decode_kriegspiel_answer, data)
+
+
+def _decode_kriegspiel_answer(data: Dict[str, Any]) -> KriegspielAnswer:
     try:
         main_announcement = deserialize_main_announcement(data["main_announcement"])
         
@@ -287,9 +440,8 @@ def deserialize_kriegspiel_answer(data: Dict[str, Any]) -> KriegspielAnswer:
         raise MalformedDataError(f"Invalid KriegspielAnswer data: {data}") from e
 
 
-def serialize_kriegspiel_scoresheet(scoresheet: KriegspielScoresheet) -> Dict[str, Any]:
-    """Serialize KriegspielScoresheet to dictionary."""
-    snapshot = scoresheet.snapshot()
+def serialize_scoresheet_snapshot(snapshot: ScoresheetSnapshot) -> Dict[str, Any]:
+    """Serialize a ScoresheetSnapshot to dictionary."""
     return {
         "color": "WHITE" if snapshot.color == chess.WHITE else "BLACK",
         "moves_own": [
@@ -306,11 +458,16 @@ def serialize_kriegspiel_scoresheet(scoresheet: KriegspielScoresheet) -> Dict[st
     }
 
 
-def deserialize_kriegspiel_scoresheet(data: Dict[str, Any]) -> KriegspielScoresheet:
-    """Deserialize dictionary to KriegspielScoresheet."""
+def serialize_kriegspiel_scoresheet(scoresheet: KriegspielScoresheet) -> Dict[str, Any]:
+    """Serialize KriegspielScoresheet to dictionary."""
+    return serialize_scoresheet_snapshot(scoresheet.snapshot())
+
+
+def deserialize_scoresheet_snapshot(data: Dict[str, Any]) -> ScoresheetSnapshot:
+    """Deserialize dictionary directly to a ScoresheetSnapshot."""
     try:
         color = chess.WHITE if data["color"] == "WHITE" else chess.BLACK
-        snapshot = ScoresheetSnapshot(
+        return ScoresheetSnapshot(
             color=color,
             moves_own=tuple(
                 tuple(
@@ -328,7 +485,131 @@ def deserialize_kriegspiel_scoresheet(data: Dict[str, Any]) -> KriegspielScoresh
             ),
             last_move_number=data["last_move_number"],
         )
-        return KriegspielScoresheet.from_snapshot(snapshot)
+    except (KeyError, TypeError, ValueError) as e:
+        raise MalformedDataError("Invalid KriegspielScoresheet data") from e
+
+
+def deserialize_kriegspiel_scoresheet(data: Dict[str, Any]) -> KriegspielScoresheet:
+    """Deserialize dictionary to KriegspielScoresheet."""
+    return KriegspielScoresheet.from_snapshot(deserialize_scoresheet_snapshot(data))
+
+
+def serialize_compact_answer(answer: KriegspielAnswer) -> Union[int, Dict[str, Any]]:
+    """Serialize KriegspielAnswer to a schema 10 integer or short-key dictionary."""
+    result = {}
+    if answer.special_announcement != SpecialCaseAnnouncement.NONE:
+        result["s"] = answer.special_announcement.value
+    if answer.capture_at_square is not None:
+        result["c"] = answer.capture_at_square
+    if answer.captured_piece_announcement is not None:
+        result["p"] = answer.captured_piece_announcement.value
+    if answer.dropped_piece_announcement is not None:
+        result["d"] = answer.dropped_piece_announcement.value
+    if answer.check_1 is not None and answer.check_2 is not None:
+        result["k"] = [answer.check_1.value, answer.check_2.value]
+    if answer.promotion_announced:
+        result["pr"] = 1
+    if answer.en_passant_announced:
+        result["ep"] = 1
+    if answer.next_turn_pawn_tries is not None:
+        result["t"] = answer.next_turn_pawn_tries
+    if answer.next_turn_has_pawn_capture is not None:
+        result["h"] = int(answer.next_turn_has_pawn_capture)
+    if answer.next_turn_pawn_try_squares is not None:
+        result["q"] = list(answer.next_turn_pawn_try_squares)
+    if not result:
+        return answer.main_announcement.value
+    result["m"] = answer.main_announcement.value
+    return result
+
+
+def deserialize_compact_answer(data: Union[int, Dict[str, Any]]) -> KriegspielAnswer:
+    """
+    Deserialize a schema 10 answer to KriegspielAnswer.
+
+    Answers are interned like in `deserialize_kriegspiel_answer`.
+    """
+    return _interned_answer("compact", _decode_compact_answer, data)
+
+
+def _decode_compact_answer(data: Union[int, Dict[str, Any]]) -> KriegspielAnswer:
+    if not isinstance(data, dict):
+        return KriegspielAnswer(_enum_from_value(_MAIN_ANNOUNCEMENT_VALUES, MainAnnouncement, data))
+    try:
+        main_announcement = _enum_from_value(_MAIN_ANNOUNCEMENT_VALUES, MainAnnouncement, data["m"])
+        kwargs = {}
+        if "c" in data:
+            kwargs["capture_at_square"] = data["c"]
+        if "p" in data:
+            kwargs["captured_piece_announcement"] = _enum_from_value(
+                _CAPTURED_PIECE_ANNOUNCEMENT_VALUES, CapturedPieceAnnouncement, data["p"]
+            )
+        if "d" in data:
+            kwargs["dropped_piece_announcement"] = _enum_from_value(
+                _CAPTURED_PIECE_ANNOUNCEMENT_VALUES, CapturedPieceAnnouncement, data["d"]
+            )
+        if "pr" in data:
+            kwargs["promotion_announced"] = bool(data["pr"])
+        if "ep" in data:
+            kwargs["en_passant_announced"] = bool(data["ep"])
+        if "t" in data:
+            kwargs["next_turn_pawn_tries"] = data["t"]
+        if "h" in data:
+            kwargs["next_turn_has_pawn_capture"] = bool(data["h"])
+        if "q" in data:
+            kwargs["next_turn_pawn_try_squares"] = data["q"]
+        if "s" in data:
+            special_announcement = _enum_from_value(
+                _SPECIAL_CASE_ANNOUNCEMENT_VALUES, SpecialCaseAnnouncement, data["s"]
+            )
+            if "k" in data:
+                check_1, check_2 = (
+                    _enum_from_value(_SPECIAL_CASE_ANNOUNCEMENT_VALUES, SpecialCaseAnnouncement, value)
+                    for value in data["k"]
+                )
+                special_announcement = (special_announcement, [check_1, check_2])
+            kwargs["special_announcement"] = special_announcement
+        return KriegspielAnswer(main_announcement, **kwargs)
+    except (KeyError, TypeError, ValueError) as e:
+        raise MalformedDataError(f"Invalid KriegspielAnswer data: {data}") from e
+
+
+def serialize_compact_scoresheet(snapshot: ScoresheetSnapshot) -> Dict[str, Any]:
+    """Serialize a ScoresheetSnapshot to a schema 10 dictionary; the color is implied by its key."""
+    return {
+        "moves_own": [
+            [[pack_kriegspiel_move(move), serialize_compact_answer(answer)] for move, answer in move_set]
+            for move_set in snapshot.moves_own
+        ],
+        "moves_opponent": [
+            [[question.value, serialize_compact_answer(answer)] for question, answer in move_set]
+            for move_set in snapshot.moves_opponent
+        ],
+        "last_move_number": snapshot.last_move_number,
+    }
+
+
+def deserialize_compact_scoresheet(data: Dict[str, Any], color: chess.Color) -> ScoresheetSnapshot:
+    """Deserialize a schema 10 scoresheet dictionary to a ScoresheetSnapshot."""
+    try:
+        return ScoresheetSnapshot(
+            color=color,
+            moves_own=tuple(
+                tuple(
+                    (unpack_kriegspiel_move(code), deserialize_compact_answer(answer_data))
+                    for code, answer_data in move_set
+                )
+                for move_set in data["moves_own"]
+            ),
+            moves_opponent=tuple(
+                tuple(
+                    (deserialize_question_value(value), deserialize_compact_answer(answer_data))
+                    for value, answer_data in move_set
+                )
+                for move_set in data["moves_opponent"]
+            ),
+            last_move_number=data["last_move_number"],
+        )
     except (KeyError, TypeError, ValueError) as e:
         raise MalformedDataError("Invalid KriegspielScoresheet data") from e
 
@@ -348,20 +629,72 @@ def serialize_berkeley_game(game) -> Dict[str, Any]:
             "must_use_pawns": snapshot.must_use_pawns,
             "game_over": snapshot.game_over,
             "possible_to_ask": serialize_possible_to_ask(list(snapshot.possible_to_ask or ())),
-            "white_scoresheet": serialize_kriegspiel_scoresheet(
-                KriegspielScoresheet.from_snapshot(snapshot.white_scoresheet)
-            ),
-            "black_scoresheet": serialize_kriegspiel_scoresheet(
-                KriegspielScoresheet.from_snapshot(snapshot.black_scoresheet)
-            ),
+            "white_scoresheet": serialize_scoresheet_snapshot(snapshot.white_scoresheet),
+            "black_scoresheet": serialize_scoresheet_snapshot(snapshot.black_scoresheet),
         }
     }
 
 
-def deserialize_berkeley_game(data: Dict[str, Any]):
-    """Deserialize dictionary to a shared KriegspielGame instance."""
+def serialize_compact_game(game) -> Dict[str, Any]:
+    """
+    Serialize a shared Kriegspiel game to a compact schema 10 dictionary.
+
+    `possible_to_ask` is only written when the current turn has already
+    narrowed it, e.g. after illegal tries; otherwise the loader regenerates it.
+    """
+    snapshot = game.snapshot()
+    game_state = {
+        "ruleset_id": snapshot.ruleset_id,
+        "board_fen": snapshot.board_fen,
+    }
+    if snapshot.any_rule:
+        game_state["any_rule"] = True
+    if snapshot.must_use_pawns:
+        game_state["must_use_pawns"] = True
+    if snapshot.game_over:
+        game_state["game_over"] = True
+    if game._possible_to_ask != game._regenerated_possible_to_ask():
+        game_state["possible_to_ask"] = sorted(pack_kriegspiel_move(move) for move in snapshot.possible_to_ask)
+    game_state["white_scoresheet"] = serialize_compact_scoresheet(snapshot.white_scoresheet)
+    game_state["black_scoresheet"] = serialize_compact_scoresheet(snapshot.black_scoresheet)
+    return {
+        "schema_version": COMPACT_SERIALIZATION_SCHEMA_VERSION,
+        "library_version": __version__,
+        "game_type": "BerkeleyGame",
+        "game_state": game_state,
+    }
+
+
+def _compact_game_state_fields(game_state: Dict[str, Any]) -> Dict[str, Any]:
+    possible_to_ask = game_state.get("possible_to_ask")
+    if possible_to_ask is not None:
+        if not isinstance(possible_to_ask, list):
+            raise MalformedDataError("Invalid possible_to_ask: expected a list of packed questions")
+        possible_to_ask = tuple(unpack_kriegspiel_move(code) for code in possible_to_ask)
+    return {
+        "ruleset_id": game_state["ruleset_id"],
+        "any_rule": bool(game_state.get("any_rule", False)),
+        "board_fen": game_state["board_fen"],
+        "move_stack": None,
+        "must_use_pawns": bool(game_state.get("must_use_pawns", False)),
+        "game_over": bool(game_state.get("game_over", False)),
+        "possible_to_ask": possible_to_ask,
+        "white_scoresheet": game_state["white_scoresheet"],
+        "black_scoresheet": game_state["black_scoresheet"],
+    }
+
+
+def _game_state_fields(data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """
+    Validate the envelope and game state fields of a serialized game.
+
+    Returns the schema version and the snapshot fields, with both scoresheets
+    still in their serialized form. `move_stack` is None for schema 10, where
+    it is derived from the scoresheets.
+    """
     try:
-        # Check schema compatibility. Live data uses schema 3+; new writes use schema 8.
+        # Check schema compatibility. Live data uses schema 3+; new writes use
+        # schema 9, or schema 10 when written compact.
         schema_version = data.get("schema_version")
         if schema_version is None:
             raise UnsupportedVersionError("Missing schema_version")
@@ -373,6 +706,7 @@ def deserialize_berkeley_game(data: Dict[str, Any]):
             RAND_SERIALIZATION_SCHEMA_VERSION,
             CRAZYKRIEG_SERIALIZATION_SCHEMA_VERSION,
             SERIALIZATION_SCHEMA_VERSION,
+            COMPACT_SERIALIZATION_SCHEMA_VERSION,
         }:
             raise UnsupportedVersionError(f"Unsupported schema_version: {schema_version}")
 
@@ -382,6 +716,8 @@ def deserialize_berkeley_game(data: Dict[str, Any]):
             raise MalformedDataError(f"Invalid game type: {game_type}. Expected: BerkeleyGame")
 
         game_state = data["game_state"]
+        if schema_version == COMPACT_SERIALIZATION_SCHEMA_VERSION:
+            return schema_version, _compact_game_state_fields(game_state)
 
         if "move_stack" not in game_state:
             raise MalformedDataError("Missing move_stack in BerkeleyGame data")
@@ -401,28 +737,164 @@ def deserialize_berkeley_game(data: Dict[str, Any]):
             raise MalformedDataError("Missing possible_to_ask in BerkeleyGame data")
         possible_to_ask = tuple(deserialize_possible_to_ask(game_state["possible_to_ask"]))
 
-        snapshot = KriegspielGameSnapshot(
-            ruleset_id=ruleset_id,
-            any_rule=any_rule,
-            board_fen=game_state["board_fen"],
-            move_stack=tuple(move_stack),
-            must_use_pawns=game_state["must_use_pawns"],
-            game_over=game_state["game_over"],
-            possible_to_ask=possible_to_ask,
-            white_scoresheet=deserialize_kriegspiel_scoresheet(game_state["white_scoresheet"]).snapshot(),
-            black_scoresheet=deserialize_kriegspiel_scoresheet(game_state["black_scoresheet"]).snapshot(),
-        )
+        return schema_version, {
+            "ruleset_id": ruleset_id,
+            "any_rule": any_rule,
+            "board_fen": game_state["board_fen"],
+            "move_stack": tuple(move_stack),
+            "must_use_pawns": game_state["must_use_pawns"],
+            "game_over": game_state["game_over"],
+            "possible_to_ask": possible_to_ask,
+            "white_scoresheet": game_state["white_scoresheet"],
+            "black_scoresheet": game_state["black_scoresheet"],
+        }
+    except SerializationError:
+        raise
+    except (KeyError, TypeError) as e:
+        raise MalformedDataError("Invalid BerkeleyGame data structure") from e
+
+
+def deserialize_game_snapshot(data: Dict[str, Any]) -> KriegspielGameSnapshot:
+    """Deserialize dictionary to a KriegspielGameSnapshot without rebuilding a game."""
+    schema_version, fields = _game_state_fields(data)
+    if schema_version == COMPACT_SERIALIZATION_SCHEMA_VERSION:
+        fields["white_scoresheet"] = deserialize_compact_scoresheet(fields["white_scoresheet"], chess.WHITE)
+        fields["black_scoresheet"] = deserialize_compact_scoresheet(fields["black_scoresheet"], chess.BLACK)
+        try:
+            fields["move_stack"] = move_stack_from_scoresheets(fields["white_scoresheet"], fields["black_scoresheet"])
+        except ValueError as e:
+            raise MalformedDataError(str(e)) from e
+    else:
+        fields["white_scoresheet"] = deserialize_scoresheet_snapshot(fields["white_scoresheet"])
+        fields["black_scoresheet"] = deserialize_scoresheet_snapshot(fields["black_scoresheet"])
+    return KriegspielGameSnapshot(**fields)
+
+
+def _scan_own_turns(moves_own, compact: bool):
+    """
+    Summarize serialized own turns without decoding them.
+
+    Returns the UCI moves completed in each turn, the capture counts and the
+    serialized last answer.
+    """
+    completed_per_turn = []
+    captures = 0
+    pawn_captures = 0
+    last_answer = None
+    for turn in moves_own:
+        completed = []
+        for question, answer in turn:
+            if compact:
+                main = answer["m"] if isinstance(answer, dict) else answer
+                captured = answer.get("p") if isinstance(answer, dict) else None
+                is_common = question & 3 == QuestionAnnouncement.COMMON.value
+                capture = main == MainAnnouncement.CAPTURE_DONE.value
+                pawn = captured == CapturedPieceAnnouncement.PAWN.value
+                done = main in (MainAnnouncement.REGULAR_MOVE.value, MainAnnouncement.CAPTURE_DONE.value)
+            else:
+                main = answer["main_announcement"]
+                is_common = question["question_type"] == QuestionAnnouncement.COMMON.name
+                capture = main == MainAnnouncement.CAPTURE_DONE.name
+                pawn = answer.get("captured_piece_announcement") == CapturedPieceAnnouncement.PAWN.name
+                done = main in (MainAnnouncement.REGULAR_MOVE.name, MainAnnouncement.CAPTURE_DONE.name)
+            if capture:
+                captures += 1
+                if pawn:
+                    pawn_captures += 1
+            if is_common and done:
+                uci = unpack_chess_move(question >> 2).uci() if compact else question["chess_move"]
+                if uci is None:
+                    raise MalformedDataError("Scoresheet move is missing chess_move")
+                completed.append(uci)
+            last_answer = answer
+        if len(completed) > 1:
+            raise MalformedDataError("Scoresheet turn contains multiple completed moves")
+        completed_per_turn.append(completed)
+    return completed_per_turn, (captures, pawn_captures), last_answer
+
+
+def _lazy_scoresheet(data: Dict[str, Any], color: chess.Color, compact: bool):
+    """Build a lazily decoded KriegspielScoresheet and the UCI moves completed per turn."""
+    try:
+        if not compact:
+            color = chess.WHITE if data["color"] == "WHITE" else chess.BLACK
+        moves_own = data["moves_own"]
+        if not isinstance(data["moves_opponent"], list):
+            raise TypeError("moves_opponent must be a list")
+        completed_per_turn, capture_counts, last_answer = _scan_own_turns(moves_own, compact)
+        if last_answer is not None:
+            decode_answer = deserialize_compact_answer if compact else deserialize_kriegspiel_answer
+            last_answer = decode_answer(last_answer)
+        last_move_number = data["last_move_number"]
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise MalformedDataError("Invalid KriegspielScoresheet data") from e
 
+    def decode():
+        if compact:
+            snapshot = deserialize_compact_scoresheet(data, color)
+        else:
+            snapshot = deserialize_scoresheet_snapshot(data)
+        return [list(turn) for turn in snapshot.moves_own], [list(turn) for turn in snapshot.moves_opponent]
+
+    scoresheet = KriegspielScoresheet._lazy(color, last_move_number, decode, capture_counts, last_answer)
+    return scoresheet, completed_per_turn
+
+
+def _interleave_turns(white_turns, black_turns) -> Tuple[str, ...]:
+    move_stack = []
+    for white_moves, black_moves in zip_longest(white_turns, black_turns, fillvalue=()):
+        move_stack.extend(white_moves)
+        move_stack.extend(black_moves)
+    return tuple(move_stack)
+
+
+def _deserialize_lazy_game(data: Dict[str, Any], game_class):
+    schema_version, fields = _game_state_fields(data)
+    compact = schema_version == COMPACT_SERIALIZATION_SCHEMA_VERSION
+    whites_scoresheet, white_turns = _lazy_scoresheet(fields["white_scoresheet"], chess.WHITE, compact)
+    blacks_scoresheet, black_turns = _lazy_scoresheet(fields["black_scoresheet"], chess.BLACK, compact)
+    derived_move_stack = _interleave_turns(white_turns, black_turns)
+    return game_class._restore(
+        ruleset_id=fields["ruleset_id"],
+        board_fen=fields["board_fen"],
+        move_stack=derived_move_stack if compact else fields["move_stack"],
+        must_use_pawns=fields["must_use_pawns"],
+        game_over=fields["game_over"],
+        possible_to_ask=fields["possible_to_ask"],
+        derive_move_stack=lambda: derived_move_stack,
+        whites_scoresheet=whites_scoresheet,
+        blacks_scoresheet=blacks_scoresheet,
+    )
+
+
+def deserialize_berkeley_game(data: Dict[str, Any], game_class=None, lazy: bool = False):
+    """
+    Deserialize dictionary to a live game instance.
+
+    The payload is decoded straight into a snapshot and handed to
+    `game_class.from_snapshot`, so the move stack is replayed exactly once.
+    `game_class` defaults to `KriegspielGame`.
+
+    With `lazy=True` the scoresheets are only scanned for their completed
+    moves, capture counts and last answers; their turns are decoded on first
+    access. Malformed turns the scan does not look at then surface as
+    `MalformedDataError` at that point instead of during loading.
+
+    A game whose ruleset differs from `game_class.RULESET` raises `ValueError`.
+    """
+    if game_class is None:
         # Import here to avoid circular import
         from kriegspiel.game import KriegspielGame
 
-        return KriegspielGame.from_snapshot(snapshot)
-    except UnsupportedVersionError:
-        raise
+        game_class = KriegspielGame
+    try:
+        if lazy:
+            game = _deserialize_lazy_game(data, game_class)
+        else:
+            game = game_class._from_snapshot(deserialize_game_snapshot(data))
     except ValueError as e:
         raise MalformedDataError(str(e)) from e
-    except (KeyError, TypeError) as e:
-        raise MalformedDataError("Invalid BerkeleyGame data structure") from e
+    return game_class._require_ruleset(game)
 
 
 def _completed_moves_from_turn(turn):
@@ -433,22 +905,36 @@ def _completed_moves_from_turn(turn):
         raise MalformedDataError(str(e)) from e
 
 
-def save_game_to_json(game, filename: str) -> None:
-    """Save a shared Kriegspiel game to a JSON file."""
+def save_game_to_json(game, filename: str, compact: bool = False) -> None:
+    """
+    Save a shared Kriegspiel game to a JSON file.
+
+    With `compact=True` the game is written as an unindented schema 10 document.
+    """
     try:
-        data = serialize_berkeley_game(game)
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2, cls=KriegspielJSONEncoder)
+        if compact:
+            data = serialize_compact_game(game)
+            with open(filename, 'w') as f:
+                json.dump(data, f, separators=(",", ":"))
+        else:
+            data = serialize_berkeley_game(game)
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2, cls=KriegspielJSONEncoder)
     except (IOError, OSError) as e:
         raise SerializationError(f"Failed to save game to {filename}") from e
 
 
-def load_game_from_json(filename: str):
-    """Load a shared Kriegspiel game from JSON file."""
+def load_game_from_json(filename: str, game_class=None, lazy: bool = False):
+    """
+    Load a shared Kriegspiel game from JSON file.
+
+    With `lazy=True` scoresheet turns are decoded on first access; see
+    `deserialize_berkeley_game`.
+    """
     try:
         with open(filename, 'r') as f:
             data = json.load(f)
-        return deserialize_berkeley_game(data)
+        return deserialize_berkeley_game(data, game_class=game_class, lazy=lazy)
     except (IOError, OSError) as e:
         raise SerializationError(f"Failed to load game from {filename}") from e
     except json.JSONDecodeError as e:
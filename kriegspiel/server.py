@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+"""
+asyncio hosting of many concurrent referee games.
+
+`SessionManager` owns games keyed by id. Questions to one game are answered
+strictly in arrival order behind a per-game `asyncio.Lock`, while the event
+loop interleaves different games: every `ask` yields to the loop before it
+runs, so a client flooding one game cannot starve the others. Admission
+control caps the number of hosted games (`max_games`) and the number of
+questions waiting on one game (`max_pending`); both are reported to callers
+as `SessionError` subclasses instead of growing queues without bound.
+
+A small newline-delimited JSON TCP front end is included for local load
+testing. Every request line is a JSON object; an optional `id` is echoed in
+the response, which may arrive out of order:
+
+    {"id": 1, "op": "create", "ruleset": "berkeley"}
+        -> {"id": 1, "ok": true, "game": "<game id>"}
+    {"id": 2, "op": "questions", "game": "<game id>"}
+        -> {"id": 2, "ok": true, "questions": [<packed questions>]}
+    {"id": 3, "op": "ask", "game": "<game id>", "question": <packed question>}
+        -> {"id": 3, "ok": true, "answer": <compact answer>}
+    {"id": 4, "op": "close", "game": "<game id>"}
+    {"id": 5, "op": "stats"}
+
+Questions are `pack_kriegspiel_move` codes and answers use the compact
+schema 10 encoding. Failures are reported as
+`{"ok": false, "error": "<exception type>", "message": "..."}`; unexpected
+exceptions are also logged. Each connection runs at most `max_in_flight`
+requests at a time and stops reading until one of them is answered.
+
+Command line:
+
+    python -m kriegspiel.server [--host HOST] [--port PORT] [--max-games N] [--max-pending N]
+                                [--max-in-flight N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, Optional, Sequence
+
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielAnswer
+from kriegspiel.move import KriegspielMove
+from kriegspiel.rulesets import RULESET_BERKELEY
+from kriegspiel.serialization import SerializationError
+from kriegspiel.serialization import pack_kriegspiel_move
+from kriegspiel.serialization import serialize_compact_answer
+from kriegspiel.serialization import unpack_kriegspiel_move
+
+DEFAULT_MAX_GAMES = 10000
+DEFAULT_MAX_PENDING = 8
+DEFAULT_LATENCY_SAMPLES = 100000
+DEFAULT_MAX_IN_FLIGHT = 64
+
+_logger = logging.getLogger(__name__)
+
+
+class SessionError(Exception):
+    """Base exception for session manager errors."""
+    pass
+
+
+class UnknownGameError(SessionError):
+    """Raised when a game id is not hosted by the manager."""
+    pass
+
+
+class AdmissionError(SessionError):
+    """Raised when a new game would exceed `max_games`."""
+    pass
+
+
+class QueueFullError(SessionError):
+    """Raised when a game already has `max_pending` questions waiting."""
+    pass
+
+
+class _Session(object):
+    __slots__ = ("game", "lock", "pending")
+
+    def __init__(self, game):
+        self.game = game
+        # Created on first use so the lock binds to the loop that asks.
+        self.lock = None
+        self.pending = 0
+
+
+class SessionManager(object):
+    """
+    Host many referee games in one event loop.
+
+    Must be used from a single event loop. Latency samples cover the time
+    from the `ask` call to its answer, queueing included, for the most recent
+    `latency_samples` questions.
+    """
+
+    def __init__(
+        self,
+        max_games: int = DEFAULT_MAX_GAMES,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        latency_samples: int = DEFAULT_LATENCY_SAMPLES,
+    ):
+        if max_games < 1 or max_pending < 1 or latency_samples < 1:
+            raise ValueError("max_games, max_pending and latency_samples must be positive")
+        self._max_games = max_games
+        self._max_pending = max_pending
+        self._sessions: Dict[str, _Session] = {}
+        self._latencies = deque(maxlen=latency_samples)
+        self._asks = 0
+        self._rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, game_id) -> bool:
+        return game_id in self._sessions
+
+    def create_game(self, ruleset: str = RULESET_BERKELEY, game_id: Optional[str] = None) -> str:
+        """Start hosting a new game and return its id."""
+        if len(self._sessions) >= self._max_games:
+            self._rejected += 1
+            raise AdmissionError(f"Game limit of {self._max_games} reached")
+        if game_id is None:
+            game_id = uuid.uuid4().hex
+        elif game_id in self._sessions:
+            raise ValueError(f"Game id already in use: {game_id}")
+        self._sessions[game_id] = _Session(KriegspielGame(ruleset=ruleset))
+        return game_id
+
+    def close_game(self, game_id: str) -> None:
+        """Stop hosting a game. Questions already queued on it are still answered."""
+        self._session(game_id)
+        del self._sessions[game_id]
+
+    def game(self, game_id: str) -> KriegspielGame:
+        """Return the hosted game for read-only use; ask questions through `ask`."""
+        return self._session(game_id).game
+
+    def _session(self, game_id: str) -> _Session:
+        try:
+            return self._sessions[game_id]
+        except KeyError:
+            raise UnknownGameError(f"Unknown game: {game_id}") from None
+
+    async def ask(self, game_id: str, question: KriegspielMove) -> KriegspielAnswer:
+        """Ask `question` on a hosted game once the questions queued before it are answered."""
+        start = time.perf_counter()
+        session = self._session(game_id)
+        if session.pending >= self._max_pending:
+            self._rejected += 1
+            raise QueueFullError(f"Game {game_id} already has {self._max_pending} pending questions")
+        if session.lock is None:
+            session.lock = asyncio.Lock()
+        session.pending += 1
+        try:
+            async with session.lock:
+                # Let other games run before spending CPU on this one.
+                await asyncio.sleep(0)
+                answer = session.game.ask_for(question)
+        finally:
+            session.pending -= 1
+        self._asks += 1
+        self._latencies.append(time.perf_counter() - start)
+        return answer
+
+    def latency_percentiles(self, percentiles: Sequence[float] = (50, 90, 99)) -> Dict[float, float]:
+        """Return nearest-rank ask latency percentiles in seconds; empty before the first answer."""
+        samples = sorted(self._latencies)
+        if not samples:
+            return {}
+        return {
+            percentile: samples[max(0, math.ceil(percentile / 100 * len(samples)) - 1)]
+            for percentile in percentiles
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters and p50/p90/p99 ask latency in milliseconds."""
+        stats = {"games": len(self._sessions), "asks": self._asks, "rejected": self._rejected}
+        for percentile, seconds in self.latency_percentiles().items():
+            stats[f"p{percentile}_ms"] = round(seconds * 1000, 3)
+        return stats
+
+
+async def _dispatch(manager: SessionManager, request: Dict[str, Any]) -> Dict[str, Any]:
+    op = request.get("op")
+    if op == "create":
+        return {"game": manager.create_game(ruleset=request.get("ruleset", RULESET_BERKELEY))}
+    if op == "questions":
+        game = manager.game(request["game"])
+        return {"questions": sorted(pack_kriegspiel_move(move) for move in game.possible_to_ask)}
+    if op == "ask":
+        question = unpack_kriegspiel_move(request["question"])
+        return {"answer": serialize_compact_answer(await manager.ask(request["game"], question))}
+    if op == "close":
+        manager.close_game(request["game"])
+        return {}
+    if op == "stats":
+        return {"stats": manager.stats()}
+    raise ValueError(f"Unknown op: {op!r}")
+
+
+async def _respond(manager: SessionManager, line: bytes, writer: asyncio.StreamWriter) -> None:
+    request_id = None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        request_id = request.get("id")
+        response = {"ok": True, **await _dispatch(manager, request)}
+    except (KeyError, TypeError, ValueError, SessionError, SerializationError) as e:
+        # json.JSONDecodeError is a ValueError.
+        response = {"ok": False, "error": type(e).__name__, "message": str(e)}
+    except Exception as e:
+        _logger.exception("Request %r failed", line)
+        response = {"ok": False, "error": type(e).__name__, "message": str(e)}
+    if request_id is not None:
+        response["id"] = request_id
+    writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+
+
+async def handle_connection(
+    manager: SessionManager,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> None:
+    """
+    Serve newline-delimited JSON requests from one client until it disconnects.
+
+    At most `max_in_flight` requests run at a time; further lines are read
+    once one of them is answered.
+    """
+    tasks = set()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            # Requests run concurrently so a slow game does not hold up the connection.
+            await in_flight.acquire()
+            task = asyncio.ensure_future(_respond(manager, line, writer))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            task.add_done_callback(lambda _: in_flight.release())
+            await writer.drain()
+        await asyncio.gather(*tasks)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(
+    manager: SessionManager, host: str = "127.0.0.1", port: int = 0, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+) -> asyncio.AbstractServer:
+    """Start the NDJSON front end for `manager`; port 0 picks a free port."""
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be positive")
+    return await asyncio.start_server(
+        lambda reader, writer: handle_connection(manager, reader, writer, max_in_flight), host, port
+    )
+
+
+async def _serve_forever(args) -> None:  # pragma: no cover
+    manager = SessionManager(max_games=args.max_games, max_pending=args.max_pending)
+    server = await serve(manager, args.host, args.port, args.max_in_flight)
+    for sock in server.sockets:
+        print(f"listening={sock.getsockname()}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Serve Kriegspiel referee games over newline-delimited JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7654)
+    parser.add_argument("--max-games", type=int, default=DEFAULT_MAX_GAMES)
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING)
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 from typing import Tuple
@@ -11,13 +12,17 @@ import chess
 from kriegspiel.move import KriegspielAnswer
 from kriegspiel.move import KriegspielMove
 from kriegspiel.move import QuestionAnnouncement
+from kriegspiel.move import SpecialCaseAnnouncement
 
 
 MoveTurn = Tuple[Tuple[KriegspielMove, KriegspielAnswer], ...]
 OpponentTurn = Tuple[Tuple[QuestionAnnouncement, KriegspielAnswer], ...]
 
+# Snapshots and views are slotted where dataclasses support it (Python 3.10+).
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, **_SLOTS)
 class ScoresheetSnapshot:
     """Serializable, public view of a player's scoresheet state."""
 
@@ -26,8 +31,13 @@ class ScoresheetSnapshot:
     moves_opponent: Tuple[OpponentTurn, ...]
     last_move_number: int
 
+    @property
+    def last_own_answer(self):
+        """The answer to this player's most recent question, or None before the first one."""
+        return self.moves_own[-1][-1][1] if self.moves_own else None
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class MaterialSideSummary:
     """Public material status for one color."""
 
@@ -35,7 +45,7 @@ class MaterialSideSummary:
     pawns_captured: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class PublicMaterialSummary:
     """Public material status derived from referee announcements."""
 
@@ -43,7 +53,7 @@ class PublicMaterialSummary:
     black: MaterialSideSummary
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class ReserveSideSummary:
     """Public reserve/pocket material for one color."""
 
@@ -54,7 +64,7 @@ class ReserveSideSummary:
     queens: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class PublicReserveSummary:
     """Public reserve/pocket material for both colors."""
 
@@ -62,7 +72,7 @@ class PublicReserveSummary:
     black: ReserveSideSummary
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class KriegspielGameSnapshot:
     """Serializable, public view of a hidden-board Kriegspiel game."""
 
@@ -77,9 +87,135 @@ class KriegspielGameSnapshot:
     black_scoresheet: ScoresheetSnapshot
 
 
+def _rank_fen(pieces: dict, rank: int) -> str:
+    fen = []
+    empty = 0
+    for square in range(rank * 8, rank * 8 + 8):
+        piece = pieces.get(square)
+        if piece is None:
+            empty += 1
+            continue
+        if empty:
+            fen.append(str(empty))
+            empty = 0
+        fen.append(piece.symbol())
+    if empty:
+        fen.append(str(empty))
+    return "".join(fen)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class PlayerView:
+    """One player's own pieces at a ply: placement FEN, bitboards and piece list."""
+
+    color: chess.Color
+    ply: int
+    board_fen: str
+    occupied: chess.Bitboard
+    pawns: chess.Bitboard
+    knights: chess.Bitboard
+    bishops: chess.Bitboard
+    rooks: chess.Bitboard
+    queens: chess.Bitboard
+    kings: chess.Bitboard
+    pieces: Tuple[Tuple[chess.Square, chess.Piece], ...]
+
+    @classmethod
+    def from_board(cls, board: chess.BaseBoard, color: chess.Color, ply: int) -> "PlayerView":
+        """Mask the pieces of `color` out of `board` without copying it."""
+        own = chess.BaseBoard.empty()
+        mask = board.occupied_co[color]
+        own.pawns = board.pawns & mask
+        own.knights = board.knights & mask
+        own.bishops = board.bishops & mask
+        own.rooks = board.rooks & mask
+        own.queens = board.queens & mask
+        own.kings = board.kings & mask
+        own.occupied_co[color] = mask
+        own.occupied = mask
+        return cls(
+            color=color,
+            ply=ply,
+            board_fen=own.board_fen(),
+            occupied=mask,
+            pawns=own.pawns,
+            knights=own.knights,
+            bishops=own.bishops,
+            rooks=own.rooks,
+            queens=own.queens,
+            kings=own.kings,
+            pieces=tuple(own.piece_map().items()),
+        )
+
+    def advanced(self, board: chess.BaseBoard, ply: int) -> "PlayerView":
+        """
+        Return the view of `board` at `ply`, one move after this view.
+
+        A single move only vacates or fills the squares it touches, so only
+        the squares whose occupancy changed are read from `board` and only
+        their ranks of the FEN are rebuilt.
+        """
+        mask = board.occupied_co[self.color]
+        changed = self.occupied ^ mask
+        kept = ~changed
+        added = changed & mask
+        pieces = [(square, piece) for square, piece in self.pieces if not chess.BB_SQUARES[square] & changed]
+        pieces.extend((square, board.piece_at(square)) for square in chess.scan_reversed(added))
+        pieces.sort(reverse=True, key=lambda item: item[0])
+        by_square = dict(pieces)
+        ranks = self.board_fen.split("/")
+        for rank in {chess.square_rank(square) for square in chess.scan_forward(changed)}:
+            ranks[7 - rank] = _rank_fen(by_square, rank)
+        return PlayerView(
+            color=self.color,
+            ply=ply,
+            board_fen="/".join(ranks),
+            occupied=mask,
+            pawns=(self.pawns & kept) | (board.pawns & added),
+            knights=(self.knights & kept) | (board.knights & added),
+            bishops=(self.bishops & kept) | (board.bishops & added),
+            rooks=(self.rooks & kept) | (board.rooks & added),
+            queens=(self.queens & kept) | (board.queens & added),
+            kings=(self.kings & kept) | (board.kings & added),
+            pieces=tuple(pieces),
+        )
+
+    def board(self) -> chess.BaseBoard:
+        """Return a new `chess.BaseBoard` holding only these pieces."""
+        return chess.BaseBoard(self.board_fen)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class RefereeEvent:
+    """A recorded referee answer, as delivered to `KriegspielGame` listeners."""
+
+    color: chess.Color
+    question: KriegspielMove
+    answer: KriegspielAnswer
+    opponent_notified: bool
+    ply: int
+    fen: str
+    game_over: bool
+
+
 # Backward-compatible alias for older Berkeley-named APIs.
 BerkeleyGameSnapshot = KriegspielGameSnapshot
 
+RESULT_WHITE_WINS = "1-0"
+RESULT_BLACK_WINS = "0-1"
+RESULT_DRAW = "1/2-1/2"
+RESULT_UNFINISHED = "*"
+
+GAME_RESULTS = {
+    SpecialCaseAnnouncement.CHECKMATE_WHITE_WINS: RESULT_WHITE_WINS,
+    SpecialCaseAnnouncement.STALEMATE_WHITE_WINS: RESULT_WHITE_WINS,
+    SpecialCaseAnnouncement.CHECKMATE_BLACK_WINS: RESULT_BLACK_WINS,
+    SpecialCaseAnnouncement.STALEMATE_BLACK_WINS: RESULT_BLACK_WINS,
+    SpecialCaseAnnouncement.DRAW_STALEMATE: RESULT_DRAW,
+    SpecialCaseAnnouncement.DRAW_INSUFFICIENT: RESULT_DRAW,
+    SpecialCaseAnnouncement.DRAW_TOOMANYREVERSIBLEMOVES: RESULT_DRAW,
+}
+
 
 def completed_moves_from_turn(turn: MoveTurn) -> Tuple[str, ...]:
     """Return UCI moves for successful COMMON questions within a single turn."""
@@ -97,17 +233,54 @@ def completed_moves_from_turn(turn: MoveTurn) -> Tuple[str, ...]:
     return tuple(completed_moves)
 
 
+def turns_in_ply_order(
+    white_scoresheet: ScoresheetSnapshot, black_scoresheet: ScoresheetSnapshot
+) -> Tuple[MoveTurn, ...]:
+    """Return both players' own turns in the order they were played, starting with White."""
+    turns = []
+    white_turns = white_scoresheet.moves_own
+    black_turns = black_scoresheet.moves_own
+    max_turns = max(len(white_turns), len(black_turns))
+
+    for turn_index in range(max_turns):
+        if turn_index < len(white_turns):
+            turns.append(white_turns[turn_index])
+        if turn_index < len(black_turns):
+            turns.append(black_turns[turn_index])
+
+    return tuple(turns)
+
+
 def move_stack_from_scoresheets(
     white_scoresheet: ScoresheetSnapshot, black_scoresheet: ScoresheetSnapshot
 ) -> Tuple[str, ...]:
     """Extract the executed chess moves recorded in both players' own scoresheets."""
     extracted = []
-    max_turns = max(len(white_scoresheet.moves_own), len(black_scoresheet.moves_own))
+    for turn in turns_in_ply_order(white_scoresheet, black_scoresheet):
+        extracted.extend(completed_moves_from_turn(turn))
+    return tuple(extracted)
 
-    for turn_index in range(max_turns):
-        if turn_index < len(white_scoresheet.moves_own):
-            extracted.extend(completed_moves_from_turn(white_scoresheet.moves_own[turn_index]))
-        if turn_index < len(black_scoresheet.moves_own):
-            extracted.extend(completed_moves_from_turn(black_scoresheet.moves_own[turn_index]))
 
-    return tuple(extracted)
+def result_from_final_answers(*answers) -> str:
+    """
+    Return the PGN-style result announced by any of the players' last answers.
+
+    The terminal announcement is always the last answer of the player who
+    moved last; `None` entries stand for players without answers yet.
+    """
+    for answer in answers:
+        if answer is not None:
+            result = GAME_RESULTS.get(answer.special_announcement)
+            if result is not None:
+                return result
+    return RESULT_UNFINISHED
+
+
+def result_from_scoresheets(white_scoresheet, black_scoresheet) -> str:
+    """
+    Return the PGN-style result announced at the end of the game.
+
+    Unfinished games yield `RESULT_UNFINISHED`. Accepts scoresheet snapshots
+    or live scoresheets.
+    """
+    return result_from_final_answers(white_scoresheet.last_own_answer, black_scoresheet.last_own_answer)
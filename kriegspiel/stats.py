@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+"""
+Optional per-phase timing of `KriegspielGame.ask_for`.
+
+`KriegspielGame.enable_stats()` wraps `ask_for` and the methods of its
+phases on that one game instance:
+
+    validation          _validate_question
+    legality            _is_legal_move (board.is_legal)
+    make_move           _make_move
+    special_cases       _check_special_cases
+    ruleset_metadata    _next_turn_metadata
+    recording           _record_the_move
+    regeneration        _generate_possible_to_ask_list
+    post_answer         _apply_post_answer_constraints
+
+Phase times are exclusive: a regeneration run by a post-answer constraint is
+counted as regeneration only. Each answered question adds its phase calls and
+times to the row of its ruleset id and main announcement, in the game's own
+`RefereeStats` and, unless disabled, in the process-wide `GLOBAL_STATS`.
+
+Games without stats enabled run the class methods directly, so the disabled
+cost is nothing at all.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from kriegspiel.move import MainAnnouncement
+
+PHASES = (
+    ("validation", "_validate_question"),
+    ("legality", "_is_legal_move"),
+    ("make_move", "_make_move"),
+    ("special_cases", "_check_special_cases"),
+    ("ruleset_metadata", "_next_turn_metadata"),
+    ("recording", "_record_the_move"),
+    ("regeneration", "_generate_possible_to_ask_list"),
+    ("post_answer", "_apply_post_answer_constraints"),
+)
+PHASE_NAMES = tuple(name for name, _ in PHASES)
+
+_ASKS = 0
+_SECONDS = 1
+_CALLS = 2
+_PHASE_SECONDS = 3
+
+
+class RefereeStats(object):
+    """Question counts and per-phase calls and seconds, by ruleset id and main announcement."""
+
+    def __init__(self):
+        # (ruleset id, MainAnnouncement) -> [asks, seconds, phase calls, phase seconds]
+        self._rows: Dict[Any, list] = {}
+
+    def _row(self, key) -> list:
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = [0, 0.0, [0] * len(PHASES), [0.0] * len(PHASES)]
+        return row
+
+    def add(self, ruleset_id: str, announcement: MainAnnouncement, seconds: float, calls, phase_seconds) -> None:
+        """Add one answered question."""
+        row = self._row((ruleset_id, announcement))
+        row[_ASKS] += 1
+        row[_SECONDS] += seconds
+        row_calls, row_seconds = row[_CALLS], row[_PHASE_SECONDS]
+        for index in range(len(PHASES)):
+            row_calls[index] += calls[index]
+            row_seconds[index] += phase_seconds[index]
+
+    def merge(self, other: "RefereeStats") -> None:
+        """Add every row of `other` to this one."""
+        for key, (asks, seconds, calls, phase_seconds) in other._rows.items():
+            row = self._row(key)
+            row[_ASKS] += asks
+            row[_SECONDS] += seconds
+            for index in range(len(PHASES)):
+                row[_CALLS][index] += calls[index]
+                row[_PHASE_SECONDS][index] += phase_seconds[index]
+
+    def reset(self) -> None:
+        self._rows.clear()
+
+    @property
+    def asks(self) -> int:
+        return sum(row[_ASKS] for row in self._rows.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Return `{ruleset id: {announcement name: row}}`.
+
+        Each row is `{"asks", "seconds", "phases": {phase: {"calls", "seconds"}}}`.
+        """
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (ruleset_id, announcement), (asks, seconds, calls, phase_seconds) in sorted(
+            self._rows.items(), key=lambda item: (item[0][0], item[0][1].value)
+        ):
+            result.setdefault(ruleset_id, {})[announcement.name] = {
+                "asks": asks,
+                "seconds": seconds,
+                "phases": {
+                    name: {"calls": calls[index], "seconds": phase_seconds[index]}
+                    for index, name in enumerate(PHASE_NAMES)
+                },
+            }
+        return result
+
+    def phase_totals(self) -> Dict[str, Dict[str, Any]]:
+        """Return `{phase: {"calls", "seconds"}}` summed over every row."""
+        totals = {name: {"calls": 0, "seconds": 0.0} for name in PHASE_NAMES}
+        for _, _, calls, phase_seconds in self._rows.values():
+            for index, name in enumerate(PHASE_NAMES):
+                totals[name]["calls"] += calls[index]
+                totals[name]["seconds"] += phase_seconds[index]
+        return totals
+
+
+GLOBAL_STATS = RefereeStats()
+
+
+class _Probe(object):
+    """Scratch counters of the question being answered."""
+
+    __slots__ = ("calls", "seconds", "nested")
+
+    def __init__(self):
+        self.calls = [0] * len(PHASES)
+        self.seconds = [0.0] * len(PHASES)
+        self.nested = 0.0
+
+    def clear(self) -> None:
+        for index in range(len(PHASES)):
+            self.calls[index] = 0
+            self.seconds[index] = 0.0
+        self.nested = 0.0
+
+
+def _timed_phase(probe: _Probe, index: int, method):
+    def phase(*args):
+        outer = probe.nested
+        probe.nested = 0.0
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            probe.calls[index] += 1
+            probe.seconds[index] += elapsed - probe.nested
+            probe.nested = outer + elapsed
+
+    return phase
+
+
+def instrument(game, aggregate: bool = True, stats: Optional[RefereeStats] = None) -> RefereeStats:
+    """
+    Time the phases of `game.ask_for` from now on and return the game's `RefereeStats`.
+
+    `stats` continues counting into an existing `RefereeStats` instead of a new one.
+    """
+    if stats is None:
+        stats = RefereeStats()
+    probe = _Probe()
+    for index, (_, method_name) in enumerate(PHASES):
+        setattr(game, method_name, _timed_phase(probe, index, getattr(game, method_name)))
+    ask_for = game.ask_for
+
+    def timed_ask_for(move):
+        probe.clear()
+        start = time.perf_counter()
+        answer = ask_for(move)
+        seconds = time.perf_counter() - start
+        stats.add(game.ruleset_id, answer.main_announcement, seconds, probe.calls, probe.seconds)
+        if aggregate:
+            GLOBAL_STATS.add(game.ruleset_id, answer.main_announcement, seconds, probe.calls, probe.seconds)
+        return answer
+
+    game.ask_for = timed_ask_for
+    return stats
+
+
+def uninstrument(game) -> None:
+    """Remove the wrappers installed by `instrument`."""
+    for _, method_name in PHASES:
+        game.__dict__.pop(method_name, None)
+    game.__dict__.pop("ask_for", None)
+
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""
+Least-recently-used store of live games with spill-to-disk.
+
+`GameStore` keeps the `max_live` most recently used games as live
+`KriegspielGame` objects. Older games are evicted to the compact binary
+encoding (`kriegspiel.binary`, zlib compressed), which is a small fraction
+of a live game: no python-chess board, scoresheet objects or askable cache.
+Evicted games are kept in memory up to `memory_budget` bytes; beyond that
+the oldest ones are written to `directory`, one `.ksgb` file per game.
+
+`get` and `ask` rehydrate an evicted game transparently with
+`from_snapshot` of its original class, so callers never see whether a game
+was live. Listeners, observers and stats are kept aside while a game is
+evicted and put back on the rehydrated game, which is a new object: hooks
+that hold on to the evicted game object itself do not follow it. A game is
+decoded before its stored copy is discarded, so a failed rehydration leaves
+it stored. Eviction, spill and rehydration counters and a rehydration latency
+histogram are reported by `stats()`.
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from kriegspiel.binary import deserialize_game_binary
+from kriegspiel.binary import serialize_game_binary
+from kriegspiel.metrics import DEFAULT_LATENCY_BUCKETS
+from kriegspiel.metrics import LatencyHistogram
+from kriegspiel.move import KriegspielAnswer
+from kriegspiel.move import KriegspielMove
+from kriegspiel.serialization import SerializationError
+
+DEFAULT_MAX_LIVE = 1000
+
+_SUFFIX = ".ksgb"
+
+
+@dataclass(frozen=True)
+class StoreStats:
+    """Residency and activity counters of a `GameStore`."""
+
+    live: int
+    spilled_in_memory: int
+    spilled_on_disk: int
+    spilled_bytes: int
+    evictions: int
+    disk_spills: int
+    rehydrations: int
+    rehydration_seconds: Tuple[Tuple[float, int], ...]
+
+
+class GameStore(object):
+    """
+    Keep the most recently used games live and the rest serialized.
+
+    `memory_budget` caps the bytes of serialized games kept in memory and
+    requires `directory`; without it every evicted game stays in memory.
+    """
+
+    def __init__(
+        self,
+        max_live: int = DEFAULT_MAX_LIVE,
+        memory_budget: Optional[int] = None,
+        directory: Optional[str] = None,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        if max_live < 1:
+            raise ValueError("max_live must be positive")
+        if memory_budget is not None and (memory_budget < 0 or directory is None):
+            raise ValueError("memory_budget must be non-negative and requires a directory")
+        self._max_live = max_live
+        self._memory_budget = memory_budget
+        self._directory = directory
+        self._live = OrderedDict()
+        # Evicted games: id -> (game class, bytes) in eviction order, or the class of a game on disk.
+        self._in_memory = OrderedDict()
+        self._on_disk: Dict[str, type] = {}
+        # Evicted games with listeners, observers or stats: id -> KriegspielGame._hooks()
+        self._hooks: Dict[str, tuple] = {}
+        self._spilled_bytes = 0
+        self._evictions = 0
+        self._disk_spills = 0
+        self._rehydrations = 0
+        self._latency = LatencyHistogram(latency_buckets)
+
+    def __len__(self) -> int:
+        return len(self._live) + len(self._in_memory) + len(self._on_disk)
+
+    def __contains__(self, game_id) -> bool:
+        return game_id in self._live or game_id in self._in_memory or game_id in self._on_disk
+
+    def _path(self, game_id: str) -> str:
+        # Game ids are arbitrary strings; hash them into safe file names.
+        return os.path.join(self._directory, hashlib.sha1(game_id.encode()).hexdigest() + _SUFFIX)
+
+    def add(self, game, game_id: Optional[str] = None) -> str:
+        """Store a live game as the most recently used one and return its id."""
+        if game_id is None:
+            game_id = uuid.uuid4().hex
+        elif game_id in self:
+            raise ValueError(f"Game id already in use: {game_id}")
+        self._live[game_id] = game
+        self._evict()
+        return game_id
+
+    def get(self, game_id: str):
+        """Return the live game, rehydrating it if it was evicted, and mark it most recently used."""
+        game = self._live.get(game_id)
+        if game is not None:
+            self._live.move_to_end(game_id)
+            return game
+        game = self._rehydrate(game_id)
+        self._live[game_id] = game
+        self._evict()
+        return game
+
+    def ask(self, game_id: str, question: KriegspielMove) -> KriegspielAnswer:
+        """Ask `question` on a stored game."""
+        return self.get(game_id).ask_for(question)
+
+    def remove(self, game_id: str) -> None:
+        """Forget a game wherever it is stored."""
+        if self._live.pop(game_id, None) is not None:
+            return
+        self._hooks.pop(game_id, None)
+        if game_id in self._in_memory:
+            self._spilled_bytes -= len(self._in_memory.pop(game_id)[1])
+            return
+        if game_id not in self._on_disk:
+            raise KeyError(game_id)
+        del self._on_disk[game_id]
+        os.remove(self._path(game_id))
+
+    def _rehydrate(self, game_id: str):
+        start = time.perf_counter()
+        if game_id in self._in_memory:
+            game_class, data = self._in_memory[game_id]
+            game = deserialize_game_binary(data, game_class=game_class)
+            del self._in_memory[game_id]
+            self._spilled_bytes -= len(data)
+        elif game_id in self._on_disk:
+            path = self._path(game_id)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except (IOError, OSError) as e:
+                raise SerializationError(f"Failed to load game from {path}") from e
+            game = deserialize_game_binary(data, game_class=self._on_disk[game_id])
+            try:
+                os.remove(path)
+            except (IOError, OSError) as e:
+                raise SerializationError(f"Failed to remove spilled game {path}") from e
+            del self._on_disk[game_id]
+        else:
+            raise KeyError(game_id)
+        hooks = self._hooks.pop(game_id, None)
+        if hooks is not None:
+            game._attach_hooks(hooks)
+        self._rehydrations += 1
+        self._latency.observe(time.perf_counter() - start)
+        return game
+
+    def _evict(self) -> None:
+        while len(self._live) > self._max_live:
+            game_id, game = self._live.popitem(last=False)
+            data = serialize_game_binary(game, compression="zlib")
+            self._in_memory[game_id] = (type(game), data)
+            hooks = game._hooks()
+            if hooks is not None:
+                self._hooks[game_id] = hooks
+            self._spilled_bytes += len(data)
+            self._evictions += 1
+        if self._memory_budget is None:
+            return
+        while self._spilled_bytes > self._memory_budget:
+            game_id, (game_class, data) = self._in_memory.popitem(last=False)
+            path = self._path(game_id)
+            try:
+                with open(path, "wb") as f:
+                    f.write(data)
+            except (IOError, OSError) as e:
+                self._in_memory[game_id] = (game_class, data)
+                self._in_memory.move_to_end(game_id, last=False)
+                raise SerializationError(f"Failed to save game to {path}") from e
+            self._on_disk[game_id] = game_class
+            self._spilled_bytes -= len(data)
+            self._disk_spills += 1
+
+    def stats(self) -> StoreStats:
+        return StoreStats(
+            live=len(self._live),
+            spilled_in_memory=len(self._in_memory),
+            spilled_on_disk=len(self._on_disk),
+            spilled_bytes=self._spilled_bytes,
+            evictions=self._evictions,
+            disk_spills=self._disk_spills,
+            rehydrations=self._rehydrations,
+            rehydration_seconds=self._latency.buckets(),
+        )
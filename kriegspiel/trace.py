@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+"""
+A fixed-size in-memory trace of referee events.
+
+`TraceRing` is a `RefereeObserver` that records every hook call as one
+compact event: a monotonic `time.perf_counter_ns()` timestamp, the event
+kind, the game and a single integer argument:
+
+    before_question       pack_kriegspiel_move(question)
+    after_question        pack_kriegspiel_move(question) << 3 | main announcement
+    move_pushed           pack_chess_move(move)
+    askable_regenerated   number of possible questions
+    game_over             0
+
+Events live in preallocated arrays, so recording never allocates and the
+ring holds the newest `capacity` events however long it runs. Attach one
+ring to many games and dump it when a latency spike needs explaining:
+
+    ring = TraceRing()
+    game.add_observer(ring)
+    ...
+    ring.write_chrome_trace("referee.trace.json")
+
+The file opens in chrome://tracing or Perfetto: every answered question is
+an `ask_for` slice on the track of its game, the other events are instants.
+"""
+
+import json
+import time
+from array import array
+from typing import Any, Dict, List, Tuple
+
+from kriegspiel.move import MainAnnouncement
+from kriegspiel.observer import RefereeObserver
+from kriegspiel.serialization import pack_chess_move
+from kriegspiel.serialization import pack_kriegspiel_move
+from kriegspiel.serialization import unpack_chess_move
+from kriegspiel.serialization import unpack_kriegspiel_move
+
+BEFORE_QUESTION = 0
+AFTER_QUESTION = 1
+MOVE_PUSHED = 2
+ASKABLE_REGENERATED = 3
+GAME_OVER = 4
+
+EVENT_NAMES = ("before_question", "after_question", "move_pushed", "askable_regenerated", "game_over")
+
+DEFAULT_CAPACITY = 65536
+
+
+class TraceRing(RefereeObserver):
+    """Keep the newest `capacity` referee events of every game it observes."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = array("q", bytes(8 * capacity))
+        self._kinds = array("B", bytes(capacity))
+        self._games = array("Q", bytes(8 * capacity))
+        self._args = array("q", bytes(8 * capacity))
+        self._next = 0
+        self._recorded = 0
+
+    def _record(self, kind: int, game, arg: int) -> None:
+        index = self._next
+        self._timestamps[index] = time.perf_counter_ns()
+        self._kinds[index] = kind
+        self._games[index] = id(game)
+        self._args[index] = arg
+        self._next = index + 1 if index + 1 < self.capacity else 0
+        self._recorded += 1
+
+    def before_question(self, game, question):
+        self._record(BEFORE_QUESTION, game, pack_kriegspiel_move(question))
+
+    def after_question(self, game, question, answer):
+        self._record(AFTER_QUESTION, game, pack_kriegspiel_move(question) << 3 | answer.main_announcement.value)
+
+    def move_pushed(self, game, move):
+        self._record(MOVE_PUSHED, game, pack_chess_move(move))
+
+    def askable_regenerated(self, game):
+        self._record(ASKABLE_REGENERATED, game, len(game._possible_to_ask))
+
+    def game_over(self, game):
+        self._record(GAME_OVER, game, 0)
+
+    def __len__(self) -> int:
+        return min(self._recorded, self.capacity)
+
+    @property
+    def overwritten(self) -> int:
+        """Number of events lost to wraparound."""
+        return self._recorded - len(self)
+
+    def clear(self) -> None:
+        self._next = 0
+        self._recorded = 0
+
+    def events(self) -> List[Tuple[int, int, int, int]]:
+        """Return the kept events, oldest first, as `(timestamp_ns, kind, game id, arg)`."""
+        size = len(self)
+        start = self._next - size
+        return [
+            (self._timestamps[index], self._kinds[index], self._games[index], self._args[index])
+            for index in (start + offset for offset in range(size))
+        ]
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Return the kept events in the Chrome trace-event format.
+
+        Timestamps are microseconds since the oldest kept event. Each game gets
+        its own thread id, numbered in order of first appearance. A question
+        whose start was overwritten is shown by its answer instant only.
+        """
+        events = self.events()
+        origin = events[0][0] if events else 0
+        threads: Dict[int, int] = {}
+        started: Dict[int, Tuple[int, int]] = {}
+        trace_events = []
+        for timestamp, kind, game, arg in events:
+            tid = threads.setdefault(game, len(threads) + 1)
+            ts = (timestamp - origin) / 1000.0
+            if kind == BEFORE_QUESTION:
+                started[tid] = (timestamp, arg)
+                continue
+            if kind == AFTER_QUESTION:
+                question = unpack_kriegspiel_move(arg >> 3)
+                args = {"question": _describe(question), "answer": MainAnnouncement(arg & 7).name}
+                start = started.pop(tid, None)
+                if start is not None and start[1] == arg >> 3:
+                    trace_events.append({
+                        "name": "ask_for", "ph": "X", "pid": 1, "tid": tid,
+                        "ts": (start[0] - origin) / 1000.0, "dur": (timestamp - start[0]) / 1000.0, "args": args,
+                    })
+                    continue
+            elif kind == MOVE_PUSHED:
+                args = {"move": unpack_chess_move(arg).uci()}
+            elif kind == ASKABLE_REGENERATED:
+                args = {"possible_to_ask": arg}
+            else:
+                args = {}
+            trace_events.append({
+                "name": EVENT_NAMES[kind], "ph": "i", "s": "t", "pid": 1, "tid": tid, "ts": ts, "args": args,
+            })
+        for game, tid in threads.items():
+            trace_events.append({
+                "name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": f"game {game:#x}"},
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, filename: str) -> None:
+        with open(filename, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def _describe(question) -> str:
+    if question.chess_move is None:
+        return question.question_type.name
+    return question.chess_move.uci()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Compare JSON and binary game encodings on a generated corpus."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from kriegspiel.binary import deserialize_game_binary, serialize_game_binary
+from kriegspiel.game import KriegspielGame
+from kriegspiel.serialization import KriegspielJSONEncoder, deserialize_berkeley_game, serialize_berkeley_game
+
+RULESETS = ("berkeley", "berkeley_any", "cincinnati", "crazykrieg", "english", "rand", "wild16")
+
+
+def build_corpus(games_per_ruleset: int, max_questions: int) -> list[KriegspielGame]:
+    """Play seeded random questions to build games of varying length for every ruleset."""
+    corpus = []
+    for ruleset in RULESETS:
+        for seed in range(games_per_ruleset):
+            rng = random.Random(seed)
+            game = KriegspielGame(ruleset=ruleset)
+            for _ in range(rng.randint(1, max_questions)):
+                if game.game_over:
+                    break
+                game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+            corpus.append(game)
+    return corpus
+
+
+def json_encoder(indent):
+    def encode(game):
+        return json.dumps(serialize_berkeley_game(game), indent=indent, cls=KriegspielJSONEncoder).encode()
+
+    return encode
+
+
+def json_decoder(data):
+    return deserialize_berkeley_game(json.loads(data))
+
+
+def binary_encoder(compression):
+    def encode(game):
+        return serialize_game_binary(game, compression=compression)
+
+    return encode
+
+
+FORMATS = {
+    "json-indent": (json_encoder(2), json_decoder),
+    "json": (json_encoder(None), json_decoder),
+    "binary": (binary_encoder(None), deserialize_game_binary),
+    "binary-zlib": (binary_encoder("zlib"), deserialize_game_binary),
+    "binary-lzma": (binary_encoder("lzma"), deserialize_game_binary),
+}
+
+
+def measure(corpus, encode, decode):
+    start = time.perf_counter()
+    blobs = [encode(game) for game in corpus]
+    encode_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for blob in blobs:
+        decode(blob)
+    decode_seconds = time.perf_counter() - start
+    total_bytes = sum(len(blob) for blob in blobs)
+    return {
+        "bytes_per_game": total_bytes / len(corpus),
+        "encode_games_per_second": len(corpus) / encode_seconds,
+        "decode_games_per_second": len(corpus) / decode_seconds,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON and binary game encodings")
+    parser.add_argument("--games-per-ruleset", type=int, default=20)
+    parser.add_argument("--max-questions", type=int, default=600)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.games_per_ruleset, args.max_questions)
+    print(f"games={len(corpus)}")
+    for name, (encode, decode) in FORMATS.items():
+        result = measure(corpus, encode, decode)
+        print(
+            f"format={name} bytes_per_game={result['bytes_per_game']:.0f} "
+            f"encode_games_per_second={result['encode_games_per_second']:.0f} "
+            f"decode_games_per_second={result['decode_games_per_second']:.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
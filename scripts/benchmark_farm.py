@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Measure sharded referee farm throughput against a single in-process engine."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from kriegspiel.farm import RefereeFarm
+from kriegspiel.game import KriegspielGame
+
+
+def record_games(count: int, questions: int, ruleset: str):
+    """Play random games in-process and return their question and answer sequences."""
+    transcripts = []
+    for seed in range(count):
+        rng = random.Random(seed)
+        game = KriegspielGame(ruleset=ruleset)
+        transcript = []
+        for _ in range(questions):
+            if game.game_over:
+                break
+            question = rng.choice(sorted(game.possible_to_ask))
+            transcript.append((question, game.ask_for(question)))
+        transcripts.append(transcript)
+    return transcripts
+
+
+def replay_in_process(transcripts, games: int, ruleset: str) -> float:
+    hosted = [(KriegspielGame(ruleset=ruleset), transcripts[i % len(transcripts)]) for i in range(games)]
+    start = time.perf_counter()
+    for game, transcript in hosted:
+        for question, _ in transcript:
+            game.ask_for(question)
+    return time.perf_counter() - start
+
+
+def replay_on_farm(transcripts, games: int, shards: int, ruleset: str):
+    with RefereeFarm(shards=shards) as farm:
+        hosted = [(farm.create_game(ruleset=ruleset), transcripts[i % len(transcripts)]) for i in range(games)]
+        start = time.perf_counter()
+        for ply in range(max(len(transcript) for transcript in transcripts)):
+            batch = [(game_id, transcript[ply]) for game_id, transcript in hosted if ply < len(transcript)]
+            answers = farm.ask_many((game_id, question) for game_id, (question, _) in batch)
+            if answers != [answer for _, (_, answer) in batch]:
+                raise AssertionError("farm answers differ from in-process answers")
+        return time.perf_counter() - start, farm.stats()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark RefereeFarm throughput")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=80, help="questions asked per game")
+    parser.add_argument("--transcripts", type=int, default=50, help="distinct recorded games to replay")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--ruleset", default="berkeley")
+    args = parser.parse_args()
+
+    transcripts = record_games(args.transcripts, args.questions, args.ruleset)
+    asks = sum(len(transcripts[i % len(transcripts)]) for i in range(args.games))
+    print(f"games={args.games}")
+    print(f"asks={asks}")
+    seconds = replay_in_process(transcripts, args.games, args.ruleset)
+    print(f"in_process_asks_per_second={asks / seconds:.0f}")
+    for shards in args.shards:
+        seconds, stats = replay_on_farm(transcripts, args.games, shards, args.ruleset)
+        print(f"shards={shards} asks_per_second={asks / seconds:.0f} batches={stats.batches}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Micro-benchmark helper for loading saved Kriegspiel games from disk."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.rulesets import RULESET_CINCINNATI
+
+
+def build_long_game(plies: int, ruleset: str | None = None) -> KriegspielGame:
+    """Play seeded random questions until a game reaches exactly `plies` half-moves."""
+    for seed in range(1000):
+        rng = random.Random(seed)
+        game = KriegspielGame(ruleset=ruleset)
+        while not game.game_over and len(game._board.move_stack) < plies:
+            game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+        if len(game._board.move_stack) == plies:
+            return game
+    raise RuntimeError(f"Could not build a {plies}-ply game")
+
+
+def benchmark(loader, filename: str, iterations: int, rounds: int) -> list[float]:
+    run_times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            loader(filename)
+        run_times.append((time.perf_counter() - start) / iterations)
+    return run_times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark KriegspielGame.load_game latency")
+    parser.add_argument("--plies", type=int, default=300)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--lazy", action="store_true", help="decode scoresheets on first access")
+    args = parser.parse_args()
+
+    cases = [
+        ("KriegspielGame", partial(KriegspielGame.load_game, lazy=args.lazy), build_long_game(args.plies)),
+        (
+            "CincinnatiGame",
+            partial(CincinnatiGame.load_game, lazy=args.lazy),
+            build_long_game(args.plies, RULESET_CINCINNATI),
+        ),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        for name, loader, game in cases:
+            filename = os.path.join(directory, f"{name}.json")
+            game.save_game(filename)
+            run_times = benchmark(loader, filename, args.iterations, args.rounds)
+            print(f"class={name}")
+            print(f"lazy={args.lazy}")
+            print(f"plies={len(game._board.move_stack)}")
+            print(f"file_bytes={os.path.getsize(filename)}")
+            print(f"median_milliseconds_per_load={statistics.median(run_times) * 1000:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Load-test the asyncio session manager with many concurrently active games."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from kriegspiel.server import SessionManager
+
+
+async def play(manager: SessionManager, game_id: str, questions: int, think: float, seed: int) -> None:
+    """Ask random askable questions on one game, one at a time, like a single client."""
+    rng = random.Random(seed)
+    game = manager.game(game_id)
+    for _ in range(questions):
+        if think:
+            await asyncio.sleep(rng.expovariate(1 / think))
+        if game.game_over:
+            break
+        await manager.ask(game_id, rng.choice(tuple(game.possible_to_ask)))
+
+
+async def run(games: int, questions: int, think: float, ruleset: str) -> None:
+    manager = SessionManager(max_games=games, latency_samples=games * questions)
+    start = time.perf_counter()
+    game_ids = [manager.create_game(ruleset=ruleset) for _ in range(games)]
+    created = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        play(manager, game_id, questions, think, seed) for seed, game_id in enumerate(game_ids)
+    ))
+    elapsed = time.perf_counter() - start
+
+    stats = manager.stats()
+    print(f"games={games}")
+    print(f"create_seconds={created:.3f}")
+    print(f"asks={stats['asks']}")
+    print(f"asks_per_second={stats['asks'] / elapsed:.0f}")
+    for key in ("p50_ms", "p90_ms", "p99_ms"):
+        print(f"{key}={stats[key]}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SessionManager ask latency under concurrent load")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--questions", type=int, default=10, help="questions asked per game")
+    parser.add_argument(
+        "--think", type=float, default=10.0,
+        help="mean seconds between a client's questions; 0 floods the manager",
+    )
+    parser.add_argument("--ruleset", default="berkeley")
+    args = parser.parse_args()
+    asyncio.run(run(args.games, args.questions, args.think, args.ruleset))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""JSON Lines game archive tests."""
+
+import json
+import os
+import random
+import tempfile
+
+import chess
+import pytest
+
+from kriegspiel.archive import (
+    ArchiveHeader, ArchivedGame, game_header, iter_games, write_games,
+)
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.serialization import MalformedDataError, SerializationError, serialize_berkeley_game
+from kriegspiel.snapshot import KriegspielGameSnapshot
+
+
+def _play(game, *ucis):
+    for uci in ucis:
+        game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+    return game
+
+
+def _random_game(ruleset, seed, questions=80):
+    rng = random.Random(seed)
+    game = KriegspielGame(ruleset=ruleset)
+    for _ in range(questions):
+        if game.game_over:
+            break
+        game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+    return game
+
+
+@pytest.fixture
+def archive_path():
+    with tempfile.TemporaryDirectory() as directory:
+        yield os.path.join(directory, "games.jsonl")
+
+
+def test_game_result_follows_terminal_announcement():
+    assert BerkeleyGame().result == "*"
+    assert _play(BerkeleyGame(), "f2f3", "e7e5", "g2g4", "d8h4").result == "0-1"
+    assert _play(BerkeleyGame(), "e2e4", "f7f6", "d2d4", "g7g5", "d1h5").result == "1-0"
+
+
+def test_game_header_summarizes_game():
+    game = _play(BerkeleyGame(), "f2f3", "e7e5", "g2g4", "d8h4")
+
+    assert game_header(game) == ArchiveHeader(ruleset_id="berkeley_any", result="0-1", plies=4)
+
+
+def test_write_and_iterate_roundtrip(archive_path):
+    games = [_random_game(ruleset, seed) for ruleset in ("berkeley", "cincinnati", "wild16") for seed in range(2)]
+
+    assert write_games(iter(games), archive_path, batch_size=4) == len(games)
+    records = list(iter_games(archive_path))
+
+    assert all(isinstance(record, ArchivedGame) for record in records)
+    assert [record.header for record in records] == [game_header(game) for game in games]
+    for record, game in zip(records, games):
+        assert serialize_berkeley_game(record.game()) == serialize_berkeley_game(game)
+        assert isinstance(record.snapshot(), KriegspielGameSnapshot)
+
+
+def test_each_line_is_a_json_document(archive_path):
+    write_games([BerkeleyGame()], archive_path)
+
+    with open(archive_path) as f:
+        lines = f.readlines()
+
+    assert len(lines) == 1
+    document = json.loads(lines[0])
+    assert list(document) == ["header", "game"]
+    assert document["game"]["schema_version"] == 10
+
+
+def test_eager_iteration_builds_requested_class(archive_path):
+    write_games([_play(CincinnatiGame(), "e2e4")], archive_path)
+
+    games = list(iter_games(archive_path, lazy=False, game_class=CincinnatiGame))
+
+    assert len(games) == 1
+    assert isinstance(games[0], CincinnatiGame)
+    assert len(games[0]._move_stack) == 1
+
+
+def test_header_filters(archive_path):
+    games = [
+        _play(BerkeleyGame(), "f2f3", "e7e5", "g2g4", "d8h4"),
+        _play(BerkeleyGame(), "e2e4"),
+        _play(KriegspielGame(ruleset="english"), "e2e4", "e7e5"),
+    ]
+    write_games(games, archive_path)
+
+    def plies(**filters):
+        return [record.header.plies for record in iter_games(archive_path, **filters)]
+
+    assert plies(ruleset="berkeley_any") == [4, 1]
+    assert plies(result="0-1") == [4]
+    assert plies(result="*") == [1, 2]
+    assert plies(min_plies=2) == [4, 2]
+    assert plies(max_plies=2) == [1, 2]
+    assert plies(ruleset="english", max_plies=1) == []
+
+
+def test_filters_skip_scoresheet_decoding(archive_path, monkeypatch):
+    write_games([BerkeleyGame(), _play(BerkeleyGame(), "e2e4")], archive_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("game payload decoded")
+
+    monkeypatch.setattr(json, "loads", fail)
+
+    assert [record.header.plies for record in iter_games(archive_path, min_plies=1)] == [1]
+
+
+def test_append_and_blank_lines(archive_path):
+    write_games([BerkeleyGame()], archive_path)
+    with open(archive_path, "a") as f:
+        f.write("\n")
+    write_games([_play(BerkeleyGame(), "e2e4")], archive_path, append=True)
+
+    assert [record.header.plies for record in iter_games(archive_path)] == [0, 1]
+
+
+def test_write_empty_iterable(archive_path):
+    assert write_games([], archive_path) == 0
+    assert list(iter_games(archive_path)) == []
+
+
+def test_invalid_batch_size(archive_path):
+    with pytest.raises(ValueError, match="batch_size"):
+        write_games([], archive_path, batch_size=0)
+
+
+@pytest.mark.parametrize("line", [
+    "not json",
+    '{"game":{},"header":{}}',
+    '{"header":{"ruleset_id":"berkeley","result":"*","plies":0}}',
+    '{"header":{"ruleset_id":"berkeley","result":"*"},"game":{}}',
+    '{"header":[1],"game":{}}',
+    '{"header":{"ruleset_id":"berkeley","result":"*",',
+])
+def test_malformed_records(archive_path, line):
+    with open(archive_path, "w") as f:
+        f.write(line + "\n")
+
+    with pytest.raises(MalformedDataError, match="line 1"):
+        list(iter_games(archive_path))
+
+
+def test_malformed_payload_is_reported_on_decode(archive_path):
+    with open(archive_path, "w") as f:
+        f.write('{"header":{"ruleset_id":"berkeley","result":"*","plies":0},"game":{oops}}\n')
+
+    record = next(iter_games(archive_path))
+
+    with pytest.raises(MalformedDataError, match="Invalid JSON in archived game"):
+        record.game()
+
+
+def test_io_errors():
+    with pytest.raises(SerializationError, match="Failed to write games"):
+        write_games([BerkeleyGame()], "/invalid/path/games.jsonl")
+    with pytest.raises(SerializationError, match="Failed to read games"):
+        list(iter_games("/nonexistent/games.jsonl"))
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""Archive audit and re-adjudication tests."""
+
+import json
+import os
+import random
+import tempfile
+
+import chess
+import pytest
+
+import kriegspiel.audit as audit
+from kriegspiel.audit import AuditResult, audit_file, audit_snapshot, iter_audit, main, question_sequence
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.binary import save_game_binary
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielAnswer as KSAnswer
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import MainAnnouncement as MA
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.move import SpecialCaseAnnouncement as SCA
+
+
+def _play(game, *ucis):
+    for uci in ucis:
+        game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+    return game
+
+
+def _random_game(ruleset, seed, questions=120):
+    rng = random.Random(seed)
+    game = KriegspielGame(ruleset=ruleset)
+    for _ in range(questions):
+        if game.game_over:
+            break
+        game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+    return game
+
+
+@pytest.fixture
+def directory():
+    with tempfile.TemporaryDirectory() as path:
+        yield path
+
+
+def _tampered(directory):
+    path = os.path.join(directory, "tampered.json")
+    _play(BerkeleyGame(), "e2e4", "e7e5", "g1f3").save_game(path)
+    with open(path) as f:
+        data = json.load(f)
+    data["game_state"]["black_scoresheet"]["moves_own"][0][0][1]["special_announcement"] = "CHECK_RANK"
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
+
+def test_question_sequence_follows_ply_order():
+    game = _play(BerkeleyGame(), "e2e4", "e7e5", "e4e5", "g1f3")
+
+    sequence = question_sequence(game.snapshot())
+
+    assert [question.chess_move.uci() for question, _ in sequence] == ["e2e4", "e7e5", "e4e5", "g1f3"]
+    assert [answer.main_announcement for _, answer in sequence] == [
+        MA.REGULAR_MOVE, MA.REGULAR_MOVE, MA.ILLEGAL_MOVE, MA.REGULAR_MOVE,
+    ]
+
+
+@pytest.mark.parametrize("ruleset", [
+    "berkeley", "berkeley_any", "cincinnati", "crazykrieg", "english", "rand", "wild16",
+])
+def test_current_engine_reproduces_its_own_games(ruleset):
+    for seed in range(3):
+        game = _random_game(ruleset, seed)
+
+        questions, divergence = audit_snapshot(game.snapshot())
+
+        assert divergence is None
+        assert questions == len(question_sequence(game.snapshot()))
+
+
+def test_first_divergence_is_reported(directory):
+    result = audit_file(_tampered(directory))
+
+    assert not result.ok
+    assert result.questions == 2
+    assert result.divergence.index == 1
+    assert result.divergence.ply == 1
+    assert result.divergence.question == KSMove(QA.COMMON, chess.Move.from_uci("e7e5"))
+    assert result.divergence.recorded == KSAnswer(MA.REGULAR_MOVE, special_announcement=SCA.CHECK_RANK)
+    assert result.divergence.replayed == KSAnswer(MA.REGULAR_MOVE)
+
+
+def test_file_errors_are_reported(directory):
+    broken = os.path.join(directory, "broken.json")
+    with open(broken, "w") as f:
+        f.write("{broken")
+    unknown = os.path.join(directory, "unknown.json")
+    BerkeleyGame().save_game(unknown, compact=True)
+    with open(unknown) as f:
+        data = json.load(f)
+    data["game_state"]["ruleset_id"] = "shogi"
+    with open(unknown, "w") as f:
+        json.dump(data, f)
+
+    assert audit_file(broken) == AuditResult(
+        broken, error_type="MalformedDataError", error=f"Invalid JSON in file {broken}"
+    )
+    assert audit_file(unknown).error_type == "ValueError"
+
+
+def test_unexpected_errors_are_reported_per_file(directory, monkeypatch):
+    path = os.path.join(directory, "game.json")
+    BerkeleyGame().save_game(path)
+
+    def explode(snapshot):
+        raise KeyError("lost square")
+
+    monkeypatch.setattr(audit, "audit_snapshot", explode)
+
+    assert audit_file(path) == AuditResult(path, error_type="KeyError", error="'lost square'")
+
+
+def test_iter_audit_streams_in_input_order(directory):
+    clean = os.path.join(directory, "clean.ksgb")
+    save_game_binary(_play(BerkeleyGame(), "d2d4"), clean)
+    tampered = _tampered(directory)
+
+    results = list(iter_audit([directory], workers=2, chunksize=1))
+
+    assert [result.path for result in results] == [clean, tampered]
+    assert [result.ok for result in results] == [True, False]
+    assert results[0].questions == 1
+
+
+def test_main_reports_divergences_and_errors(directory, capsys):
+    _play(BerkeleyGame(), "d2d4").save_game(os.path.join(directory, "a.json"))
+    _tampered(directory)
+    with open(os.path.join(directory, "z.json"), "w") as f:
+        json.dump([], f)
+
+    assert main([directory, "--workers", "1"]) == 1
+
+    out = capsys.readouterr().out
+    assert "diverged path=" in out and "index=1 ply=1" in out
+    assert "error path=" in out and "type=MalformedDataError" in out
+    assert "files=3" in out
+    assert "failures=2" in out
+
+
+def test_main_succeeds_on_clean_archive(directory, capsys):
+    _play(BerkeleyGame(), "d2d4").save_game(os.path.join(directory, "a.json"))
+
+    assert main([directory, "--workers", "1"]) == 0
+    assert "failures=0" in capsys.readouterr().out
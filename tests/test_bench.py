@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark suite tests."""
+
+import json
+
+import pytest
+
+from kriegspiel.bench import (
+    RULESETS, BenchmarkResult, _ask_any_policy, build_suite, compare, main, record_script, run_benchmark,
+    run_suite,
+)
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import QuestionAnnouncement as QA
+
+
+@pytest.fixture(scope="module")
+def report():
+    return run_suite(rounds=1, games=1, questions=40)
+
+
+def test_suite_covers_rulesets_and_subsystems(report):
+    names = set(report["results"])
+    for ruleset in RULESETS:
+        assert {f"ask_for.{ruleset}", f"snapshot.{ruleset}", f"from_snapshot.{ruleset}"} <= names
+        assert {f"material_summary.{ruleset}", f"scoresheet_access.{ruleset}"} <= names
+    assert {"ask_any.berkeley_any", "ask_any.crazykrieg", "illegal_attempts.wild16", "terminal_detection"} <= names
+    assert all(result["operations"] > 0 and len(result["rounds"]) == 1 for result in report["results"].values())
+    assert report["environment"]["kriegspiel"]
+    assert report["config"] == {"rounds": 1, "games": 1, "questions": 40, "filter": None}
+    json.dumps(report)
+
+
+def test_scripts_are_reproducible():
+    assert record_script("crazykrieg", 3, questions=40) == record_script("crazykrieg", 3, questions=40)
+
+    game = KriegspielGame(ruleset="berkeley_any")
+    for question in record_script("berkeley_any", 0, questions=60):
+        assert game.ask_for(question).main_announcement.name != "IMPOSSIBLE_TO_ASK"
+
+
+def test_filter_and_results():
+    suite = build_suite(games=1, name_filter="terminal", questions=40)
+    assert list(suite) == ["terminal_detection"]
+
+    result = run_benchmark("terminal_detection", suite["terminal_detection"], rounds=3)
+    assert result.operations == 1000
+    assert result.per_op_seconds == sorted(result.rounds)[1] / 1000
+    assert BenchmarkResult("x", 4, (2.0, 1.0, 3.0)).as_dict() == {
+        "operations": 4, "rounds": [2.0, 1.0, 3.0], "per_op_us": 500000.0, "ops_per_second": 2.0,
+    }
+
+
+def test_compare_reports_regressions_over_threshold():
+    baseline = {"results": {"a": {"per_op_us": 10.0}, "b": {"per_op_us": 10.0}, "gone": {"per_op_us": 1.0}}}
+    report = {"results": {"a": {"per_op_us": 10.9}, "b": {"per_op_us": 11.5}, "new": {"per_op_us": 99.0}}}
+
+    regressions = compare(report, baseline, threshold=0.1)
+
+    assert [(regression.name, regression.ratio) for regression in regressions] == [("b", 1.15)]
+    assert compare(report, baseline, threshold=0.2) == []
+
+
+def test_main_writes_json_and_compares(tmp_path, capsys):
+    args = ["--rounds", "1", "--games", "1", "--questions", "40", "--filter", "ask_any.english"]
+    output = tmp_path / "bench.json"
+    assert main(args + ["--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert list(report["results"]) == ["ask_any.english"]
+
+    slow = dict(report, results={"ask_any.english": {"per_op_us": 1e9}})
+    fast = dict(report, results={"ask_any.english": {"per_op_us": 1e-9}})
+    (tmp_path / "slow.json").write_text(json.dumps(slow))
+    (tmp_path / "fast.json").write_text(json.dumps(fast))
+    capsys.readouterr()
+
+    assert main(args + ["--baseline", str(tmp_path / "slow.json")]) == 0
+    assert json.loads(capsys.readouterr().out)["results"]["ask_any.english"]["operations"] > 0
+
+    assert main(args + ["--baseline", str(tmp_path / "fast.json")]) == 1
+    assert "regression name=ask_any.english" in capsys.readouterr().err
+
+
+def test_ask_any_scripts_ask_any():
+    script = record_script("english", 0, policy=_ask_any_policy, questions=30)
+    assert KSMove(QA.ASK_ANY) in script
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""Lazy package import and import-time benchmark tests."""
+
+import json
+
+import pytest
+
+import kriegspiel
+from kriegspiel.bench_import import STATEMENTS, main, measure_import, run_suite
+from kriegspiel.game import KriegspielGame
+from kriegspiel.snapshot import KriegspielGameSnapshot
+
+
+def test_package_exports_resolve_lazily():
+    assert set(kriegspiel.__all__) <= set(dir(kriegspiel))
+    exports = {name: getattr(kriegspiel, name) for name in kriegspiel.__all__}
+    assert exports["KriegspielGame"] is KriegspielGame
+    assert exports["BerkeleyGameSnapshot"] is KriegspielGameSnapshot
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        kriegspiel.Missing
+
+
+def test_package_import_skips_engine_and_variants():
+    package = measure_import("import kriegspiel")
+    assert package["watched"] == []
+    assert package["seconds"] > 0
+
+    assert measure_import("from kriegspiel import *")["watched"] == ["chess"]
+    assert measure_import(STATEMENTS["crazykrieg"])["watched"] == ["chess", "chess.variant"]
+    assert "json" in measure_import(STATEMENTS["serialization"])["watched"]
+
+
+def test_suite_reports_every_statement():
+    report = run_suite(rounds=1, name_filter="package")
+    assert list(report["results"]) == ["package"]
+    result = report["results"]["package"]
+    assert result["operations"] == 1 and result["loaded"] == [] and result["modules"] > 0
+    assert report["config"] == {"rounds": 1, "filter": "package"}
+
+
+def test_main_checks_budget(tmp_path, capsys):
+    output = tmp_path / "imports.json"
+    assert main(["--rounds", "1", "--filter", "package", "--budget", "1000", "--output", str(output)]) == 0
+    assert json.loads(output.read_text())["results"]["package"]["operations"] == 1
+
+    assert main(["--rounds", "1", "--filter", "package", "--budget", "0"]) == 1
+    assert "over_budget name=package" in capsys.readouterr().err
+
+    assert main(["--rounds", "1", "--filter", "engine", "--budget", "0"]) == 0
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+"""Idle-game memory benchmark tests."""
+
+import json
+
+from kriegspiel.bench import RULESETS
+from kriegspiel.bench_memory import BUDGETS, idle_script, main, over_budget, run_suite
+from kriegspiel.game import KriegspielGame
+
+
+def test_idle_script_stops_at_the_requested_ply():
+    game = KriegspielGame(ruleset="rand")
+    for question in idle_script("rand", 1, 6):
+        game.ask_for(question)
+    assert len(game._move_stack) == 6
+    assert idle_script("rand", 1, 0) == []
+
+
+def test_suite_covers_rulesets_within_budget():
+    report = run_suite(games=1, plies=(0, 4))
+
+    assert set(report["results"]) == {f"idle.{ruleset}.{ply}" for ruleset in RULESETS for ply in (0, 4)}
+    for ruleset in RULESETS:
+        idle = report["results"][f"idle.{ruleset}.0"]
+        moved = report["results"][f"idle.{ruleset}.4"]
+        assert idle["bytes_per_game"] > 0 and moved["bytes_per_game"] > 0
+        assert idle["budget_bytes"] == BUDGETS[0] and moved["budget_bytes"] is None
+        assert (idle["plies"], moved["plies"]) == (0, 4)
+    assert over_budget(report) == []
+    json.dumps(report)
+
+
+def test_main_reports_budget_overruns(tmp_path, capsys, monkeypatch):
+    args = ["--games", "1", "--plies", "0", "--filter", "idle.wild16"]
+    output = tmp_path / "memory.json"
+    assert main(args + ["--output", str(output)]) == 0
+    assert list(json.loads(output.read_text())["results"]) == ["idle.wild16.0"]
+
+    monkeypatch.setitem(BUDGETS, 0, 1)
+    assert main(args) == 1
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["results"]["idle.wild16.0"]["budget_bytes"] == 1
+    assert "over_budget name=idle.wild16.0" in captured.err
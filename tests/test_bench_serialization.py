@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""Serialization benchmark suite tests."""
+
+import json
+
+from kriegspiel.bench import RULESETS
+from kriegspiel.bench_serialization import OPERATIONS, WRAPPERS, build_corpus, main, peak_memory, run_suite
+from kriegspiel.serialization import serialize_berkeley_game
+
+
+def test_corpus_is_reproducible():
+    first, second = build_corpus("rand", games=2, lengths=(10, 40)), build_corpus("rand", games=2, lengths=(10, 40))
+
+    assert len(first) == 4
+    assert [serialize_berkeley_game(game)["game_state"] for game in first] == [
+        serialize_berkeley_game(game)["game_state"] for game in second
+    ]
+    assert len(first[0]._move_stack) < len(first[2]._move_stack)
+
+
+def test_suite_covers_every_operation_and_ruleset():
+    report = run_suite(rounds=1, games=1, lengths=(4, 12))
+
+    assert set(report["results"]) == {f"{operation}.{ruleset}" for operation in OPERATIONS for ruleset in RULESETS}
+    assert set(WRAPPERS) == set(RULESETS)
+    assert report["corpus"]["wild16"]["games"] == 2
+    for name, result in report["results"].items():
+        assert result["operations"] == 2
+        assert result["peak_bytes"] > 0
+        assert ("bytes_per_game" in result) == name.startswith(("serialize.", "save_game"))
+    assert report["results"]["save_game.berkeley"]["bytes_per_game"] > (
+        report["results"]["save_game_compact.berkeley"]["bytes_per_game"]
+    )
+    json.dumps(report)
+
+
+def test_peak_memory():
+    def setup():
+        return (lambda: bytearray(1 << 20)), 1
+
+    assert peak_memory(setup) >= 1 << 20
+
+
+def test_main_filters_and_compares(tmp_path, capsys):
+    args = ["--rounds", "1", "--games", "1", "--lengths", "6", "--filter", "load_game.crazykrieg"]
+    output = tmp_path / "serialization.json"
+    assert main(args + ["--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert list(report["results"]) == ["load_game.crazykrieg", "wrapper_load_game.crazykrieg"]
+    assert report["config"]["lengths"] == [6]
+
+    fast = dict(report, results={"load_game.crazykrieg": {"per_op_us": 1e-9}})
+    (tmp_path / "fast.json").write_text(json.dumps(fast))
+    assert main(args + ["--baseline", str(tmp_path / "fast.json")]) == 1
+    assert "regression name=load_game.crazykrieg" in capsys.readouterr().err
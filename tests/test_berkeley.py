@@ -1011,8 +1011,7 @@ def test_from_snapshot_rejects_wrong_type():
 def test_ask_for_reports_unsupported_question_type_once_it_is_marked_possible():
     g = BerkeleyGame()
     strange_question = KSMove(QA.NONE)
-    g._possible_to_ask.append(strange_question)
-    g._possible_to_ask_set.add(strange_question)
+    g._possible_to_ask.add(strange_question)
 
     with pytest.raises(ValueError, match="Unsupported question type"):
         g._ask_for(strange_question)
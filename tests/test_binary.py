@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+"""Binary game format round-trip and error-handling tests."""
+
+import dataclasses
+import os
+import random
+import struct
+import tempfile
+
+import chess
+import pytest
+
+from kriegspiel.binary import (
+    BINARY_FORMAT_VERSION, BINARY_MAGIC,
+    deserialize_game_binary, deserialize_snapshot_binary,
+    load_game_binary, save_game_binary,
+    serialize_game_binary, serialize_snapshot_binary,
+)
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import CapturedPieceAnnouncement as CPA
+from kriegspiel.move import KriegspielAnswer as KSAnswer
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import MainAnnouncement as MA
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.move import SpecialCaseAnnouncement as SCA
+from kriegspiel.serialization import (
+    MalformedDataError, SerializationError, UnsupportedVersionError,
+    pack_chess_move, serialize_berkeley_game, unpack_chess_move,
+)
+from kriegspiel.snapshot import KriegspielGameSnapshot, ScoresheetSnapshot
+
+RULESETS = ["berkeley", "berkeley_any", "cincinnati", "crazykrieg", "english", "rand", "wild16"]
+
+
+def _random_game(ruleset, seed, questions=150):
+    rng = random.Random(seed)
+    game = KriegspielGame(ruleset=ruleset)
+    for _ in range(questions):
+        if game.game_over:
+            break
+        game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+    return game
+
+
+def _snapshot_with_answers(answers, opponent_answers=()):
+    """Build a structurally valid snapshot whose white scoresheet holds the given answers."""
+    game = BerkeleyGame()
+    snapshot = game.snapshot()
+    white = ScoresheetSnapshot(
+        color=chess.WHITE,
+        moves_own=(tuple((KSMove(QA.COMMON, chess.Move.from_uci("a2a5")), answer) for answer in answers),),
+        moves_opponent=(tuple((QA.COMMON, answer) for answer in opponent_answers),) if opponent_answers else (),
+        last_move_number=1,
+    )
+    return KriegspielGameSnapshot(
+        ruleset_id=snapshot.ruleset_id,
+        any_rule=snapshot.any_rule,
+        board_fen=snapshot.board_fen,
+        move_stack=(),
+        must_use_pawns=False,
+        game_over=False,
+        possible_to_ask=None,
+        white_scoresheet=white,
+        black_scoresheet=snapshot.black_scoresheet,
+    )
+
+
+@pytest.mark.parametrize("ruleset", RULESETS)
+def test_binary_roundtrip_matches_schema_9(ruleset):
+    game = _random_game(ruleset, seed=7)
+
+    restored = deserialize_game_binary(serialize_game_binary(game))
+
+    assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma"])
+def test_binary_roundtrip_with_compression(compression):
+    game = _random_game("berkeley_any", seed=11, questions=400)
+
+    data = serialize_game_binary(game, compression=compression)
+    restored = deserialize_game_binary(data)
+
+    assert len(data) < len(serialize_game_binary(game))
+    assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+
+def test_binary_roundtrip_finished_game():
+    game = BerkeleyGame()
+    for uci in ("f2f3", "e7e5", "g2g4", "d8h4"):
+        game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+
+    restored = deserialize_game_binary(serialize_game_binary(game))
+
+    assert restored.game_over is True
+    assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+
+def test_binary_roundtrip_preserves_pending_pawn_obligation():
+    game = BerkeleyGame()
+    for uci in ("e2e4", "d7d5"):
+        game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+    game.ask_for(KSMove(QA.ASK_ANY))
+
+    restored = deserialize_game_binary(serialize_game_binary(game))
+
+    assert restored.must_use_pawns is True
+    assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+
+def test_binary_is_much_smaller_than_json():
+    game = _random_game("berkeley_any", seed=3)
+
+    assert len(serialize_game_binary(game)) * 5 < len(str(serialize_berkeley_game(game)))
+
+
+def test_binary_encoding_is_deterministic():
+    game = _random_game("wild16", seed=2)
+
+    assert serialize_game_binary(game) == serialize_game_binary(deserialize_game_binary(serialize_game_binary(game)))
+
+
+def test_binary_header_layout():
+    data = serialize_game_binary(BerkeleyGame(), compression="lzma")
+
+    assert struct.unpack_from("<4sBB", data) == (BINARY_MAGIC, BINARY_FORMAT_VERSION, 2)
+
+
+def test_binary_roundtrip_preserves_rare_answer_fields():
+    answers = [
+        KSAnswer(MA.ILLEGAL_MOVE),
+        KSAnswer(MA.ILLEGAL_MOVE, special_announcement=(SCA.CHECK_DOUBLE, [SCA.CHECK_FILE, SCA.CHECK_KNIGHT])),
+        KSAnswer(MA.ILLEGAL_MOVE, special_announcement=SCA.CHECK_DOUBLE),
+        KSAnswer(MA.ILLEGAL_MOVE, special_announcement=SCA.STALEMATE_BLACK_WINS),
+        KSAnswer(MA.ILLEGAL_MOVE, next_turn_pawn_tries=300),
+        KSAnswer(MA.ILLEGAL_MOVE, next_turn_has_pawn_capture=True),
+        KSAnswer(MA.ILLEGAL_MOVE, next_turn_has_pawn_capture=False),
+        KSAnswer(MA.ILLEGAL_MOVE, next_turn_pawn_try_squares=(chess.A2, chess.H7)),
+        KSAnswer(MA.ILLEGAL_MOVE, promotion_announced=True),
+    ]
+    opponent_answers = [
+        KSAnswer(MA.CAPTURE_DONE, capture_at_square=chess.H8, captured_piece_announcement=CPA.QUEEN,
+                 en_passant_announced=True),
+        KSAnswer(MA.REGULAR_MOVE, dropped_piece_announcement=CPA.KNIGHT),
+    ]
+    snapshot = _snapshot_with_answers(answers, opponent_answers)
+
+    restored = deserialize_snapshot_binary(serialize_snapshot_binary(snapshot))
+
+    assert restored == snapshot
+
+
+def test_binary_roundtrip_preserves_legacy_snapshot_without_possible_to_ask():
+    game = BerkeleyGame()
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+    snapshot = game.snapshot()
+    legacy = dataclasses.replace(snapshot, possible_to_ask=None)
+
+    restored = deserialize_snapshot_binary(serialize_snapshot_binary(legacy))
+
+    assert restored == legacy
+
+
+def test_binary_preserves_non_common_questions_with_moves():
+    snapshot = _snapshot_with_answers([KSAnswer(MA.ILLEGAL_MOVE)])
+    strange = KSMove(QA.NONE, chess.Move.from_uci("b1c3"))
+    snapshot = dataclasses.replace(snapshot, possible_to_ask=(strange, KSMove(QA.ASK_ANY)))
+
+    restored = deserialize_snapshot_binary(serialize_snapshot_binary(snapshot))
+
+    assert set(restored.possible_to_ask) == {strange, KSMove(QA.ASK_ANY)}
+
+
+def test_binary_load_builds_requested_wrapper():
+    game = CincinnatiGame()
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+
+    restored = deserialize_game_binary(serialize_game_binary(game), game_class=CincinnatiGame)
+
+    assert restored.__class__ is CincinnatiGame
+    assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+
+def test_save_and_load_game_binary():
+    game = _random_game("crazykrieg", seed=5, questions=60)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".ksg") as handle:
+        filename = handle.name
+
+    try:
+        save_game_binary(game, filename, compression="zlib")
+        restored = load_game_binary(filename)
+    finally:
+        os.unlink(filename)
+
+    assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+
+def test_save_game_binary_reports_io_errors():
+    with pytest.raises(SerializationError, match="Failed to save game"):
+        save_game_binary(BerkeleyGame(), "/nonexistent/directory/game.ksg")
+
+
+def test_load_game_binary_reports_io_errors():
+    with pytest.raises(SerializationError, match="Failed to load game"):
+        load_game_binary("/nonexistent/game.ksg")
+
+
+def test_serialize_rejects_unknown_compression():
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        serialize_game_binary(BerkeleyGame(), compression="bz2")
+
+
+@pytest.mark.parametrize(
+    ("data", "error", "message"),
+    [
+        (b"KSG", MalformedDataError, "Truncated binary game header"),
+        (b"XXXX\x01\x00", MalformedDataError, "Invalid binary game magic"),
+        (BINARY_MAGIC + b"\x63\x00", UnsupportedVersionError, "Unsupported binary format version"),
+        (BINARY_MAGIC + b"\x01\x07", MalformedDataError, "Unsupported binary compression id"),
+        (BINARY_MAGIC + b"\x01\x01garbage", MalformedDataError, "Corrupt compressed"),
+        (BINARY_MAGIC + b"\x01\x00", MalformedDataError, "Truncated binary game data"),
+        (BINARY_MAGIC + b"\x01\x00\x05abc", MalformedDataError, "Truncated binary game data"),
+        (BINARY_MAGIC + b"\x01\x00\x01\xff", MalformedDataError, "Invalid text field"),
+    ],
+)
+def test_deserialize_rejects_malformed_headers_and_fields(data, error, message):
+    with pytest.raises(error, match=message):
+        deserialize_snapshot_binary(data)
+
+
+def test_serialize_rejects_answer_with_several_pawn_capture_fields():
+    answer = KSAnswer(MA.ILLEGAL_MOVE, next_turn_pawn_tries=2)
+    answer._next_turn_has_pawn_capture = True
+    snapshot = _snapshot_with_answers([answer])
+
+    with pytest.raises(SerializationError, match="more than one next-turn pawn-capture field"):
+        serialize_snapshot_binary(snapshot)
+
+
+def test_deserialize_rejects_trailing_bytes():
+    data = serialize_game_binary(BerkeleyGame())
+
+    with pytest.raises(MalformedDataError, match="trailing bytes"):
+        deserialize_snapshot_binary(data + b"\x00")
+
+
+def test_deserialize_rejects_board_that_does_not_match_scoresheets():
+    game = BerkeleyGame()
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+    snapshot = dataclasses.replace(game.snapshot(), board_fen=chess.Board().fen())
+
+    with pytest.raises(MalformedDataError, match="does not match board_fen"):
+        deserialize_game_binary(serialize_snapshot_binary(snapshot))
+
+
+def test_deserialize_rejects_scoresheet_with_multiple_completed_moves():
+    snapshot = _snapshot_with_answers([KSAnswer(MA.REGULAR_MOVE), KSAnswer(MA.REGULAR_MOVE)])
+
+    with pytest.raises(MalformedDataError, match="multiple completed moves"):
+        deserialize_snapshot_binary(serialize_snapshot_binary(snapshot))
+
+
+def _corrupt_first_answer(snapshot, flags):
+    """Replace the first own answer of an encoded snapshot with raw varint flags."""
+    data = bytearray(serialize_snapshot_binary(snapshot))
+    original = bytearray()
+    from kriegspiel.binary import _write_answer
+
+    _write_answer(original, snapshot.white_scoresheet.moves_own[0][0][1])
+    replacement = bytearray()
+    value = flags
+    while value > 0x7F:
+        replacement.append((value & 0x7F) | 0x80)
+        value >>= 7
+    replacement.append(value)
+    index = data.index(bytes(original), len(data) - 2 * len(original) - 8)
+    return bytes(data[:index] + replacement + data[index + len(original):])
+
+
+@pytest.mark.parametrize(
+    ("flags", "message"),
+    [
+        (7, "Invalid KriegspielAnswer flags"),
+        (1 | (15 << 3), "Invalid KriegspielAnswer flags"),
+        (1 | (7 << 8), "Invalid CapturedPieceAnnouncement code"),
+        (1 | (_ := list(SCA).index(SCA.CHECK_DOUBLE)) << 3 | (7 << 14) | (1 << 17), "Invalid check code"),
+        (1 | (2 << 11), "Invalid KriegspielAnswer flags"),
+    ],
+)
+def test_deserialize_rejects_invalid_answer_flags(flags, message):
+    snapshot = _snapshot_with_answers([KSAnswer(MA.NO_ANY)])
+
+    with pytest.raises(MalformedDataError, match=message):
+        deserialize_snapshot_binary(_corrupt_first_answer(snapshot, flags))
+
+
+def test_deserialize_rejects_invalid_question_type():
+    snapshot = _snapshot_with_answers([KSAnswer(MA.NO_ANY)])
+    data = serialize_snapshot_binary(snapshot)
+    question_code = pack_chess_move(chess.Move.from_uci("a2a5")) << 2 | QA.COMMON.value
+    encoded = bytearray()
+    while question_code > 0x7F:
+        encoded.append((question_code & 0x7F) | 0x80)
+        question_code >>= 7
+    encoded.append(question_code)
+    corrupted = bytearray(encoded)
+    corrupted[0] |= 3
+
+    with pytest.raises(MalformedDataError, match="Invalid QuestionAnnouncement code"):
+        deserialize_snapshot_binary(data.replace(bytes(encoded), bytes(corrupted)))
+
+
+@pytest.mark.parametrize(
+    "move",
+    [
+        chess.Move.from_uci("e2e4"),
+        chess.Move.from_uci("h7h8n"),
+        chess.Move.from_uci("a2b1q"),
+        chess.Move.from_uci("Q@d5"),
+        chess.Move.from_uci("P@a3"),
+    ],
+)
+def test_pack_chess_move_roundtrip(move):
+    assert unpack_chess_move(pack_chess_move(move)) == move
+
+
+@pytest.mark.parametrize("code", [-1, 1 << 18, "e2e4", True, 7 << 12, 7 << 15])
+def test_unpack_chess_move_rejects_invalid_codes(code):
+    with pytest.raises(MalformedDataError, match="Invalid packed move"):
+        unpack_chess_move(code)
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+"""Parallel bulk load, validation and conversion tests."""
+
+import json
+import os
+import tempfile
+
+import chess
+import pytest
+
+import kriegspiel.bulk as bulk
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.binary import load_game_binary, save_game_binary
+from kriegspiel.bulk import (
+    BulkReport, BulkResult, convert_files, expand_paths, iter_loaded, load_game_file, main, validate_files,
+)
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.serialization import MalformedDataError, SerializationError, serialize_berkeley_game
+
+
+def _play(game, *ucis):
+    for uci in ucis:
+        game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+    return game
+
+
+@pytest.fixture
+def directory():
+    with tempfile.TemporaryDirectory() as path:
+        games = os.path.join(path, "games")
+        os.mkdir(games)
+        _play(BerkeleyGame(), "e2e4", "e7e5").save_game(os.path.join(games, "a.json"))
+        _play(CincinnatiGame(), "d2d4").save_game(os.path.join(games, "b.json"), compact=True)
+        save_game_binary(_play(BerkeleyGame(), "g1f3"), os.path.join(games, "c.ksgb"), compression="zlib")
+        with open(os.path.join(games, "d.json"), "w") as f:
+            json.dump({"schema_version": 99}, f)
+        with open(os.path.join(games, "e.json"), "w") as f:
+            f.write("{broken")
+        with open(os.path.join(games, "notes.txt"), "w") as f:
+            f.write("ignored")
+        yield path
+
+
+def _games(directory):
+    return os.path.join(directory, "games")
+
+
+def test_expand_paths_lists_game_files(directory):
+    expanded = expand_paths([_games(directory), "missing.json"])
+
+    assert [os.path.basename(path) for path in expanded] == [
+        "a.json", "b.json", "c.ksgb", "d.json", "e.json", "missing.json",
+    ]
+
+
+def test_load_game_file_reads_json_and_binary(directory):
+    assert len(load_game_file(os.path.join(_games(directory), "a.json"))._move_stack) == 2
+    assert load_game_file(os.path.join(_games(directory), "c.ksgb"))._move_stack[0].uci() == "g1f3"
+
+
+@pytest.mark.parametrize("content,match", [
+    ("[]", "Invalid BerkeleyGame data structure"),
+    (b"\xff", "Invalid JSON"),
+])
+def test_load_game_file_rejects_malformed_json(directory, content, match):
+    path = os.path.join(directory, "bad.json")
+    with open(path, "wb") as f:
+        f.write(content.encode() if isinstance(content, str) else content)
+
+    with pytest.raises(MalformedDataError, match=match):
+        load_game_file(path)
+
+
+def test_load_game_file_reports_replay_errors(directory):
+    game = BerkeleyGame()
+    data = serialize_berkeley_game(game)
+    data["game_state"]["board_fen"] = "8/8/8/8/8/8/8/K6k w - - 0 1"
+    path = os.path.join(directory, "bad.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+    with pytest.raises(MalformedDataError, match="does not match board_fen"):
+        load_game_file(path)
+
+
+def test_validate_reports_per_file_errors(directory):
+    report = validate_files([_games(directory), os.path.join(directory, "missing.json")], workers=1)
+
+    assert isinstance(report, BulkReport)
+    assert report.files == 6
+    assert [os.path.basename(result.path) for result in report.failures] == ["d.json", "e.json", "missing.json"]
+    assert [result.error_type for result in report.failures] == [
+        "UnsupportedVersionError", "MalformedDataError", "SerializationError",
+    ]
+    assert report.files_per_second > 0
+
+
+def test_validate_in_process_pool(directory):
+    report = validate_files([_games(directory)], workers=2, chunksize=2)
+
+    assert report.files == 5
+    assert len(report.failures) == 2
+
+
+def test_map_paths_keeps_a_bounded_window_in_flight():
+    pulled = []
+
+    def paths():
+        for index in range(1000):
+            pulled.append(index)
+            yield f"games/{index}.json"
+
+    results = bulk.map_paths(os.path.basename, paths(), workers=2, chunksize=3)
+
+    assert next(results) == "0.json"
+    assert len(pulled) <= bulk.CHUNKS_PER_WORKER * 2 * 3 + 1
+    assert list(results) == [f"{index}.json" for index in range(1, 1000)]
+    assert bulk._map_chunk(os.path.basename, ["a/b.json", "c.ksgb"]) == ["b.json", "c.ksgb"]
+
+
+def test_iter_loaded_yields_snapshots_in_order(directory):
+    results = list(iter_loaded([_games(directory)], workers=1))
+
+    assert [result.ok for result in results] == [True, True, True, False, False]
+    assert results[1].snapshot.ruleset_id == "cincinnati"
+    game = KriegspielGame.from_snapshot(results[0].snapshot)
+    assert len(game._move_stack) == 2
+
+
+@pytest.mark.parametrize("output_format,suffix", [
+    ("json", ".json"), ("compact", ".json"), ("binary", ".ksgb"), ("binary-zlib", ".ksgb"),
+])
+def test_convert_files(directory, output_format, suffix):
+    output = os.path.join(directory, "out")
+
+    report = convert_files([_games(directory)], output, output_format=output_format, workers=1)
+
+    converted = [result.output for result in report.results if result.ok]
+    assert [os.path.basename(path) for path in converted] == ["a" + suffix, "b" + suffix, "c" + suffix]
+    original = load_game_file(os.path.join(_games(directory), "b.json"))
+    assert serialize_berkeley_game(load_game_file(converted[1])) == serialize_berkeley_game(original)
+
+
+def test_convert_reports_write_errors(directory):
+    output = os.path.join(directory, "out")
+    os.mkdir(output)
+    os.mkdir(os.path.join(output, "a.json"))
+
+    report = convert_files([os.path.join(_games(directory), "a.json")], output, workers=1)
+
+    assert report.failures[0].error_type == "SerializationError"
+    assert "Failed to save game" in report.failures[0].error
+
+
+def test_convert_reports_output_collisions(directory):
+    other = os.path.join(directory, "other")
+    os.mkdir(other)
+    BerkeleyGame().save_game(os.path.join(other, "a.json"))
+    BerkeleyGame().save_game(os.path.join(other, "c.json"))
+    output = os.path.join(directory, "out")
+
+    report = convert_files([_games(directory), other], output, output_format="binary", workers=1)
+
+    assert [os.path.basename(result.path) for result in report.failures] == [
+        "d.json", "e.json", "a.json", "c.json",
+    ]
+    first_a, second_a = report.failures[2], report.results[0]
+    assert first_a.error_type == "OutputCollision"
+    assert first_a.path == os.path.join(other, "a.json")
+    assert first_a.error == f"Output {os.path.join(output, 'a.ksgb')} is already written for {second_a.path}"
+    assert report.failures[3].error_type == "OutputCollision"
+    assert len(load_game_file(os.path.join(output, "a.ksgb"))._move_stack) == 2
+
+
+def test_unexpected_errors_are_reported_per_file(directory, monkeypatch):
+    def explode(path):
+        raise RuntimeError(f"cannot read {os.path.basename(path)}")
+
+    monkeypatch.setattr(bulk, "load_game_file", explode)
+
+    report = validate_files([_games(directory)], workers=1)
+
+    assert report.files == 5
+    assert {result.error_type for result in report.failures} == {"RuntimeError"}
+    assert report.failures[0].error == "cannot read a.json"
+
+
+def test_invalid_arguments(directory):
+    with pytest.raises(ValueError, match="Unsupported format"):
+        convert_files([], directory, output_format="xml")
+    with pytest.raises(ValueError, match="chunksize"):
+        validate_files([], chunksize=0)
+
+
+def test_empty_report_throughput():
+    report = BulkReport(results=[], seconds=0.0)
+
+    assert report.files == 0
+    assert report.files_per_second == 0.0
+    assert BulkResult("x").ok
+
+
+def test_cli_validate_and_convert(directory, capsys):
+    assert main(["validate", os.path.join(_games(directory), "a.json"), "--workers", "1"]) == 0
+    assert "files=1" in capsys.readouterr().out
+
+    output = os.path.join(directory, "out")
+    assert main(["convert", _games(directory), "--output", output, "--format", "binary", "--workers", "1"]) == 1
+    printed = capsys.readouterr().out
+    assert "failures=2" in printed
+    assert "type=UnsupportedVersionError" in printed
+    assert load_game_binary(os.path.join(output, "a.ksgb")).ruleset_id == "berkeley_any"
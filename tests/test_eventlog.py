@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""Append-only event-log persistence tests."""
+
+import json
+import os
+import random
+import tempfile
+
+import chess
+import pytest
+
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.eventlog import GameJournal, checkpoint_path, log_path
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.serialization import MalformedDataError, SerializationError, serialize_berkeley_game
+
+
+def _question(uci):
+    return KSMove(QA.COMMON, chess.Move.from_uci(uci))
+
+
+def _ask_random(journal, rng, questions):
+    for _ in range(questions):
+        if journal.game.game_over:
+            break
+        journal.ask_for(rng.choice(sorted(journal.game.possible_to_ask)))
+        journal.flush()
+
+
+def _log_lines(path):
+    with open(log_path(path)) as f:
+        return f.read().splitlines()
+
+
+@pytest.fixture
+def path():
+    with tempfile.TemporaryDirectory() as directory:
+        yield os.path.join(directory, "game")
+
+
+def test_recovery_replays_log_after_checkpoint(path):
+    rng = random.Random(3)
+    with GameJournal.create(path, CincinnatiGame(), checkpoint_every=25) as journal:
+        _ask_random(journal, rng, 60)
+        expected = serialize_berkeley_game(journal.game)
+        events = journal.events
+
+    recovered = GameJournal.open(path, game_class=CincinnatiGame)
+
+    assert isinstance(recovered.game, CincinnatiGame)
+    assert recovered.events == events
+    assert serialize_berkeley_game(recovered.game) == expected
+    recovered.close()
+
+
+def test_flush_appends_only_new_events(path):
+    journal = GameJournal.create(path, BerkeleyGame())
+    journal.ask_for(_question("e2e4"))
+    journal.flush()
+    journal.ask_for(_question("e7e5"))
+    journal.ask_for(_question("e4e5"))
+
+    assert len(_log_lines(path)) == 1
+    journal.flush()
+    lines = _log_lines(path)
+
+    assert [json.loads(line)[0] for line in lines] == [1, 2, 3]
+    assert json.loads(lines[2])[2] == 1
+    journal.close()
+
+
+def test_checkpoint_truncates_log_and_replaces_snapshot(path):
+    journal = GameJournal.create(path, BerkeleyGame(), checkpoint_every=2)
+    journal.ask_for(_question("e2e4"))
+    journal.flush()
+    journal.ask_for(_question("e7e5"))
+    journal.flush()
+
+    with open(checkpoint_path(path)) as f:
+        checkpoint = json.load(f)
+
+    assert _log_lines(path) == []
+    assert checkpoint["events"] == 2
+    assert checkpoint["game"]["schema_version"] == 10
+    assert not os.path.exists(checkpoint_path(path) + ".tmp")
+    journal.close()
+
+
+def test_explicit_checkpoint_covers_pending_events(path):
+    journal = GameJournal.create(path, BerkeleyGame())
+    journal.ask_for(_question("e2e4"))
+    journal.checkpoint()
+    journal.close()
+
+    assert _log_lines(path) == []
+    assert len(GameJournal.open(path).game._move_stack) == 1
+
+
+def test_events_covered_by_checkpoint_are_skipped(path):
+    journal = GameJournal.create(path, BerkeleyGame())
+    journal.ask_for(_question("e2e4"))
+    journal.flush()
+    stale_log = _log_lines(path)
+    journal.checkpoint()
+    journal.ask_for(_question("e7e5"))
+    journal.close()
+    # Simulate a crash between the checkpoint rename and the log truncation.
+    lines = stale_log + _log_lines(path)
+    with open(log_path(path), "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+    recovered = GameJournal.open(path)
+
+    assert [move.uci() for move in recovered.game._move_stack] == ["e2e4", "e7e5"]
+    recovered.close()
+
+
+def test_torn_final_line_is_discarded(path):
+    journal = GameJournal.create(path, BerkeleyGame())
+    journal.ask_for(_question("e2e4"))
+    journal.close()
+    with open(log_path(path), "a") as f:
+        f.write('[2,')
+
+    recovered = GameJournal.open(path)
+    recovered.ask_for(_question("e7e5"))
+    recovered.close()
+
+    assert [json.loads(line)[0] for line in _log_lines(path)] == [1, 2]
+    assert len(GameJournal.open(path).game._move_stack) == 2
+
+
+def test_torn_only_line_is_discarded(path):
+    GameJournal.create(path, BerkeleyGame()).close()
+    with open(log_path(path), "w") as f:
+        f.write('[1,')
+
+    recovered = GameJournal.open(path)
+    recovered.close()
+
+    assert _log_lines(path) == []
+
+
+@pytest.mark.parametrize("line,match", [
+    ('{"a":1}', "Invalid event log entry"),
+    ('["1",2,3]', "Invalid event log entry"),
+    ('[3,4,2]', "Missing events"),
+    ('[1,-1,2]', "Invalid packed question"),
+])
+def test_malformed_log_entries(path, line, match):
+    GameJournal.create(path, BerkeleyGame()).close()
+    with open(log_path(path), "w") as f:
+        f.write(line + "\n")
+
+    with pytest.raises(MalformedDataError, match=match):
+        GameJournal.open(path)
+
+
+def test_divergent_answer_is_reported(path):
+    journal = GameJournal.create(path, BerkeleyGame())
+    journal.ask_for(_question("e2e4"))
+    journal.close()
+    sequence, code, _ = json.loads(_log_lines(path)[0])
+    with open(log_path(path), "w") as f:
+        f.write(json.dumps([sequence, code, 1]) + "\n")
+
+    with pytest.raises(MalformedDataError, match="diverges from the log at event 1"):
+        GameJournal.open(path)
+
+
+@pytest.mark.parametrize("content,match", [
+    ("{oops", "Invalid JSON in checkpoint"),
+    ('{"game":{}}', "Invalid checkpoint"),
+    ('{"events":0,"game":[]}', "Invalid checkpoint"),
+])
+def test_malformed_checkpoints(path, content, match):
+    GameJournal.create(path, BerkeleyGame()).close()
+    with open(checkpoint_path(path), "w") as f:
+        f.write(content)
+
+    with pytest.raises(MalformedDataError, match=match):
+        GameJournal.open(path)
+
+
+def test_fsync_mode(path):
+    with GameJournal.create(path, BerkeleyGame(), checkpoint_every=1, fsync=True) as journal:
+        journal.ask_for(_question("e2e4"))
+        journal.flush()
+
+    assert _log_lines(path) == []
+    assert GameJournal.open(path).events == 1
+
+
+def test_invalid_checkpoint_interval(path):
+    with pytest.raises(ValueError, match="checkpoint_every"):
+        GameJournal.create(path, BerkeleyGame(), checkpoint_every=0)
+
+
+def test_io_errors(path, monkeypatch):
+    with pytest.raises(SerializationError, match="Failed to create game journal"):
+        GameJournal.create("/invalid/path/game", BerkeleyGame())
+    with pytest.raises(SerializationError, match="Failed to open game journal"):
+        GameJournal.open(path)
+
+    journal = GameJournal.create(path, BerkeleyGame())
+    journal.ask_for(_question("e2e4"))
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(SerializationError, match="Failed to checkpoint game journal"):
+        journal.checkpoint()
+    journal._log.close()
+    journal._log = open(log_path(path), "r")
+    with pytest.raises(SerializationError, match="Failed to write game journal"):
+        journal.flush()
+    journal._log.close()
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+"""Sharded referee farm tests."""
+
+import multiprocessing
+import os
+import pickle
+import random
+
+import chess
+import pytest
+
+from kriegspiel.farm import HashRing, RefereeFarm, ShardError, _reply, _Shard
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielAnswer as KSAnswer
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import MainAnnouncement as MA
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.serialization import serialize_berkeley_game
+from kriegspiel.server import UnknownGameError
+
+
+def _question(uci):
+    return KSMove(QA.COMMON, chess.Move.from_uci(uci))
+
+
+@pytest.fixture(scope="module")
+def farm():
+    with RefereeFarm(shards=2) as farm:
+        yield farm
+
+
+def test_hash_ring_is_stable_and_spreads_keys():
+    ring = HashRing(4)
+    keys = [f"game-{i}" for i in range(2000)]
+    nodes = [ring.node_for(key) for key in keys]
+
+    assert nodes == [HashRing(4).node_for(key) for key in keys]
+    assert all(nodes.count(node) > 250 for node in range(4))
+
+    # Adding a node only moves keys onto the new node.
+    grown = HashRing(5)
+    assert all(grown.node_for(key) in (node, 4) for key, node in zip(keys, nodes))
+
+    with pytest.raises(ValueError, match="must be positive"):
+        HashRing(0)
+
+
+def test_answers_match_in_process_games(farm):
+    rng = random.Random(7)
+    local = {ruleset: KriegspielGame(ruleset=ruleset) for ruleset in ("berkeley", "berkeley_any", "crazykrieg")}
+    game_ids = {ruleset: farm.create_game(ruleset=ruleset) for ruleset in local}
+    assert len({farm.shard_of(game_id) for game_id in game_ids.values()}) >= 1
+
+    for _ in range(60):
+        requests, expected = [], []
+        for ruleset, game in local.items():
+            if game.game_over:
+                continue
+            for _ in range(2):
+                question = rng.choice(sorted(game.possible_to_ask))
+                expected.append(game.ask_for(question))
+                requests.append((game_ids[ruleset], question))
+        assert farm.ask_many(requests) == expected
+
+    for ruleset, game in local.items():
+        snapshot = farm.snapshot(game_ids[ruleset])
+        assert snapshot == game.snapshot()
+        assert sorted(farm.possible_to_ask(game_ids[ruleset])) == sorted(game.possible_to_ask)
+        farm.close_game(game_ids[ruleset])
+
+
+def test_migration_keeps_game_state(farm):
+    game_id = farm.create_game(game_id="migrating")
+    farm.ask(game_id, _question("e2e4"))
+    home = farm.shard_of(game_id)
+
+    farm.migrate(game_id, 1 - home)
+    farm.migrate(game_id, 1 - home)
+
+    assert farm.shard_of(game_id) == 1 - home
+    assert farm.ask(game_id, _question("e7e5")) == KSAnswer(MA.REGULAR_MOVE)
+    local = KriegspielGame()
+    local.ask_for(_question("e2e4"))
+    local.ask_for(_question("e7e5"))
+    assert serialize_berkeley_game(KriegspielGame.from_snapshot(farm.snapshot(game_id))) == (
+        serialize_berkeley_game(local)
+    )
+
+    farm.migrate(game_id, home)
+    assert farm.shard_of(game_id) == home
+    assert farm.ask(game_id, _question("g1f3")) == KSAnswer(MA.REGULAR_MOVE)
+    farm.close_game(game_id)
+
+    with pytest.raises(ValueError, match="range 0..1"):
+        farm.migrate(game_id, 2)
+
+
+def test_failed_migration_keeps_the_game_on_its_shard():
+    with RefereeFarm(shards=2) as farm:
+        game_id = farm.create_game()
+        home = farm.shard_of(game_id)
+        farm.ask(game_id, _question("e2e4"))
+        # A game with the same id already lives on the target shard.
+        farm._run([("create", game_id, None)], shard=1 - home)
+
+        with pytest.raises(ValueError, match="already in use"):
+            farm.migrate(game_id, 1 - home)
+
+        assert farm.shard_of(game_id) == home
+        assert farm.snapshot(game_id).move_stack == ("e2e4",)
+        with pytest.raises(UnknownGameError):
+            farm.migrate("missing", farm.shard_of("missing"))
+        with pytest.raises(UnknownGameError):
+            farm.migrate("missing", 1 - farm.shard_of("missing"))
+
+
+def test_errors_are_raised_in_caller(farm):
+    game_id = farm.create_game()
+
+    with pytest.raises(ValueError, match="already in use"):
+        farm.create_game(game_id=game_id)
+    with pytest.raises(TypeError, match="must be a KriegspielMove"):
+        farm.ask(game_id, "e2e4")
+    with pytest.raises(UnknownGameError, match="Unknown game: missing"):
+        farm.ask("missing", _question("e2e4"))
+    with pytest.raises(UnknownGameError):
+        farm.close_game("missing")
+
+    # The failing question stops its game's batch; earlier questions are kept.
+    with pytest.raises(TypeError):
+        farm.ask_many([(game_id, _question("e2e4")), (game_id, None), (game_id, _question("e7e5"))])
+    assert len(farm.snapshot(game_id).move_stack) == 1
+    farm.close_game(game_id)
+
+
+def test_earliest_error_is_raised():
+    with RefereeFarm(shards=2) as farm:
+        game_id = next(f"g{i}" for i in range(100) if farm.shard_of(f"g{i}") == 0)
+        missing = next(f"g{i}" for i in range(100) if farm.shard_of(f"g{i}") == 1)
+        farm.create_game(game_id=game_id)
+
+        with pytest.raises(UnknownGameError):
+            farm.ask_many([(missing, _question("e2e4")), (game_id, None)])
+        with pytest.raises(TypeError):
+            farm.ask_many([(game_id, None), (missing, _question("e2e4"))])
+
+
+def test_batch_error_carries_the_applied_answers():
+    with RefereeFarm(shards=2) as farm:
+        first = next(f"g{i}" for i in range(100) if farm.shard_of(f"g{i}") == 0)
+        second = next(f"g{i}" for i in range(100) if farm.shard_of(f"g{i}") == 1)
+        farm.create_game(game_id=first)
+        farm.create_game(game_id=second)
+
+        with pytest.raises(TypeError) as raised:
+            farm.ask_many([
+                (second, _question("e2e4")), (first, None), (first, _question("e2e4")), (second, _question("e7e5")),
+            ])
+
+        assert raised.value.results == [KSAnswer(MA.REGULAR_MOVE), None, None, KSAnswer(MA.REGULAR_MOVE)]
+        assert list(raised.value.failures) == [1]
+        assert raised.value.failures[1] is raised.value
+        assert farm.snapshot(first).move_stack == ()
+        assert farm.snapshot(second).move_stack == ("e2e4", "e7e5")
+
+
+class _ExitOnUnpickle(object):
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+
+def test_failed_sends_and_dead_workers_leave_no_stale_replies():
+    with RefereeFarm(shards=2) as farm:
+        first = next(f"g{i}" for i in range(100) if farm.shard_of(f"g{i}") == 0)
+        second = next(f"g{i}" for i in range(100) if farm.shard_of(f"g{i}") == 1)
+        farm.create_game(game_id=first)
+        farm.create_game(game_id=second)
+
+        # The second shard's batch does not pickle; the first shard's reply is still read.
+        with pytest.raises((AttributeError, pickle.PicklingError)):
+            farm.ask_many([(first, _question("e2e4")), (second, lambda: None)])
+        assert farm.ask(first, _question("e7e5")) == KSAnswer(MA.REGULAR_MOVE)
+        assert farm.snapshot(first).move_stack == ("e2e4", "e7e5")
+
+        # The second worker dies while reading its batch.
+        with pytest.raises(EOFError):
+            farm.ask_many([(second, _ExitOnUnpickle()), (first, _question("g1f3"))])
+        assert farm.snapshot(first).move_stack == ("e2e4", "e7e5", "g1f3")
+
+
+def test_unpicklable_worker_replies_become_shard_errors():
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    error = ValueError("bad")
+    error.callback = lambda: None
+
+    _reply(sender, (["ok"], error, 0.5))
+    results, raised, busy = receiver.recv()
+    assert (results, busy) == (["ok"], 0.5)
+    assert isinstance(raised, ShardError) and str(raised).startswith("ValueError: ValueError('bad')")
+
+    _reply(sender, ([lambda: None], None, 0.5))
+    results, raised, _ = receiver.recv()
+    assert results == [] and isinstance(raised, ShardError)
+
+
+def test_stats():
+    with RefereeFarm(shards=2) as farm:
+        assert farm.shards == 2
+        assert farm.stats().asks_per_second == 0.0
+
+        game_ids = [farm.create_game() for _ in range(8)]
+        farm.ask_many([(game_id, _question("e2e4")) for game_id in game_ids])
+        stats = farm.stats()
+
+    assert stats.total_asks == 8
+    assert sum(stats.asks) == 8
+    assert stats.batches >= 9
+    assert stats.asks_per_second > 0
+    assert all(seconds >= 0 for seconds in stats.busy_seconds)
+    assert farm.shards == 0
+
+
+def test_default_shard_count():
+    with RefereeFarm() as farm:
+        assert farm.shards >= 1
+
+
+def test_shard_handles_batches_in_process():
+    shard = _Shard()
+    e2e4 = _question("e2e4")
+
+    results, error, seconds = shard.handle([
+        ("create", "a", "berkeley"), ("ask", "a", e2e4), ("possible", "a", None), ("check", "a", None),
+        ("snapshot", "a", None), ("close", "a", None),
+    ])
+    assert error is None and seconds >= 0
+    assert results[1] == KSAnswer(MA.REGULAR_MOVE)
+    assert e2e4 not in results[2]
+    assert shard.games == {}
+
+    results, error, _ = shard.handle([("import", "b", results[4]), ("snapshot", "b", None), ("close", "b", None)])
+    assert error is None
+    assert results[1].move_stack == ("e2e4",)
+
+    results, error, _ = shard.handle([
+        ("create", "c", None), ("create", "c", None), ("close", "c", None),
+    ])
+    assert results == [None]
+    assert str(error) == "Game id already in use: c"
+
+    results, error, _ = shard.handle([("dance", "d", None)])
+    assert results == []
+    assert str(error) == "Unknown op: 'dance'"
+
+    _, error, _ = shard.handle([("ask", "missing", e2e4)])
+    assert isinstance(error, UnknownGameError)
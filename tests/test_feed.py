@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""Announcement feed and broadcaster tests."""
+
+import asyncio
+import random
+
+import chess
+import pytest
+
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.feed import (
+    SPECTATOR, FeedBroadcaster, SpectatorDelay, player_announcement,
+)
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielAnswer as KSAnswer
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import MainAnnouncement as MA
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.wild16 import Wild16Game
+
+
+def _play(game, *questions):
+    for question in questions:
+        if question == "any":
+            game.ask_for(KSMove(QA.ASK_ANY))
+        else:
+            game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(question)))
+    return game
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def _flatten(turns):
+    return [entry for turn in turns for entry in turn]
+
+
+@pytest.mark.parametrize("ruleset", [
+    "berkeley", "berkeley_any", "cincinnati", "crazykrieg", "english", "rand", "wild16",
+])
+def test_player_feeds_match_scoresheets(ruleset):
+    for seed in range(3):
+        rng = random.Random(seed)
+        game = KriegspielGame(ruleset=ruleset)
+        events = []
+        game.subscribe(events.append)
+        for _ in range(120):
+            if game.game_over:
+                break
+            game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+
+        snapshot = game.snapshot()
+        for color, scoresheet in ((chess.WHITE, snapshot.white_scoresheet), (chess.BLACK, snapshot.black_scoresheet)):
+            announcements = [player_announcement(event, color) for event in events]
+            announcements = [announcement for announcement in announcements if announcement is not None]
+            assert [(a.question, a.answer) for a in announcements if a.own] == _flatten(scoresheet.moves_own)
+            assert [(a.question_type, a.answer) for a in announcements if not a.own] == (
+                _flatten(scoresheet.moves_opponent)
+            )
+            assert all(a.question is None for a in announcements if not a.own)
+
+
+def test_events_describe_the_answer():
+    game = BerkeleyGame()
+    events = []
+    game.subscribe(events.append)
+
+    _play(game, "e2e4", "e1e3", "e7e5", "e4e5")
+
+    assert [(event.color, event.answer.main_announcement, event.ply) for event in events] == [
+        (chess.WHITE, MA.REGULAR_MOVE, 1), (chess.BLACK, MA.REGULAR_MOVE, 2), (chess.WHITE, MA.ILLEGAL_MOVE, 2),
+    ]
+    assert events[-1].fen == game._board.fen()
+    assert not events[-1].game_over
+
+    game.unsubscribe(events.append)
+    _play(game, "g1f3")
+    assert len(events) == 3
+
+
+def test_spectator_delay():
+    game = BerkeleyGame()
+    delay = SpectatorDelay(2)
+    released = []
+    game.subscribe(lambda event: released.extend(delay.push(event)))
+
+    _play(game, "e2e4", "e7e5", "f1c4")
+    assert [move.ply for move in released] == [1]
+    _play(game, "a7a6", "d1h5", "b8c6")
+    assert [move.move.uci() for move in released] == ["e2e4", "e7e5", "f1c4", "a7a6"]
+
+    _play(game, "h5f7")
+    assert [move.ply for move in released] == [1, 2, 3, 4, 5, 6, 7]
+    assert released[-1].fen == game._board.fen()
+
+    with pytest.raises(ValueError, match="negative"):
+        SpectatorDelay(-1)
+
+
+def test_broadcast_to_game_channels():
+    broadcaster = FeedBroadcaster()
+    game = BerkeleyGame()
+    listener = broadcaster.attach(game, "g", spectator_delay=0)
+
+    async def scenario():
+        white = [broadcaster.subscribe(("g", chess.WHITE)) for _ in range(100)]
+        black = broadcaster.subscribe(("g", chess.BLACK))
+        spectator = broadcaster.subscribe(("g", SPECTATOR))
+        _play(game, "e2e4", "e7e5", "f1c4", "a7a6", "d1h5", "b8c6", "h5h8", "h5f7")
+        return (
+            [[item async for item in subscription] for subscription in white],
+            [item async for item in black],
+            [item async for item in spectator],
+        )
+
+    white, black, spectator = _run(scenario())
+
+    assert all(items == white[0] for items in white)
+    assert [(item.own, item.answer.main_announcement) for item in white[0]][-2:] == [
+        (True, MA.ILLEGAL_MOVE), (True, MA.CAPTURE_DONE),
+    ]
+    assert [item.own for item in black] == [False, True, False, True, False, True, False, False]
+    assert [item.move.uci() for item in spectator][-1] == "h5f7"
+    assert broadcaster.subscribers(("g", chess.WHITE)) == 0
+    assert broadcaster.delivered == 100 * 8 + 8 + 7
+
+    game.unsubscribe(listener)
+
+
+def test_private_illegal_attempts_are_not_broadcast():
+    broadcaster = FeedBroadcaster()
+    game = Wild16Game()
+    broadcaster.attach(game, "g")
+
+    async def scenario():
+        black = broadcaster.subscribe(("g", chess.BLACK))
+        _play(game, "e2e4", "e7e5", "e4e5")
+        return [await black.__anext__() for _ in range(black.pending())]
+
+    items = _run(scenario())
+
+    assert [(item.own, item.answer.main_announcement) for item in items] == [
+        (False, MA.REGULAR_MOVE), (True, MA.REGULAR_MOVE),
+    ]
+
+
+def test_slow_subscribers_are_dropped():
+    broadcaster = FeedBroadcaster(max_buffer=2)
+
+    async def scenario():
+        fast, slow = broadcaster.subscribe("k"), broadcaster.subscribe("k")
+        received = []
+        for item in range(5):
+            broadcaster.publish("k", item)
+            if item < 4:
+                received.append(await fast.__anext__())
+        assert slow.pending() == 1
+        fast.close()
+        fast.close()
+        return received, [item async for item in fast], [item async for item in slow], slow.dropped
+
+    received, rest, slow_items, dropped = _run(scenario())
+
+    assert received == [0, 1, 2, 3]
+    assert rest == [4]
+    assert slow_items == []
+    assert dropped
+    assert (broadcaster.published, broadcaster.dropped) == (5, 1)
+    assert broadcaster.subscribers("k") == 0
+    assert broadcaster.publish("nobody", 1) == 0
+
+
+def test_invalid_buffer():
+    with pytest.raises(ValueError, match="positive"):
+        FeedBroadcaster(max_buffer=0)
+
+
+def test_impossible_questions_produce_no_event():
+    game = BerkeleyGame()
+    events = []
+    game.subscribe(events.append)
+
+    assert game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("a1a8"))) == KSAnswer(MA.IMPOSSIBLE_TO_ASK)
+    assert events == []
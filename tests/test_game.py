@@ -3,6 +3,7 @@
 """Tests for the neutral shared-engine public API."""
 
 import os
+import random
 import tempfile
 
 import chess
@@ -16,12 +17,14 @@ from kriegspiel import KriegspielGame
 from kriegspiel import KriegspielMove as KSMove
 from kriegspiel import MainAnnouncement as MA
 from kriegspiel import MaterialSideSummary
+from kriegspiel import PlayerView
 from kriegspiel import PublicMaterialSummary
 from kriegspiel import PublicReserveSummary
 from kriegspiel import QuestionAnnouncement as QA
 from kriegspiel import RandGame
 from kriegspiel import ReserveSideSummary
 from kriegspiel import Wild16Game
+import kriegspiel.game as game_module
 from kriegspiel.move import CapturedPieceAnnouncement as CPA
 from kriegspiel.move import KriegspielAnswer as KSAnswer
 from kriegspiel.rulesets import RULESET_BERKELEY
@@ -70,6 +73,72 @@ def test_generic_game_load_game_returns_generic_class():
     assert restored._board.fen() == game._board.fen()
 
 
+def test_load_game_replays_the_move_stack_once(monkeypatch):
+    game = KriegspielGame(ruleset=RULESET_BERKELEY)
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e7e5")))
+    calls = []
+    original_from_snapshot = KriegspielGame._from_snapshot.__func__
+
+    def counting_from_snapshot(cls, snapshot):
+        calls.append(cls)
+        return original_from_snapshot(cls, snapshot)
+
+    monkeypatch.setattr(KriegspielGame, "_from_snapshot", classmethod(counting_from_snapshot))
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as handle:
+        filename = handle.name
+
+    try:
+        game.save_game(filename)
+        restored = BerkeleyGame.load_game(filename)
+    finally:
+        os.unlink(filename)
+
+    assert calls == [BerkeleyGame]
+    assert restored.__class__ is BerkeleyGame
+    assert set(restored.possible_to_ask) == set(game.possible_to_ask)
+    assert restored.snapshot().white_scoresheet == game.snapshot().white_scoresheet
+
+
+@pytest.mark.parametrize(
+    "wrapper_class",
+    [CincinnatiGame, CrazyKriegGame, EnglishGame, RandGame, Wild16Game],
+)
+def test_wrapper_copies_shared_engine_state_and_leaves_the_source_usable(wrapper_class):
+    game = KriegspielGame(ruleset=wrapper_class().ruleset_id)
+    game.enable_stats()
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+
+    wrapped = wrapper_class._from_kriegspiel_game(game)
+
+    assert wrapped.__class__ is wrapper_class
+    assert wrapped.snapshot() == game.snapshot()
+    assert wrapped._board is not game._board
+    assert wrapped._possible_to_ask is not game._possible_to_ask
+    assert wrapped._whites_scoresheet is not game._whites_scoresheet
+
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e7e5")))
+    assert game.stats().asks == 2
+    assert len(wrapped._move_stack) == 1
+
+
+def test_from_snapshot_does_not_regenerate_stored_questions(monkeypatch):
+    game = CincinnatiGame()
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+    snapshot = game.snapshot()
+
+    def fail_regeneration(self):
+        raise AssertionError("askable questions should come from the snapshot")
+
+    monkeypatch.setattr(KriegspielGame, "_generate_possible_to_ask_list", fail_regeneration)
+
+    restored = CincinnatiGame.from_snapshot(snapshot)
+
+    assert restored.__class__ is CincinnatiGame
+    assert set(restored.possible_to_ask) == set(game.possible_to_ask)
+
+
 def test_generic_game_from_snapshot_rejects_wrong_type():
     with pytest.raises(TypeError, match="KriegspielGameSnapshot"):
         KriegspielGame.from_snapshot("not-a-snapshot")
@@ -297,3 +366,142 @@ def test_package_root_exports_variant_entrypoints():
     assert PublicMaterialSummary.__name__ == "PublicMaterialSummary"
     assert PublicReserveSummary.__name__ == "PublicReserveSummary"
     assert ReserveSideSummary.__name__ == "ReserveSideSummary"
+    assert PlayerView.__name__ == "PlayerView"
+
+
+def _players_board_by_removal(board, color):
+    players_board = board.copy(stack=False)
+    for square, piece in board.piece_map().items():
+        if piece.color != color:
+            players_board.remove_piece_at(square)
+    return players_board
+
+
+@pytest.mark.parametrize("ruleset", ["berkeley", "crazykrieg"])
+def test_player_view_shows_own_pieces_at_every_ply(ruleset):
+    rng = random.Random(11)
+    game = KriegspielGame(ruleset=ruleset)
+    for _ in range(200):
+        if game.game_over:
+            break
+        for color in chess.COLORS:
+            view = game.player_view(color)
+            expected = _players_board_by_removal(game._board, color)
+            assert view.color == color
+            assert view.ply == len(game._move_stack)
+            assert view.board_fen == expected.board_fen(promoted=False)
+            assert view.occupied == expected.occupied
+            assert view.pawns | view.knights | view.bishops | view.rooks | view.queens | view.kings == view.occupied
+            assert dict(view.pieces) == expected.piece_map()
+            assert view.board().piece_map() == expected.piece_map()
+            assert view == PlayerView.from_board(game._board, color, view.ply)
+        assert game._build_players_board().fen() == _players_board_by_removal(game._board, game._board.turn).fen()
+        game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+
+
+def test_player_view_is_cached_per_ply():
+    game = BerkeleyGame()
+    white = game.player_view(chess.WHITE)
+
+    assert game.player_view(chess.WHITE) is white
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e5")))
+    assert game.player_view(chess.WHITE) is white
+
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+    moved = game.player_view(chess.WHITE)
+    assert moved is not white
+    assert moved.ply == 1
+    assert chess.E4 in dict(moved.pieces)
+    assert game.player_view(chess.BLACK).board_fen == "rnbqkbnr/pppppppp/8/8/8/8/8/8"
+
+
+def test_player_view_is_rebuilt_only_when_more_than_one_move_behind(monkeypatch):
+    game = BerkeleyGame()
+    game.player_view(chess.WHITE)
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+    rebuilt = []
+    from_board = PlayerView.from_board
+    monkeypatch.setattr(PlayerView, "from_board", lambda *args: rebuilt.append(args) or from_board(*args))
+
+    assert game.player_view(chess.WHITE).board_fen == "8/8/8/8/4P3/8/PPPP1PPP/RNBQKBNR"
+    assert rebuilt == []
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("d7d5")))
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e4d5")))
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("d8d5")))
+    assert game.player_view(chess.WHITE).board_fen == "8/8/8/8/8/8/PPPP1PPP/RNBQKBNR"
+    assert len(rebuilt) == 1
+
+
+@pytest.mark.parametrize("ruleset", ["berkeley_any", "crazykrieg", "english", "wild16"])
+def test_copy_is_independent(ruleset):
+    rng = random.Random(4)
+    game = KriegspielGame(ruleset=ruleset)
+    for _ in range(60):
+        if game.game_over:
+            break
+        game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+    game.subscribe(lambda event: None)
+    before = game.snapshot()
+
+    copy = game.copy()
+    assert type(copy) is KriegspielGame
+    assert copy.snapshot() == before
+    assert copy._listeners == []
+
+    restored = KriegspielGame.from_snapshot(before)
+    for _ in range(30):
+        if copy.game_over:
+            break
+        question = rng.choice(sorted(copy.possible_to_ask))
+        assert copy.ask_for(question) == restored.ask_for(question)
+    assert copy.snapshot() == restored.snapshot()
+    assert game.snapshot() == before
+
+
+def test_copy_keeps_wrapper_class_and_lazy_scoresheets(tmp_path):
+    game = Wild16Game()
+    game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+    filename = str(tmp_path / "game.json")
+    game.save_game(filename)
+    loaded = Wild16Game.load_game(filename, lazy=True)
+    assert not loaded._whites_scoresheet.decoded
+
+    copy = loaded.copy()
+    copy.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e7e5")))
+
+    assert isinstance(copy, Wild16Game)
+    assert not loaded._whites_scoresheet.decoded
+    assert loaded.snapshot().white_scoresheet == game.snapshot().white_scoresheet
+    assert loaded.snapshot().move_stack == ("e2e4",)
+    assert len(copy.snapshot().white_scoresheet.moves_opponent) == 1
+
+
+def test_idle_games_share_questions_answers_and_keep_no_board_history():
+    first = KriegspielGame(ruleset="berkeley")
+    second = KriegspielGame(ruleset="berkeley")
+    for uci in ("e2e4", "e7e5", "g1f3"):
+        for game in (first, second):
+            game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+
+    assert first._board.move_stack == []
+    assert [move.uci() for move in first._move_stack] == ["e2e4", "e7e5", "g1f3"]
+    assert all(a is b for a, b in zip(first._move_stack, second._move_stack))
+    assert first._whites_scoresheet.last_own_answer is second._whites_scoresheet.last_own_answer
+    assert {id(question) for question in first.possible_to_ask} == {id(question) for question in second.possible_to_ask}
+    assert first.possible_to_ask is not first.possible_to_ask
+    assert not hasattr(first.snapshot(), "__dict__")
+
+
+def test_shared_questions_and_answers_are_read_only():
+    first = KriegspielGame(ruleset="berkeley")
+    second = KriegspielGame(ruleset="berkeley")
+    question = next(q for q in first.possible_to_ask if q.question_type == QA.COMMON)
+    answer = first.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4")))
+
+    with pytest.raises(AttributeError, match="immutable"):
+        question.chess_move = chess.Move.from_uci("a2a4")
+    with pytest.raises(AttributeError, match="immutable"):
+        answer._main_announcement = MA.ILLEGAL_MOVE
+    assert answer.main_announcement == MA.REGULAR_MOVE
+    assert question in second.possible_to_ask
+    assert second.ask_for(KSMove(QA.COMMON, chess.Move.from_uci("e2e4"))) is answer
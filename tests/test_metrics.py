@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+"""Prometheus metrics tests."""
+
+import re
+import subprocess
+import sys
+
+import chess
+import pytest
+
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.english import EnglishGame
+from kriegspiel.metrics import LatencyHistogram, RefereeMetrics
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.wild16 import Wild16Game
+
+
+def _play(game, *questions):
+    for question in questions:
+        if question == "any":
+            game.ask_for(KSMove(QA.ASK_ANY))
+        else:
+            game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(question)))
+    return game
+
+
+def _samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_questions_are_recorded():
+    metrics = RefereeMetrics()
+    game = BerkeleyGame()
+    metrics.attach(game)
+
+    _play(game, "e2e4", "e7e5", "e4e5", "a1a8", "g1f3")
+
+    samples = _samples(metrics.render())
+    assert samples['kriegspiel_ask_for_seconds_count{ruleset="berkeley_any"}'] == 5
+    assert samples['kriegspiel_ask_for_seconds_bucket{ruleset="berkeley_any",le="+Inf"}'] == 5
+    assert samples['kriegspiel_regeneration_seconds_count{ruleset="berkeley_any"}'] == 3
+    assert samples['kriegspiel_answers_total{ruleset="berkeley_any",announcement="REGULAR_MOVE"}'] == 3
+    assert samples['kriegspiel_answers_total{ruleset="berkeley_any",announcement="ILLEGAL_MOVE"}'] == 1
+    assert samples['kriegspiel_answers_total{ruleset="berkeley_any",announcement="IMPOSSIBLE_TO_ASK"}'] == 1
+    assert samples['kriegspiel_answers_total{ruleset="berkeley_any",announcement="CAPTURE_DONE"}'] == 0
+    assert samples['kriegspiel_games_total{ruleset="berkeley_any"}'] == 1
+    assert samples["kriegspiel_save_seconds_count"] == 0
+
+    metrics.detach(game)
+    _play(game, "a7a6")
+    assert _samples(metrics.render())['kriegspiel_ask_for_seconds_count{ruleset="berkeley_any"}'] == 5
+
+
+def test_rulesets_are_labelled_separately():
+    metrics = RefereeMetrics()
+    for game in (BerkeleyGame(), Wild16Game(), Wild16Game()):
+        metrics.attach(game)
+        _play(game, "e2e4")
+
+    samples = _samples(metrics.render())
+    assert samples['kriegspiel_games_total{ruleset="wild16"}'] == 2
+    assert samples['kriegspiel_ask_for_seconds_count{ruleset="wild16"}'] == 2
+    assert samples['kriegspiel_ask_for_seconds_count{ruleset="berkeley_any"}'] == 1
+
+
+def test_nested_regeneration_is_timed():
+    metrics = RefereeMetrics()
+    game = _play(EnglishGame(), "e2e4", "d7d5", "any")
+    metrics.attach(game)
+
+    # A failed pawn try after HAS_ANY rebuilds the questions inside ask_for.
+    _play(game, "e4f5")
+
+    samples = _samples(metrics.render())
+    assert samples['kriegspiel_answers_total{ruleset="english",announcement="ILLEGAL_MOVE"}'] == 1
+    assert samples['kriegspiel_regeneration_seconds_count{ruleset="english"}'] == 1
+    assert samples['kriegspiel_ask_for_seconds_sum{ruleset="english"}'] >= (
+        samples['kriegspiel_regeneration_seconds_sum{ruleset="english"}']
+    )
+
+
+def test_games_observed_without_attach_are_recorded():
+    metrics = RefereeMetrics()
+    berkeley = BerkeleyGame()
+    english = _play(EnglishGame(), "e2e4", "d7d5", "any")
+    berkeley.add_observer(metrics)
+    english.add_observer(metrics)
+
+    _play(berkeley, "a1a8", "e2e4")
+    _play(english, "e4f5")
+
+    samples = _samples(metrics.render())
+    assert samples['kriegspiel_ask_for_seconds_count{ruleset="berkeley_any"}'] == 2
+    assert samples['kriegspiel_regeneration_seconds_count{ruleset="english"}'] == 1
+    assert samples['kriegspiel_answers_total{ruleset="english",announcement="ILLEGAL_MOVE"}'] == 1
+    assert samples['kriegspiel_games_total{ruleset="berkeley_any"}'] == 0
+
+
+def test_exposition_format():
+    metrics = RefereeMetrics(referee_buckets=(0.5, 1.0))
+    game = BerkeleyGame()
+    metrics.attach(game)
+    _play(game, "e2e4")
+
+    text = metrics.render()
+    assert text.endswith("\n")
+    assert "# TYPE kriegspiel_ask_for_seconds histogram\n" in text
+    assert "# TYPE kriegspiel_answers_total counter\n" in text
+    assert (
+        'kriegspiel_ask_for_seconds_bucket{ruleset="berkeley_any",le="0.5"} 1\n'
+        'kriegspiel_ask_for_seconds_bucket{ruleset="berkeley_any",le="1.0"} 1\n'
+        'kriegspiel_ask_for_seconds_bucket{ruleset="berkeley_any",le="+Inf"} 1\n'
+    ) in text
+    assert 'kriegspiel_load_seconds_bucket{le="+Inf"} 0\n' in text
+    sample = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? [0-9.e+-]+$')
+    assert all(line.startswith("# ") or sample.match(line) for line in text.splitlines())
+
+    with pytest.raises(ValueError, match="increasing"):
+        RefereeMetrics(referee_buckets=(1.0, 0.5))
+
+
+def test_save_and_load_are_timed(tmp_path):
+    metrics = RefereeMetrics()
+    game = _play(Wild16Game(), "e2e4", "e7e5")
+    filename = str(tmp_path / "game.json")
+
+    metrics.save_game(game, filename)
+    metrics.save_game(game, filename, compact=True)
+    loaded = metrics.load_game(Wild16Game, filename)
+    _play(loaded, "g1f3")
+
+    assert isinstance(loaded, Wild16Game)
+    samples = _samples(metrics.render())
+    assert samples["kriegspiel_save_seconds_count"] == 2
+    assert samples["kriegspiel_load_seconds_count"] == 1
+    assert samples["kriegspiel_save_seconds_sum"] > 0
+    assert samples['kriegspiel_ask_for_seconds_count{ruleset="wild16"}'] == 1
+
+    prom = tmp_path / "kriegspiel.prom"
+    metrics.write(str(prom))
+    assert prom.read_text() == metrics.render()
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == ".tmp"] == []
+
+
+def test_label_values_are_escaped():
+    from kriegspiel.metrics import _labels
+
+    assert _labels({}) == ""
+    assert _labels({"a": 'x"y\\z\n'}) == '{a="x\\"y\\\\z\\n"}'
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram((0.001, 0.01))
+    for seconds in (0.0005, 0.001, 0.005, 1.0):
+        histogram.observe(seconds)
+
+    assert histogram.buckets() == ((0.001, 2), (0.01, 1), (float("inf"), 1))
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(1.0065)
+
+    with pytest.raises(ValueError, match="increasing"):
+        LatencyHistogram((0.01, 0.001))
+    with pytest.raises(ValueError, match="increasing"):
+        LatencyHistogram(())
+
+
+def test_metrics_do_not_import_the_store():
+    code = "import sys, kriegspiel.metrics; print('kriegspiel.store' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout == "False\n"
@@ -11,6 +11,9 @@ These are primarily unit tests focusing on data validation,
 type checking, and individual component behavior.
 """
 
+import copy
+import pickle
+
 import pytest
 
 from kriegspiel.berkeley import chess
@@ -25,6 +28,8 @@ from kriegspiel.move import MainAnnouncement as MA
 from kriegspiel.move import SpecialCaseAnnouncement as SCA
 
 from kriegspiel.move import KriegspielScoresheet as KSSS
+import kriegspiel.move as move_module
+from kriegspiel.move import _frozen_answer
 
 @pytest.mark.unit
 def test_incorrect_move_type():
@@ -580,3 +585,71 @@ def test_ksss_opponent_not_enough_details_in_response():
     a = KSSS(chess.BLACK)
     with pytest.raises(ValueError):
         a.record_move_opponent(QA.COMMON, MA.REGULAR_MOVE)
+
+
+def test_ksss_turn_lists_are_rebuilt_on_access():
+    scoresheet = KSSS(chess.WHITE)
+    scoresheet.record_move_own(KSMove(QA.COMMON, chess.Move(chess.E2, chess.E5)), KSAnswer(MA.ILLEGAL_MOVE))
+    scoresheet.moves_own[0].clear()
+    scoresheet.moves_own.append([])
+
+    assert len(scoresheet.moves_own) == 1 and len(scoresheet.moves_own[0]) == 1
+    assert scoresheet.moves_own is not scoresheet.moves_own
+    assert KSSS.from_snapshot(scoresheet.snapshot()).snapshot() == scoresheet.snapshot()
+
+
+def test_ksss_single_turn_accessors_match_the_nested_lists():
+    scoresheet = KSSS(chess.WHITE)
+    e4 = KSMove(QA.COMMON, chess.Move.from_uci("e2e4"))
+    d4 = KSMove(QA.COMMON, chess.Move.from_uci("d2d4"))
+    scoresheet.record_move_own(e4, KSAnswer(MA.REGULAR_MOVE))
+    scoresheet.record_move_opponent(QA.COMMON, KSAnswer(MA.REGULAR_MOVE))
+    scoresheet.record_move_own(d4, KSAnswer(MA.ILLEGAL_MOVE))
+    scoresheet.record_move_own(d4, KSAnswer(MA.REGULAR_MOVE))
+    turns_own, turns_opponent = scoresheet.moves_own, scoresheet.moves_opponent
+
+    def lazy():
+        return KSSS._lazy(chess.WHITE, 2, lambda: (turns_own, turns_opponent), (0, 0), None)
+
+    for sheet in (scoresheet, lazy()):
+        assert [sheet.own_turn(i) for i in (0, 1, -1, -2)] == [turns_own[i] for i in (0, 1, -1, -2)]
+    for sheet in (scoresheet, lazy()):
+        assert sheet.opponent_turn(-1) == sheet.opponent_turn(0) == turns_opponent[0]
+    assert (lazy().own_turn_count, lazy().opponent_turn_count) == (2, 1)
+    assert (scoresheet.own_turn_count, scoresheet.opponent_turn_count) == (2, 1)
+    with pytest.raises(IndexError):
+        scoresheet.own_turn(2)
+    with pytest.raises(IndexError):
+        scoresheet.opponent_turn(-2)
+
+
+def test_moves_and_answers_have_no_instance_dict():
+    assert not hasattr(KSMove(QA.ASK_ANY), "__dict__")
+    assert not hasattr(KSAnswer(MA.NO_ANY), "__dict__")
+    assert not hasattr(KSSS(chess.WHITE), "__dict__")
+
+
+def test_moves_and_shared_answers_are_immutable_and_round_trip():
+    question = KSMove(QA.COMMON, chess.Move.from_uci("e2e4"))
+    answer = _frozen_answer(KSAnswer(MA.CAPTURE_DONE, capture_at_square=chess.E5))
+
+    with pytest.raises(AttributeError, match="immutable"):
+        question.chess_move = chess.Move.from_uci("a2a4")
+    with pytest.raises(AttributeError, match="immutable"):
+        del question.question_type
+    with pytest.raises(AttributeError, match="immutable"):
+        answer._capture_at_square = chess.E4
+    with pytest.raises(AttributeError, match="immutable"):
+        del answer._move_done
+    assert _frozen_answer(answer) is answer
+    for value in (question, answer):
+        for restored in (pickle.loads(pickle.dumps(value)), copy.copy(value), copy.deepcopy(value)):
+            assert restored == value and type(restored) is type(value)
+
+
+def test_answers_are_not_interned_once_the_cache_is_full(monkeypatch):
+    monkeypatch.setattr(move_module, "ANSWER_CACHE_SIZE", 0)
+    answer = KSAnswer(MA.REGULAR_MOVE, next_turn_pawn_tries=99)
+
+    assert move_module._shared_answer(answer) is answer
+    assert answer not in move_module._ANSWERS
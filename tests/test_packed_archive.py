@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+
+"""Memory-mapped packed archive tests."""
+
+import os
+import random
+import struct
+import tempfile
+
+import chess
+import pytest
+
+from kriegspiel.archive import ArchiveHeader, game_header
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.packed_archive import (
+    ENCODING_BINARY, ENCODING_JSON, PackedArchive,
+    compact_directories, main, sidecar_path, write_packed_archive,
+)
+from kriegspiel.serialization import (
+    MalformedDataError, SerializationError, UnsupportedVersionError, serialize_berkeley_game,
+)
+from kriegspiel.snapshot import KriegspielGameSnapshot
+
+
+def _play(game, *ucis):
+    for uci in ucis:
+        game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+    return game
+
+
+def _random_game(ruleset, seed, questions=80):
+    rng = random.Random(seed)
+    game = KriegspielGame(ruleset=ruleset)
+    for _ in range(questions):
+        if game.game_over:
+            break
+        game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+    return game
+
+
+@pytest.fixture
+def directory():
+    with tempfile.TemporaryDirectory() as path:
+        yield path
+
+
+@pytest.mark.parametrize("encoding,compression", [
+    (ENCODING_BINARY, None), (ENCODING_BINARY, "zlib"), (ENCODING_JSON, None),
+])
+def test_random_access_roundtrip(directory, encoding, compression):
+    games = [_random_game(ruleset, seed) for ruleset in ("berkeley", "rand", "crazykrieg") for seed in range(2)]
+    path = os.path.join(directory, "games.kspa")
+
+    assert write_packed_archive(games, path, encoding=encoding, compression=compression) == len(games)
+
+    with PackedArchive(path) as archive:
+        assert len(archive) == len(games)
+        assert archive.encoding == encoding
+        for game_id in reversed(range(len(games))):
+            restored = archive.game(game_id)
+            assert serialize_berkeley_game(restored) == serialize_berkeley_game(games[game_id])
+            assert archive.header(game_id) == game_header(games[game_id])
+        assert isinstance(archive.snapshot(-1), KriegspielGameSnapshot)
+
+
+def test_game_builds_requested_class(directory):
+    path = os.path.join(directory, "games.kspa")
+    write_packed_archive([_play(CincinnatiGame(), "e2e4"), BerkeleyGame()], path)
+
+    with PackedArchive(path) as archive:
+        assert isinstance(archive.game(0, game_class=CincinnatiGame), CincinnatiGame)
+        with pytest.raises(MalformedDataError, match="must use the cincinnati ruleset"):
+            archive.game(1, game_class=CincinnatiGame)
+
+
+def test_find_uses_sidecar_index(directory):
+    games = [
+        _play(BerkeleyGame(), "f2f3", "e7e5", "g2g4", "d8h4"),
+        _play(KriegspielGame(ruleset="english"), "e2e4"),
+        _play(BerkeleyGame(), "e2e4", "f7f6", "d2d4", "g7g5", "d1h5"),
+    ]
+    path = os.path.join(directory, "games.kspa")
+    write_packed_archive(games, path)
+
+    with PackedArchive(path) as archive:
+        assert list(archive.find()) == [0, 1, 2]
+        assert list(archive.find(ruleset="berkeley_any")) == [0, 2]
+        assert list(archive.find(result="1-0")) == [2]
+        assert list(archive.find(min_plies=2, max_plies=4)) == [0]
+        assert list(archive.find(max_plies=1)) == [1]
+        assert archive.header(1) == ArchiveHeader(ruleset_id="english", result="*", plies=1)
+
+
+def test_empty_archive(directory):
+    path = os.path.join(directory, "games.kspa")
+    assert write_packed_archive([], path) == 0
+
+    with PackedArchive(path) as archive:
+        assert len(archive) == 0
+        assert list(archive.find()) == []
+        with pytest.raises(IndexError):
+            archive.record(0)
+
+
+def test_game_id_out_of_range(directory):
+    path = os.path.join(directory, "games.kspa")
+    write_packed_archive([BerkeleyGame()], path)
+
+    with PackedArchive(path) as archive:
+        with pytest.raises(IndexError, match="out of range"):
+            archive.game(1)
+        with pytest.raises(IndexError, match="out of range"):
+            archive.header(-2)
+
+
+def test_compaction_merges_directories(directory, capsys):
+    sources = [os.path.join(directory, name) for name in ("a", "b")]
+    games = [[_play(BerkeleyGame(), "e2e4"), BerkeleyGame()], [_play(CincinnatiGame(), "d2d4", "d7d5")]]
+    for source, source_games in zip(sources, games):
+        os.mkdir(source)
+        for index, game in enumerate(source_games):
+            game.save_game(os.path.join(source, f"{index}.json"))
+    path = os.path.join(directory, "games.kspa")
+
+    assert main([path, *sources, "--encoding", "json"]) == 0
+
+    assert "games=3" in capsys.readouterr().out
+    with PackedArchive(path) as archive:
+        assert archive.encoding == ENCODING_JSON
+        assert [archive.header(game_id).plies for game_id in range(3)] == [1, 0, 2]
+        assert archive.game(2).ruleset_id == "cincinnati"
+
+
+def test_compact_directories_with_compression(directory):
+    source = os.path.join(directory, "games")
+    os.mkdir(source)
+    _play(BerkeleyGame(), "e2e4").save_game(os.path.join(source, "game.json"), compact=True)
+    path = os.path.join(directory, "games.kspa")
+
+    report = compact_directories([source], path, compression="lzma")
+
+    assert report.files == 1 and report.failures == []
+    with PackedArchive(path) as archive:
+        assert archive.header(0).plies == 1
+
+
+def test_compaction_skips_and_reports_bad_files(directory, capsys):
+    source = os.path.join(directory, "games")
+    os.mkdir(source)
+    _play(BerkeleyGame(), "e2e4").save_game(os.path.join(source, "a.json"))
+    with open(os.path.join(source, "b.json"), "w") as f:
+        f.write("{not json")
+    with open(os.path.join(source, "c.json"), "w") as f:
+        f.write("[]")
+    BerkeleyGame().save_game(os.path.join(source, "d.json"))
+    path = os.path.join(directory, "games.kspa")
+
+    assert main([path, source]) == 1
+
+    out = capsys.readouterr().out
+    assert f"error path={os.path.join(source, 'b.json')} type=MalformedDataError" in out
+    assert "games=2" in out and "failures=2" in out
+    with PackedArchive(path) as archive:
+        assert [archive.header(game_id).plies for game_id in range(len(archive))] == [1, 0]
+
+
+def test_failed_write_keeps_the_previous_archive(directory):
+    path = os.path.join(directory, "games.kspa")
+    write_packed_archive([_play(BerkeleyGame(), "e2e4")], path)
+
+    def games():
+        yield BerkeleyGame()
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError, match="source failed"):
+        write_packed_archive(games(), path)
+
+    assert sorted(os.listdir(directory)) == ["games.kspa", "games.kspa.idx"]
+    with PackedArchive(path) as archive:
+        assert len(archive) == 1 and archive.header(0).plies == 1
+
+
+def test_unsupported_encoding(directory):
+    with pytest.raises(ValueError, match="Unsupported encoding"):
+        write_packed_archive([], os.path.join(directory, "games.kspa"), encoding="xml")
+
+
+def test_compression_requires_the_binary_encoding(directory, capsys):
+    path = os.path.join(directory, "games.kspa")
+
+    with pytest.raises(ValueError, match="Compression is not supported for the json encoding"):
+        write_packed_archive([BerkeleyGame()], path, encoding=ENCODING_JSON, compression="zlib")
+    with pytest.raises(SystemExit):
+        main([path, directory, "--encoding", "json", "--compression", "zlib"])
+
+    assert "--compression is not supported" in capsys.readouterr().err
+    assert not os.path.exists(path)
+
+
+def test_failed_sidecar_replace_is_detected(directory, monkeypatch):
+    path = os.path.join(directory, "games.kspa")
+    write_packed_archive([BerkeleyGame()], path)
+    replace = os.replace
+
+    def fail_on_sidecar(source, target):
+        if target == sidecar_path(path):
+            raise OSError("disk full")
+        replace(source, target)
+
+    monkeypatch.setattr(os, "replace", fail_on_sidecar)
+    with pytest.raises(SerializationError, match="Failed to write packed archive"):
+        write_packed_archive([_play(BerkeleyGame(), "e2e4")], path)
+
+    assert sorted(os.listdir(directory)) == ["games.kspa", "games.kspa.idx"]
+    with PackedArchive(path) as archive:
+        assert len(archive.game(0)._move_stack) == 1
+        with pytest.raises(MalformedDataError, match="does not match the archive"):
+            archive.header(0)
+
+
+def test_io_errors(directory):
+    with pytest.raises(SerializationError, match="Failed to write packed archive"):
+        write_packed_archive([BerkeleyGame()], "/invalid/path/games.kspa")
+    with pytest.raises(SerializationError, match="Failed to open packed archive"):
+        PackedArchive("/nonexistent/games.kspa")
+
+    path = os.path.join(directory, "games.kspa")
+    write_packed_archive([BerkeleyGame()], path)
+    os.unlink(sidecar_path(path))
+    with PackedArchive(path) as archive:
+        assert archive.game(0).ruleset_id == "berkeley_any"
+        with pytest.raises(SerializationError, match="Failed to read sidecar index"):
+            archive.header(0)
+
+
+def _rewrite(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _archive_bytes(directory, games=(), encoding=ENCODING_BINARY):
+    path = os.path.join(directory, "games.kspa")
+    write_packed_archive(list(games) or [BerkeleyGame()], path, encoding=encoding)
+    with open(path, "rb") as f:
+        return path, bytearray(f.read())
+
+
+@pytest.mark.parametrize("mutate,error,match", [
+    (lambda data: data[:10], MalformedDataError, "Truncated packed archive"),
+    (lambda data: b"XXXX" + data[4:], MalformedDataError, "Invalid packed archive magic"),
+    (lambda data: data[:4] + bytes([9]) + data[5:], UnsupportedVersionError, "Unsupported packed archive version"),
+    (lambda data: data[:5] + bytes([7]) + data[6:], MalformedDataError, "Unsupported packed archive encoding"),
+    (lambda data: data + b"\0", MalformedDataError, "Invalid offset index"),
+])
+def test_malformed_archive_headers(directory, mutate, error, match):
+    path, data = _archive_bytes(directory)
+    _rewrite(path, bytes(mutate(data)))
+
+    with pytest.raises(error, match=match):
+        PackedArchive(path)
+
+
+def test_empty_file_cannot_be_opened(directory):
+    path = os.path.join(directory, "games.kspa")
+    _rewrite(path, b"")
+
+    with pytest.raises(SerializationError, match="Failed to open packed archive"):
+        PackedArchive(path)
+
+
+@pytest.mark.parametrize("offset,length", [(24, 10 ** 6), (0, 8)])
+def test_malformed_index_entry(directory, offset, length):
+    path, data = _archive_bytes(directory)
+    index_offset = struct.unpack_from("<Q", data, 16)[0]
+    struct.pack_into("<QQ", data, index_offset, offset, length)
+    _rewrite(path, bytes(data))
+
+    with PackedArchive(path) as archive:
+        with pytest.raises(MalformedDataError, match="Invalid offset index entry"):
+            archive.game(0)
+
+
+def test_malformed_json_record(directory):
+    path, data = _archive_bytes(directory, encoding=ENCODING_JSON)
+    data[24] = ord("[")
+    _rewrite(path, bytes(data))
+
+    with PackedArchive(path) as archive:
+        with pytest.raises(MalformedDataError, match="Invalid JSON record"):
+            archive.snapshot(0)
+
+
+def test_malformed_game_record(directory):
+    path, data = _archive_bytes(directory, games=[BerkeleyGame()])
+    fen_start = bytes(data).index(b"rnbqkbnr")
+    data[fen_start:fen_start + 8] = b"rnbqkbnq"
+    _rewrite(path, bytes(data))
+
+    with PackedArchive(path) as archive:
+        with pytest.raises(MalformedDataError):
+            archive.game(0)
+
+
+@pytest.mark.parametrize("mutate,error,match", [
+    (lambda data: b"XXXX" + data[4:], MalformedDataError, "Invalid sidecar index magic"),
+    (lambda data: data[:4] + bytes([9]) + data[5:], UnsupportedVersionError, "Unsupported sidecar index version"),
+    (lambda data: data[:5] + struct.pack("<I", 5) + data[9:], MalformedDataError, "does not match"),
+    (lambda data: data[:-1], MalformedDataError, "Invalid sidecar index"),
+    (lambda data: data[:9] + struct.pack("<Q", 1) + data[17:], MalformedDataError, "does not match"),
+    (lambda data: data[:17] + struct.pack("<I", 1) + data[21:], MalformedDataError, "does not match"),
+    (lambda data: data[:21] + bytes([2]) + data[22:], MalformedDataError, "Invalid sidecar index"),
+    (lambda data: data[:2], MalformedDataError, "Invalid sidecar index"),
+    (lambda data: data + bytes(6), MalformedDataError, "Invalid sidecar index"),
+])
+def test_malformed_sidecar_index(directory, mutate, error, match):
+    path, _ = _archive_bytes(directory)
+    with open(sidecar_path(path), "rb") as f:
+        data = f.read()
+    _rewrite(sidecar_path(path), bytes(mutate(data)))
+
+    with PackedArchive(path) as archive:
+        with pytest.raises(error, match=match):
+            archive.header(0)
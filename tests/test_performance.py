@@ -87,6 +87,26 @@ class TestPerformance:
 
         assert elapsed_time < 0.15, f"200-move game took {elapsed_time:.3f}s, expected < 0.15s"
 
+    def test_scoresheet_last_turn_access_does_not_grow_with_the_game(self):
+        """Reading the last turn of a 200-move game must not rebuild the whole history."""
+        g = BerkeleyGame()
+        for _ in range(50):
+            g.ask_for(KSMove(QA.COMMON, chess.Move(chess.G1, chess.F3)))
+            g.ask_for(KSMove(QA.COMMON, chess.Move(chess.G8, chess.F6)))
+            g.ask_for(KSMove(QA.COMMON, chess.Move(chess.F3, chess.G1)))
+            g.ask_for(KSMove(QA.COMMON, chess.Move(chess.F6, chess.G8)))
+        sheet = g._whites_scoresheet
+        assert sheet.own_turn(-1) == sheet.moves_own[-1]
+        with _coverage_tracing_paused():
+            start_time = _perf_now()
+            for _ in range(10000):
+                sheet.own_turn(-1)
+                sheet.opponent_turn(-1)
+                sheet.last_own_answer
+            elapsed_time = _perf_now() - start_time
+
+        assert elapsed_time < 0.05, f"10000 last-turn reads took {elapsed_time:.3f}s, expected < 0.05s"
+
     def test_move_generation_performance_initial_position(self):
         """Repeated regeneration from the initial position should stay comfortably sublinear."""
         elapsed_time = _measure_regeneration(BerkeleyGame(), 2000)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""Kriegspiel perft tests."""
+
+import chess
+import pytest
+
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.perft import REFERENCE_COUNTS, kperft, kperft_divide, main
+
+
+def _perft_by_snapshot(game, depth):
+    """Reference perft that rebuilds every child from a snapshot instead of `copy()`."""
+    if depth == 0:
+        return 1
+    nodes = 0
+    snapshot = game.snapshot()
+    for question in sorted(game.possible_to_ask):
+        child = KriegspielGame.from_snapshot(snapshot)
+        child.ask_for(question)
+        nodes += _perft_by_snapshot(child, depth - 1)
+    return nodes
+
+
+@pytest.mark.parametrize("ruleset", sorted(REFERENCE_COUNTS))
+def test_reference_counts(ruleset):
+    game = KriegspielGame(ruleset=ruleset)
+    before = game.snapshot()
+
+    assert tuple(kperft(game, depth) for depth in range(1, 4)) == REFERENCE_COUNTS[ruleset][:3]
+    assert kperft(game, 0) == 1
+    assert game.snapshot() == before
+
+
+@pytest.mark.parametrize("ruleset", ["berkeley_any", "crazykrieg", "english", "rand"])
+def test_copy_matches_snapshot_rebuilds(ruleset):
+    game = KriegspielGame(ruleset=ruleset)
+    for uci in ("e2e4", "d7d5"):
+        game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+
+    assert kperft(game, 2) == _perft_by_snapshot(game, 2)
+
+
+def test_finished_games_have_no_children():
+    game = KriegspielGame(ruleset="berkeley")
+    for uci in ("e2e4", "e7e5", "f1c4", "a7a6", "d1h5", "b8c6", "h5f7"):
+        game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(uci)))
+
+    assert game.game_over
+    assert kperft(game, 1) == kperft(game, 3) == 0
+
+
+def test_divide():
+    game = KriegspielGame(ruleset="berkeley_any")
+    counts = kperft_divide(game, 2)
+
+    assert list(counts) == sorted(game.possible_to_ask)
+    assert sum(counts.values()) == REFERENCE_COUNTS["berkeley_any"][1]
+    # NO_ANY removes ASK_ANY and the 14 pawn tries, leaving White its 20 moves.
+    assert counts[KSMove(QA.ASK_ANY)] == 20
+
+    with pytest.raises(ValueError, match="positive"):
+        kperft_divide(game, 0)
+    with pytest.raises(ValueError, match="negative"):
+        kperft(game, -1)
+
+
+def test_main(capsys):
+    assert main(["--ruleset", "wild16", "--ruleset", "cincinnati", "--depth", "2", "--check"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[:3] for line in lines] == [
+        ["ruleset=wild16", "depth=2", "nodes=400"], ["ruleset=cincinnati", "depth=2", "nodes=400"],
+    ]
+
+    assert main(["--ruleset", "berkeley_any", "--depth", "1", "--divide"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "ASK_ANY 1"
+    assert len(lines) == REFERENCE_COUNTS["berkeley_any"][0] + 1
+
+    assert main(["--ruleset", "rand", "--depth", "0", "--check"]) == 0
+    assert "unchecked ruleset=rand depth=0" in capsys.readouterr().out
+
+
+def test_main_reports_mismatches(monkeypatch, capsys):
+    monkeypatch.setitem(REFERENCE_COUNTS, "rand", (21,))
+
+    assert main(["--ruleset", "rand", "--depth", "1", "--check"]) == 1
+    assert "mismatch ruleset=rand depth=1 expected=21 nodes=20" in capsys.readouterr().out
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""PGN export and import tests."""
+
+import io
+import os
+import random
+import tempfile
+
+import chess
+import chess.pgn
+import pytest
+
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import CapturedPieceAnnouncement as CPA
+from kriegspiel.move import KriegspielAnswer as KSAnswer
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import MainAnnouncement as MA
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.move import SpecialCaseAnnouncement as SCA
+from kriegspiel.pgn import export_pgn, format_answer, format_question, game_to_pgn, iter_pgn, pgn_to_game, write_pgn
+from kriegspiel.serialization import MalformedDataError, SerializationError, serialize_berkeley_game
+
+
+def _play(game, *questions):
+    for question in questions:
+        if question == "any":
+            game.ask_for(KSMove(QA.ASK_ANY))
+        else:
+            game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(question)))
+    return game
+
+
+def _random_game(ruleset, seed, questions=160):
+    rng = random.Random(seed)
+    game = KriegspielGame(ruleset=ruleset)
+    for _ in range(questions):
+        if game.game_over:
+            break
+        game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+    return game
+
+
+def _read(text, game_class=None):
+    return pgn_to_game(chess.pgn.read_game(io.StringIO(text)), game_class=game_class)
+
+
+@pytest.fixture
+def pgn_path():
+    with tempfile.TemporaryDirectory() as directory:
+        yield os.path.join(directory, "games.pgn")
+
+
+def test_export_annotates_referee_transcript():
+    game = _play(BerkeleyGame(any_rule=True), "e2e4", "d7d5", "any", "e4d5", "d8d5", "d1h5", "d5e4")
+
+    text = export_pgn(game, headers={"White": "Alice"})
+
+    assert '[Event "Kriegspiel"]' in text
+    assert '[White "Alice"]' in text
+    assert '[Ruleset "berkeley_any"]' in text
+    assert '[Result "*"]' in text
+    assert "2. exd5 { [%ks any:has_any e4d5:capture_done@d5] }" in text
+    assert "3... Qe4+ { [%ks d5e4:regular_move,check_file] }" in text
+
+
+@pytest.mark.parametrize("ruleset", [
+    "berkeley", "berkeley_any", "cincinnati", "crazykrieg", "english", "rand", "wild16",
+])
+def test_export_import_roundtrip(ruleset):
+    for seed in range(3):
+        game = _random_game(ruleset, seed)
+
+        restored = _read(export_pgn(game))
+
+        assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+
+def test_unfinished_turn_is_kept():
+    game = _play(CincinnatiGame(), "e1e3")
+    text = export_pgn(game)
+
+    assert "{ [%ksnext e1e3:nonsense] }" in text
+    assert serialize_berkeley_game(_read(text)) == serialize_berkeley_game(game)
+
+    game = _play(CincinnatiGame(), "e2e4", "e8e6")
+    text = export_pgn(game)
+
+    assert "1. e4 { [%ks e2e4:regular_move,pawn_capture=no] [%ksnext e8e6:nonsense] }" in text
+    assert serialize_berkeley_game(_read(text)) == serialize_berkeley_game(game)
+
+
+def test_result_header_follows_game():
+    game = _play(BerkeleyGame(), "e2e4", "f7f6", "d2d4", "g7g5", "d1h5")
+
+    pgn_game = game_to_pgn(game)
+
+    assert pgn_game.headers["Result"] == "1-0"
+    assert pgn_game.end().comment == "[%ks d1h5:regular_move,checkmate_white_wins]"
+
+
+def test_format_answer_details():
+    assert format_question(KSMove(QA.ASK_ANY)) == "any"
+    assert format_question(KSMove(QA.COMMON, chess.Move.from_uci("N@f3"))) == "N@f3"
+    assert format_answer(KSAnswer(
+        MA.CAPTURE_DONE, capture_at_square=chess.E5, captured_piece_announcement=CPA.PAWN,
+        en_passant_announced=True, special_announcement=(SCA.CHECK_DOUBLE, [SCA.CHECK_RANK, SCA.CHECK_KNIGHT]),
+        next_turn_pawn_tries=2,
+    )) == "capture_done@e5,check_double=check_rank+check_knight,captured=pawn,en_passant,tries=2"
+    assert format_answer(KSAnswer(
+        MA.REGULAR_MOVE, dropped_piece_announcement=CPA.KNIGHT, promotion_announced=True,
+        next_turn_pawn_try_squares=[chess.D4, chess.E4],
+    )) == "regular_move,dropped=knight,promotion,try_squares=d4+e4"
+    assert format_answer(KSAnswer(MA.REGULAR_MOVE, next_turn_has_pawn_capture=True)) == (
+        "regular_move,pawn_capture=yes"
+    )
+
+
+def test_import_plain_pgn():
+    game = _read("1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0")
+
+    assert type(game) is KriegspielGame
+    assert game.ruleset_id == "berkeley"
+    assert game.result == "1-0"
+    assert len(game._whites_scoresheet.moves_own) == 4
+
+
+def test_import_crazyhouse_defaults_to_crazykrieg():
+    game = _read('[Variant "Crazyhouse"]\n\n1. e4 d5 2. exd5 Qxd5 3. P@e4 *')
+
+    assert game.ruleset_id == "crazykrieg"
+    assert game._move_stack[-1] == chess.Move.from_uci("P@e4")
+
+
+def test_import_builds_requested_class():
+    text = export_pgn(_play(CincinnatiGame(), "e2e4"))
+
+    assert isinstance(_read(text, game_class=CincinnatiGame), CincinnatiGame)
+    assert type(_read(text, game_class=KriegspielGame)) is KriegspielGame
+    with pytest.raises(MalformedDataError, match="must use the cincinnati ruleset"):
+        _read("1. e4 *", game_class=CincinnatiGame)
+
+
+def test_import_replays_requested_class_once(monkeypatch):
+    text = export_pgn(_play(CincinnatiGame(), "e2e4", "e7e5"))
+
+    def fail_from_snapshot(snapshot):
+        raise AssertionError("the PGN should be replayed into the requested class directly")
+
+    monkeypatch.setattr(CincinnatiGame, "from_snapshot", fail_from_snapshot)
+
+    game = _read(text, game_class=CincinnatiGame)
+
+    assert type(game) is CincinnatiGame
+    assert [move.uci() for move in game._move_stack] == ["e2e4", "e7e5"]
+
+
+@pytest.mark.parametrize("text,match", [
+    ("1. e4 e5 2. Ke3 *", "Invalid PGN"),
+    ('[Ruleset "shogi"]\n\n1. e4 *', "Unsupported ruleset"),
+    ('[FEN "8/8/8/8/8/8/8/K6k w - - 0 1"]\n\n1. Kb1 *', "initial position"),
+    ("1. e4 { [%ks zz:regular_move] } *", "Invalid transcript question"),
+    ("1. e4 { [%ks d2d4:regular_move] } *", "does not produce move 1"),
+    ("1. e4 { [%ks e2e4:regular_move] [%ksnext e7e5:regular_move] } *", "completes a move"),
+])
+def test_malformed_pgn(text, match):
+    with pytest.raises(MalformedDataError, match=match):
+        _read(text)
+
+
+def test_write_and_iterate_collection(pgn_path):
+    games = [_random_game(ruleset, seed) for ruleset in ("berkeley", "wild16") for seed in range(2)]
+
+    assert write_pgn(iter(games[:3]), pgn_path) == 3
+    assert write_pgn(games[3:], pgn_path, append=True) == 1
+    restored = iter_pgn(pgn_path)
+
+    assert serialize_berkeley_game(next(restored)) == serialize_berkeley_game(games[0])
+    assert [serialize_berkeley_game(game) for game in restored] == [
+        serialize_berkeley_game(game) for game in games[1:]
+    ]
+
+
+def test_iterate_builds_requested_class(pgn_path):
+    write_pgn([_play(CincinnatiGame(), "e2e4")], pgn_path)
+
+    assert [type(game) for game in iter_pgn(pgn_path, game_class=CincinnatiGame)] == [CincinnatiGame]
+
+
+def test_io_errors():
+    with pytest.raises(SerializationError, match="Failed to write PGN"):
+        write_pgn([BerkeleyGame()], "/invalid/path/games.pgn")
+    with pytest.raises(SerializationError, match="Failed to read PGN"):
+        list(iter_pgn("/nonexistent/games.pgn"))
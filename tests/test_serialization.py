@@ -6,6 +6,7 @@ import tempfile
 import os
 import chess
 import chess.variant
+import random
 from types import SimpleNamespace
 
 from kriegspiel.move import (
@@ -13,6 +14,8 @@ from kriegspiel.move import (
     KriegspielMove, KriegspielAnswer, KriegspielScoresheet
 )
 from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.cincinnati import CincinnatiGame
+from kriegspiel.snapshot import KriegspielGameSnapshot, ScoresheetSnapshot
 from kriegspiel.serialization import (
     serialize_chess_move, deserialize_chess_move,
     serialize_enum, deserialize_question_announcement, deserialize_main_announcement, 
@@ -22,8 +25,13 @@ from kriegspiel.serialization import (
     serialize_kriegspiel_scoresheet, deserialize_kriegspiel_scoresheet,
     serialize_kriegspiel_game, deserialize_kriegspiel_game,
     serialize_berkeley_game, deserialize_berkeley_game,
+    serialize_scoresheet_snapshot, deserialize_scoresheet_snapshot, deserialize_game_snapshot,
     save_game_to_json, load_game_from_json,
-    KriegspielJSONEncoder, SERIALIZATION_SCHEMA_VERSION, _completed_moves_from_turn,
+    serialize_compact_game, serialize_compact_answer, deserialize_compact_answer,
+    serialize_compact_scoresheet, deserialize_compact_scoresheet,
+    pack_kriegspiel_move, unpack_kriegspiel_move, deserialize_question_value,
+    KriegspielJSONEncoder, SERIALIZATION_SCHEMA_VERSION, COMPACT_SERIALIZATION_SCHEMA_VERSION,
+    _completed_moves_from_turn,
     SerializationError, UnsupportedVersionError, MalformedDataError
 )
 from kriegspiel.rulesets import RULESET_BERKELEY
@@ -504,6 +512,19 @@ class TestKriegspielScoresheetSerializer:
         assert len(result["moves_opponent"]) == 1
         assert result["last_move_number"] == 1
     
+    def test_scoresheet_snapshot_roundtrip(self):
+        game = BerkeleyGame(any_rule=True)
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e2e4")))
+        game.ask_for(KriegspielMove(QuestionAnnouncement.ASK_ANY))
+        snapshot = game._blacks_scoresheet.snapshot()
+
+        serialized = serialize_scoresheet_snapshot(snapshot)
+        restored = deserialize_scoresheet_snapshot(serialized)
+
+        assert serialized == serialize_kriegspiel_scoresheet(game._blacks_scoresheet)
+        assert isinstance(restored, ScoresheetSnapshot)
+        assert restored == snapshot
+
     def test_deserialize_empty_scoresheet(self):
         data = {
             "color": "WHITE", 
@@ -759,6 +780,37 @@ class TestBerkeleyGameSerializer:
             next_turn_pawn_try_squares=tuple(),
         )
 
+    def test_deserialize_game_snapshot_matches_live_snapshot(self):
+        game = BerkeleyGame(any_rule=True)
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e2e4")))
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("d7d5")))
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e4d5")))
+
+        snapshot = deserialize_game_snapshot(serialize_berkeley_game(game))
+
+        assert isinstance(snapshot, KriegspielGameSnapshot)
+        assert snapshot.white_scoresheet == game._whites_scoresheet.snapshot()
+        assert snapshot.black_scoresheet == game._blacks_scoresheet.snapshot()
+        assert set(snapshot.possible_to_ask) == set(game.possible_to_ask)
+        assert snapshot.move_stack == game.snapshot().move_stack
+
+    def test_deserialize_berkeley_game_builds_requested_class(self):
+        game = CincinnatiGame()
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e2e4")))
+
+        restored = deserialize_berkeley_game(serialize_berkeley_game(game), game_class=CincinnatiGame)
+
+        assert restored.__class__ is CincinnatiGame
+        assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+    def test_deserialize_berkeley_game_rejects_wrapper_ruleset_mismatch(self):
+        serialized = serialize_berkeley_game(BerkeleyGame(any_rule=False))
+
+        with pytest.raises(ValueError, match="cincinnati ruleset"):
+            deserialize_berkeley_game(serialized, game_class=CincinnatiGame)
+        with pytest.raises(ValueError, match="cincinnati ruleset"):
+            deserialize_berkeley_game(serialized, game_class=CincinnatiGame, lazy=True)
+
     def test_deserialize_rejects_missing_move_stack(self):
         game = BerkeleyGame(any_rule=True)
         serialized = serialize_berkeley_game(game)
@@ -1240,3 +1292,442 @@ class TestErrorHandling:
     def test_berkeley_game_load_error_handling(self):
         with pytest.raises(SerializationError):
             BerkeleyGame.load_game("/nonexistent/file.json")
+
+
+class TestCompactSchema:
+    """Test the compact schema 10 writer and reader."""
+
+    @staticmethod
+    def _random_game(ruleset, seed, questions=120):
+        rng = random.Random(seed)
+        game = BerkeleyGame(ruleset=ruleset) if ruleset in {RULESET_BERKELEY, RULESET_BERKELEY_ANY} else None
+        if game is None:
+            from kriegspiel.game import KriegspielGame
+            game = KriegspielGame(ruleset=ruleset)
+        for _ in range(questions):
+            if game.game_over:
+                break
+            game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+        return game
+
+    @pytest.mark.parametrize("ruleset", [
+        RULESET_BERKELEY, RULESET_BERKELEY_ANY, RULESET_CINCINNATI, RULESET_CRAZYKRIEG,
+        RULESET_ENGLISH, RULESET_RAND, RULESET_WILD16,
+    ])
+    def test_compact_roundtrip_matches_schema_9(self, ruleset):
+        for seed in range(3):
+            game = self._random_game(ruleset, seed)
+            data = json.loads(json.dumps(serialize_compact_game(game)))
+
+            restored = deserialize_berkeley_game(data)
+
+            assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+    def test_compact_document_layout(self):
+        game = BerkeleyGame(any_rule=True)
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e2e4")))
+
+        data = serialize_compact_game(game)
+        state = data["game_state"]
+
+        assert data["schema_version"] == COMPACT_SERIALIZATION_SCHEMA_VERSION
+        assert data["game_type"] == "BerkeleyGame"
+        assert state["any_rule"] is True
+        assert "move_stack" not in state
+        assert "possible_to_ask" not in state
+        assert "must_use_pawns" not in state
+        assert "game_over" not in state
+        assert "color" not in state["white_scoresheet"]
+        assert state["white_scoresheet"]["moves_own"] == [[
+            [pack_kriegspiel_move(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e2e4"))),
+             MainAnnouncement.REGULAR_MOVE.value]
+        ]]
+        assert state["black_scoresheet"]["moves_opponent"] == [[
+            [QuestionAnnouncement.COMMON.value, MainAnnouncement.REGULAR_MOVE.value]
+        ]]
+
+    def test_compact_keeps_possible_to_ask_narrowed_by_illegal_tries(self):
+        game = BerkeleyGame()
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e2e4")))
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e7e5")))
+        game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e4e5")))
+        assert KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e4e5")) not in game.possible_to_ask
+
+        data = serialize_compact_game(game)
+        restored = deserialize_berkeley_game(data)
+
+        assert data["game_state"]["possible_to_ask"] == sorted(data["game_state"]["possible_to_ask"])
+        assert set(restored.possible_to_ask) == set(game.possible_to_ask)
+
+    def test_compact_regenerates_pending_pawn_obligation(self):
+        game = BerkeleyGame(any_rule=True)
+        for uci in ("e2e4", "d7d5"):
+            game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci(uci)))
+        game.ask_for(KriegspielMove(QuestionAnnouncement.ASK_ANY))
+        assert game.must_use_pawns
+
+        data = serialize_compact_game(game)
+        restored = deserialize_berkeley_game(data)
+
+        assert data["game_state"]["must_use_pawns"] is True
+        assert "possible_to_ask" not in data["game_state"]
+        assert restored.must_use_pawns
+        assert set(restored.possible_to_ask) == set(game.possible_to_ask)
+
+    def test_compact_finished_game(self):
+        game = BerkeleyGame()
+        for uci in ("f2f3", "e7e5", "g2g4", "d8h4"):
+            game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci(uci)))
+        assert game.game_over
+
+        data = serialize_compact_game(game)
+        restored = deserialize_berkeley_game(data)
+
+        assert data["game_state"]["game_over"] is True
+        assert "possible_to_ask" not in data["game_state"]
+        assert restored.game_over
+        assert restored.possible_to_ask == []
+
+    def test_compact_file_is_unindented_and_smaller(self):
+        game = self._random_game(RULESET_BERKELEY_ANY, 0)
+        with tempfile.TemporaryDirectory() as directory:
+            verbose = os.path.join(directory, "verbose.json")
+            compact = os.path.join(directory, "compact.json")
+            game.save_game(verbose)
+            game.save_game(compact, compact=True)
+
+            with open(compact) as f:
+                text = f.read()
+            restored = BerkeleyGame.load_game(compact)
+
+            assert "\n" not in text and ", " not in text
+            assert os.path.getsize(compact) * 5 < os.path.getsize(verbose)
+        assert serialize_berkeley_game(restored) == serialize_berkeley_game(game)
+
+    def test_plain_answers_are_bare_integers(self):
+        assert serialize_compact_answer(KriegspielAnswer(MainAnnouncement.ILLEGAL_MOVE)) == 1
+        assert deserialize_compact_answer(1) == KriegspielAnswer(MainAnnouncement.ILLEGAL_MOVE)
+
+    @pytest.mark.parametrize("answer", [
+        KriegspielAnswer(
+            MainAnnouncement.ILLEGAL_MOVE,
+            special_announcement=(SpecialCaseAnnouncement.CHECK_DOUBLE,
+                                  [SpecialCaseAnnouncement.CHECK_FILE, SpecialCaseAnnouncement.CHECK_KNIGHT]),
+        ),
+        KriegspielAnswer(MainAnnouncement.ILLEGAL_MOVE, special_announcement=SpecialCaseAnnouncement.CHECK_DOUBLE),
+        KriegspielAnswer(MainAnnouncement.ILLEGAL_MOVE, special_announcement=SpecialCaseAnnouncement.CHECK_RANK),
+        KriegspielAnswer(MainAnnouncement.ILLEGAL_MOVE, next_turn_pawn_tries=3),
+        KriegspielAnswer(MainAnnouncement.ILLEGAL_MOVE, next_turn_has_pawn_capture=False),
+        KriegspielAnswer(MainAnnouncement.ILLEGAL_MOVE, next_turn_pawn_try_squares=(chess.A2, chess.H7)),
+        KriegspielAnswer(MainAnnouncement.REGULAR_MOVE, promotion_announced=True),
+        KriegspielAnswer(MainAnnouncement.CAPTURE_DONE, capture_at_square=chess.D5,
+                         captured_piece_announcement=CapturedPieceAnnouncement.PAWN, en_passant_announced=True),
+        KriegspielAnswer(MainAnnouncement.REGULAR_MOVE, dropped_piece_announcement=CapturedPieceAnnouncement.KNIGHT),
+    ])
+    def test_rich_answers_roundtrip(self, answer):
+        data = serialize_compact_answer(answer)
+
+        assert isinstance(data, dict)
+        assert deserialize_compact_answer(json.loads(json.dumps(data))) == answer
+
+    @pytest.mark.parametrize("data", [99, True, "REGULAR_MOVE", [2], {"s": 6}, {"m": 1, "s": 99}, {"m": 1, "p": 0},
+                                      {"m": 1, "s": 11, "k": [6]}, {"m": 1, "t": "x"}])
+    def test_invalid_compact_answers(self, data):
+        with pytest.raises(MalformedDataError):
+            deserialize_compact_answer(data)
+
+    def test_packed_question_roundtrip(self):
+        questions = [
+            KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e7e8q")),
+            KriegspielMove(QuestionAnnouncement.ASK_ANY),
+            KriegspielMove(QuestionAnnouncement.NONE, chess.Move.from_uci("b1c3")),
+        ]
+        for question in questions:
+            assert unpack_kriegspiel_move(pack_kriegspiel_move(question)) == question
+
+    @pytest.mark.parametrize("code", [-1, True, "e2e4", None, 3, 1 << 30])
+    def test_invalid_packed_questions(self, code):
+        with pytest.raises(MalformedDataError):
+            unpack_kriegspiel_move(code)
+
+    def test_question_values(self):
+        assert deserialize_question_value(2) == QuestionAnnouncement.ASK_ANY
+        with pytest.raises(MalformedDataError, match="Invalid QuestionAnnouncement code"):
+            deserialize_question_value(7)
+
+    def test_compact_scoresheet_roundtrip(self):
+        game = self._random_game(RULESET_CINCINNATI, 1)
+        snapshot = game.snapshot().black_scoresheet
+
+        data = json.loads(json.dumps(serialize_compact_scoresheet(snapshot)))
+
+        assert deserialize_compact_scoresheet(data, chess.BLACK) == snapshot
+
+    @pytest.mark.parametrize("data", [
+        {"moves_own": [], "moves_opponent": []},
+        {"moves_own": [[[4, 2, 3]]], "moves_opponent": [], "last_move_number": 0},
+        {"moves_own": 5, "moves_opponent": [], "last_move_number": 0},
+    ])
+    def test_invalid_compact_scoresheets(self, data):
+        with pytest.raises(MalformedDataError, match="Invalid KriegspielScoresheet data"):
+            deserialize_compact_scoresheet(data, chess.WHITE)
+
+    def test_invalid_compact_game_states(self):
+        game = BerkeleyGame()
+        data = serialize_compact_game(game)
+
+        bad = json.loads(json.dumps(data))
+        bad["game_state"]["possible_to_ask"] = 5
+        with pytest.raises(MalformedDataError, match="Invalid possible_to_ask"):
+            deserialize_game_snapshot(bad)
+
+        bad = json.loads(json.dumps(data))
+        del bad["game_state"]["board_fen"]
+        with pytest.raises(MalformedDataError, match="Invalid BerkeleyGame data structure"):
+            deserialize_game_snapshot(bad)
+
+        bad = json.loads(json.dumps(data))
+        e2e4 = pack_kriegspiel_move(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("e2e4")))
+        d2d4 = pack_kriegspiel_move(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("d2d4")))
+        bad["game_state"]["white_scoresheet"]["moves_own"] = [[[e2e4, 2], [d2d4, 2]]]
+        with pytest.raises(MalformedDataError, match="multiple completed moves"):
+            deserialize_game_snapshot(bad)
+
+
+
+class TestLazyLoading:
+    """Test loading games with lazily decoded scoresheets."""
+
+    @staticmethod
+    def _random_game(ruleset, seed, questions=160):
+        from kriegspiel.game import KriegspielGame
+
+        rng = random.Random(seed)
+        game = KriegspielGame(ruleset=ruleset)
+        for _ in range(questions):
+            if game.game_over:
+                break
+            game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+        return game
+
+    @staticmethod
+    def _play(game, *ucis):
+        for uci in ucis:
+            game.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci(uci)))
+        return game
+
+    @pytest.mark.parametrize("serialize", [serialize_berkeley_game, serialize_compact_game])
+    @pytest.mark.parametrize("ruleset", [RULESET_BERKELEY_ANY, RULESET_CINCINNATI, RULESET_CRAZYKRIEG, RULESET_WILD16])
+    def test_lazy_load_matches_eager_load(self, serialize, ruleset):
+        for seed in range(3):
+            game = self._random_game(ruleset, seed)
+            data = json.loads(json.dumps(serialize(game), cls=KriegspielJSONEncoder))
+
+            eager = deserialize_berkeley_game(data)
+            lazy = deserialize_berkeley_game(data, lazy=True)
+
+            assert lazy.result == eager.result
+            assert lazy.public_material_summary == eager.public_material_summary
+            assert lazy.possible_to_ask == eager.possible_to_ask
+            assert serialize_berkeley_game(lazy) == serialize_berkeley_game(eager)
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_scoresheets_are_decoded_on_first_access(self, compact):
+        game = self._play(BerkeleyGame(), "e2e4", "d7d5", "e4d5", "d8d5", "b1c3", "d5a5")
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "game.json")
+            game.save_game(filename, compact=compact)
+            restored = BerkeleyGame.load_game(filename, lazy=True)
+
+        white, black = restored._whites_scoresheet, restored._blacks_scoresheet
+        assert isinstance(restored, BerkeleyGame)
+        assert restored.result == "*"
+        assert white.capture_counts() == game._whites_scoresheet.capture_counts() == (1, 0)
+        assert black.capture_counts() == game._blacks_scoresheet.capture_counts() == (1, 0)
+        assert black.last_own_answer == KriegspielAnswer(MainAnnouncement.REGULAR_MOVE)
+        assert not white.decoded and not black.decoded
+
+        restored.ask_for(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("g1f3")))
+
+        assert white.decoded and black.decoded
+        assert white.capture_counts() == (1, 0)
+        assert serialize_berkeley_game(restored) == serialize_berkeley_game(
+            self._play(game, "g1f3")
+        )
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_lazy_load_reports_terminal_result(self, compact):
+        game = self._play(BerkeleyGame(), "f2f3", "e7e5", "g2g4", "d8h4")
+        data = json.loads(json.dumps(
+            serialize_compact_game(game) if compact else serialize_berkeley_game(game), cls=KriegspielJSONEncoder
+        ))
+
+        restored = deserialize_berkeley_game(data, lazy=True)
+
+        assert restored.game_over
+        assert restored.result == "0-1"
+        assert not restored._blacks_scoresheet.decoded
+
+    def test_last_move_check_decodes_scoresheet(self):
+        game = self._play(BerkeleyGame(), "e2e4")
+        restored = deserialize_berkeley_game(serialize_compact_game(game), lazy=True)
+
+        assert restored._whites_scoresheet.was_the_last_move_ended(chess.WHITE)
+        assert restored._whites_scoresheet.decoded
+
+    def test_wrappers_forward_lazy_flag(self):
+        game = self._play(CincinnatiGame(), "e2e4")
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "game.json")
+            game.save_game(filename)
+            restored = CincinnatiGame.load_game(filename, lazy=True)
+
+        assert isinstance(restored, CincinnatiGame)
+        assert not restored._whites_scoresheet.decoded
+        assert restored._whites_scoresheet.moves_own[0][0][0].chess_move == chess.Move.from_uci("e2e4")
+
+    def test_lazy_load_validates_move_stack(self):
+        game = self._play(BerkeleyGame(), "e2e4", "e7e5")
+        data = serialize_berkeley_game(game)
+        data["game_state"]["move_stack"] = ["d2d4", "e7e5"]
+
+        with pytest.raises(MalformedDataError):
+            deserialize_berkeley_game(data, lazy=True)
+
+        data = serialize_berkeley_game(game)
+        data["game_state"]["white_scoresheet"]["moves_own"][0][0][0]["chess_move"] = "d2d4"
+        with pytest.raises(MalformedDataError, match="do not match move_stack"):
+            deserialize_berkeley_game(data, lazy=True)
+
+    @pytest.mark.parametrize("mutate,match", [
+        (lambda state: state["white_scoresheet"].pop("last_move_number"), "Invalid KriegspielScoresheet data"),
+        (lambda state: state["white_scoresheet"].update(moves_opponent=5), "Invalid KriegspielScoresheet data"),
+        (lambda state: state["white_scoresheet"].update(moves_own=[["oops"]]), "Invalid KriegspielScoresheet data"),
+        (
+            lambda state: state["white_scoresheet"]["moves_own"][0][0][0].update(chess_move=None),
+            "missing chess_move",
+        ),
+        (
+            lambda state: state["white_scoresheet"]["moves_own"][0].append(state["white_scoresheet"]["moves_own"][0][0]),
+            "multiple completed moves",
+        ),
+        (
+            lambda state: state["white_scoresheet"]["moves_own"][0][0][1].update(main_announcement="NOPE"),
+            "Invalid MainAnnouncement",
+        ),
+        (lambda state: state.pop("board_fen"), "Invalid BerkeleyGame data structure"),
+    ])
+    def test_malformed_schema_9_data(self, mutate, match):
+        data = json.loads(json.dumps(
+            serialize_berkeley_game(self._play(BerkeleyGame(), "e2e4", "e7e5")), cls=KriegspielJSONEncoder
+        ))
+        mutate(data["game_state"])
+
+        with pytest.raises(MalformedDataError, match=match):
+            deserialize_berkeley_game(data, lazy=True)
+
+    @pytest.mark.parametrize("mutate,match", [
+        (lambda sheet: sheet.update(moves_own=[[["e2e4", 2]]]), "Invalid KriegspielScoresheet data"),
+        (lambda sheet: sheet["moves_own"][0].append(sheet["moves_own"][0][0]), "multiple completed moves"),
+        (lambda sheet: sheet["moves_own"][0][0].__setitem__(1, 99), "Invalid MainAnnouncement code"),
+    ])
+    def test_malformed_schema_10_data(self, mutate, match):
+        data = json.loads(json.dumps(serialize_compact_game(self._play(BerkeleyGame(), "e2e4", "e7e5"))))
+        mutate(data["game_state"]["white_scoresheet"])
+
+        with pytest.raises(MalformedDataError, match=match):
+            deserialize_berkeley_game(data, lazy=True)
+
+    def test_malformed_turns_surface_on_decode(self):
+        data = json.loads(json.dumps(
+            serialize_berkeley_game(self._play(BerkeleyGame(), "e2e4", "e7e5")), cls=KriegspielJSONEncoder
+        ))
+        data["game_state"]["black_scoresheet"]["moves_opponent"][0][0][0] = "NOPE"
+
+        restored = deserialize_berkeley_game(data, lazy=True)
+
+        with pytest.raises(MalformedDataError, match="Invalid QuestionAnnouncement"):
+            restored._blacks_scoresheet.moves_opponent
+
+    def test_lazy_load_of_fresh_game(self):
+        from kriegspiel.snapshot import result_from_scoresheets
+
+        restored = deserialize_berkeley_game(serialize_compact_game(BerkeleyGame()), lazy=True)
+
+        assert restored._whites_scoresheet.last_own_answer is None
+        assert result_from_scoresheets(*(sheet.snapshot() for sheet in (
+            restored._whites_scoresheet, restored._blacks_scoresheet
+        ))) == restored.result == "*"
+
+
+class TestDecodeCaches:
+    """Test interning of decoded moves and answers."""
+
+    def test_uci_moves_are_interned(self):
+        assert deserialize_chess_move("e2e4") is deserialize_chess_move("e2e4")
+        code = pack_kriegspiel_move(KriegspielMove(QuestionAnnouncement.COMMON, chess.Move.from_uci("g1f3")))
+        assert unpack_kriegspiel_move(code).chess_move is unpack_kriegspiel_move(code).chess_move
+        with pytest.raises(MalformedDataError, match="Invalid UCI move string"):
+            deserialize_chess_move("e9e4")
+
+    def test_moves_are_not_shared(self):
+        data = {"question_type": "COMMON", "chess_move": "e2e4"}
+
+        assert deserialize_kriegspiel_move(data) is not deserialize_kriegspiel_move(data)
+
+    @pytest.mark.parametrize("serialize,deserialize", [
+        (serialize_kriegspiel_answer, deserialize_kriegspiel_answer),
+        (serialize_compact_answer, deserialize_compact_answer),
+    ])
+    def test_equal_answers_are_interned(self, serialize, deserialize):
+        answers = [
+            KriegspielAnswer(MainAnnouncement.ILLEGAL_MOVE),
+            KriegspielAnswer(MainAnnouncement.REGULAR_MOVE, next_turn_pawn_try_squares=[9, 12]),
+            KriegspielAnswer(
+                MainAnnouncement.CAPTURE_DONE, capture_at_square=36,
+                special_announcement=SpecialCaseAnnouncement.CHECK_RANK,
+            ),
+        ]
+        for answer in answers:
+            data = json.loads(json.dumps(serialize(answer), cls=KriegspielJSONEncoder))
+
+            decoded = deserialize(data)
+
+            assert decoded == answer
+            assert deserialize(json.loads(json.dumps(data))) is decoded
+
+    def test_interning_keeps_value_types_apart(self):
+        data = serialize_kriegspiel_answer(
+            KriegspielAnswer(MainAnnouncement.REGULAR_MOVE, next_turn_has_pawn_capture=True)
+        )
+        deserialize_kriegspiel_answer(data)
+
+        with pytest.raises(MalformedDataError, match="Invalid KriegspielAnswer data"):
+            deserialize_kriegspiel_answer({**data, "next_turn_has_pawn_capture": 1})
+        with pytest.raises(MalformedDataError, match="Invalid KriegspielAnswer data"):
+            deserialize_compact_answer({"m": 2, "q": [{}]})
+        with pytest.raises(MalformedDataError, match="Invalid MainAnnouncement code"):
+            deserialize_compact_answer(True)
+
+    def test_answer_cache_is_bounded(self, monkeypatch):
+        import kriegspiel.move as move_module
+
+        monkeypatch.setattr(move_module, "ANSWER_CACHE_SIZE", 0)
+        monkeypatch.setattr(move_module, "_ANSWERS", {})
+
+        assert deserialize_compact_answer(5) is not deserialize_compact_answer(5)
+        assert move_module._ANSWERS == {}
+
+    def test_decoders_and_games_share_one_answer_table(self):
+        from kriegspiel.move import _shared_answer
+
+        answer = KriegspielAnswer(MainAnnouncement.REGULAR_MOVE, next_turn_pawn_tries=7)
+        shared = _shared_answer(answer)
+
+        assert deserialize_kriegspiel_answer(serialize_kriegspiel_answer(answer)) is shared
+        assert deserialize_compact_answer(serialize_compact_answer(answer)) is shared
+
+    def test_enum_names_are_validated(self):
+        assert deserialize_special_case_announcement("CHECK_FILE") is SpecialCaseAnnouncement.CHECK_FILE
+        with pytest.raises(MalformedDataError, match="Invalid CapturedPieceAnnouncement: KING"):
+            deserialize_captured_piece_announcement("KING")
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""asyncio session manager and NDJSON front end tests."""
+
+import asyncio
+import json
+import logging
+
+import chess
+import pytest
+
+from kriegspiel.move import KriegspielAnswer as KSAnswer
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import MainAnnouncement as MA
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.serialization import pack_kriegspiel_move
+import kriegspiel.server as server_module
+from kriegspiel.server import (
+    AdmissionError, QueueFullError, SessionManager, UnknownGameError, handle_connection, serve,
+)
+
+
+def _question(uci):
+    return KSMove(QA.COMMON, chess.Move.from_uci(uci))
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_questions_to_one_game_are_answered_in_order():
+    manager = SessionManager()
+    game_id = manager.create_game()
+
+    async def scenario():
+        return await asyncio.gather(*(
+            manager.ask(game_id, _question(uci)) for uci in ("e2e4", "e7e5", "e4e5", "g1f3")
+        ))
+
+    answers = _run(scenario())
+
+    assert [answer.main_announcement for answer in answers] == [
+        MA.REGULAR_MOVE, MA.REGULAR_MOVE, MA.ILLEGAL_MOVE, MA.REGULAR_MOVE,
+    ]
+    assert [move.uci() for move in manager.game(game_id)._move_stack] == ["e2e4", "e7e5", "g1f3"]
+
+
+def test_games_are_interleaved():
+    manager = SessionManager()
+    busy, quiet = manager.create_game(), manager.create_game()
+    order = []
+
+    async def ask(game_id, uci):
+        await manager.ask(game_id, _question(uci))
+        order.append(game_id)
+
+    async def scenario():
+        await asyncio.gather(
+            ask(busy, "e2e4"), ask(busy, "e7e5"), ask(busy, "g1f3"), ask(quiet, "d2d4"),
+        )
+
+    _run(scenario())
+
+    assert order.index(quiet) < len(order) - 1
+
+
+def test_admission_control():
+    manager = SessionManager(max_games=2)
+    manager.create_game(game_id="a")
+    manager.create_game(ruleset="cincinnati")
+
+    with pytest.raises(AdmissionError, match="limit of 2"):
+        manager.create_game()
+    assert len(manager) == 2
+    assert "a" in manager
+    assert manager.stats()["rejected"] == 1
+
+    manager.close_game("a")
+    assert manager.create_game(game_id="b") == "b"
+
+
+def test_duplicate_game_id():
+    manager = SessionManager()
+    manager.create_game(game_id="a")
+
+    with pytest.raises(ValueError, match="already in use"):
+        manager.create_game(game_id="a")
+
+
+def test_pending_questions_are_bounded():
+    manager = SessionManager(max_pending=2)
+    game_id = manager.create_game()
+
+    async def scenario():
+        return await asyncio.gather(
+            *(manager.ask(game_id, _question(uci)) for uci in ("e2e4", "e7e5", "g1f3")),
+            return_exceptions=True,
+        )
+
+    first, second, third = _run(scenario())
+
+    assert first == second == KSAnswer(MA.REGULAR_MOVE)
+    assert isinstance(third, QueueFullError)
+    assert manager.stats()["rejected"] == 1
+
+
+def test_unknown_games():
+    manager = SessionManager()
+
+    with pytest.raises(UnknownGameError, match="Unknown game: x"):
+        manager.game("x")
+    with pytest.raises(UnknownGameError):
+        manager.close_game("x")
+    with pytest.raises(UnknownGameError):
+        _run(manager.ask("x", _question("e2e4")))
+
+
+def test_latency_statistics():
+    manager = SessionManager(latency_samples=2)
+    game_id = manager.create_game()
+
+    assert manager.latency_percentiles() == {}
+    assert manager.stats() == {"games": 1, "asks": 0, "rejected": 0}
+
+    async def scenario():
+        for uci in ("e2e4", "e7e5", "g1f3"):
+            await manager.ask(game_id, _question(uci))
+
+    _run(scenario())
+
+    stats = manager.stats()
+    assert stats["asks"] == 3
+    assert 0 < stats["p50_ms"] <= stats["p90_ms"] <= stats["p99_ms"]
+    assert set(manager.latency_percentiles((0, 100))) == {0, 100}
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError, match="must be positive"):
+        SessionManager(max_pending=0)
+
+
+def test_ndjson_front_end():
+    manager = SessionManager(max_games=1)
+    e2e4 = pack_kriegspiel_move(_question("e2e4"))
+
+    async def scenario():
+        server = await serve(manager)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def request(payload):
+            writer.write((payload if isinstance(payload, str) else json.dumps(payload)).encode() + b"\n")
+            return json.loads(await reader.readline())
+
+        responses = {}
+        responses["create"] = await request({"id": 1, "op": "create", "ruleset": "berkeley_any"})
+        game_id = responses["create"]["game"]
+        writer.write(b"\n")
+        responses["questions"] = await request({"id": 2, "op": "questions", "game": game_id})
+        responses["ask"] = await request({"id": 3, "op": "ask", "game": game_id, "question": e2e4})
+        responses["bad_question"] = await request({"op": "ask", "game": game_id, "question": -1})
+        responses["full"] = await request({"op": "create"})
+        responses["stats"] = await request({"op": "stats"})
+        responses["close"] = await request({"id": 4, "op": "close", "game": game_id})
+        responses["unknown_game"] = await request({"op": "close", "game": game_id})
+        responses["unknown_op"] = await request({"op": "dance"})
+        responses["not_json"] = await request("{oops")
+        responses["not_object"] = await request("[1]")
+        responses["missing"] = await request({"op": "ask"})
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    responses = _run(scenario())
+
+    assert responses["create"]["ok"] and responses["create"]["id"] == 1
+    assert e2e4 in responses["questions"]["questions"]
+    assert responses["ask"] == {"ok": True, "answer": MA.REGULAR_MOVE.value, "id": 3}
+    assert responses["bad_question"]["error"] == "MalformedDataError"
+    assert responses["full"]["error"] == "AdmissionError"
+    assert responses["stats"]["stats"]["asks"] == 1
+    assert responses["close"] == {"ok": True, "id": 4}
+    assert responses["unknown_game"]["error"] == "UnknownGameError"
+    assert responses["unknown_op"]["message"] == "Unknown op: 'dance'"
+    assert responses["not_json"]["error"] == "JSONDecodeError"
+    assert responses["not_object"]["message"] == "Request must be a JSON object"
+    assert responses["missing"]["error"] == "KeyError"
+
+
+def test_front_end_answers_pipelined_requests_before_disconnect():
+    manager = SessionManager()
+    game_id = manager.create_game()
+
+    async def scenario():
+        server = await serve(manager)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for request_id, uci in enumerate(("e2e4", "e7e5", "g1f3")):
+            writer.write(json.dumps({
+                "id": request_id, "op": "ask", "game": game_id, "question": pack_kriegspiel_move(_question(uci)),
+            }).encode() + b"\n")
+        writer.write_eof()
+        lines = [json.loads(line) for line in (await reader.read()).splitlines()]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return lines
+
+    lines = _run(scenario())
+
+    assert sorted(line["id"] for line in lines) == [0, 1, 2]
+    assert all(line["ok"] for line in lines)
+    assert len(manager.game(game_id)._move_stack) == 3
+
+
+def test_front_end_closes_reset_connections():
+    class Writer(object):
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.set_exception(ConnectionResetError())
+        writer = Writer()
+        await handle_connection(SessionManager(), reader, writer)
+        return writer
+
+    assert _run(scenario()).closed
+
+
+def test_front_end_reports_unexpected_errors(caplog):
+    manager = SessionManager()
+    game_id = manager.create_game()
+
+    async def broken_ask(game_id, question):
+        raise RuntimeError("referee crashed")
+
+    manager.ask = broken_ask
+
+    async def scenario():
+        server = await serve(manager)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(json.dumps({
+            "id": 7, "op": "ask", "game": game_id, "question": pack_kriegspiel_move(_question("e2e4")),
+        }).encode() + b"\n")
+        response = json.loads(await reader.readline())
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    with caplog.at_level(logging.ERROR, logger="kriegspiel.server"):
+        response = _run(scenario())
+
+    assert response == {"ok": False, "error": "RuntimeError", "message": "referee crashed", "id": 7}
+    assert "referee crashed" in caplog.text
+
+
+def test_front_end_bounds_requests_in_flight_per_connection(monkeypatch):
+    running = []
+    peak = []
+
+    async def slow_respond(manager, line, writer):
+        running.append(line)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(line)
+
+    monkeypatch.setattr(server_module, "_respond", slow_respond)
+
+    class Writer(object):
+        async def drain(self):
+            pass
+
+        def close(self):
+            pass
+
+    async def scenario():
+        reader = asyncio.StreamReader()
+        for request_id in range(6):
+            reader.feed_data(json.dumps({"id": request_id, "op": "stats"}).encode() + b"\n")
+        reader.feed_eof()
+        await handle_connection(SessionManager(), reader, Writer(), max_in_flight=2)
+
+    _run(scenario())
+
+    assert len(peak) == 6 and max(peak) == 2
+    with pytest.raises(ValueError, match="max_in_flight"):
+        _run(serve(SessionManager(), max_in_flight=0))
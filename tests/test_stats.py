@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""ask_for phase statistics tests."""
+
+import random
+
+import chess
+import pytest
+
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.english import EnglishGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.serialization import serialize_berkeley_game
+from kriegspiel.stats import GLOBAL_STATS, PHASE_NAMES, RefereeStats
+
+
+def _play(game, *questions):
+    for question in questions:
+        if question == "any":
+            game.ask_for(KSMove(QA.ASK_ANY))
+        else:
+            game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(question)))
+    return game
+
+
+@pytest.fixture(autouse=True)
+def clean_global_stats():
+    GLOBAL_STATS.reset()
+    yield
+    GLOBAL_STATS.reset()
+
+
+def test_disabled_by_default():
+    game = BerkeleyGame()
+
+    assert game.stats() is None
+    assert "ask_for" not in game.__dict__
+    _play(game, "e2e4")
+    assert GLOBAL_STATS.asks == 0
+
+
+def test_phases_by_ruleset_and_announcement():
+    game = BerkeleyGame(any_rule=True)
+    stats = game.enable_stats()
+
+    _play(game, "e2e4", "d7d5", "any", "e4d5", "a1a8", "e8e6")
+
+    rows = stats.as_dict()["berkeley_any"]
+    assert {name: row["asks"] for name, row in rows.items()} == {
+        "IMPOSSIBLE_TO_ASK": 2, "REGULAR_MOVE": 2, "CAPTURE_DONE": 1, "HAS_ANY": 1,
+    }
+    regular = rows["REGULAR_MOVE"]["phases"]
+    for phase in ("validation", "legality", "make_move", "special_cases", "ruleset_metadata", "recording",
+                  "regeneration", "post_answer"):
+        assert regular[phase]["calls"] == 2
+        assert regular[phase]["seconds"] >= 0
+    impossible = rows["IMPOSSIBLE_TO_ASK"]["phases"]
+    assert [name for name in PHASE_NAMES if impossible[name]["calls"]] == ["validation", "post_answer"]
+    assert rows["HAS_ANY"]["phases"]["legality"]["calls"] == 0
+    assert rows["REGULAR_MOVE"]["seconds"] >= sum(phase["seconds"] for phase in regular.values())
+
+    totals = stats.phase_totals()
+    assert totals["validation"]["calls"] == 6
+    assert totals["make_move"]["calls"] == 3
+    assert stats.asks == 6
+    assert GLOBAL_STATS.asks == 6
+
+
+def test_nested_phases_are_counted_once():
+    game = EnglishGame()
+    _play(game, "e2e4", "d7d5", "any")
+    stats = game.enable_stats()
+
+    # A failed pawn try after HAS_ANY regenerates the questions inside the post-answer constraints.
+    _play(game, "e4f5")
+
+    row = stats.as_dict()["english"]["ILLEGAL_MOVE"]
+    assert row["phases"]["regeneration"]["calls"] == 1
+    assert row["phases"]["post_answer"]["calls"] == 1
+    assert row["seconds"] >= sum(phase["seconds"] for phase in row["phases"].values())
+
+
+def test_answers_are_unchanged():
+    rng = random.Random(5)
+    plain, timed = KriegspielGame(ruleset="crazykrieg"), KriegspielGame(ruleset="crazykrieg")
+    timed.enable_stats(aggregate=False)
+    for _ in range(150):
+        if plain.game_over:
+            break
+        question = rng.choice(sorted(plain.possible_to_ask))
+        assert timed.ask_for(question) == plain.ask_for(question)
+
+    assert serialize_berkeley_game(timed) == serialize_berkeley_game(plain)
+    assert GLOBAL_STATS.asks == 0
+    assert timed.stats().asks > 0
+
+
+def test_enable_restarts_and_disable_removes_wrappers():
+    game = BerkeleyGame()
+    first = game.enable_stats()
+    _play(game, "e2e4")
+    second = game.enable_stats()
+    _play(game, "e7e5")
+
+    assert (first.asks, second.asks) == (1, 1)
+    game.disable_stats()
+    game.disable_stats()
+    assert game.stats() is None
+    assert not {"ask_for", "_make_move"} & set(game.__dict__)
+    _play(game, "g1f3")
+    assert second.asks == 1
+    assert GLOBAL_STATS.asks == 2
+
+
+def test_errors_are_not_counted():
+    game = BerkeleyGame()
+    stats = game.enable_stats()
+
+    with pytest.raises(TypeError):
+        game.ask_for("e2e4")
+    assert stats.asks == 0
+
+
+def test_merge_and_reset():
+    first, second = BerkeleyGame(any_rule=False), KriegspielGame(ruleset="wild16")
+    total = RefereeStats()
+    for game in (first, second):
+        game.enable_stats(aggregate=False)
+        _play(game, "e2e4", "e7e5")
+        total.merge(game.stats())
+    total.merge(first.stats())
+
+    assert total.as_dict()["berkeley"]["REGULAR_MOVE"]["asks"] == 4
+    assert total.as_dict()["wild16"]["REGULAR_MOVE"]["phases"]["make_move"]["calls"] == 2
+    assert total.asks == 6
+
+    total.reset()
+    assert total.as_dict() == {}
+    assert total.phase_totals()["make_move"] == {"calls": 0, "seconds": 0.0}
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+
+"""Idle-game store tests."""
+
+import os
+import random
+import tempfile
+
+import chess
+import pytest
+
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.game import KriegspielGame
+from kriegspiel.move import KriegspielAnswer as KSAnswer
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import MainAnnouncement as MA
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.observer import RefereeObserver
+from kriegspiel.serialization import SerializationError, serialize_berkeley_game
+from kriegspiel.store import GameStore
+from kriegspiel.wild16 import Wild16Game
+
+
+def _question(uci):
+    return KSMove(QA.COMMON, chess.Move.from_uci(uci))
+
+
+def _random_game(ruleset, seed, questions=80):
+    rng = random.Random(seed)
+    game = KriegspielGame(ruleset=ruleset)
+    for _ in range(questions):
+        if game.game_over:
+            break
+        game.ask_for(rng.choice(sorted(game.possible_to_ask)))
+    return game
+
+
+@pytest.fixture
+def directory():
+    with tempfile.TemporaryDirectory() as directory:
+        yield directory
+
+
+def test_least_recently_used_games_are_evicted():
+    store = GameStore(max_live=2)
+    first, second, third = (store.add(KriegspielGame()) for _ in range(3))
+
+    stats = store.stats()
+    assert (stats.live, stats.spilled_in_memory, stats.evictions) == (2, 1, 1)
+    assert stats.spilled_bytes > 0
+    assert len(store) == 3
+    assert first in store and third in store and "other" not in store
+
+    # Touching `second` makes `third` the next victim.
+    store.get(second)
+    assert store.ask(first, _question("e2e4")) == KSAnswer(MA.REGULAR_MOVE)
+    stats = store.stats()
+    assert (stats.live, stats.evictions, stats.rehydrations) == (2, 2, 1)
+    assert store.get(second) is store.get(second)
+    assert store.stats().rehydrations == 1
+
+
+def test_rehydrated_games_are_unchanged():
+    store = GameStore(max_live=1)
+    games = [_random_game(ruleset, seed) for ruleset in ("berkeley", "cincinnati", "crazykrieg") for seed in range(2)]
+    expected = [serialize_berkeley_game(game) for game in games]
+    game_ids = [store.add(game) for game in games]
+
+    for game_id, document in zip(game_ids, expected):
+        assert serialize_berkeley_game(store.get(game_id)) == document
+
+    # Further play matches play on the original games.
+    rng = random.Random(3)
+    for game_id, game in zip(game_ids, games):
+        if not game.game_over:
+            question = rng.choice(sorted(game.possible_to_ask))
+            assert store.ask(game_id, question) == game.ask_for(question)
+            store.add(KriegspielGame())
+
+
+def test_game_class_is_kept():
+    store = GameStore(max_live=1)
+    berkeley = store.add(BerkeleyGame(any_rule=True))
+    wild16 = store.add(Wild16Game())
+
+    assert type(store.get(berkeley)) is BerkeleyGame
+    assert type(store.get(wild16)) is Wild16Game
+
+
+def test_memory_budget_spills_to_disk(directory):
+    store = GameStore(max_live=1, memory_budget=0, directory=directory)
+    first = store.add(_random_game("berkeley", 0), game_id="a/b")
+    document = serialize_berkeley_game(store.get(first))
+    store.add(KriegspielGame(), game_id="second")
+
+    stats = store.stats()
+    assert (stats.spilled_in_memory, stats.spilled_on_disk, stats.disk_spills, stats.spilled_bytes) == (0, 1, 1, 0)
+    assert len(os.listdir(directory)) == 1
+
+    assert serialize_berkeley_game(store.get(first)) == document
+    assert store.stats().spilled_on_disk == 1
+    assert len(os.listdir(directory)) == 1
+
+    store.remove("second")
+    store.remove(first)
+    assert os.listdir(directory) == []
+    assert len(store) == 0
+
+
+def test_budget_keeps_recent_games_in_memory(directory):
+    store = GameStore(max_live=1, memory_budget=10 ** 6, directory=directory)
+    for _ in range(3):
+        store.add(KriegspielGame())
+
+    stats = store.stats()
+    assert (stats.spilled_in_memory, stats.spilled_on_disk) == (2, 0)
+
+
+def test_remove():
+    store = GameStore(max_live=1)
+    spilled, live = store.add(KriegspielGame()), store.add(KriegspielGame())
+
+    store.remove(spilled)
+    store.remove(live)
+
+    assert store.stats().spilled_bytes == 0
+    with pytest.raises(KeyError):
+        store.remove(live)
+    with pytest.raises(KeyError):
+        store.get(live)
+
+
+def test_duplicate_ids_and_invalid_settings():
+    store = GameStore()
+    store.add(KriegspielGame(), game_id="a")
+
+    with pytest.raises(ValueError, match="already in use"):
+        store.add(KriegspielGame(), game_id="a")
+    with pytest.raises(ValueError, match="max_live"):
+        GameStore(max_live=0)
+    with pytest.raises(ValueError, match="requires a directory"):
+        GameStore(memory_budget=100)
+
+
+def test_disk_errors(directory):
+    store = GameStore(max_live=1, memory_budget=0, directory=os.path.join(directory, "missing"))
+    store.add(KriegspielGame(), game_id="a")
+
+    with pytest.raises(SerializationError, match="Failed to save game"):
+        store.add(KriegspielGame(), game_id="b")
+    assert store.stats().spilled_in_memory == 1
+
+    store = GameStore(max_live=1, memory_budget=0, directory=directory)
+    store.add(KriegspielGame(), game_id="a")
+    store.add(KriegspielGame(), game_id="b")
+    os.remove(store._path("a"))
+
+    with pytest.raises(SerializationError, match="Failed to load game"):
+        store.get("a")
+    assert "a" in store
+
+
+def test_failed_rehydration_keeps_the_stored_game(directory, monkeypatch):
+    store = GameStore(max_live=1)
+    store.add(_random_game("berkeley", seed=1), game_id="a")
+    store.add(KriegspielGame(), game_id="b")
+    game_class, data = store._in_memory["a"]
+    store._in_memory["a"] = (game_class, data[:-4])
+
+    with pytest.raises(SerializationError):
+        store.get("a")
+    assert store.stats().spilled_in_memory == 1 and store.stats().spilled_bytes == len(data)
+    store._in_memory["a"] = (game_class, data)
+    assert store.get("a").snapshot().move_stack
+
+    store = GameStore(max_live=1, memory_budget=0, directory=directory)
+    store.add(KriegspielGame(), game_id="a")
+    store.add(KriegspielGame(), game_id="b")
+    with open(store._path("a"), "rb") as f:
+        data = f.read()
+    with open(store._path("a"), "wb") as f:
+        f.write(data[:-4])
+
+    with pytest.raises(SerializationError):
+        store.get("a")
+    assert os.path.exists(store._path("a")) and store.stats().spilled_on_disk == 1
+
+    with open(store._path("a"), "wb") as f:
+        f.write(data)
+
+    def fail_remove(path):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(os, "remove", fail_remove)
+    with pytest.raises(SerializationError, match="Failed to remove spilled game"):
+        store.get("a")
+    monkeypatch.undo()
+    assert store.stats().spilled_on_disk == 1
+    assert store.get("a").ruleset_id == "berkeley_any"
+    assert not os.path.exists(store._path("a"))
+
+
+def test_hooks_survive_eviction():
+    class Observer(RefereeObserver):
+        def __init__(self):
+            self.answers = []
+
+        def after_question(self, game, question, answer):
+            self.answers.append(answer)
+
+    store = GameStore(max_live=1)
+    game = KriegspielGame()
+    events = []
+    observer = Observer()
+    game.subscribe(events.append)
+    game.add_observer(observer)
+    stats = game.enable_stats(aggregate=False)
+    store.add(game, game_id="a")
+    store.ask("a", _question("e2e4"))
+    other = KriegspielGame()
+    other.subscribe(events.append)
+    store.add(other, game_id="b")
+
+    assert store.ask("a", _question("e7e5")) == KSAnswer(MA.REGULAR_MOVE)
+    rehydrated = store.get("a")
+    assert rehydrated is not game
+    assert [event.ply for event in events] == [1, 2]
+    assert len(observer.answers) == 2
+    assert rehydrated.stats() is stats and stats.asks == 2
+
+    store.add(KriegspielGame(), game_id="c")
+    assert set(store._hooks) == {"a", "b"}
+    store.remove("a")
+    store.ask("b", _question("d2d4"))
+    assert store.get("b").stats() is None
+    assert [event.ply for event in events] == [1, 2, 1]
+    assert store._hooks == {}
+
+
+def test_rehydration_latency_histogram():
+    store = GameStore(max_live=1, latency_buckets=(10.0,))
+    first = store.add(KriegspielGame())
+    store.add(KriegspielGame())
+    store.get(first)
+
+    assert store.stats().rehydration_seconds == ((10.0, 1), (float("inf"), 0))
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""Observer hook and trace ring tests."""
+
+import json
+
+import chess
+import pytest
+
+from kriegspiel.berkeley import BerkeleyGame
+from kriegspiel.move import KriegspielMove as KSMove
+from kriegspiel.move import MainAnnouncement as MA
+from kriegspiel.move import QuestionAnnouncement as QA
+from kriegspiel.observer import RefereeObserver
+from kriegspiel.trace import (
+    AFTER_QUESTION, ASKABLE_REGENERATED, BEFORE_QUESTION, MOVE_PUSHED, TraceRing,
+)
+
+
+def _play(game, *questions):
+    for question in questions:
+        if question == "any":
+            game.ask_for(KSMove(QA.ASK_ANY))
+        else:
+            game.ask_for(KSMove(QA.COMMON, chess.Move.from_uci(question)))
+    return game
+
+
+class _Recorder(RefereeObserver):
+    def __init__(self):
+        self.calls = []
+
+    def before_question(self, game, question):
+        self.calls.append(("before", question))
+
+    def after_question(self, game, question, answer):
+        self.calls.append(("after", answer.main_announcement))
+
+    def move_pushed(self, game, move):
+        self.calls.append(("pushed", move.uci()))
+
+    def askable_regenerated(self, game):
+        self.calls.append(("regenerated", len(game.possible_to_ask)))
+
+    def game_over(self, game):
+        self.calls.append(("over", game.game_over))
+
+
+def test_hooks_run_in_order():
+    game = BerkeleyGame()
+    recorder = _Recorder()
+    game.add_observer(recorder)
+
+    _play(game, "e2e4", "e7e5", "e4e5", "a1a8")
+
+    assert recorder.calls == [
+        ("before", KSMove(QA.COMMON, chess.Move.from_uci("e2e4"))),
+        ("pushed", "e2e4"),
+        ("regenerated", 35),
+        ("after", MA.REGULAR_MOVE),
+        ("before", KSMove(QA.COMMON, chess.Move.from_uci("e7e5"))),
+        ("pushed", "e7e5"),
+        ("regenerated", 45),
+        ("after", MA.REGULAR_MOVE),
+        ("before", KSMove(QA.COMMON, chess.Move.from_uci("e4e5"))),
+        ("after", MA.ILLEGAL_MOVE),
+        ("before", KSMove(QA.COMMON, chess.Move.from_uci("a1a8"))),
+        ("after", MA.IMPOSSIBLE_TO_ASK),
+    ]
+
+    game.remove_observer(recorder)
+    _play(game, "g1f3")
+    assert len(recorder.calls) == 12
+
+
+def test_game_over_hook_runs_once():
+    game = BerkeleyGame()
+    recorder = _Recorder()
+    game.add_observer(RefereeObserver())
+    game.add_observer(recorder)
+
+    _play(game, "e2e4", "e7e5", "f1c4", "a7a6", "d1h5", "b8c6", "h5f7", "a6a5")
+
+    assert recorder.calls[-6:] == [
+        ("pushed", "h5f7"),
+        ("regenerated", 0),
+        ("after", MA.CAPTURE_DONE),
+        ("over", True),
+        ("before", KSMove(QA.COMMON, chess.Move.from_uci("a6a5"))),
+        ("after", MA.IMPOSSIBLE_TO_ASK),
+    ]
+    assert [call for call in recorder.calls if call[0] == "over"] == [("over", True)]
+
+
+def test_ring_records_compact_events():
+    game = BerkeleyGame()
+    ring = TraceRing()
+    game.add_observer(ring)
+
+    _play(game, "e2e4", "e7e5", "e4e5")
+
+    events = ring.events()
+    assert [kind for _, kind, _, _ in events] == [
+        BEFORE_QUESTION, MOVE_PUSHED, ASKABLE_REGENERATED, AFTER_QUESTION,
+        BEFORE_QUESTION, MOVE_PUSHED, ASKABLE_REGENERATED, AFTER_QUESTION,
+        BEFORE_QUESTION, AFTER_QUESTION,
+    ]
+    assert {game_id for _, _, game_id, _ in events} == {id(game)}
+    assert all(a <= b for (a, _, _, _), (b, _, _, _) in zip(events, events[1:]))
+    assert events[-1][3] & 7 == MA.ILLEGAL_MOVE.value
+    assert (len(ring), ring.overwritten) == (10, 0)
+
+
+def test_ring_wraps_around():
+    game = BerkeleyGame()
+    ring = TraceRing(capacity=6)
+    game.add_observer(ring)
+
+    _play(game, "e2e4", "e7e5", "e4e5")
+
+    assert (len(ring), ring.overwritten) == (6, 4)
+    assert [kind for _, kind, _, _ in ring.events()] == [
+        BEFORE_QUESTION, MOVE_PUSHED, ASKABLE_REGENERATED, AFTER_QUESTION, BEFORE_QUESTION, AFTER_QUESTION,
+    ]
+
+    ring.clear()
+    assert ring.events() == []
+    assert ring.to_chrome_trace() == {"traceEvents": [], "displayTimeUnit": "ms"}
+
+    with pytest.raises(ValueError, match="positive"):
+        TraceRing(capacity=0)
+
+
+def test_chrome_trace_export(tmp_path):
+    ring = TraceRing(capacity=13)
+    first, second = BerkeleyGame(), BerkeleyGame()
+    first.add_observer(ring)
+    _play(first, "e2e4", "e7e5", "f1c4", "a7a6", "d1h5", "b8c6", "h5f7")
+    second.add_observer(ring)
+    _play(second, "e2e4", "any")
+
+    trace = ring.to_chrome_trace()
+    events = trace["traceEvents"]
+
+    assert events[0] == {
+        "name": "askable_regenerated", "ph": "i", "s": "t", "pid": 1, "tid": 1, "ts": 0.0,
+        "args": {"possible_to_ask": 66},
+    }
+    # The start of b8c6 was overwritten, so only its answer is shown.
+    assert (events[1]["name"], events[1]["args"]) == (
+        "after_question", {"question": "b8c6", "answer": "REGULAR_MOVE"},
+    )
+    slices = [event for event in events if event["ph"] == "X"]
+    assert [(event["tid"], event["args"]["question"], event["args"]["answer"]) for event in slices] == [
+        (1, "h5f7", "CAPTURE_DONE"), (2, "e2e4", "REGULAR_MOVE"), (2, "ASK_ANY", "NO_ANY"),
+    ]
+    assert all(event["dur"] >= 0 for event in slices)
+    instants = [(event["name"], event["args"]) for event in events if event["ph"] == "i"]
+    assert ("move_pushed", {"move": "h5f7"}) in instants
+    assert ("askable_regenerated", {"possible_to_ask": 0}) in instants
+    assert ("game_over", {}) in instants
+    assert [event["args"]["name"] for event in events if event["ph"] == "M"] == [
+        f"game {id(first):#x}", f"game {id(second):#x}",
+    ]
+
+    filename = tmp_path / "trace.json"
+    ring.write_chrome_trace(str(filename))
+    assert json.loads(filename.read_text()) == trace